@@ -0,0 +1,46 @@
+"""Add keyset pagination indexes
+
+Adds (sort column, id) composite indexes so cursor-paginated permit and
+property searches can seek directly to the next page:
+- septic_permits: permit_date, address_normalized, owner_name, created_at
+- properties: address_normalized, owner_name, created_at
+
+Indexes are built CONCURRENTLY to avoid locking the 7M+ row permits table.
+
+Revision ID: f1a2b3c4d5e6
+Revises: e1f2g3h4i5j6
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f1a2b3c4d5e6'
+down_revision = 'e1f2g3h4i5j6'
+branch_labels = None
+depends_on = None
+
+
+KEYSET_INDEXES = [
+    ('idx_septic_permits_keyset_permit_date', 'septic_permits', 'permit_date'),
+    ('idx_septic_permits_keyset_address', 'septic_permits', 'address_normalized'),
+    ('idx_septic_permits_keyset_owner', 'septic_permits', 'owner_name'),
+    ('idx_septic_permits_keyset_created', 'septic_permits', 'created_at'),
+    ('idx_properties_keyset_address', 'properties', 'address_normalized'),
+    ('idx_properties_keyset_owner', 'properties', 'owner_name'),
+    ('idx_properties_keyset_created', 'properties', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in KEYSET_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column}, id)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _column in reversed(KEYSET_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
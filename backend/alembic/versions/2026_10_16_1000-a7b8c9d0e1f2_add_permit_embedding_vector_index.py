@@ -0,0 +1,55 @@
+"""Convert permit embeddings to pgvector with an HNSW index
+
+Changes:
+- Requires the pgvector extension (previously optional)
+- septic_permits.embedding: double precision[] -> vector(384), by
+  dropping the array column and adding a new one; both are catalog-only
+  changes, whereas ALTER COLUMN ... TYPE would rewrite the whole table
+  under an ACCESS EXCLUSIVE lock. Existing arrays (from no particular
+  model) are discarded and re-embedded by the backfill
+- HNSW index on embedding using cosine distance, built CONCURRENTLY
+- Partial index on id for rows still waiting for an embedding (backfill scan)
+
+Revision ID: a7b8c9d0e1f2
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a7b8c9d0e1f2'
+down_revision = 'f1a2b3c4d5e6'
+branch_labels = None
+depends_on = None
+
+
+EMBEDDING_DIMENSIONS = 384
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+
+    op.execute('ALTER TABLE septic_permits DROP COLUMN embedding')
+    op.execute(f'ALTER TABLE septic_permits ADD COLUMN embedding vector({EMBEDDING_DIMENSIONS})')
+
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_septic_permits_embedding_hnsw
+            ON septic_permits USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_septic_permits_embedding_pending
+            ON septic_permits (id)
+            WHERE embedding IS NULL AND is_active = TRUE
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_septic_permits_embedding_pending')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_septic_permits_embedding_hnsw')
+
+    op.execute('ALTER TABLE septic_permits DROP COLUMN embedding')
+    op.execute('ALTER TABLE septic_permits ADD COLUMN embedding double precision[]')
@@ -0,0 +1,51 @@
+"""Add PostGIS geography indexes for radius search
+
+Changes:
+- Enables the postgis extension
+- GiST expression index on geography(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326))
+  for septic_permits
+- Same for properties, falling back to the parcel centroid
+  (COALESCE(latitude, centroid_lat), COALESCE(longitude, centroid_lon))
+
+Expression indexes avoid rewriting the tables to add a geography column;
+queries must use the same expressions (SepticPermit.geo_point / Property.geo_point).
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b8c9d0e1f2a3'
+down_revision = 'a7b8c9d0e1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS postgis')
+
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_septic_permits_geog
+            ON septic_permits USING gist (
+                geography(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326))
+            )
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_properties_geog
+            ON properties USING gist (
+                geography(ST_SetSRID(ST_MakePoint(
+                    COALESCE(longitude, centroid_lon),
+                    COALESCE(latitude, centroid_lat)
+                ), 4326))
+            )
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_properties_geog')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_septic_permits_geog')
@@ -0,0 +1,165 @@
+"""Add permit_rollups with trigger-maintained counters
+
+Changes:
+- Create permit_rollups (dimension, state_id, county_id, period) counters
+  over active permits: state, county, state_year, state_month (no global
+  row, so concurrent writers in different states never queue on one lock)
+- Statement-level AFTER INSERT/UPDATE/DELETE triggers on septic_permits
+  apply one grouped upsert per statement using transition tables, so bulk
+  ingestion chunks cost one rollup write, and updates that don't touch
+  counted fields net to zero and write nothing
+- Populate from existing permits
+
+The trigger and population SQL is a snapshot of
+app.services.permit_rollup_service as of this revision; later changes to
+the service need their own migration.
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import List
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c9d0e1f2a3b4'
+down_revision = 'b8c9d0e1f2a3'
+branch_labels = None
+depends_on = None
+
+
+# Snapshot of the rollup SQL in app.services.permit_rollup_service at this
+# revision, kept here so the migration does not change when the service does
+
+# Rows contributing to the rollups from one relation, with a +1/-1 sign
+DELTA_SELECT = """
+    SELECT
+        state_id,
+        COALESCE(county_id, 0) AS county_id,
+        COALESCE(EXTRACT(YEAR FROM permit_date)::int, 0) AS permit_year,
+        COALESCE((EXTRACT(YEAR FROM permit_date) * 100 + EXTRACT(MONTH FROM permit_date))::int, 0) AS permit_month,
+        data_quality_score AS quality,
+        {sign} AS sign
+    FROM {relation}
+    WHERE is_active
+"""
+
+# Fan each delta row out to every dimension and add it to the counters
+ROLLUP_UPSERT = """
+    WITH delta AS (
+        {delta}
+    ),
+    expanded AS (
+        SELECT 'state' AS dimension, state_id, 0 AS county_id, 0 AS period, sign, quality FROM delta
+        UNION ALL
+        SELECT 'county', state_id, county_id, 0, sign, quality FROM delta WHERE county_id <> 0
+        UNION ALL
+        SELECT 'state_year', state_id, 0, permit_year, sign, quality FROM delta
+        UNION ALL
+        SELECT 'state_month', state_id, 0, permit_month, sign, quality FROM delta
+    )
+    INSERT INTO permit_rollups AS r (
+        dimension, state_id, county_id, period,
+        permit_count, quality_sum, quality_count, updated_at
+    )
+    SELECT
+        dimension, state_id, county_id, period,
+        SUM(sign),
+        SUM(sign * COALESCE(quality, 0)),
+        SUM(CASE WHEN quality IS NOT NULL THEN sign ELSE 0 END),
+        now()
+    FROM expanded
+    GROUP BY dimension, state_id, county_id, period
+    HAVING SUM(sign) <> 0
+        OR SUM(sign * COALESCE(quality, 0)) <> 0
+        OR SUM(CASE WHEN quality IS NOT NULL THEN sign ELSE 0 END) <> 0
+    ORDER BY dimension, state_id, county_id, period
+    ON CONFLICT (dimension, state_id, county_id, period) DO UPDATE SET
+        permit_count = r.permit_count + EXCLUDED.permit_count,
+        quality_sum = r.quality_sum + EXCLUDED.quality_sum,
+        quality_count = r.quality_count + EXCLUDED.quality_count,
+        updated_at = EXCLUDED.updated_at
+"""
+
+ROLLUP_TRIGGERS = {
+    # operation: (transition table clause, delta rows)
+    'insert': (
+        'REFERENCING NEW TABLE AS new_rows',
+        DELTA_SELECT.format(sign=1, relation='new_rows'),
+    ),
+    'update': (
+        'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows',
+        DELTA_SELECT.format(sign=1, relation='new_rows') + ' UNION ALL ' +
+        DELTA_SELECT.format(sign=-1, relation='old_rows'),
+    ),
+    'delete': (
+        'REFERENCING OLD TABLE AS old_rows',
+        DELTA_SELECT.format(sign=-1, relation='old_rows'),
+    ),
+}
+
+# Initial population from septic_permits
+POPULATE_SQL = ROLLUP_UPSERT.format(delta=DELTA_SELECT.format(sign=1, relation='septic_permits'))
+
+
+def rollup_trigger_statements() -> List[str]:
+    """CREATE statements for the statement-level rollup triggers on septic_permits."""
+    statements = []
+    for operation, (referencing, delta) in ROLLUP_TRIGGERS.items():
+        statements.append(f"""
+            CREATE OR REPLACE FUNCTION permit_rollups_after_{operation}()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                {ROLLUP_UPSERT.format(delta=delta)};
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        statements.append(f"""
+            DROP TRIGGER IF EXISTS trig_septic_permits_rollup_{operation} ON septic_permits;
+            CREATE TRIGGER trig_septic_permits_rollup_{operation}
+            AFTER {operation.upper()} ON septic_permits
+            {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION permit_rollups_after_{operation}();
+        """)
+    return statements
+
+
+def drop_rollup_trigger_statements() -> List[str]:
+    """DROP statements reversing rollup_trigger_statements()."""
+    statements = []
+    for operation in ROLLUP_TRIGGERS:
+        statements.append(f'DROP TRIGGER IF EXISTS trig_septic_permits_rollup_{operation} ON septic_permits')
+        statements.append(f'DROP FUNCTION IF EXISTS permit_rollups_after_{operation}()')
+    return statements
+
+
+def upgrade() -> None:
+    op.create_table(
+        'permit_rollups',
+        sa.Column('dimension', sa.String(20), nullable=False),
+        sa.Column('state_id', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('county_id', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('period', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('permit_count', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('quality_sum', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('quality_count', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('dimension', 'state_id', 'county_id', 'period'),
+    )
+
+    for statement in rollup_trigger_statements():
+        op.execute(statement)
+
+    # Initial population from existing permits
+    op.execute(POPULATE_SQL)
+
+
+def downgrade() -> None:
+    for statement in drop_rollup_trigger_statements():
+        op.execute(statement)
+
+    op.drop_table('permit_rollups')
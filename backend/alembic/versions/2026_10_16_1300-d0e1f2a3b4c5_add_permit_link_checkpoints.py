@@ -0,0 +1,61 @@
+"""Add permit link checkpoints and incremental linking indexes
+
+Changes:
+- Create permit_link_checkpoints (per-scope watermarks and resume cursors
+  for the background permit-to-property linker)
+- Partial index on unlinked active permits by (updated_at, id)
+- Index on properties (updated_at, id)
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'd0e1f2a3b4c5'
+down_revision = 'c9d0e1f2a3b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'permit_link_checkpoints',
+        sa.Column('scope', sa.String(100), nullable=False),
+        sa.Column('permit_watermark', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('property_watermark', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='idle'),
+        sa.Column('run_mode', sa.String(20), nullable=True),
+        sa.Column('run_started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('permit_cursor_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('permit_cursor_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('property_cursor_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('property_cursor_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('last_run_stats', sa.JSON, nullable=True),
+        sa.Column('last_error', sa.Text, nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('scope')
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_septic_permits_unlinked_updated
+            ON septic_permits (updated_at, id)
+            WHERE property_id IS NULL AND is_active = TRUE
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_properties_updated
+            ON properties (updated_at, id)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_properties_updated')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_septic_permits_unlinked_updated')
+
+    op.drop_table('permit_link_checkpoints')
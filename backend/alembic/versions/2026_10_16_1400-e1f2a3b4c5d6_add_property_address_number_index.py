@@ -0,0 +1,32 @@
+"""Add property street-number index for fuzzy address matching
+
+Changes:
+- Expression index on properties (state_id, county_id,
+  split_part(address_normalized, ' ', 1)) used to load the candidate
+  blocks of the fuzzy address matcher
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e1f2a3b4c5d6'
+down_revision = 'd0e1f2a3b4c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_properties_address_number
+            ON properties (state_id, county_id, split_part(address_normalized, ' ', 1))
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_properties_address_number')
@@ -0,0 +1,63 @@
+"""Add permit dedup checkpoints and duplicate-detection block indexes
+
+Changes:
+- Create permit_dedup_checkpoints (per-scope watermark and resume cursor
+  for the background duplicate detector)
+- Expression index on active permits by (state_id, normalized parcel number)
+- Expression index on active permits by (state_id, owner + street)
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'f2a3b4c5d6e7'
+down_revision = 'e1f2a3b4c5d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'permit_dedup_checkpoints',
+        sa.Column('scope', sa.String(100), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='idle'),
+        sa.Column('run_mode', sa.String(20), nullable=True),
+        sa.Column('run_started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('cursor_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('cursor_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('last_run_stats', sa.JSON, nullable=True),
+        sa.Column('last_error', sa.Text, nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('scope')
+    )
+
+    # Expressions must match SepticPermit.parcel_key() / owner_street_key()
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_septic_permits_parcel_key
+            ON septic_permits (state_id, upper(regexp_replace(parcel_number, '[^A-Za-z0-9]', '', 'g')))
+            WHERE parcel_number IS NOT NULL AND is_active = TRUE
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_septic_permits_owner_street
+            ON septic_permits (
+                state_id,
+                (owner_name_normalized || '|' || regexp_replace(address_normalized, '^[0-9]+[A-Z]?\\s+', ''))
+            )
+            WHERE owner_name_normalized IS NOT NULL AND is_active = TRUE
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_septic_permits_owner_street')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_septic_permits_parcel_key')
+
+    op.drop_table('permit_dedup_checkpoints')
@@ -0,0 +1,50 @@
+"""Record the address normalizer version on permits and properties
+
+Changes:
+- address_normalizer_version (smallint, nullable) on septic_permits and
+  properties. NULL marks rows normalized by the per-writer normalizers
+  that predate app.utils.address_normalization.canonicalize_address;
+  the rehash_addresses job recomputes address_normalized/address_hash
+  for every row below the current version
+- Expression indexes on coalesce(address_normalizer_version, 0) so the
+  rehash job finds stale rows without scanning; once every row is on the
+  same version B-tree deduplication keeps them small
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a3b4c5d6e7f8'
+down_revision = 'f2a3b4c5d6e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable without default: metadata-only change, no table rewrite
+    op.add_column('septic_permits', sa.Column('address_normalizer_version', sa.SmallInteger(), nullable=True))
+    op.add_column('properties', sa.Column('address_normalizer_version', sa.SmallInteger(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_septic_permits_normalizer_version
+            ON septic_permits ((coalesce(address_normalizer_version, 0)))
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_properties_normalizer_version
+            ON properties ((coalesce(address_normalizer_version, 0)))
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_properties_normalizer_version')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_septic_permits_normalizer_version')
+
+    op.drop_column('properties', 'address_normalizer_version')
+    op.drop_column('septic_permits', 'address_normalizer_version')
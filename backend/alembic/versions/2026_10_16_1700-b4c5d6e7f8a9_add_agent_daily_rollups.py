@@ -0,0 +1,134 @@
+"""Add agent_daily_rollups for agent performance and the quality heatmap
+
+Changes:
+- Create agent_daily_rollups: per (user_id, UTC day of call_logs.created_at)
+  call counts, (sum, count) pairs for call and analysis scores, and
+  strengths/improvement_areas item counts as JSONB. Refreshed per cell by
+  the analysis pipeline and the RingCentral sync (AgentRollupService)
+- Index on day for the heatmap range read
+- Populate from existing calls
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'b4c5d6e7f8a9'
+down_revision = 'a3b4c5d6e7f8'
+branch_labels = None
+depends_on = None
+
+
+# Same aggregation as AgentRollupService.REFRESH_SQL over every call
+POPULATE_SQL = """
+    WITH cells AS (
+        SELECT DISTINCT user_id, (created_at AT TIME ZONE 'UTC')::date AS day
+        FROM call_logs
+    ),
+    calls AS (
+        SELECT
+            c.user_id, c.day,
+            cl.duration_seconds, cl.quality_score, cl.sentiment_score,
+            ca.id AS analysis_id,
+            ca.professionalism_score, ca.empathy_score, ca.clarity_score, ca.resolution_score,
+            CASE WHEN json_typeof(ca.strengths) = 'array' THEN ca.strengths END AS strengths,
+            CASE WHEN json_typeof(ca.improvement_areas) = 'array' THEN ca.improvement_areas END AS improvement_areas
+        FROM cells c
+        JOIN call_logs cl
+            ON cl.user_id = c.user_id
+            AND cl.created_at >= c.day::timestamp AT TIME ZONE 'UTC'
+            AND cl.created_at < (c.day + 1)::timestamp AT TIME ZONE 'UTC'
+        LEFT JOIN call_analyses ca ON ca.call_log_id = cl.id
+    ),
+    totals AS (
+        SELECT
+            user_id, day,
+            COUNT(*) AS call_count,
+            COALESCE(SUM(duration_seconds), 0) AS duration_sum, COUNT(duration_seconds) AS duration_count,
+            COALESCE(SUM(quality_score), 0) AS quality_sum, COUNT(quality_score) AS quality_count,
+            COALESCE(SUM(sentiment_score), 0) AS sentiment_sum, COUNT(sentiment_score) AS sentiment_count,
+            COUNT(analysis_id) AS analysis_count,
+            COALESCE(SUM(professionalism_score), 0) AS professionalism_sum,
+            COUNT(professionalism_score) AS professionalism_count,
+            COALESCE(SUM(empathy_score), 0) AS empathy_sum, COUNT(empathy_score) AS empathy_count,
+            COALESCE(SUM(clarity_score), 0) AS clarity_sum, COUNT(clarity_score) AS clarity_count,
+            COALESCE(SUM(resolution_score), 0) AS resolution_sum, COUNT(resolution_score) AS resolution_count
+        FROM calls
+        GROUP BY user_id, day
+    ),
+    items AS (
+        SELECT user_id, day, 'strengths' AS kind, json_array_elements_text(strengths) AS item
+        FROM calls WHERE strengths IS NOT NULL
+        UNION ALL
+        SELECT user_id, day, 'improvement_areas', json_array_elements_text(improvement_areas)
+        FROM calls WHERE improvement_areas IS NOT NULL
+    ),
+    coaching AS (
+        SELECT user_id, day, kind, jsonb_object_agg(item, n) AS counts
+        FROM (
+            SELECT user_id, day, kind, item, COUNT(*) AS n
+            FROM items
+            GROUP BY user_id, day, kind, item
+        ) item_counts
+        GROUP BY user_id, day, kind
+    )
+    INSERT INTO agent_daily_rollups AS r (
+        user_id, day, call_count, duration_sum, duration_count,
+        quality_sum, quality_count, sentiment_sum, sentiment_count,
+        analysis_count, professionalism_sum, professionalism_count,
+        empathy_sum, empathy_count, clarity_sum, clarity_count,
+        resolution_sum, resolution_count, strengths, improvement_areas, updated_at
+    )
+    SELECT
+        t.user_id, t.day, t.call_count, t.duration_sum, t.duration_count,
+        t.quality_sum, t.quality_count, t.sentiment_sum, t.sentiment_count,
+        t.analysis_count, t.professionalism_sum, t.professionalism_count,
+        t.empathy_sum, t.empathy_count, t.clarity_sum, t.clarity_count,
+        t.resolution_sum, t.resolution_count,
+        COALESCE(s.counts, jsonb_build_object()), COALESCE(i.counts, jsonb_build_object()), now()
+    FROM totals t
+    LEFT JOIN coaching s ON s.user_id = t.user_id AND s.day = t.day AND s.kind = 'strengths'
+    LEFT JOIN coaching i ON i.user_id = t.user_id AND i.day = t.day AND i.kind = 'improvement_areas'
+    ORDER BY t.user_id, t.day
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'agent_daily_rollups',
+        sa.Column('user_id', sa.String(255), primary_key=True),
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('call_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('duration_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('quality_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('quality_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sentiment_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('sentiment_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('analysis_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('professionalism_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('professionalism_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('empathy_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('empathy_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('clarity_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('clarity_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('resolution_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('resolution_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('strengths', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('improvement_areas', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.create_index('ix_agent_daily_rollups_day', 'agent_daily_rollups', ['day'])
+
+    # Initial population from existing calls
+    op.execute(POPULATE_SQL)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_agent_daily_rollups_day', 'agent_daily_rollups')
+    op.drop_table('agent_daily_rollups')
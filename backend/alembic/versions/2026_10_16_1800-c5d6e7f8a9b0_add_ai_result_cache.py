@@ -0,0 +1,53 @@
+"""Add ai_result_cache for transcription and LLM analysis results
+
+Changes:
+- Create ai_result_cache: results keyed by SHA-256 over (kind, model,
+  prompt_version, content_hash) so reprocessing a call reuses Whisper and
+  GPT/Ollama results whose input and prompt are unchanged (AIResultCache,
+  postgres backend)
+- Indexes on kind and content_hash (inspection / invalidation), expires_at
+  (TTL sweep) and last_used_at (LRU eviction past the size budget)
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c5d6e7f8a9b0'
+down_revision = 'b4c5d6e7f8a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_result_cache',
+        sa.Column('cache_key', sa.String(64), primary_key=True),
+        sa.Column('kind', sa.String(64), nullable=False),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('prompt_version', sa.String(64), nullable=False),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('result', postgresql.JSONB(), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_ai_result_cache_kind', 'ai_result_cache', ['kind'])
+    op.create_index('ix_ai_result_cache_content_hash', 'ai_result_cache', ['content_hash'])
+    op.create_index('ix_ai_result_cache_last_used_at', 'ai_result_cache', ['last_used_at'])
+    op.create_index('ix_ai_result_cache_expires_at', 'ai_result_cache', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_result_cache_expires_at', table_name='ai_result_cache')
+    op.drop_index('ix_ai_result_cache_last_used_at', table_name='ai_result_cache')
+    op.drop_index('ix_ai_result_cache_content_hash', table_name='ai_result_cache')
+    op.drop_index('ix_ai_result_cache_kind', table_name='ai_result_cache')
+    op.drop_table('ai_result_cache')
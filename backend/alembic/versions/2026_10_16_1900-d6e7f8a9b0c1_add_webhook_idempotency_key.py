@@ -0,0 +1,36 @@
+"""Add idempotency_key to rc_webhook_events
+
+Changes:
+- Add rc_webhook_events.idempotency_key, derived at ingestion from
+  (telephonySessionId, event type, 30-second timestamp bucket), so
+  WebhookProcessor finds duplicate deliveries with an index lookup over
+  adjacent buckets instead of re-reading every processed payload of the
+  same type from the last 10 minutes
+- Index on idempotency_key
+
+Existing rows keep a NULL key; the duplicate window is 30 seconds, so
+only events received after the upgrade need one.
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd6e7f8a9b0c1'
+down_revision = 'c5d6e7f8a9b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('rc_webhook_events', sa.Column('idempotency_key', sa.String(400), nullable=True))
+    op.create_index('ix_rc_webhook_events_idempotency_key', 'rc_webhook_events', ['idempotency_key'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_rc_webhook_events_idempotency_key', table_name='rc_webhook_events')
+    op.drop_column('rc_webhook_events', 'idempotency_key')
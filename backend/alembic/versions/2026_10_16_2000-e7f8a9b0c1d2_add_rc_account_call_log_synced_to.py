@@ -0,0 +1,32 @@
+"""Add call_log_synced_to to rc_accounts
+
+Changes:
+- Add rc_accounts.call_log_synced_to, the end of the last fully imported
+  call-log window. Each sync starts from it (less
+  RINGCENTRAL_SYNC_OVERLAP_MINUTES) instead of re-reading the whole
+  hours_back window.
+
+Existing accounts start with NULL, so their next sync reads the full
+window once.
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e7f8a9b0c1d2'
+down_revision = 'd6e7f8a9b0c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('rc_accounts', sa.Column('call_log_synced_to', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('rc_accounts', 'call_log_synced_to')
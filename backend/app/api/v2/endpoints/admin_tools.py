@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_active_user
 from app.models.ringcentral import CallLog
+from app.services.agent_rollup_service import AgentRollupService
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +89,7 @@ async def fix_call_statuses(
             updated_count += 1
 
         db.commit()
+        AgentRollupService(db).refresh_calls([call.id for call in ringing_calls])
 
         logger.info(f"Fixed {updated_count} call statuses from ringing to completed")
 
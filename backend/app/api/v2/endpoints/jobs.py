@@ -6,7 +6,7 @@ Provides monitoring, control, and status endpoints for the job processing system
 import logging
 from typing import Optional, List, Dict, Any
 
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_active_user
@@ -103,9 +103,10 @@ async def queue_analysis_job(
     call_log_id: str,
     analysis_modules: Optional[List[str]] = None,
     priority: str = "medium",
+    analysis_mode: Optional[str] = Query(None, pattern="^(sequential|concurrent|fused)$"),
     current_user = Depends(get_current_active_user)
 ):
-    """Queue a call analysis job."""
+    """Queue a call analysis job (analysis_mode defaults to CALL_ANALYSIS_MODE)."""
     try:
         priority_map = {
             "low": JobPriority.LOW,
@@ -118,7 +119,8 @@ async def queue_analysis_job(
         job_id = await background_job_manager.queue_analysis(
             call_log_id=call_log_id,
             analysis_modules=analysis_modules,
-            priority=job_priority
+            priority=job_priority,
+            analysis_mode=analysis_mode
         )
 
         return {
@@ -326,6 +328,225 @@ async def cleanup_old_jobs(
         )
 
 
+@router.post("/maintenance/permit-embeddings")
+async def backfill_permit_embeddings(
+    batch_size: int = 256,
+    time_budget_seconds: int = 540,
+    current_user = Depends(get_current_active_user)
+):
+    """
+    Embed permits that are missing or have stale semantic search embeddings.
+
+    Each job runs for up to time_budget_seconds and re-queues itself until
+    no pending permits remain.
+    """
+    try:
+        job_id = await background_job_manager.queue_embedding_backfill(
+            batch_size=batch_size,
+            time_budget_seconds=time_budget_seconds
+        )
+
+        return {
+            "status": "queued",
+            "backfill_job_id": job_id,
+            "batch_size": batch_size,
+            "message": "Permit embedding backfill job queued"
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to queue embedding backfill job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue embedding backfill job"
+        )
+
+
+@router.post("/maintenance/permit-rollups")
+async def rebuild_permit_rollups(
+    current_user = Depends(get_current_active_user)
+):
+    """
+    Recompute permit stats/facet rollups from scratch.
+
+    Rollups are maintained incrementally by database triggers; this is only
+    needed to repair drift.
+    """
+    try:
+        job_id = await background_job_manager.queue_job(
+            job_type="rebuild_permit_rollups",
+            job_data={},
+            priority=JobPriority.LOW
+        )
+
+        return {
+            "status": "queued",
+            "rebuild_job_id": job_id,
+            "message": "Permit rollup rebuild job queued"
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to queue rollup rebuild job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue rollup rebuild job"
+        )
+
+
+@router.get("/maintenance/ai-cache")
+async def get_ai_cache_stats(
+    current_user = Depends(get_current_active_user)
+):
+    """
+    AI result cache size and hit/miss counters.
+
+    Counters are per process (this API process); the eviction job reports
+    the worker's.
+    """
+    from app.services.ai_result_cache import get_ai_result_cache
+
+    try:
+        return get_ai_result_cache().stats()
+    except Exception as e:
+        logger.error(f"Failed to get AI cache stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get AI cache stats"
+        )
+
+
+@router.post("/maintenance/ai-cache/evict")
+async def evict_ai_cache(
+    current_user = Depends(get_current_active_user)
+):
+    """Queue eviction of expired and over-budget AI result cache entries."""
+    try:
+        job_id = await background_job_manager.queue_job(
+            job_type="evict_ai_cache",
+            job_data={},
+            priority=JobPriority.LOW
+        )
+
+        return {
+            "status": "queued",
+            "eviction_job_id": job_id,
+            "message": "AI cache eviction job queued"
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to queue AI cache eviction job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue AI cache eviction job"
+        )
+
+
+@router.post("/maintenance/agent-rollups")
+async def rebuild_agent_rollups(
+    days: Optional[int] = Query(None, ge=1, le=3650, description="Only rebuild the last N days"),
+    current_user = Depends(get_current_active_user)
+):
+    """
+    Recompute agent performance / quality heatmap rollups.
+
+    Rollups are refreshed as calls are synced and analyzed; this is only
+    needed to repair drift (e.g. calls edited or deleted directly).
+    """
+    try:
+        job_id = await background_job_manager.queue_job(
+            job_type="rebuild_agent_rollups",
+            job_data={"days": days},
+            priority=JobPriority.LOW
+        )
+
+        return {
+            "status": "queued",
+            "rebuild_job_id": job_id,
+            "message": "Agent rollup rebuild job queued"
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to queue agent rollup rebuild job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue agent rollup rebuild job"
+        )
+
+
+@router.post("/maintenance/permit-duplicates")
+async def detect_permit_duplicates(
+    state_code: Optional[str] = None,
+    full: bool = False,
+    min_confidence: float = 75.0,
+    time_budget_seconds: int = 540,
+    current_user = Depends(get_current_active_user)
+):
+    """
+    Find likely duplicate permits and record them for review
+    (GET /permits/duplicates).
+
+    Incremental by default: only permits ingested since the last completed
+    run are compared. Each job runs for up to time_budget_seconds and
+    re-queues itself until the run is finished.
+    """
+    try:
+        job_id = await background_job_manager.queue_duplicate_detection(
+            state_code=state_code.upper() if state_code else None,
+            full=full,
+            min_confidence=min_confidence,
+            time_budget_seconds=time_budget_seconds
+        )
+
+        return {
+            "status": "queued",
+            "dedup_job_id": job_id,
+            "state_code": state_code,
+            "full": full,
+            "message": "Permit duplicate detection job queued"
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to queue duplicate detection job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue duplicate detection job"
+        )
+
+
+@router.post("/maintenance/address-rehash")
+async def rehash_addresses(
+    table: Optional[str] = Query(None, pattern="^(permits|properties)$"),
+    time_budget_seconds: int = 540,
+    current_user = Depends(get_current_active_user)
+):
+    """
+    Recompute address_normalized/address_hash for permits and properties
+    written by an older address normalizer version.
+
+    Each job runs for up to time_budget_seconds and re-queues itself until
+    every stale row is done, then queues a full permit linking run if any
+    hash changed.
+    """
+    try:
+        job_id = await background_job_manager.queue_address_rehash(
+            tables=[table] if table else None,
+            time_budget_seconds=time_budget_seconds
+        )
+
+        return {
+            "status": "queued",
+            "rehash_job_id": job_id,
+            "table": table or "all",
+            "message": "Address rehash job queued"
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to queue address rehash job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue address rehash job"
+        )
+
+
 @router.get("/health")
 async def job_system_health():
     """Health check for the job processing system."""
@@ -398,14 +619,13 @@ async def list_all_jobs(
 ):
     """List all jobs for admin monitoring (admin only)."""
     try:
-        # This would require additional implementation in background_job_manager
-        # For now, return queue stats
-        stats = await background_job_manager.get_queue_stats()
+        jobs = await background_job_manager.list_jobs(limit=limit, status_filter=status_filter)
 
         return {
-            "message": "Full job listing requires additional implementation",
-            "queue_stats": stats,
-            "note": "Use /queue/stats for current queue information"
+            "jobs": jobs,
+            "count": len(jobs),
+            "limit": limit,
+            "status_filter": status_filter
         }
 
     except Exception as e:
@@ -419,14 +639,17 @@ async def list_all_jobs(
 @router.post("/admin/restart-failed")
 async def restart_failed_jobs(
     max_jobs: int = 50,
+    job_type: Optional[str] = None,
     current_user = Depends(get_current_active_user)
 ):
-    """Restart failed jobs (admin only)."""
+    """Replay dead-lettered (permanently failed) jobs, oldest first (admin only)."""
     try:
-        # This would require additional implementation
+        result = await background_job_manager.replay_failed_jobs(max_jobs=max_jobs, job_type=job_type)
+
         return {
-            "status": "not_implemented",
-            "message": "Failed job restart functionality requires additional implementation"
+            "status": "queued",
+            **result,
+            "message": f"Requeued {result['replayed']} failed jobs"
         }
 
     except Exception as e:
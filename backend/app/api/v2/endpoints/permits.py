@@ -9,11 +9,17 @@ Provides:
 - Duplicate management
 """
 
+import json
 import logging
-from typing import List, Optional
+import time
+import zlib
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import get_db, get_current_active_user
 from app.models.septic_permit import (
@@ -23,12 +29,15 @@ from app.models.septic_permit import (
 from app.schemas.septic_permit import (
     PermitSearchRequest, PermitSearchResponse, PermitResponse,
     PermitStatsResponse, PermitStatsOverview,
-    BatchIngestionRequest, BatchIngestionResponse,
+    BatchIngestionRequest, BatchIngestionResponse, StreamIngestionProgress,
+    IngestionMode, PermitCreate,
     DuplicatePair, DuplicateResolution, DuplicateResponse,
     StateResponse, CountyResponse, SystemTypeResponse, SourcePortalResponse,
     PermitVersionResponse, PermitHistoryResponse, PermitSummary
 )
-from app.services.permit_ingestion_service import get_permit_ingestion_service
+from app.services.permit_ingestion_service import (
+    get_permit_ingestion_service, BULK_CHUNK_SIZE
+)
 from app.services.permit_search_service import get_permit_search_service
 
 logger = logging.getLogger(__name__)
@@ -51,10 +60,14 @@ async def search_permits(
     longitude: Optional[float] = Query(None, ge=-180, le=180),
     radius_miles: Optional[float] = Query(None, ge=0.1, le=100),
     page: int = Query(1, ge=1),
-    page_size: int = Query(25, ge=1, le=100),
+    page_size: int = Query(25, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     sort_by: str = Query("relevance"),
     sort_order: str = Query("desc"),
     include_inactive: bool = Query(False),
+    semantic_weight: Optional[float] = Query(None, ge=0, le=1, description="0 disables semantic retrieval"),
+    keyword_candidates: int = Query(200, ge=1, le=2000),
+    semantic_candidates: int = Query(200, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
@@ -67,7 +80,9 @@ async def search_permits(
     - State/county/city/zip filtering
     - Date range filtering
     - Geo-radius search
-    - Pagination and sorting
+    - Pagination and sorting (page numbers, or keyset via cursor/next_cursor)
+    - Relevance-sorted text queries fuse keyword and vector candidates with RRF;
+      stage_timings_ms reports the cost of each stage
     """
     try:
         # Parse comma-separated values
@@ -93,9 +108,13 @@ async def search_permits(
             radius_miles=radius_miles,
             page=page,
             page_size=page_size,
+            cursor=cursor,
             sort_by=sort_by,
             sort_order=sort_order,
-            include_inactive=include_inactive
+            include_inactive=include_inactive,
+            semantic_weight=semantic_weight,
+            keyword_candidates=keyword_candidates,
+            semantic_candidates=semantic_candidates
         )
 
         service = get_permit_search_service(db)
@@ -126,6 +145,11 @@ async def search_permits_post(
     try:
         service = get_permit_search_service(db)
         return service.search(request)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid parameter: {str(e)}"
+        )
     except Exception as e:
         logger.error(f"Search failed: {e}")
         raise HTTPException(
@@ -402,6 +426,7 @@ async def ingest_batch(
     - Updates existing records if changed
     - Creates version history for updates
     - Returns statistics on processing
+    - mode="bulk" uses set-based multi-row upserts for large imports
     """
     try:
         if len(request.permits) > 10000:
@@ -411,7 +436,9 @@ async def ingest_batch(
             )
 
         service = get_permit_ingestion_service(db)
-        return service.ingest_batch(request.permits, request.source_portal_code)
+        return service.ingest_batch(
+            request.permits, request.source_portal_code, mode=request.mode
+        )
 
     except HTTPException:
         raise
@@ -423,6 +450,168 @@ async def ingest_batch(
         )
 
 
+# Streaming ingestion limits. Only one chunk of parsed records, one partial
+# line and a capped error list are held in memory at any time.
+MAX_NDJSON_LINE_BYTES = 1_000_000
+MAX_STREAM_ERROR_DETAILS = 1000
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class _IngestionProgressResponse(StreamingResponse):
+    """
+    StreamingResponse that does not listen for client disconnects.
+
+    Starlette's default implementation consumes ``receive()`` concurrently
+    with the body iterator, which would steal request body chunks that the
+    streaming ingestion endpoint is still reading.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def _iter_ndjson_lines(request: Request, progress: dict) -> AsyncIterator[bytes]:
+    """
+    Yield NDJSON lines from a (optionally gzip-compressed) request body.
+
+    The body is decompressed incrementally; compression is detected from the
+    Content-Encoding header or the gzip magic bytes.
+    """
+    decompressor = None
+    detected = False
+    buffer = b''
+
+    async for chunk in request.stream():
+        if not chunk:
+            continue
+        progress['bytes_read'] += len(chunk)
+
+        if not detected:
+            encoding = request.headers.get('content-encoding', '').lower()
+            if 'gzip' in encoding or chunk[:2] == GZIP_MAGIC:
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            detected = True
+
+        data = decompressor.decompress(chunk) if decompressor else chunk
+        buffer += data
+
+        lines = buffer.split(b'\n')
+        buffer = lines.pop()
+        if len(buffer) > MAX_NDJSON_LINE_BYTES:
+            raise ValueError(f"NDJSON line exceeds {MAX_NDJSON_LINE_BYTES} bytes")
+
+        for line in lines:
+            if line.strip():
+                yield line
+
+    if decompressor:
+        buffer += decompressor.flush()
+    for line in buffer.split(b'\n'):
+        if line.strip():
+            yield line
+
+
+def _sse_event(payload: StreamIngestionProgress) -> str:
+    """Serialize a progress event as a Server-Sent Event frame."""
+    return f"event: {payload.event}\ndata: {payload.model_dump_json()}\n\n"
+
+
+@router.post("/batch/stream")
+async def ingest_batch_stream(
+    request: Request,
+    source_portal_code: str = Query(..., max_length=100),
+    mode: IngestionMode = Query("bulk", description="row or bulk ingestion per chunk"),
+    chunk_size: int = Query(BULK_CHUNK_SIZE, ge=100, le=10000),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_active_user)
+):
+    """
+    Stream permits as NDJSON (one PermitCreate object per line).
+
+    - Accepts plain or gzip-compressed bodies (Content-Encoding: gzip)
+    - Validates and ingests each chunk as it is read, so memory stays flat
+      regardless of upload size and there is no 10,000 record cap
+    - Responds with Server-Sent Events: one ``progress`` event per chunk and
+      a final ``complete`` (or ``error``) event with the batch statistics
+    """
+    service = get_permit_ingestion_service(db)
+
+    async def generate_progress():
+        start_time = time.time()
+        import_batch, stats = await run_in_threadpool(
+            service.begin_import_batch, source_portal_code
+        )
+        errors = []
+        progress = {'bytes_read': 0}
+        pending: List[PermitCreate] = []
+        pending_offset = 0
+        records_read = 0
+
+        def event(name: str, message: str = "") -> str:
+            stats.rows_per_second = (
+                records_read / (time.time() - start_time) if records_read else 0.0
+            )
+            return _sse_event(StreamIngestionProgress(
+                event=name,
+                records_read=records_read,
+                bytes_read=progress['bytes_read'],
+                stats=stats,
+                message=message
+            ))
+
+        async def flush() -> None:
+            nonlocal pending, pending_offset
+            if pending:
+                await run_in_threadpool(
+                    service.ingest_records, pending, stats, errors, mode, pending_offset
+                )
+                del errors[MAX_STREAM_ERROR_DETAILS:]
+            pending = []
+            pending_offset = records_read
+
+        try:
+            async for line in _iter_ndjson_lines(request, progress):
+                index = records_read
+                records_read += 1
+                stats.total_records = records_read
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError("NDJSON line is not a JSON object")
+                    record.setdefault('source_portal_code', source_portal_code)
+                    pending.append(PermitCreate.model_validate(record))
+                except (ValueError, ValidationError) as e:
+                    stats.errors += 1
+                    if len(errors) < MAX_STREAM_ERROR_DETAILS:
+                        errors.append({'index': index, 'permit_number': None, 'error': str(e)})
+
+                if len(pending) >= chunk_size:
+                    await flush()
+                    yield event('progress')
+
+            await flush()
+            response = await run_in_threadpool(
+                service.finish_import_batch, import_batch, stats, errors, start_time
+            )
+            yield event('complete', response.message)
+
+        except Exception as e:
+            logger.error(f"Streaming batch ingestion failed: {e}")
+            await run_in_threadpool(db.rollback)
+            import_batch.status = 'failed'
+            import_batch.errors = stats.errors
+            await run_in_threadpool(db.commit)
+            yield event('error', str(e))
+
+    return _IngestionProgressResponse(
+        generate_progress(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ===== DUPLICATES =====
 
 @router.get("/duplicates", response_model=List[DuplicatePair])
@@ -42,6 +42,12 @@ async def search_properties(
     min_sqft: Optional[int] = Query(None, ge=0),
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1, le=100),
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    radius_miles: Optional[float] = Query(None, ge=0.1, le=100),
+    sort_by: str = Query("address_normalized", description="address_normalized, owner_name, created_at, distance"),
+    sort_order: str = Query("asc", description="asc or desc"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
@@ -54,7 +60,8 @@ async def search_properties(
     - Property type filtering
     - Year built range
     - Bedroom/sqft minimums
-    - Pagination
+    - Radius search (exact circle, distance_miles, sort_by=distance)
+    - Pagination (page numbers, or keyset via cursor/next_cursor)
     """
     try:
         service = get_property_service(db)
@@ -69,7 +76,18 @@ async def search_properties(
             min_bedrooms=min_bedrooms,
             min_sqft=min_sqft,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            latitude=latitude,
+            longitude=longitude,
+            radius_miles=radius_miles
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid parameter: {str(e)}"
         )
     except Exception as e:
         logger.error(f"Property search failed: {e}")
@@ -290,92 +308,77 @@ async def link_permits_to_property(
         )
 
 
+def _resolve_link_scope(db: Session, state_code: str, county_name: Optional[str]) -> Optional[int]:
+    """Validate the state and resolve an optional county name to its id."""
+    from app.models.septic_permit import State, County
+
+    state = db.query(State).filter(State.code == state_code.upper()).first()
+    if not state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"State {state_code} not found"
+        )
+
+    if not county_name:
+        return None
+
+    county = db.query(County).filter(
+        County.state_id == state.id,
+        County.name.ilike(f"%{county_name}%")
+    ).first()
+    if not county:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"County {county_name} not found in {state_code}"
+        )
+    return county.id
+
+
 @router.post("/link-all")
 async def link_all_permits(
     state_code: str = Query(..., description="State code to process"),
     county_name: Optional[str] = Query(None, description="County name (optional)"),
+    full: bool = Query(False, description="Re-examine all unlinked permits, not just new ones"),
+    min_confidence: str = Query("medium", pattern="^(low|medium|high|exact)$",
+                                description="Lowest fuzzy match tier to link"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
     """
-    Batch link all unlinked permits to properties by matching addresses.
-    Useful after bulk property ingestion.
+    Queue a background job linking unlinked permits to properties.
+
+    Links by address hash, then by enhanced address normalization, then by
+    blocked fuzzy matching down to min_confidence. Runs are
+    incremental (only records changed since the last run for this scope)
+    and checkpointed; poll /jobs/status/{job_id} or /properties/linking/status.
     """
-    from app.models.property import Property
-    from app.models.septic_permit import SepticPermit, State, County
+    from app.services.background_jobs import background_job_manager
 
     try:
-        # Get state
-        state = db.query(State).filter(State.code == state_code.upper()).first()
-        if not state:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"State {state_code} not found"
-            )
-
-        # Get county if specified
-        county_id = None
-        if county_name:
-            county = db.query(County).filter(
-                County.state_id == state.id,
-                County.name.ilike(f"%{county_name}%")
-            ).first()
-            if county:
-                county_id = county.id
-
-        # Get all properties with address hashes
-        prop_query = db.query(Property).filter(
-            Property.state_id == state.id,
-            Property.address_hash != None,
-            Property.is_active == True
-        )
-        if county_id:
-            prop_query = prop_query.filter(Property.county_id == county_id)
-
-        properties = prop_query.all()
-        logger.info(f"Found {len(properties)} properties to match")
-
-        # Build address hash lookup
-        hash_to_property = {p.address_hash: p.id for p in properties}
-
-        # Find unlinked permits
-        permit_query = db.query(SepticPermit).filter(
-            SepticPermit.state_id == state.id,
-            SepticPermit.address_hash != None,
-            SepticPermit.property_id == None,
-            SepticPermit.is_active == True
+        county_id = _resolve_link_scope(db, state_code, county_name)
+        job_id = await background_job_manager.queue_permit_linking(
+            state_code=state_code.upper(),
+            county_id=county_id,
+            full=full,
+            min_confidence=min_confidence
         )
-        if county_id:
-            permit_query = permit_query.filter(SepticPermit.county_id == county_id)
-
-        permits = permit_query.all()
-        logger.info(f"Found {len(permits)} unlinked permits")
-
-        # Link by hash
-        linked_count = 0
-        for permit in permits:
-            if permit.address_hash in hash_to_property:
-                permit.property_id = hash_to_property[permit.address_hash]
-                linked_count += 1
-
-        db.commit()
 
         return {
+            "status": "queued",
+            "job_id": job_id,
             "state_code": state_code,
             "county_name": county_name,
-            "properties_checked": len(properties),
-            "permits_checked": len(permits),
-            "permits_linked": linked_count
+            "full": full,
+            "min_confidence": min_confidence
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Batch linking failed: {e}")
-        db.rollback()
+        logger.error(f"Failed to queue permit linking: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Batch linking failed"
+            detail="Failed to queue permit linking"
         )
 
 
@@ -384,6 +387,8 @@ async def relink_permits_enhanced(
     state_code: str = Query(..., description="State code to process"),
     county_name: Optional[str] = Query(None, description="County name (optional)"),
     dry_run: bool = Query(True, description="If true, only report what would be linked"),
+    min_confidence: str = Query("medium", pattern="^(low|medium|high|exact)$",
+                                description="Lowest fuzzy match tier to link"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
@@ -395,114 +400,70 @@ async def relink_permits_enhanced(
     - "1000 Mabel DR, Franklin, TN, 37064" -> matches "1000 MABEL DR"
     - "9001 Haggard Ln, College Grove, TN 37046" -> matches "9001 HAGGARD LN"
 
-    Use dry_run=true first to see what would be linked without making changes.
+    Permits that still don't match exactly are fuzzy matched against
+    properties with the same street number (and street name or ZIP); each
+    match reports its confidence tier.
+
+    Use dry_run=true first to preview matches for a sample of unlinked
+    permits. Without dry_run, a full linking job is queued.
     """
-    from app.models.property import Property
-    from app.models.septic_permit import SepticPermit, State, County
-    from app.services.property_service import PropertyService
+    from app.services.address_matching_service import MatchConfidence
+    from app.services.background_jobs import background_job_manager
+    from app.services.permit_linking_service import get_permit_linking_service
 
     try:
-        # Get state
-        state = db.query(State).filter(State.code == state_code.upper()).first()
-        if not state:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"State {state_code} not found"
-            )
-
-        # Get county if specified
-        county_id = None
-        if county_name:
-            county = db.query(County).filter(
-                County.state_id == state.id,
-                County.name.ilike(f"%{county_name}%")
-            ).first()
-            if county:
-                county_id = county.id
-
-        # Get county for hash computation
-        county_obj = db.query(County).filter(County.id == county_id).first() if county_id else None
-        county_name_for_hash = county_obj.name if county_obj else ""
-
-        # Build property address lookup (enhanced normalized -> property_id)
-        prop_query = db.query(Property).filter(
-            Property.state_id == state.id,
-            Property.address_normalized != None,
-            Property.is_active == True
-        )
-        if county_id:
-            prop_query = prop_query.filter(Property.county_id == county_id)
-
-        properties = prop_query.all()
-        logger.info(f"Found {len(properties)} properties to index")
-
-        # Build lookup with BOTH standard and enhanced normalized addresses
-        address_to_property = {}
-        for p in properties:
-            # Standard normalized (already in DB)
-            if p.address_normalized:
-                address_to_property[p.address_normalized] = p.id
+        county_id = _resolve_link_scope(db, state_code, county_name)
 
-        logger.info(f"Built lookup with {len(address_to_property)} address entries")
-
-        # Find unlinked permits
-        permit_query = db.query(SepticPermit).filter(
-            SepticPermit.state_id == state.id,
-            SepticPermit.property_id == None,
-            SepticPermit.is_active == True
+        if dry_run:
+            preview = get_permit_linking_service(db).preview(
+                state_code, county_id, min_confidence=MatchConfidence(min_confidence)
+            )
+            return {
+                "state_code": state_code,
+                "county_name": county_name,
+                "dry_run": True,
+                **preview
+            }
+
+        job_id = await background_job_manager.queue_permit_linking(
+            state_code=state_code.upper(),
+            county_id=county_id,
+            full=True,
+            min_confidence=min_confidence
         )
-        if county_id:
-            permit_query = permit_query.filter(SepticPermit.county_id == county_id)
-
-        unlinked_permits = permit_query.all()
-        logger.info(f"Found {len(unlinked_permits)} unlinked permits")
-
-        # Try to match using enhanced normalization
-        would_link = []
-        linked_count = 0
-
-        for permit in unlinked_permits:
-            if not permit.address:
-                continue
-
-            # Apply enhanced normalization to permit address
-            enhanced_addr = PropertyService.normalize_address_enhanced(permit.address)
-
-            if enhanced_addr and enhanced_addr in address_to_property:
-                property_id = address_to_property[enhanced_addr]
-
-                would_link.append({
-                    "permit_id": str(permit.id),
-                    "original_address": permit.address,
-                    "normalized_address": enhanced_addr,
-                    "property_id": str(property_id)
-                })
-
-                if not dry_run:
-                    permit.property_id = property_id
-                    linked_count += 1
-
-        if not dry_run:
-            db.commit()
-            logger.info(f"Linked {linked_count} permits with enhanced normalization")
-
         return {
             "state_code": state_code,
             "county_name": county_name,
-            "dry_run": dry_run,
-            "properties_indexed": len(properties),
-            "unlinked_permits_checked": len(unlinked_permits),
-            "would_link": len(would_link),
-            "actually_linked": linked_count if not dry_run else 0,
-            "sample_matches": would_link[:20] if would_link else []
+            "dry_run": False,
+            "status": "queued",
+            "job_id": job_id
         }
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Enhanced relinking failed: {e}")
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Enhanced relinking failed: {str(e)}"
         )
+
+
+@router.get("/linking/status")
+async def get_link_status(
+    state_code: str = Query(..., description="State code"),
+    county_name: Optional[str] = Query(None, description="County name (optional)"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_active_user)
+):
+    """Checkpoint and last-run statistics of the permit linker for a scope."""
+    from app.services.permit_linking_service import get_permit_linking_service
+
+    county_id = _resolve_link_scope(db, state_code, county_name)
+    checkpoint = get_permit_linking_service(db).get_checkpoint(state_code, county_id)
+    if not checkpoint:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No linking runs recorded for this scope"
+        )
+    return checkpoint
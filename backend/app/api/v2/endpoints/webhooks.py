@@ -17,7 +17,8 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db
 from app.core.config import settings
 from app.models.ringcentral import RCWebhookEvent, CallLog, RCAccount
-from app.services.webhook_processor import WebhookProcessor, WebhookProcessingError
+from app.services.webhook_processor import WebhookProcessor, WebhookProcessingError, webhook_idempotency_key
+from app.services.webhook_stream import webhook_event_stream, WebhookStreamError
 
 logger = logging.getLogger(__name__)
 
@@ -54,9 +55,15 @@ def verify_webhook_signature(payload: bytes, signature: str, secret: str) -> boo
         return False
 
 
+_webhook_processor: Optional[WebhookProcessor] = None
+
+
 async def get_webhook_processor() -> WebhookProcessor:
-    """Dependency to get webhook processor instance."""
-    return WebhookProcessor()
+    """Dependency to get webhook processor instance (shared; it holds no per-event state)."""
+    global _webhook_processor
+    if _webhook_processor is None:
+        _webhook_processor = WebhookProcessor()
+    return _webhook_processor
 
 
 # ===== WEBHOOK ENDPOINTS =====
@@ -109,6 +116,24 @@ async def handle_ringcentral_webhook(
         # Extract event information
         event_type = payload.get("event", "unknown")
         event_id = payload.get("uuid", f"webhook_{int(time.time())}")
+        received_at = datetime.utcnow()
+
+        # Fast ack: hand the event to the stream consumers (worker.py) and
+        # answer before touching the database
+        if settings.WEBHOOK_FAST_ACK:
+            try:
+                stored_event_id = await webhook_event_stream.append(
+                    payload, raw_payload, headers, signature, received_at
+                )
+                return {
+                    "status": "received",
+                    "event_id": str(stored_event_id),
+                    "event_type": event_type,
+                    "processing_time_ms": round((time.time() - start_time) * 1000, 2),
+                    "queued_for_processing": True
+                }
+            except WebhookStreamError as e:
+                logger.warning(f"Webhook stream unavailable, storing event {event_id} directly: {e}")
 
         # Create webhook event record
         webhook_event = RCWebhookEvent(
@@ -117,7 +142,8 @@ async def handle_ringcentral_webhook(
             headers=headers,
             signature=signature,
             signature_valid=True,
-            received_at=datetime.utcnow()
+            idempotency_key=webhook_idempotency_key(payload, event_type, received_at),
+            received_at=received_at
         )
 
         db.add(webhook_event)
@@ -173,12 +199,15 @@ async def test_webhook_endpoint(
     logger.info("Processing test webhook payload")
 
     # Create test webhook event
+    event_type = payload.get("event", "test_event")
+    received_at = datetime.utcnow()
     webhook_event = RCWebhookEvent(
-        event_type=payload.get("event", "test_event"),
+        event_type=event_type,
         raw_payload=payload,
         headers={"x-test": "true"},
         signature_valid=True,
-        received_at=datetime.utcnow()
+        idempotency_key=webhook_idempotency_key(payload, event_type, received_at),
+        received_at=received_at
     )
 
     db.add(webhook_event)
@@ -428,16 +457,25 @@ async def webhook_health_check(db: Session = Depends(get_db)):
 
         status = "healthy" if health_score >= 80 else "degraded" if health_score >= 50 else "unhealthy"
 
-        return {
+        health = {
             "status": status,
             "health_score": round(health_score, 1),
             "recent_events_30min": recent_events,
             "recent_failures_30min": recent_failures,
             "failure_rate": round(failure_rate * 100 if recent_events > 0 else 0, 2),
             "webhook_secret_configured": bool(settings.RINGCENTRAL_WEBHOOK_SECRET),
-            "webhook_url_configured": bool(settings.RINGCENTRAL_WEBHOOK_URL)
+            "webhook_url_configured": bool(settings.RINGCENTRAL_WEBHOOK_URL),
+            "fast_ack_enabled": settings.WEBHOOK_FAST_ACK
         }
 
+        # Events acknowledged but not yet stored and processed by the stream consumers
+        if settings.WEBHOOK_FAST_ACK:
+            stream_stats = await webhook_event_stream.get_stream_stats()
+            health["stream_pending"] = stream_stats["pending"]
+            health["stream_unread"] = stream_stats["lag"]
+
+        return health
+
     except Exception as e:
         logger.error(f"Webhook health check failed: {e}")
         return {
@@ -49,6 +49,8 @@ class Settings(BaseSettings):
     RINGCENTRAL_REDIRECT_URI: str
     RINGCENTRAL_WEBHOOK_SECRET: str
     RINGCENTRAL_WEBHOOK_URL: str  # Public URL for webhook delivery
+    RINGCENTRAL_SYNC_PAGE_CONCURRENCY: int = 3  # Call-log pages fetched at once (Heavy API group: 10 req/min)
+    RINGCENTRAL_SYNC_OVERLAP_MINUTES: int = 120  # Re-read before the high-water mark for calls logged late
 
     # ===== TWILIO INTEGRATION =====
     TWILIO_ACCOUNT_SID: Optional[str] = None
@@ -63,6 +65,7 @@ class Settings(BaseSettings):
     WHISPER_MODEL: str = "gpt-4o-transcribe"
     GPT_MODEL: str = "gpt-4o-mini"
     GPT_ANALYSIS_MODEL: str = "gpt-4o-mini"  # Cost-optimized for analysis
+    CALL_ANALYSIS_MODE: str = "concurrent"  # sequential | concurrent | fused (one request for all modules)
 
     # ===== LOCAL AI (R730 ML WORKSTATION) =====
     USE_LOCAL_AI: bool = True  # Set to True to use R730 instead of OpenAI
@@ -70,18 +73,52 @@ class Settings(BaseSettings):
     OLLAMA_MODEL: str = "llama3.2:3b"
     WHISPER_BASE_URL: str = "https://localhost-0.tailad2d5f.ts.net/whisper"
     LOCAL_WHISPER_MODEL: str = "medium"
+    EMBEDDING_MODEL: str = "all-minilm"  # all-MiniLM-L6-v2 via Ollama, 384 dims
+    PERMIT_SEMANTIC_WEIGHT: float = 0.0  # Default permit search semantic weight; raise once the embedding backfill is done
 
     # ===== ADDITIONAL AI SERVERS =====
     LLAVA_MODEL: str = "llava:13b"  # Vision model for photo/document analysis
     HCTG_AI_URL: str = "https://hctg-ai.tailad2d5f.ts.net"  # RTX 5090 server
     HCTG_AI_MODEL: str = "qwen2.5:32b"  # Heavy analysis tasks
 
+    # ===== CHUNKED TRANSCRIPTION =====
+    TRANSCRIPTION_CHUNKING_ENABLED: bool = True
+    TRANSCRIPTION_CHUNK_BACKEND: str = "openai"  # openai | local (R730 Whisper)
+    TRANSCRIPTION_CHUNK_THRESHOLD_SECONDS: int = 600  # Longer (or >25 MB) recordings are chunked
+    TRANSCRIPTION_CHUNK_SECONDS: int = 300  # Target chunk length, cut at the nearest silence
+    TRANSCRIPTION_CHUNK_OVERLAP_SECONDS: float = 2.0
+    TRANSCRIPTION_CHUNK_CONCURRENCY: int = 12
+    TRANSCRIPTION_MAX_FILE_MB: int = 500  # Largest recording accepted for chunking
+    FFMPEG_PATH: str = "ffmpeg"
+
+    # ===== AI RESULT CACHE =====
+    AI_CACHE_BACKEND: str = "postgres"  # postgres | redis | none
+    AI_CACHE_TTL_DAYS: int = 30
+    AI_CACHE_MAX_MB: int = 512  # Least recently used entries evicted past this
+
     # ===== BACKGROUND PROCESSING =====
     REDIS_URL: str = "redis://localhost:6379/0"
     RQ_QUEUE_NAME: str = "call-processing"
+    REDIS_MAX_CONNECTIONS: int = 64  # Per process; each idle worker task blocks one
+    JOB_VISIBILITY_GRACE_SECONDS: int = 120  # Past a job's timeout before the reaper requeues it
+    JOB_REAP_INTERVAL_SECONDS: int = 30
+    WORKER_WHISPER_CONCURRENCY: int = 4  # Transcription stages in flight per worker process
+    WORKER_GPT_CONCURRENCY: int = 8  # Analysis stages in flight per worker process
+    WORKER_DB_CONCURRENCY: int = 4  # Disposition (database-bound) stages in flight per worker process
+    WORKER_DB_POOL_OVERFLOW: int = 10  # Connections beyond one per worker task (jobs opening a second session)
+    MAX_CONCURRENT_TRANSCRIPTIONS: int = 3
     CELERY_BROKER_URL: Optional[str] = None
     CELERY_RESULT_BACKEND: Optional[str] = None
 
+    # ===== WEBHOOK INGESTION =====
+    WEBHOOK_FAST_ACK: bool = False  # Ack after appending to the Redis stream; worker.py consumers store and process
+    WEBHOOK_STREAM_NAME: str = "rc-webhooks"
+    WEBHOOK_STREAM_SHARDS: int = 8  # Sharded by telephony session; each shard is owned by one consumer at a time
+    WEBHOOK_STREAM_MAXLEN: int = 100000  # Approximate entries kept per shard (unconsumed ones included)
+    WEBHOOK_STREAM_LEASE_SECONDS: int = 30  # Shard ownership lapses this long after a consumer dies
+    WEBHOOK_STREAM_MAX_DELIVERIES: int = 10  # Unacknowledged deliveries before an entry is dead-lettered
+    WEBHOOK_CONSUMER_BATCH_SIZE: int = 50
+
     # ===== STORAGE SETTINGS =====
     USE_S3: bool = False
     S3_BUCKET: str = ""
@@ -95,6 +132,11 @@ class Settings(BaseSettings):
     GOOGLE_STT_CREDENTIALS_JSON: Optional[str] = None  # Base64-encoded service account JSON
     GOOGLE_STT_LANGUAGE_CODE: str = "en-US"
 
+    # ===== LIVE TRANSCRIPT FAN-OUT =====
+    TRANSCRIPT_WS_BROKER: str = "memory"  # memory (one worker) | redis (pub/sub across workers and replicas)
+    TRANSCRIPT_WS_CHANNEL_PREFIX: str = "call-transcripts"  # Redis channel per call: {prefix}:{call_sid}
+    TRANSCRIPT_WS_CLIENT_QUEUE: int = 256  # Messages buffered per frontend socket; oldest dropped when full
+
     # ===== FEATURE FLAGS =====
     AUTO_DOWNLOAD_RECORDINGS: bool = True
     AUTO_SYNC_INTERVAL_MINUTES: int = 60
@@ -109,6 +151,7 @@ class Settings(BaseSettings):
 
     # ===== RATE LIMITING =====
     OPENAI_RATE_LIMIT_RPM: int = 50  # Requests per minute
+    OPENAI_MAX_CONCURRENT_REQUESTS: int = 6  # In-flight analysis requests per provider
     RINGCENTRAL_RATE_LIMIT_RPS: int = 10  # Requests per second
 
     # ===== LOGGING =====
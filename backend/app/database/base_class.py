@@ -25,6 +25,30 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def use_pooled_engine(pool_size: int, max_overflow: int = 0):
+    """
+    Rebind SessionLocal (and get_db) to an engine with its own connection
+    per concurrent session.
+
+    The default StaticPool engine hands every session the same connection,
+    which is only safe while sessions never overlap. Processes running
+    several jobs at once (worker.py) call this at startup with pool_size at
+    least the number of concurrent tasks; otherwise one task's commit or
+    rollback lands on another task's half-finished transaction.
+    """
+    global engine
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        echo=False
+    )
+    SessionLocal.configure(bind=engine)
+    return engine
+
 # Metadata for migrations
 metadata = MetaData()
 
@@ -179,6 +179,15 @@ def create_application() -> FastAPI:
             # Run database migrations automatically
             if not settings.DEBUG:  # Only auto-migrate in production
                 run_database_migrations()
+
+                # Recompute addresses written by an older normalizer version
+                try:
+                    from app.services.background_jobs import background_job_manager
+                    job_id = await background_job_manager.queue_address_rehash_if_stale()
+                    if job_id:
+                        logger.info(f"Queued address rehash job {job_id}")
+                except Exception as e:
+                    logger.warning(f"Could not check for stale address hashes: {e}")
         else:
             logger.error("Database connection failed!")
 
@@ -188,12 +197,16 @@ def create_application() -> FastAPI:
         logger.info(f"RingCentral server: {settings.RINGCENTRAL_SERVER_URL}")
         logger.info(f"Auto-disposition enabled: {settings.ENABLE_AUTO_DISPOSITION}")
         logger.info(f"Google STT enabled: {settings.GOOGLE_STT_ENABLED}, credentials: {'set' if settings.GOOGLE_STT_CREDENTIALS_JSON else 'missing'}")
+        logger.info(f"Transcript WebSocket broker: {settings.TRANSCRIPT_WS_BROKER}")
 
     @app.on_event("shutdown")
     async def shutdown_event():
         """Cleanup on application shutdown."""
         logger.info(f"Shutting down {settings.APP_NAME}")
 
+        from app.services.ws_manager import transcript_manager
+        await transcript_manager.close()
+
     # ===== HEALTH CHECK ENDPOINTS =====
     @app.get("/health")
     async def health_check():
@@ -7,9 +7,9 @@ import uuid
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
-    Boolean, Column, DateTime, Float, Integer, String, Text, JSON, ForeignKey
+    BigInteger, Boolean, Column, Date, DateTime, Float, Integer, String, Text, JSON, ForeignKey
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -267,6 +267,81 @@ class AnalysisJob(Base):
         return self.status in ['completed', 'failed', 'cancelled']
 
 
+class AgentDailyRollup(Base):
+    """
+    Per-agent, per-day call and analysis aggregates.
+
+    One row per (user_id, UTC day of call_logs.created_at), recomputed by
+    AgentRollupService whenever a call in that cell is synced or analyzed,
+    so agent performance and the quality heatmap read a few small rows
+    instead of aggregating call_logs/call_analyses per agent and day.
+    Averages are stored as (sum, count) pairs so they combine exactly
+    across days; strengths and improvement_areas map each item to the
+    number of analyses that listed it.
+    """
+    __tablename__ = "agent_daily_rollups"
+
+    user_id = Column(String(255), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+
+    call_count = Column(Integer, default=0, nullable=False)
+    duration_sum = Column(BigInteger, default=0, nullable=False)
+    duration_count = Column(Integer, default=0, nullable=False)
+    quality_sum = Column(BigInteger, default=0, nullable=False)  # call_logs.quality_score
+    quality_count = Column(Integer, default=0, nullable=False)
+    sentiment_sum = Column(Float, default=0, nullable=False)  # call_logs.sentiment_score
+    sentiment_count = Column(Integer, default=0, nullable=False)
+
+    analysis_count = Column(Integer, default=0, nullable=False)
+    professionalism_sum = Column(BigInteger, default=0, nullable=False)
+    professionalism_count = Column(Integer, default=0, nullable=False)
+    empathy_sum = Column(BigInteger, default=0, nullable=False)
+    empathy_count = Column(Integer, default=0, nullable=False)
+    clarity_sum = Column(BigInteger, default=0, nullable=False)
+    clarity_count = Column(Integer, default=0, nullable=False)
+    resolution_sum = Column(BigInteger, default=0, nullable=False)
+    resolution_count = Column(Integer, default=0, nullable=False)
+
+    strengths = Column(JSONB, nullable=False, default=dict)  # {item: analyses listing it}
+    improvement_areas = Column(JSONB, nullable=False, default=dict)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<AgentDailyRollup(user_id={self.user_id}, day={self.day}, calls={self.call_count})>"
+
+
+class AIResultCacheEntry(Base):
+    """
+    Content-addressed cache of transcription and LLM analysis results.
+
+    cache_key is a SHA-256 over (kind, model, prompt_version, content_hash):
+    content_hash is the hash of the recording bytes or transcript text and
+    prompt_version the hash of the request options or the prompt rendered
+    without the transcript, so reprocessing a call only pays for requests
+    whose input or prompt changed. Entries expire after a TTL and the least
+    recently used are evicted past a size budget (AIResultCache).
+    """
+    __tablename__ = "ai_result_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    kind = Column(String(64), nullable=False, index=True)  # transcription, analysis:<module>, ...
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(String(64), nullable=False)
+    content_hash = Column(String(64), nullable=False, index=True)
+
+    result = Column(JSONB, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<AIResultCacheEntry(kind={self.kind}, key={self.cache_key[:12]}, hits={self.hit_count})>"
+
+
 # ===== INDEXES AND CONSTRAINTS =====
 # Additional indexes for performance:
 # - call_analyses(call_log_id) - already unique
@@ -6,7 +6,6 @@ Links to septic_permits (one property → many permits over time).
 """
 
 import uuid
-import hashlib
 from datetime import datetime
 from typing import Optional
 
@@ -19,6 +18,8 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.database.base_class import Base
+from app.utils.address_normalization import canonicalize_address, canonical_address_hash
+from app.utils.geo import geography_point
 
 
 class Property(Base):
@@ -42,6 +43,7 @@ class Property(Base):
     address = Column(Text, nullable=True)  # Original address
     address_normalized = Column(Text, nullable=True)  # Normalized for matching
     address_hash = Column(String(64), nullable=True, index=True)  # SHA256 for deduplication
+    address_normalizer_version = Column(SmallInteger, nullable=True)  # ADDRESS_NORMALIZER_VERSION used
     street_number = Column(String(20), nullable=True)
     street_name = Column(String(200), nullable=True)
     city = Column(String(100), nullable=True, index=True)
@@ -137,75 +139,51 @@ class Property(Base):
 
     __table_args__ = (
         Index('idx_properties_state_county', 'state_id', 'county_id'),
+        # Keyset pagination: (sort column, id) for each supported sort
+        Index('idx_properties_keyset_address', 'address_normalized', 'id'),
+        Index('idx_properties_keyset_owner', 'owner_name', 'id'),
+        Index('idx_properties_keyset_created', 'created_at', 'id'),
+        # Incremental permit linking scans recently changed properties
+        Index('idx_properties_updated', 'updated_at', 'id'),
     )
 
     def __repr__(self):
         return f"<Property(id={self.id}, address={self.address}, parcel={self.parcel_id})>"
 
+    @classmethod
+    def geo_point(cls):
+        """Geography point used for radius search (matches idx_properties_geog)."""
+        return geography_point(
+            func.coalesce(cls.latitude, cls.centroid_lat),
+            func.coalesce(cls.longitude, cls.centroid_lon)
+        )
+
+    @classmethod
+    def normalizer_version(cls):
+        """address_normalizer_version with NULL as 0 (matches idx_properties_normalizer_version)."""
+        return func.coalesce(cls.address_normalizer_version, 0)
+
+    @classmethod
+    def address_number(cls):
+        """Leading street number of address_normalized (matches idx_properties_address_number)."""
+        return func.split_part(cls.address_normalized, ' ', 1)
+
     @staticmethod
-    def normalize_address(address: str) -> Optional[str]:
-        """
-        Normalize address for matching.
-        Uppercase, remove extra spaces, standardize abbreviations.
-        """
-        if not address:
-            return None
-
-        import re
-
-        # Uppercase
-        normalized = address.upper().strip()
-
-        # Remove multiple spaces
-        normalized = re.sub(r'\s+', ' ', normalized)
-
-        # Standardize common abbreviations
-        replacements = {
-            r'\bSTREET\b': 'ST',
-            r'\bROAD\b': 'RD',
-            r'\bDRIVE\b': 'DR',
-            r'\bAVENUE\b': 'AVE',
-            r'\bBOULEVARD\b': 'BLVD',
-            r'\bLANE\b': 'LN',
-            r'\bCOURT\b': 'CT',
-            r'\bCIRCLE\b': 'CIR',
-            r'\bPLACE\b': 'PL',
-            r'\bTERRACE\b': 'TER',
-            r'\bNORTH\b': 'N',
-            r'\bSOUTH\b': 'S',
-            r'\bEAST\b': 'E',
-            r'\bWEST\b': 'W',
-            r'\bAPARTMENT\b': 'APT',
-            r'\bSUITE\b': 'STE',
-            r'\bUNIT\b': 'UNIT',
-            r'\bHOLLOW\b': 'HOLW',
-        }
-
-        for pattern, replacement in replacements.items():
-            normalized = re.sub(pattern, replacement, normalized)
-
-        return normalized
+    def normalize_address(address: Optional[str], state_code: Optional[str] = None) -> Optional[str]:
+        """Canonical address for matching (see app.utils.address_normalization)."""
+        return canonicalize_address(address, state_code)
 
     @staticmethod
     def compute_address_hash(
-        normalized_address: Optional[str],
+        address: Optional[str],
         county_name: Optional[str],
         state_code: Optional[str]
     ) -> Optional[str]:
         """
-        Compute SHA256 hash of normalized address + county + state.
-        Used for deduplication unique constraint.
+        Compute SHA256 hash of canonical address + county + state.
+        Matches SepticPermit.compute_address_hash for the same address.
         """
-        if not normalized_address:
-            return None
-
-        components = [
-            normalized_address or '',
-            (county_name or '').upper(),
-            (state_code or '').upper()
-        ]
-        composite_key = '|'.join(components)
-        return hashlib.sha256(composite_key.encode('utf-8')).hexdigest()
+        return canonical_address_hash(address, county_name, state_code)
 
     def calculate_quality_score(self) -> int:
         """
@@ -248,3 +226,50 @@ class Property(Base):
 
         self.data_quality_score = min(score, max_score)
         return self.data_quality_score
+
+
+class PermitLinkCheckpoint(Base):
+    """
+    Progress of the background permit-to-property linker for one scope.
+
+    Watermarks mark how far incremental runs have got (records updated
+    since then are re-examined); cursors record the last (updated_at, id)
+    processed by the current run so an interrupted run resumes where it
+    stopped.
+    """
+    __tablename__ = "permit_link_checkpoints"
+
+    scope = Column(String(100), primary_key=True)  # 'all', 'TX', 'TX:county:12'
+
+    # Completed-run watermarks
+    permit_watermark = Column(DateTime(timezone=True), nullable=True)
+    property_watermark = Column(DateTime(timezone=True), nullable=True)
+
+    # In-progress run
+    status = Column(String(20), default='idle', nullable=False)  # idle, running, failed
+    run_mode = Column(String(20), nullable=True)  # incremental, full
+    run_started_at = Column(DateTime(timezone=True), nullable=True)
+    permit_cursor_at = Column(DateTime(timezone=True), nullable=True)
+    permit_cursor_id = Column(UUID(as_uuid=True), nullable=True)
+    property_cursor_at = Column(DateTime(timezone=True), nullable=True)
+    property_cursor_id = Column(UUID(as_uuid=True), nullable=True)
+
+    # Last run summary
+    last_run_stats = Column(JSON, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<PermitLinkCheckpoint(scope={self.scope}, status={self.status})>"
+
+
+# Radius search (GiST on the PostGIS geography point, see app.utils.geo)
+# Falls back to the parcel centroid when the address point is missing.
+Index('idx_properties_geog', Property.geo_point(), postgresql_using='gist')
+
+# Fuzzy-match blocking: candidates sharing a street number within a state/county
+Index('idx_properties_address_number', Property.state_id, Property.county_id, Property.address_number())
+
+# Address rehash: rows written by an older normalizer (see AddressRehashService)
+Index('idx_properties_normalizer_version', Property.normalizer_version())
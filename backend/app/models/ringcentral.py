@@ -46,6 +46,7 @@ class RCAccount(Base):
     is_connected = Column(Boolean, default=False, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     last_sync_at = Column(DateTime(timezone=True), nullable=True)
+    call_log_synced_to = Column(DateTime(timezone=True), nullable=True)  # Sync high-water mark
     last_error = Column(Text, nullable=True)
 
     # Webhook subscription
@@ -245,6 +246,9 @@ class RCWebhookEvent(Base):
     related_user_id = Column(String(255), nullable=True, index=True)
     related_session_id = Column(String(255), nullable=True)
 
+    # Duplicate detection: "<telephonySessionId>:<event_type>:<notification id>:<30s bucket>"
+    idempotency_key = Column(String(400), nullable=True, index=True)
+
     # Timestamps
     received_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -11,14 +11,21 @@ from datetime import datetime
 from typing import Optional, List
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, Date, Float, Integer, SmallInteger,
+    BigInteger, Boolean, Column, DateTime, Date, Float, Integer, SmallInteger,
     String, Text, JSON, ForeignKey, Index, UniqueConstraint, CheckConstraint
 )
 from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from pgvector.sqlalchemy import Vector
 
 from app.database.base_class import Base
+from app.utils.address_normalization import canonical_address_hash
+from app.utils.geo import geography_point
+
+
+# Output size of the permit embedding model (all-MiniLM-L6-v2)
+EMBEDDING_DIMENSIONS = 384
 
 
 # ===== REFERENCE TABLES =====
@@ -134,6 +141,7 @@ class SepticPermit(Base):
     address = Column(Text, nullable=True)  # Original address as scraped
     address_normalized = Column(Text, nullable=True)  # Normalized version
     address_hash = Column(String(64), nullable=True, index=True)  # SHA256 hash
+    address_normalizer_version = Column(SmallInteger, nullable=True)  # ADDRESS_NORMALIZER_VERSION used
     city = Column(String(100), nullable=True, index=True)
     zip_code = Column(String(20), nullable=True, index=True)
 
@@ -178,8 +186,8 @@ class SepticPermit(Base):
 
     # ===== SEARCH OPTIMIZATION =====
     # Semantic search embedding (384 dimensions for all-MiniLM-L6-v2)
-    # Note: pgvector extension required, stored as ARRAY(Float) for compatibility
-    embedding = Column(ARRAY(Float), nullable=True)
+    # pgvector column with an HNSW cosine index (see PermitEmbeddingService)
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS), nullable=True)
     embedding_model = Column(String(100), nullable=True)
     embedding_updated_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -234,33 +242,78 @@ class SepticPermit(Base):
         Index('idx_septic_permits_state_county', 'state_id', 'county_id'),
         Index('idx_septic_permits_state_county_date', 'state_id', 'county_id', 'permit_date'),
         Index('idx_septic_permits_scraped_at', 'scraped_at'),
+        # Keyset pagination: (sort column, id) for each supported sort
+        Index('idx_septic_permits_keyset_permit_date', 'permit_date', 'id'),
+        Index('idx_septic_permits_keyset_address', 'address_normalized', 'id'),
+        Index('idx_septic_permits_keyset_owner', 'owner_name', 'id'),
+        Index('idx_septic_permits_keyset_created', 'created_at', 'id'),
         # Full-text search index (GIN)
         Index('idx_septic_permits_search_vector', 'search_vector', postgresql_using='gin'),
+        # Semantic search ANN index (HNSW, cosine distance)
+        Index(
+            'idx_septic_permits_embedding_hnsw', 'embedding',
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'}
+        ),
+        # Unlinked permits in change order (incremental property linking)
+        Index(
+            'idx_septic_permits_unlinked_updated', 'updated_at', 'id',
+            postgresql_where=(
+                (Column('property_id').is_(None)) &
+                (Column('is_active') == True)
+            )
+        ),
+        # Rows still waiting for an embedding (backfill scan)
+        Index(
+            'idx_septic_permits_embedding_pending', 'id',
+            postgresql_where=(
+                (Column('embedding').is_(None)) &
+                (Column('is_active') == True)
+            )
+        ),
     )
 
     def __repr__(self):
         return f"<SepticPermit(id={self.id}, permit={self.permit_number}, state_id={self.state_id})>"
 
+    @classmethod
+    def geo_point(cls):
+        """Geography point used for radius search (matches idx_septic_permits_geog)."""
+        return geography_point(cls.latitude, cls.longitude)
+
+    @classmethod
+    def parcel_key(cls):
+        """Parcel number without punctuation/case (duplicate-detection block)."""
+        return func.upper(func.regexp_replace(cls.parcel_number, '[^A-Za-z0-9]', '', 'g'))
+
+    @classmethod
+    def owner_street_key(cls):
+        """
+        Normalized owner + street without house number (duplicate-detection
+        block); NULL when either part is missing.
+        """
+        return (
+            cls.owner_name_normalized + '|' +
+            func.regexp_replace(cls.address_normalized, r'^[0-9]+[A-Z]?\s+', '')
+        )
+
+    @classmethod
+    def normalizer_version(cls):
+        """address_normalizer_version with NULL as 0 (matches idx_septic_permits_normalizer_version)."""
+        return func.coalesce(cls.address_normalizer_version, 0)
+
     @staticmethod
     def compute_address_hash(
-        normalized_address: Optional[str],
+        address: Optional[str],
         county_name: Optional[str],
         state_code: Optional[str]
     ) -> Optional[str]:
         """
-        Compute SHA256 hash of normalized address + county + state.
+        Compute SHA256 hash of canonical address + county + state.
         Used for deduplication unique constraint.
         """
-        if not normalized_address:
-            return None
-
-        components = [
-            normalized_address or '',
-            (county_name or '').upper(),
-            (state_code or '').upper()
-        ]
-        composite_key = '|'.join(components)
-        return hashlib.sha256(composite_key.encode('utf-8')).hexdigest()
+        return canonical_address_hash(address, county_name, state_code)
 
     @staticmethod
     def compute_record_hash(data: dict) -> str:
@@ -278,6 +331,23 @@ class SepticPermit(Base):
 
 # ===== VERSION HISTORY TABLE =====
 
+# Radius search (GiST on the PostGIS geography point, see app.utils.geo)
+Index('idx_septic_permits_geog', SepticPermit.geo_point(), postgresql_using='gist')
+
+# Duplicate-detection blocks (see PermitDedupService)
+Index(
+    'idx_septic_permits_parcel_key', SepticPermit.state_id, SepticPermit.parcel_key(),
+    postgresql_where=(SepticPermit.parcel_number.isnot(None) & (SepticPermit.is_active == True))
+)
+Index(
+    'idx_septic_permits_owner_street', SepticPermit.state_id, SepticPermit.owner_street_key(),
+    postgresql_where=(SepticPermit.owner_name_normalized.isnot(None) & (SepticPermit.is_active == True))
+)
+
+# Address rehash: rows written by an older normalizer (see AddressRehashService)
+Index('idx_septic_permits_normalizer_version', SepticPermit.normalizer_version())
+
+
 class PermitVersion(Base):
     """
     Version history for permit records (audit trail).
@@ -362,6 +432,39 @@ class PermitDuplicate(Base):
         return f"<PermitDuplicate(id={self.id}, status={self.status})>"
 
 
+class PermitDedupCheckpoint(Base):
+    """
+    Progress of the background duplicate detector for one scope.
+
+    The watermark marks how far incremental runs have got (permits created
+    since then are compared on the next run); the cursor records the last
+    (created_at, id) processed by the current run so an interrupted run
+    resumes where it stopped.
+    """
+    __tablename__ = "permit_dedup_checkpoints"
+
+    scope = Column(String(100), primary_key=True)  # 'all', 'TX'
+
+    # Completed-run watermark
+    watermark = Column(DateTime(timezone=True), nullable=True)
+
+    # In-progress run
+    status = Column(String(20), default='idle', nullable=False)  # idle, running, failed
+    run_mode = Column(String(20), nullable=True)  # incremental, full
+    run_started_at = Column(DateTime(timezone=True), nullable=True)
+    cursor_at = Column(DateTime(timezone=True), nullable=True)
+    cursor_id = Column(UUID(as_uuid=True), nullable=True)
+
+    # Last run summary
+    last_run_stats = Column(JSON, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<PermitDedupCheckpoint(scope={self.scope}, status={self.status})>"
+
+
 # ===== IMPORT BATCH TRACKING =====
 
 class PermitImportBatch(Base):
@@ -397,3 +500,39 @@ class PermitImportBatch(Base):
 
     def __repr__(self):
         return f"<PermitImportBatch(id={self.id}, source={self.source_name}, status={self.status})>"
+
+
+class PermitRollup(Base):
+    """
+    Materialized counters over active septic permits.
+
+    Maintained incrementally by statement-level triggers on septic_permits
+    (one grouped upsert per INSERT/UPDATE/DELETE statement, see
+    app.services.permit_rollup_service), so dashboard stats and search
+    facets never aggregate the permits table.
+
+    Dimensions (unused key parts are 0); every row belongs to one state so
+    concurrent writers never share a global counter row, and nationwide
+    totals, years and months are summed over states on read:
+    - state:       state_id
+    - county:      state_id, county_id
+    - state_year:  state_id, period = permit year
+    - state_month: state_id, period = permit year * 100 + month
+    Permits without a permit_date count under period 0.
+    """
+    __tablename__ = "permit_rollups"
+
+    dimension = Column(String(20), primary_key=True)
+    state_id = Column(Integer, primary_key=True, default=0)
+    county_id = Column(Integer, primary_key=True, default=0)
+    period = Column(Integer, primary_key=True, default=0)
+
+    permit_count = Column(BigInteger, default=0, nullable=False)
+    quality_sum = Column(BigInteger, default=0, nullable=False)  # Sum of data_quality_score
+    quality_count = Column(BigInteger, default=0, nullable=False)  # Permits with a score
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return (f"<PermitRollup({self.dimension}, state={self.state_id}, "
+                f"county={self.county_id}, period={self.period}, count={self.permit_count})>")
@@ -184,6 +184,7 @@ class PropertySummary(BaseModel):
     lot_size_acres: Optional[float] = None
     property_type: Optional[str] = None
     permit_count: int = 0
+    distance_miles: Optional[float] = None  # Set for radius searches
 
     class Config:
         from_attributes = True
@@ -191,11 +192,13 @@ class PropertySummary(BaseModel):
 
 class PropertySearchResponse(BaseModel):
     """Paginated property search results."""
-    total: int
+    total: Optional[int] = Field(None, description="Total matches (null for cursor pages)")
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
     results: List[PropertySummary]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
+    has_more: bool = False
 
 
 class BatchPropertyResponse(BaseModel):
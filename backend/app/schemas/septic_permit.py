@@ -18,8 +18,9 @@ from pydantic import BaseModel, Field, field_validator
 
 DuplicateStatus = Literal["pending", "merged", "rejected", "reviewed"]
 DuplicateDetectionMethod = Literal["address_hash", "fuzzy_match", "semantic", "manual"]
-ImportBatchStatus = Literal["pending", "processing", "completed", "failed"]
+ImportBatchStatus = Literal["pending", "processing", "completed", "completed_with_errors", "failed"]
 ChangeSource = Literal["scraper", "manual", "merge", "api"]
+IngestionMode = Literal["row", "bulk"]
 
 
 # ===== REFERENCE DATA SCHEMAS =====
@@ -246,6 +247,7 @@ class PermitSummary(BaseModel):
     permit_date: Optional[date] = None
     system_type: Optional[str] = None
     has_property: bool = False  # Whether permit is linked to a property
+    distance_miles: Optional[float] = None  # Set for radius searches
 
     class Config:
         from_attributes = True
@@ -279,15 +281,21 @@ class PermitSearchRequest(BaseModel):
 
     # Pagination
     page: int = Field(1, ge=1)
-    page_size: int = Field(25, ge=1, le=100)
+    page_size: int = Field(25, ge=1, le=500)
+    cursor: Optional[str] = Field(None, description="Opaque next_cursor from a previous page; overrides page")
 
     # Sorting
-    sort_by: str = Field("relevance", description="Sort field: relevance, permit_date, address, owner_name")
+    sort_by: str = Field("relevance", description="Sort field: relevance, distance, permit_date, address, owner_name, created_at")
     sort_order: str = Field("desc", description="Sort direction: asc, desc")
 
     # Search options
     include_inactive: bool = Field(False, description="Include soft-deleted records")
-    semantic_weight: float = Field(0.5, ge=0, le=1, description="Weight for semantic vs keyword search")
+    semantic_weight: Optional[float] = Field(None, ge=0, le=1,
+                                             description="Weight for semantic vs keyword search (default: PERMIT_SEMANTIC_WEIGHT setting)")
+    keyword_candidates: int = Field(200, ge=1, le=2000,
+                                    description="Keyword matches fed into RRF fusion (hybrid search)")
+    semantic_candidates: int = Field(200, ge=1, le=1000,
+                                     description="Nearest-neighbour matches fed into RRF fusion (hybrid search)")
 
 
 class SearchHighlight(BaseModel):
@@ -308,17 +316,24 @@ class PermitSearchResult(BaseModel):
 class PermitSearchResponse(BaseModel):
     """Paginated search results."""
     results: List[PermitSearchResult] = []
-    total: int = 0
+    total: Optional[int] = Field(None, description="Total matches (null for cursor pages)")
+    total_capped: bool = Field(False, description="More matches exist than total (counting stops at a limit)")
     page: int = 1
     page_size: int = 25
-    total_pages: int = 0
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
+    has_more: bool = False
     query: Optional[str] = None
     execution_time_ms: float = 0.0
+    stage_timings_ms: Optional[Dict[str, float]] = Field(
+        None, description="Per-stage timings, e.g. embed_ms, keyword_ms, semantic_ms, fusion_ms, hydrate_ms"
+    )
 
     # Facets for filtering UI
     state_facets: Optional[List[Dict[str, Any]]] = None
     county_facets: Optional[List[Dict[str, Any]]] = None
     system_type_facets: Optional[List[Dict[str, Any]]] = None
+    facets_updated_at: Optional[datetime] = Field(None, description="When the facet counts last changed")
 
 
 # ===== BATCH INGESTION SCHEMAS =====
@@ -327,6 +342,7 @@ class BatchIngestionRequest(BaseModel):
     """Request to ingest a batch of permits."""
     source_portal_code: str = Field(..., max_length=100)
     permits: List[PermitCreate] = Field(..., max_items=10000)
+    mode: IngestionMode = Field("row", description="row: per-record upsert; bulk: set-based multi-row upsert")
 
 
 class BatchIngestionStats(BaseModel):
@@ -340,6 +356,7 @@ class BatchIngestionStats(BaseModel):
     errors: int = 0
     duplicate_candidates: int = 0
     processing_time_seconds: float = 0.0
+    rows_per_second: float = 0.0
     error_details: Optional[List[Dict[str, Any]]] = None
 
 
@@ -350,6 +367,15 @@ class BatchIngestionResponse(BaseModel):
     message: str = ""
 
 
+class StreamIngestionProgress(BaseModel):
+    """Progress event emitted by the streaming NDJSON ingestion endpoint."""
+    event: Literal["progress", "complete", "error"]
+    records_read: int = 0
+    bytes_read: int = 0
+    stats: BatchIngestionStats
+    message: str = ""
+
+
 # ===== DUPLICATE MANAGEMENT SCHEMAS =====
 
 class DuplicatePair(BaseModel):
@@ -424,7 +450,7 @@ class PermitStatsOverview(BaseModel):
     top_states: List[PermitStatsByState] = []
     permits_by_year: List[PermitStatsByYear] = []
 
-    last_updated: datetime = Field(default_factory=datetime.utcnow)
+    last_updated: Optional[datetime] = Field(None, description="When the permit counts last changed")
 
 
 class PermitStatsResponse(BaseModel):
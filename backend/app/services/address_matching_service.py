@@ -0,0 +1,292 @@
+"""
+Blocking fuzzy address matcher.
+
+Shared engine for permit-to-property linking (PermitLinkingService, the
+property linking endpoints and the Williamson scrapers):
+- Candidates are grouped into blocks by street number + initial of the
+  street name, and by street number + 5-digit ZIP; a query is only scored against
+  candidates sharing one of its blocks, so a permit is never compared with
+  the whole county and never matched to a different house number
+- Queries sharing the same blocks are scored together with one RapidFuzz
+  ``process.cdist`` call (parallel across cores for large blocks)
+- Every result carries a confidence tier; near-ties between different
+  candidates are reported as ambiguous instead of picking one arbitrarily
+
+The module has no database or app-config dependencies so standalone
+scripts can import it with only rapidfuzz and numpy installed.
+"""
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+
+# Score thresholds (0-100) for the fuzzy tiers
+HIGH_SCORE = 95.0
+MEDIUM_SCORE = 85.0
+
+# A sole candidate in the street block is accepted as LOW down to this score
+LOW_SCORE = 70.0
+
+# Best and runner-up (different candidates) closer than this are ambiguous
+AMBIGUITY_MARGIN = 2.0
+
+# Score matrices smaller than this are computed on one thread; spinning up
+# a worker pool costs more than it saves for typical 1-20 candidate blocks
+PARALLEL_MIN_CELLS = 50_000
+
+DIRECTIONALS = {'N', 'S', 'E', 'W', 'NE', 'NW', 'SE', 'SW'}
+
+_STREET_RE = re.compile(r'^(\d+[A-Z]?)\s+(.+)$')
+_ZIP_RE = re.compile(r'^(\d{5})')
+_SPACE_RE = re.compile(r'\s+')
+
+
+class MatchConfidence(str, Enum):
+    """Confidence tiers for an address match."""
+    EXACT = "exact"        # Identical normalized address
+    HIGH = "high"          # Fuzzy score >= HIGH_SCORE
+    MEDIUM = "medium"      # Fuzzy score >= MEDIUM_SCORE
+    LOW = "low"            # Only candidate in its street block
+    NONE = "none"          # No acceptable match
+
+
+# Tier order for min_confidence comparisons
+CONFIDENCE_RANK = {
+    MatchConfidence.NONE: 0,
+    MatchConfidence.LOW: 1,
+    MatchConfidence.MEDIUM: 2,
+    MatchConfidence.HIGH: 3,
+    MatchConfidence.EXACT: 4,
+}
+
+
+@dataclass
+class AddressMatch:
+    """Result of matching one query address."""
+    query_key: Any
+    candidate_key: Optional[Any]
+    candidate_address: Optional[str]
+    score: float
+    confidence: MatchConfidence
+    method: str  # exact, fuzzy, street_block, ambiguous, no_block, none
+
+    def meets(self, min_confidence: MatchConfidence) -> bool:
+        """True if this match is at least ``min_confidence``."""
+        return (
+            self.candidate_key is not None and
+            CONFIDENCE_RANK[self.confidence] >= CONFIDENCE_RANK[min_confidence]
+        )
+
+
+def clean_for_matching(address: Optional[str]) -> Optional[str]:
+    """Uppercase and collapse whitespace (input is assumed already normalized)."""
+    if not address:
+        return None
+    cleaned = _SPACE_RE.sub(' ', address.upper()).strip()
+    return cleaned or None
+
+
+def parse_street(address: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Split a normalized address into street number and first street-name word.
+
+    Leading directionals are skipped: "120 N MAIN ST" -> ("120", "MAIN").
+    """
+    if not address:
+        return None, None
+    match = _STREET_RE.match(address)
+    if not match:
+        return None, None
+
+    words = match.group(2).split()
+    while len(words) > 1 and words[0] in DIRECTIONALS:
+        words = words[1:]
+    return match.group(1), words[0] if words else None
+
+
+def block_keys(address: Optional[str], zip_code: Optional[str] = None) -> List[str]:
+    """
+    Blocking keys for an address: street number + first letter of the
+    street name, and street number + ZIP5 when a ZIP is known. The initial
+    (rather than the whole word) keeps "MABLE DR" and "MABEL DR" in one
+    block. Addresses without a street number get no keys and are never
+    fuzzy matched.
+    """
+    number, street = parse_street(address)
+    if not number:
+        return []
+
+    keys = []
+    if street:
+        keys.append(f"{number}|{street[0]}")
+    zip_match = _ZIP_RE.match(zip_code.strip()) if zip_code else None
+    if zip_match:
+        keys.append(f"{number}|z{zip_match.group(1)}")
+    return keys
+
+
+class AddressMatcher:
+    """
+    Index of candidate addresses, blocked for batch fuzzy matching.
+
+    Candidates are ``(key, address, zip_code)`` tuples; ``key`` is whatever
+    the caller wants back (property id, record index, ...). Addresses should
+    be normalized the same way as the queries.
+    """
+
+    def __init__(
+        self,
+        candidates: Iterable[Tuple[Any, Optional[str], Optional[str]]],
+        scorer=fuzz.token_sort_ratio,
+        high_score: float = HIGH_SCORE,
+        medium_score: float = MEDIUM_SCORE,
+        low_score: float = LOW_SCORE
+    ):
+        """Build exact and block indexes over the candidates."""
+        self.scorer = scorer
+        self.high_score = high_score
+        self.medium_score = medium_score
+        self.low_score = low_score
+
+        self._keys: List[Any] = []
+        self._addresses: List[str] = []
+        self._exact: Dict[str, List[int]] = {}
+        self._blocks: Dict[str, List[int]] = {}
+
+        for key, address, zip_code in candidates:
+            cleaned = clean_for_matching(address)
+            if not cleaned:
+                continue
+            index = len(self._keys)
+            self._keys.append(key)
+            self._addresses.append(cleaned)
+            self._exact.setdefault(cleaned, []).append(index)
+            for block in block_keys(cleaned, zip_code):
+                self._blocks.setdefault(block, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def block_count(self) -> int:
+        """Number of distinct blocks."""
+        return len(self._blocks)
+
+    def match(self, address: Optional[str], zip_code: Optional[str] = None) -> AddressMatch:
+        """Match a single address."""
+        return self.match_many([(None, address, zip_code)])[0]
+
+    def match_many(
+        self,
+        queries: Iterable[Tuple[Any, Optional[str], Optional[str]]],
+        workers: Optional[int] = None
+    ) -> List[AddressMatch]:
+        """
+        Match ``(key, address, zip_code)`` queries, returning one AddressMatch
+        per query in input order.
+
+        Args:
+            queries: Query tuples; key is echoed back as query_key
+            workers: cdist worker count; default picks 1 or all cores per
+                block based on PARALLEL_MIN_CELLS
+        """
+        queries = list(queries)
+        results: List[Optional[AddressMatch]] = [None] * len(queries)
+
+        # Group fuzzy work by the exact candidate set it will be scored against
+        groups: Dict[Tuple[int, ...], List[Tuple[int, str]]] = {}
+
+        for position, (query_key, address, zip_code) in enumerate(queries):
+            cleaned = clean_for_matching(address)
+            if not cleaned:
+                results[position] = self._no_match(query_key, 'none')
+                continue
+
+            exact = self._exact.get(cleaned)
+            if exact:
+                results[position] = self._pick_exact(query_key, exact)
+                continue
+
+            candidate_ids = set()
+            for block in block_keys(cleaned, zip_code):
+                candidate_ids.update(self._blocks.get(block, ()))
+            if not candidate_ids:
+                results[position] = self._no_match(query_key, 'no_block')
+                continue
+
+            groups.setdefault(tuple(sorted(candidate_ids)), []).append((position, cleaned))
+
+        for candidate_ids, members in groups.items():
+            choices = [self._addresses[i] for i in candidate_ids]
+            query_texts = [text for _, text in members]
+
+            if workers is None:
+                group_workers = -1 if len(query_texts) * len(choices) >= PARALLEL_MIN_CELLS else 1
+            else:
+                group_workers = workers
+
+            scores = process.cdist(
+                query_texts, choices,
+                scorer=self.scorer,
+                score_cutoff=self.low_score,
+                workers=group_workers
+            )
+
+            for row, (position, _) in enumerate(members):
+                results[position] = self._pick_fuzzy(
+                    queries[position][0], scores[row], candidate_ids
+                )
+
+        return results
+
+    # ===== RESULT SELECTION =====
+
+    def _no_match(self, query_key: Any, method: str) -> AddressMatch:
+        return AddressMatch(query_key, None, None, 0.0, MatchConfidence.NONE, method)
+
+    def _pick_exact(self, query_key: Any, indexes: List[int]) -> AddressMatch:
+        """Identical address; ambiguous if it belongs to several candidates."""
+        distinct = {self._keys[i] for i in indexes}
+        if len(distinct) > 1:
+            return self._no_match(query_key, 'ambiguous')
+        index = indexes[0]
+        return AddressMatch(
+            query_key, self._keys[index], self._addresses[index],
+            100.0, MatchConfidence.EXACT, 'exact'
+        )
+
+    def _pick_fuzzy(self, query_key: Any, row: np.ndarray, candidate_ids: Tuple[int, ...]) -> AddressMatch:
+        """Best scoring candidate of one cdist row, with tier and tie check."""
+        best = int(np.argmax(row))
+        best_score = float(row[best])
+        if best_score < self.low_score:
+            return self._no_match(query_key, 'none')
+
+        best_key = self._keys[candidate_ids[best]]
+        runner_up = 0.0
+        for column, score in enumerate(row):
+            if column != best and self._keys[candidate_ids[column]] != best_key:
+                runner_up = max(runner_up, float(score))
+        if best_score - runner_up < AMBIGUITY_MARGIN:
+            return self._no_match(query_key, 'ambiguous')
+
+        if best_score >= self.high_score:
+            confidence, method = MatchConfidence.HIGH, 'fuzzy'
+        elif best_score >= self.medium_score:
+            confidence, method = MatchConfidence.MEDIUM, 'fuzzy'
+        elif len({self._keys[i] for i in candidate_ids}) == 1:
+            # Below the fuzzy tiers only a sole candidate on the block is trusted
+            confidence, method = MatchConfidence.LOW, 'street_block'
+        else:
+            return self._no_match(query_key, 'none')
+
+        index = candidate_ids[best]
+        return AddressMatch(
+            query_key, best_key, self._addresses[index],
+            round(best_score, 1), confidence, method
+        )
@@ -0,0 +1,337 @@
+"""
+Canonical address rehash service.
+
+Recomputes address_normalized and address_hash in bulk for septic_permits
+and properties rows whose address_normalizer_version is NULL or older
+than ADDRESS_NORMALIZER_VERSION (rows written by a previous normalizer):
+- Rows are read in id keyset chunks, canonicalized together with
+  normalize_many() and written back with one UPDATE ... FROM (VALUES ...)
+  per chunk; updated_at is left alone since the address itself did not
+  change
+- A permit whose new hash is already held by another active permit in the
+  same county would violate idx_septic_permits_dedup_address; it keeps a
+  NULL hash and the pair is recorded in permit_duplicates for review
+- Rehashed rows drop out of the stale filter, so runs can be time-boxed
+  and resumed (the returned cursor skips rows already examined)
+"""
+
+import logging
+import time
+import uuid
+import zlib
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, values, column, cast, literal, any_, all_, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from app.models.property import Property
+from app.models.septic_permit import SepticPermit, PermitDuplicate, State, County
+from app.utils.address_normalization import (
+    ADDRESS_NORMALIZER_VERSION, canonical_address_hash, normalize_many
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Rows per transaction
+REHASH_CHUNK_SIZE = 5000
+
+# Tables rehashed, in run order
+REHASH_TABLES = {
+    'permits': SepticPermit,
+    'properties': Property,
+}
+
+
+class RehashError(Exception):
+    """Custom exception for address rehash errors."""
+    pass
+
+
+class AddressRehashService:
+    """
+    Bulk recomputation of canonical addresses after a normalizer change.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._lock_conn = None
+
+    # ===== LOCKING =====
+
+    def _try_lock(self) -> bool:
+        """Advisory lock (on its own connection) so only one run is active."""
+        self._lock_conn = self.db.get_bind().connect()
+        locked = bool(self._lock_conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {'key': self._lock_key()}
+        ).scalar())
+        if not locked:
+            self._lock_conn.close()
+            self._lock_conn = None
+        return locked
+
+    def _unlock(self) -> None:
+        """Release the advisory lock."""
+        if self._lock_conn is None:
+            return
+        try:
+            self._lock_conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {'key': self._lock_key()}
+            )
+        finally:
+            self._lock_conn.close()
+            self._lock_conn = None
+
+    @staticmethod
+    def _lock_key() -> int:
+        """Stable 32-bit advisory lock key."""
+        return zlib.crc32(b"address_rehash")
+
+    # ===== READ / WRITE =====
+
+    @staticmethod
+    def _stale(model):
+        """Rows below the current version (NULL counts as 0)."""
+        return model.normalizer_version() < ADDRESS_NORMALIZER_VERSION
+
+    def count_stale(self) -> Dict[str, int]:
+        """Rows per table still written by an older normalizer."""
+        return {
+            name: self.db.query(model.id).filter(self._stale(model)).count()
+            for name, model in REHASH_TABLES.items()
+        }
+
+    def has_stale_rows(self) -> bool:
+        """Any stale row at all (one probe of the normalizer_version index per table)."""
+        return any(
+            self.db.query(self.db.query(model.id).filter(self._stale(model)).exists()).scalar()
+            for model in REHASH_TABLES.values()
+        )
+
+    def _next_rows(self, model, after_id: Optional[Any], chunk_size: int) -> List[Any]:
+        """Next chunk of stale rows in id order, with county name and state code."""
+        query = select(
+            model.id, model.address, model.address_normalized, model.address_hash,
+            model.state_id, model.county_id, model.is_active,
+            County.name.label('county_name'), State.code.label('state_code')
+        ).select_from(model).join(
+            State, State.id == model.state_id
+        ).outerjoin(
+            County, County.id == model.county_id
+        ).where(self._stale(model))
+        if after_id is not None:
+            query = query.where(model.id > after_id)
+        query = query.order_by(model.id).limit(chunk_size)
+        return self.db.execute(query).all()
+
+    def _canonicalize(self, rows: List[Any], processes: Optional[int]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """(address_normalized, address_hash) per row, from the raw address when present."""
+        canonical = normalize_many(
+            [row.address or row.address_normalized for row in rows],
+            processes=processes,
+            states=[row.state_code for row in rows]
+        )
+        return [
+            (address, canonical_address_hash(address, row.county_name, row.state_code))
+            for row, address in zip(rows, canonical)
+        ]
+
+    def _resolve_permit_collisions(
+        self,
+        rows: List[Any],
+        computed: List[Tuple[Optional[str], Optional[str]]]
+    ) -> Tuple[List[Tuple[Optional[str], Optional[str]]], List[Tuple[Any, Any]]]:
+        """
+        Withhold hashes that another active permit in the same county holds
+        (or that an earlier row of this chunk claimed).
+
+        Returns:
+            Tuple of (computed values with colliding hashes set to None,
+            (holder_id, permit_id) pairs)
+        """
+        chunk_ids = [row.id for row in rows]
+        hashes = sorted({h for row, (_, h) in zip(rows, computed) if h and row.is_active})
+        if not hashes:
+            return computed, []
+
+        holders = self.db.query(
+            SepticPermit.id, SepticPermit.address_hash,
+            SepticPermit.county_id, SepticPermit.state_id
+        ).filter(
+            SepticPermit.is_active == True,
+            SepticPermit.address_hash == any_(literal(hashes, ARRAY(SepticPermit.address_hash.type))),
+            SepticPermit.id != all_(literal(chunk_ids, ARRAY(SepticPermit.id.type)))
+        ).all()
+        claimed = {(h.address_hash, h.county_id, h.state_id): h.id for h in holders}
+
+        resolved = []
+        collisions = []
+        for row, (address, address_hash) in zip(rows, computed):
+            # NULL county_id never conflicts in the unique index
+            if address_hash and row.is_active and row.county_id is not None:
+                key = (address_hash, row.county_id, row.state_id)
+                holder = claimed.setdefault(key, row.id)
+                if holder != row.id:
+                    collisions.append((holder, row.id))
+                    address_hash = None
+            resolved.append((address, address_hash))
+        return resolved, collisions
+
+    def _record_duplicates(self, pairs: List[Tuple[Any, Any]]) -> int:
+        """Record colliding permits as exact address duplicates for review."""
+        if not pairs:
+            return 0
+        records = [
+            {
+                'id': uuid.uuid4(),
+                'permit_id_1': min(a, b),
+                'permit_id_2': max(a, b),
+                'detection_method': 'address_hash',
+                'confidence_score': 100.0,
+                'matching_fields': ['address'],
+                'status': 'pending',
+            }
+            for a, b in pairs
+        ]
+        result = self.db.execute(
+            insert(PermitDuplicate.__table__)
+            .values(records)
+            .on_conflict_do_nothing(constraint='uq_permit_duplicate_pair')
+        )
+        return result.rowcount
+
+    def _write(self, model, rows: List[Any], computed: List[Tuple[Optional[str], Optional[str]]]) -> int:
+        """Write canonical values and the current version; returns rows whose hash changed."""
+        table = model.__table__
+        changed = [row.id for row, (_, h) in zip(rows, computed) if h != row.address_hash]
+
+        if model is SepticPermit and changed:
+            # Clear changing hashes first so swaps within the chunk cannot
+            # trip the unique dedup index mid-statement
+            self.db.execute(
+                update(table)
+                .where(table.c.id == any_(literal(changed, ARRAY(table.c.id.type))))
+                .values(address_hash=None)
+            )
+
+        incoming = values(
+            column('id', table.c.id.type),
+            column('address_normalized', table.c.address_normalized.type),
+            column('address_hash', table.c.address_hash.type),
+            name='incoming'
+        ).data([(row.id, address, h) for row, (address, h) in zip(rows, computed)])
+
+        self.db.execute(
+            update(table)
+            .where(table.c.id == cast(incoming.c.id, table.c.id.type))
+            .values(
+                address_normalized=incoming.c.address_normalized,
+                address_hash=incoming.c.address_hash,
+                address_normalizer_version=ADDRESS_NORMALIZER_VERSION
+            )
+        )
+        return len(changed)
+
+    # ===== RUN =====
+
+    def run(
+        self,
+        tables: Optional[List[str]] = None,
+        chunk_size: int = REHASH_CHUNK_SIZE,
+        time_budget_seconds: Optional[float] = None,
+        processes: Optional[int] = None,
+        cursor: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Rehash stale rows.
+
+        Commits after every chunk. A time-limited run returns status
+        'paused' and a cursor; pass it back to continue where it stopped.
+
+        Args:
+            tables: Subset of REHASH_TABLES names (default: all)
+            chunk_size: Rows per chunk / transaction
+            time_budget_seconds: Stop (resumably) after roughly this long
+            processes: normalize_many() worker processes (None = automatic)
+            cursor: {table: last id} returned by a paused run
+
+        Returns:
+            Dict with per-table counts, duplicates recorded, cursor and status
+        """
+        names = tables or list(REHASH_TABLES)
+        unknown = [name for name in names if name not in REHASH_TABLES]
+        if unknown:
+            raise RehashError(f"Unknown tables: {', '.join(unknown)}")
+
+        if not self._try_lock():
+            return {"status": "skipped", "reason": "already running"}
+
+        start_time = time.time()
+        cursor = dict(cursor or {})
+        stats: Dict[str, Any] = {
+            "normalizer_version": ADDRESS_NORMALIZER_VERSION,
+            "tables": {name: {"rows_rehashed": 0, "hashes_changed": 0} for name in names},
+            "duplicates_recorded": 0,
+        }
+
+        try:
+            finished = True
+            for name in names:
+                model = REHASH_TABLES[name]
+                table_stats = stats["tables"][name]
+                after_id = cursor.get(name)
+                if after_id is not None:
+                    after_id = model.id.type.python_type(after_id)
+
+                while True:
+                    if time_budget_seconds is not None and time.time() - start_time >= time_budget_seconds:
+                        finished = False
+                        break
+
+                    rows = self._next_rows(model, after_id, chunk_size)
+                    if not rows:
+                        cursor.pop(name, None)
+                        break
+
+                    computed = self._canonicalize(rows, processes)
+                    if model is SepticPermit:
+                        computed, collisions = self._resolve_permit_collisions(rows, computed)
+                        stats["duplicates_recorded"] += self._record_duplicates(collisions)
+
+                    table_stats["hashes_changed"] += self._write(model, rows, computed)
+                    table_stats["rows_rehashed"] += len(rows)
+
+                    after_id = rows[-1].id
+                    cursor[name] = str(after_id)
+                    self.db.commit()
+
+                if not finished:
+                    break
+
+            elapsed = time.time() - start_time
+            rehashed = sum(t["rows_rehashed"] for t in stats["tables"].values())
+            stats["elapsed_seconds"] = round(elapsed, 2)
+            stats["rows_per_second"] = round(rehashed / elapsed, 1) if elapsed > 0 else 0.0
+            stats["cursor"] = cursor if not finished else {}
+            stats["status"] = "completed" if finished else "paused"
+
+            logger.info(
+                f"Address rehash (v{ADDRESS_NORMALIZER_VERSION}) {stats['status']}: "
+                f"{rehashed:,} rows ({stats['rows_per_second']:,}/s), "
+                f"{stats['duplicates_recorded']:,} duplicate pairs recorded"
+            )
+            return stats
+
+        except Exception as e:
+            self.db.rollback()
+            raise RehashError(f"Address rehash failed: {str(e)}")
+
+        finally:
+            self._unlock()
+
+
+# Factory function
+def get_address_rehash_service(db: Session) -> AddressRehashService:
+    """Get address rehash service instance."""
+    return AddressRehashService(db)
@@ -0,0 +1,199 @@
+"""
+Agent daily rollup service.
+
+Maintains agent_daily_rollups (see AgentDailyRollup): one grouped query
+over call_logs joined to call_analyses recomputes every (agent, day) cell
+touched by a set of calls. The analysis pipeline refreshes a call's cell
+after storing its analysis, the RingCentral sync refreshes the cells of
+imported calls and webhook processing those of the calls its events
+touched, so agent performance and the quality heatmap never aggregate
+the call tables themselves.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy.orm import Session
+from sqlalchemy import func, text
+
+from app.models.call_analysis import AgentDailyRollup
+
+logger = logging.getLogger(__name__)
+
+
+# Recomputes whole (user_id, day) cells for every cell containing a call
+# matched by {scope}. Days are UTC days of call_logs.created_at. Same
+# aggregation as the population step in the agent_daily_rollups migration.
+REFRESH_SQL = """
+    WITH cells AS (
+        SELECT DISTINCT user_id, (created_at AT TIME ZONE 'UTC')::date AS day
+        FROM call_logs
+        WHERE {scope}
+    ),
+    calls AS (
+        SELECT
+            c.user_id, c.day,
+            cl.duration_seconds, cl.quality_score, cl.sentiment_score,
+            ca.id AS analysis_id,
+            ca.professionalism_score, ca.empathy_score, ca.clarity_score, ca.resolution_score,
+            CASE WHEN json_typeof(ca.strengths) = 'array' THEN ca.strengths END AS strengths,
+            CASE WHEN json_typeof(ca.improvement_areas) = 'array' THEN ca.improvement_areas END AS improvement_areas
+        FROM cells c
+        JOIN call_logs cl
+            ON cl.user_id = c.user_id
+            AND cl.created_at >= c.day::timestamp AT TIME ZONE 'UTC'
+            AND cl.created_at < (c.day + 1)::timestamp AT TIME ZONE 'UTC'
+        LEFT JOIN call_analyses ca ON ca.call_log_id = cl.id
+    ),
+    totals AS (
+        SELECT
+            user_id, day,
+            COUNT(*) AS call_count,
+            COALESCE(SUM(duration_seconds), 0) AS duration_sum, COUNT(duration_seconds) AS duration_count,
+            COALESCE(SUM(quality_score), 0) AS quality_sum, COUNT(quality_score) AS quality_count,
+            COALESCE(SUM(sentiment_score), 0) AS sentiment_sum, COUNT(sentiment_score) AS sentiment_count,
+            COUNT(analysis_id) AS analysis_count,
+            COALESCE(SUM(professionalism_score), 0) AS professionalism_sum,
+            COUNT(professionalism_score) AS professionalism_count,
+            COALESCE(SUM(empathy_score), 0) AS empathy_sum, COUNT(empathy_score) AS empathy_count,
+            COALESCE(SUM(clarity_score), 0) AS clarity_sum, COUNT(clarity_score) AS clarity_count,
+            COALESCE(SUM(resolution_score), 0) AS resolution_sum, COUNT(resolution_score) AS resolution_count
+        FROM calls
+        GROUP BY user_id, day
+    ),
+    items AS (
+        SELECT user_id, day, 'strengths' AS kind, json_array_elements_text(strengths) AS item
+        FROM calls WHERE strengths IS NOT NULL
+        UNION ALL
+        SELECT user_id, day, 'improvement_areas', json_array_elements_text(improvement_areas)
+        FROM calls WHERE improvement_areas IS NOT NULL
+    ),
+    coaching AS (
+        SELECT user_id, day, kind, jsonb_object_agg(item, n) AS counts
+        FROM (
+            SELECT user_id, day, kind, item, COUNT(*) AS n
+            FROM items
+            GROUP BY user_id, day, kind, item
+        ) item_counts
+        GROUP BY user_id, day, kind
+    )
+    INSERT INTO agent_daily_rollups AS r (
+        user_id, day, call_count, duration_sum, duration_count,
+        quality_sum, quality_count, sentiment_sum, sentiment_count,
+        analysis_count, professionalism_sum, professionalism_count,
+        empathy_sum, empathy_count, clarity_sum, clarity_count,
+        resolution_sum, resolution_count, strengths, improvement_areas, updated_at
+    )
+    SELECT
+        t.user_id, t.day, t.call_count, t.duration_sum, t.duration_count,
+        t.quality_sum, t.quality_count, t.sentiment_sum, t.sentiment_count,
+        t.analysis_count, t.professionalism_sum, t.professionalism_count,
+        t.empathy_sum, t.empathy_count, t.clarity_sum, t.clarity_count,
+        t.resolution_sum, t.resolution_count,
+        COALESCE(s.counts, jsonb_build_object()), COALESCE(i.counts, jsonb_build_object()), now()
+    FROM totals t
+    LEFT JOIN coaching s ON s.user_id = t.user_id AND s.day = t.day AND s.kind = 'strengths'
+    LEFT JOIN coaching i ON i.user_id = t.user_id AND i.day = t.day AND i.kind = 'improvement_areas'
+    ORDER BY t.user_id, t.day
+    ON CONFLICT (user_id, day) DO UPDATE SET
+        call_count = EXCLUDED.call_count,
+        duration_sum = EXCLUDED.duration_sum,
+        duration_count = EXCLUDED.duration_count,
+        quality_sum = EXCLUDED.quality_sum,
+        quality_count = EXCLUDED.quality_count,
+        sentiment_sum = EXCLUDED.sentiment_sum,
+        sentiment_count = EXCLUDED.sentiment_count,
+        analysis_count = EXCLUDED.analysis_count,
+        professionalism_sum = EXCLUDED.professionalism_sum,
+        professionalism_count = EXCLUDED.professionalism_count,
+        empathy_sum = EXCLUDED.empathy_sum,
+        empathy_count = EXCLUDED.empathy_count,
+        clarity_sum = EXCLUDED.clarity_sum,
+        clarity_count = EXCLUDED.clarity_count,
+        resolution_sum = EXCLUDED.resolution_sum,
+        resolution_count = EXCLUDED.resolution_count,
+        strengths = EXCLUDED.strengths,
+        improvement_areas = EXCLUDED.improvement_areas,
+        updated_at = EXCLUDED.updated_at
+"""
+
+# Sync may stamp created_at slightly before the app-side start time
+SYNC_CLOCK_MARGIN = timedelta(minutes=5)
+
+
+class AgentRollupService:
+    """
+    Incremental per-agent, per-day call aggregates.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize rollup service with database session."""
+        self.db = db
+
+    def _refresh(self, scope: str, params: Dict[str, Any]) -> int:
+        """Recompute the cells matched by scope and commit; returns cells written."""
+        try:
+            result = self.db.execute(text(REFRESH_SQL.format(scope=scope)), params)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return result.rowcount
+
+    def refresh_calls(self, call_log_ids: List[Any]) -> int:
+        """Recompute the cells of the given calls (after analysis or edits)."""
+        if not call_log_ids:
+            return 0
+        return self._refresh(
+            "id = ANY(CAST(:call_log_ids AS uuid[]))",
+            {"call_log_ids": [str(call_log_id) for call_log_id in call_log_ids]}
+        )
+
+    def refresh_since(self, since: datetime, user_id: Optional[str] = None) -> int:
+        """Recompute the cells of calls created since ``since`` (after a sync)."""
+        scope = "created_at >= :since"
+        params: Dict[str, Any] = {"since": since - SYNC_CLOCK_MARGIN}
+        if user_id is not None:
+            scope += " AND user_id = :user_id"
+            params["user_id"] = user_id
+        return self._refresh(scope, params)
+
+    def rebuild(self, days: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Recompute all cells, or the last ``days`` days.
+
+        Only needed to repair drift (calls deleted or edited outside the
+        sync/analysis pipeline). Emptied cells are removed.
+        """
+        start_time = time.time()
+        try:
+            if days is None:
+                self.db.execute(text("DELETE FROM agent_daily_rollups"))
+                self.db.execute(text(REFRESH_SQL.format(scope="TRUE")))
+            else:
+                start_day = (datetime.utcnow() - timedelta(days=days - 1)).date()
+                self.db.execute(
+                    text("DELETE FROM agent_daily_rollups WHERE day >= :start_day"),
+                    {"start_day": start_day}
+                )
+                self.db.execute(
+                    text(REFRESH_SQL.format(scope="created_at >= CAST(:start_day AS date)::timestamp AT TIME ZONE 'UTC'")),
+                    {"start_day": start_day}
+                )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        elapsed = time.time() - start_time
+        rows = self.db.query(func.count()).select_from(AgentDailyRollup).scalar() or 0
+        logger.info(f"Rebuilt agent rollups ({rows:,} rows) in {elapsed:.1f}s")
+        return {"rollup_rows": rows, "elapsed_seconds": round(elapsed, 2)}
+
+
+# Factory function
+def get_agent_rollup_service(db: Session) -> AgentRollupService:
+    """Create an agent rollup service instance."""
+    return AgentRollupService(db)
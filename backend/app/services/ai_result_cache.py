@@ -0,0 +1,404 @@
+"""
+Content-addressed cache for transcription and LLM analysis results.
+
+Results are keyed on everything that determines them, so webhook
+redeliveries, batch reprocessing and job retries reuse earlier results
+instead of sending the same audio to Whisper or the same transcript to GPT:
+- content_hash: SHA-256 of the recording bytes or of the transcript text
+- model
+- prompt_version: hash of the request options, or of the prompt rendered
+  with TRANSCRIPT_PLACEHOLDER instead of the transcript, so editing one
+  analysis module's prompt only invalidates that module's entries
+
+Backends (settings.AI_CACHE_BACKEND): postgres (ai_result_cache table, see
+AIResultCacheEntry), redis (settings.REDIS_URL) or none. Entries expire
+after AI_CACHE_TTL_DAYS; evict() also drops the least recently used
+entries past AI_CACHE_MAX_MB and runs every EVICT_EVERY_WRITES writes.
+Backend errors are logged and count as misses, so the cache can never
+fail a transcription or analysis.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings, get_database_url
+from app.models.call_analysis import AIResultCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+# Stands in for the transcript when a prompt is hashed into a prompt_version
+TRANSCRIPT_PLACEHOLDER = "{transcript}"
+
+# Bytes read per step when hashing a recording
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Run eviction after this many writes (per process)
+EVICT_EVERY_WRITES = 500
+
+# Connections of the postgres backend's own pool
+CACHE_POOL_SIZE = 4
+
+
+class AICacheKey(NamedTuple):
+    """What a cached result depends on."""
+    kind: str
+    model: str
+    prompt_version: str
+    content_hash: str
+
+    @property
+    def digest(self) -> str:
+        """Storage key: SHA-256 over all four parts."""
+        return hashlib.sha256("\x1f".join(self).encode("utf-8")).hexdigest()
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of a transcript (or any text input)."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def prompt_version(*parts: Any) -> str:
+    """Hash of the prompt pieces / request options that shape a result."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class PostgresCacheBackend:
+    """
+    Entries in ai_result_cache; hits bump hit_count and last_used_at.
+
+    Uses its own small connection pool: the application engine shares one
+    connection between all sessions (StaticPool), and cache reads/writes
+    run in worker threads and commit independently of the caller's session.
+    """
+
+    GET_SQL = """
+        UPDATE ai_result_cache
+        SET hit_count = hit_count + 1, last_used_at = now()
+        WHERE cache_key = ANY(:keys) AND expires_at > now()
+        RETURNING cache_key, result
+    """
+
+    EVICT_EXPIRED_SQL = "DELETE FROM ai_result_cache WHERE expires_at <= now()"
+
+    # Keep the most recently used entries that fit in :max_bytes
+    EVICT_OVER_BUDGET_SQL = """
+        DELETE FROM ai_result_cache
+        WHERE cache_key IN (
+            SELECT cache_key FROM (
+                SELECT
+                    cache_key,
+                    SUM(size_bytes) OVER (ORDER BY last_used_at DESC, cache_key) AS retained_bytes
+                FROM ai_result_cache
+            ) ranked
+            WHERE retained_bytes > :max_bytes
+        )
+    """
+
+    def __init__(self):
+        self.engine = create_engine(
+            get_database_url(),
+            pool_size=CACHE_POOL_SIZE,
+            max_overflow=0,
+            pool_pre_ping=True,
+            pool_recycle=300
+        )
+
+    def get_many(self, digests: List[str]) -> Dict[str, Any]:
+        with self.engine.begin() as conn:
+            rows = conn.execute(text(self.GET_SQL), {"keys": digests}).all()
+        return {row.cache_key: row.result for row in rows}
+
+    def set_many(self, entries: List[Tuple[AICacheKey, str, int]], expires_at: datetime) -> None:
+        table = AIResultCacheEntry.__table__
+        statement = insert(table).values([
+            {
+                "cache_key": key.digest,
+                "kind": key.kind,
+                "model": key.model,
+                "prompt_version": key.prompt_version,
+                "content_hash": key.content_hash,
+                "result": json.loads(payload),
+                "size_bytes": size,
+                "expires_at": expires_at,
+            }
+            for key, payload, size in entries
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.cache_key],
+            set_={
+                "result": statement.excluded.result,
+                "size_bytes": statement.excluded.size_bytes,
+                "expires_at": statement.excluded.expires_at,
+                "last_used_at": text("now()"),
+            }
+        )
+        with self.engine.begin() as conn:
+            conn.execute(statement)
+
+    def evict(self, max_bytes: int) -> Dict[str, int]:
+        with self.engine.begin() as conn:
+            expired = conn.execute(text(self.EVICT_EXPIRED_SQL)).rowcount
+            over_budget = conn.execute(text(self.EVICT_OVER_BUDGET_SQL), {"max_bytes": max_bytes}).rowcount
+        return {"expired": expired, "over_budget": over_budget}
+
+    def summary(self) -> Dict[str, Any]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT kind, COUNT(*) AS entries, COALESCE(SUM(size_bytes), 0) AS size_bytes,
+                       COALESCE(SUM(hit_count), 0) AS hits
+                FROM ai_result_cache
+                GROUP BY kind
+                ORDER BY kind
+            """)).all()
+        return {
+            "entries": sum(row.entries for row in rows),
+            "size_bytes": int(sum(row.size_bytes for row in rows)),
+            "kinds": {
+                row.kind: {"entries": row.entries, "size_bytes": int(row.size_bytes), "hits": int(row.hits)}
+                for row in rows
+            },
+        }
+
+
+class RedisCacheBackend:
+    """
+    Entries as Redis strings with a TTL, plus a sorted set of last-use
+    times and a hash of entry sizes for size-based eviction.
+    """
+
+    def __init__(self, prefix: str = "ai_cache"):
+        import redis
+
+        self.client = redis.from_url(settings.REDIS_URL)
+        self.prefix = prefix
+        self.lru_key = f"{prefix}:lru"
+        self.sizes_key = f"{prefix}:sizes"
+
+    def _entry_key(self, digest: str) -> str:
+        return f"{self.prefix}:entry:{digest}"
+
+    def get_many(self, digests: List[str]) -> Dict[str, Any]:
+        payloads = self.client.mget([self._entry_key(digest) for digest in digests])
+        hits = {
+            digest: json.loads(payload)
+            for digest, payload in zip(digests, payloads)
+            if payload is not None
+        }
+        if hits:
+            now = time.time()
+            self.client.zadd(self.lru_key, {digest: now for digest in hits})
+        return hits
+
+    def set_many(self, entries: List[Tuple[AICacheKey, str, int]], expires_at: datetime) -> None:
+        ttl_seconds = max(1, int((expires_at - datetime.now(timezone.utc)).total_seconds()))
+        now = time.time()
+        pipe = self.client.pipeline(transaction=False)
+        for key, payload, size in entries:
+            pipe.set(self._entry_key(key.digest), payload, ex=ttl_seconds)
+            pipe.zadd(self.lru_key, {key.digest: now})
+            pipe.hset(self.sizes_key, key.digest, size)
+        pipe.execute()
+
+    def _forget(self, digests: List[str]) -> None:
+        if not digests:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        pipe.delete(*[self._entry_key(digest) for digest in digests])
+        pipe.zrem(self.lru_key, *digests)
+        pipe.hdel(self.sizes_key, *digests)
+        pipe.execute()
+
+    def evict(self, max_bytes: int) -> Dict[str, int]:
+        # Oldest first
+        digests = [member.decode() for member in self.client.zrange(self.lru_key, 0, -1)]
+        if not digests:
+            return {"expired": 0, "over_budget": 0}
+
+        pipe = self.client.pipeline(transaction=False)
+        for digest in digests:
+            pipe.exists(self._entry_key(digest))
+        alive = pipe.execute()
+        expired = [digest for digest, exists in zip(digests, alive) if not exists]
+        self._forget(expired)
+
+        live = [digest for digest, exists in zip(digests, alive) if exists]
+        sizes = [int(size or 0) for size in self.client.hmget(self.sizes_key, live)] if live else []
+        total = sum(sizes)
+        over_budget = []
+        for digest, size in zip(live, sizes):
+            if total <= max_bytes:
+                break
+            over_budget.append(digest)
+            total -= size
+        self._forget(over_budget)
+        return {"expired": len(expired), "over_budget": len(over_budget)}
+
+    def summary(self) -> Dict[str, Any]:
+        sizes = self.client.hvals(self.sizes_key)
+        return {
+            "entries": self.client.zcard(self.lru_key),
+            "size_bytes": sum(int(size) for size in sizes),
+        }
+
+
+CACHE_BACKENDS = {
+    "postgres": PostgresCacheBackend,
+    "redis": RedisCacheBackend,
+}
+
+
+class AIResultCache:
+    """
+    Async front end over a cache backend, with per-kind hit/miss counters
+    (per process).
+    """
+
+    def __init__(self, backend_name: Optional[str] = None):
+        backend_name = backend_name or settings.AI_CACHE_BACKEND
+        if backend_name != "none" and backend_name not in CACHE_BACKENDS:
+            raise ValueError(f"Unknown AI cache backend: {backend_name}")
+
+        self.backend_name = backend_name
+        self.backend = CACHE_BACKENDS[backend_name]() if backend_name != "none" else None
+        self.ttl = timedelta(days=settings.AI_CACHE_TTL_DAYS)
+        self.max_bytes = settings.AI_CACHE_MAX_MB * 1024 * 1024
+
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _count(self, kind: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(kind, {"hits": 0, "misses": 0, "writes": 0, "errors": 0})
+            counters[counter] += amount
+
+    async def get_many(self, keys: List[AICacheKey]) -> Dict[AICacheKey, Any]:
+        """Cached results for whichever keys are present and unexpired."""
+        if not self.enabled or not keys:
+            return {}
+        try:
+            found = await asyncio.to_thread(self.backend.get_many, [key.digest for key in keys])
+        except Exception as e:
+            logger.warning(f"AI cache lookup failed: {e}")
+            for key in keys:
+                self._count(key.kind, "errors")
+            return {}
+
+        hits = {key: found[key.digest] for key in keys if key.digest in found}
+        for key in keys:
+            self._count(key.kind, "hits" if key in hits else "misses")
+        return hits
+
+    async def get(self, key: AICacheKey) -> Optional[Any]:
+        """Cached result for one key, or None."""
+        return (await self.get_many([key])).get(key)
+
+    async def set_many(self, items: List[Tuple[AICacheKey, Any]]) -> None:
+        """Store results (JSON-serializable) under their keys."""
+        if not self.enabled or not items:
+            return
+        # One row per key (a single upsert cannot touch a row twice)
+        entries = []
+        for key, result in dict(items).items():
+            payload = json.dumps(result, default=str)
+            entries.append((key, payload, len(payload.encode("utf-8"))))
+
+        try:
+            expires_at = datetime.now(timezone.utc) + self.ttl
+            await asyncio.to_thread(self.backend.set_many, entries, expires_at)
+        except Exception as e:
+            logger.warning(f"AI cache write failed: {e}")
+            for key, _ in items:
+                self._count(key.kind, "errors")
+            return
+
+        for key, _ in items:
+            self._count(key.kind, "writes")
+
+        with self._lock:
+            self._writes_since_evict += len(items)
+            due = self._writes_since_evict >= EVICT_EVERY_WRITES
+            if due:
+                self._writes_since_evict = 0
+        if due:
+            try:
+                await asyncio.to_thread(self.evict)
+            except Exception as e:
+                logger.warning(f"AI cache eviction failed: {e}")
+
+    async def set(self, key: AICacheKey, result: Any) -> None:
+        """Store one result."""
+        await self.set_many([(key, result)])
+
+    def evict(self) -> Dict[str, Any]:
+        """Drop expired entries, then least recently used ones past the size budget."""
+        if not self.enabled:
+            return {"backend": self.backend_name, "expired": 0, "over_budget": 0}
+        evicted = self.backend.evict(self.max_bytes)
+        if evicted["expired"] or evicted["over_budget"]:
+            logger.info(
+                f"AI cache eviction: {evicted['expired']:,} expired, "
+                f"{evicted['over_budget']:,} over the {self.max_bytes // (1024 * 1024)} MB budget"
+            )
+        return {"backend": self.backend_name, **evicted}
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this process plus the backend's size."""
+        with self._lock:
+            counters = {kind: dict(values) for kind, values in self._counters.items()}
+        hits = sum(values["hits"] for values in counters.values())
+        misses = sum(values["misses"] for values in counters.values())
+
+        stats: Dict[str, Any] = {
+            "backend": self.backend_name,
+            "ttl_days": self.ttl.days,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "counters": counters,
+        }
+        if self.enabled:
+            try:
+                stats["storage"] = self.backend.summary()
+            except Exception as e:
+                stats["storage_error"] = str(e)
+        return stats
+
+
+_ai_result_cache: Optional[AIResultCache] = None
+_ai_result_cache_lock = threading.Lock()
+
+
+def get_ai_result_cache() -> AIResultCache:
+    """Process-wide cache instance (backend from settings)."""
+    global _ai_result_cache
+    with _ai_result_cache_lock:
+        if _ai_result_cache is None:
+            _ai_result_cache = AIResultCache()
+        return _ai_result_cache
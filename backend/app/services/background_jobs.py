@@ -7,11 +7,16 @@ import logging
 import asyncio
 import time
 import json
-from typing import Dict, Any, Optional, List, Callable
+import random
+import uuid
+import weakref
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 
-import redis
+import redis.asyncio as aioredis
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -44,6 +49,258 @@ class JobPriority(Enum):
     URGENT = 10
 
 
+# Dequeue weights: each claimed slot is drawn from the non-empty priority
+# lists with probability proportional to these, so urgent and high jobs
+# overtake any low backlog while low jobs still get a share of throughput
+PRIORITY_WEIGHTS = {
+    JobPriority.URGENT: 64,
+    JobPriority.HIGH: 16,
+    JobPriority.MEDIUM: 4,
+    JobPriority.LOW: 1
+}
+
+# Delayed/legacy jobs moved to the priority lists per claim round trip
+PROMOTE_LIMIT = 100
+
+# Expired in-flight jobs handled per reaper round trip
+REAP_LIMIT = 100
+
+# Full call pipeline (transcription, analysis, disposition) job timeout
+CALL_PIPELINE_TIMEOUT = 900
+
+# Longest blocking wait for new jobs when the queues are empty
+IDLE_WAIT_SECONDS = 5
+
+# TTL of finished (completed/cancelled) job records; queued, in-flight and
+# dead-lettered records do not expire
+JOB_RECORD_TTL = 86400
+
+# Shared by the queue scripts. Queue lists and zsets hold job ids; the job
+# record ("<queue>:jobs:<id>", read through ARGV[1] as key prefix) holds
+# the payload; record keys are derived rather than declared, so the
+# scripts assume a single (non-cluster) Redis. Entries queued before that
+# carry the whole payload, which becomes the record on first sight.
+QUEUE_SCRIPT_HELPERS = """
+local function load_job(prefix, job_id)
+    local raw = redis.call('GET', prefix .. job_id)
+    if not raw then return nil end
+    local ok, job = pcall(cjson.decode, raw)
+    if ok then return job end
+    return nil
+end
+
+local function entry_job_id(prefix, entry)
+    if not entry then return nil end
+    if string.sub(entry, 1, 1) ~= '{' then return entry end
+    local ok, job = pcall(cjson.decode, entry)
+    if not ok or not job['job_id'] then return nil end
+    redis.call('SET', prefix .. job['job_id'], entry, 'NX')
+    return job['job_id']
+end
+
+local function priority_queue(level_keys, level_values, job)
+    local priority = job and tonumber(job['priority'])
+    if priority then
+        for i = 1, #level_keys do
+            if priority <= level_values[i] then return level_keys[i] end
+        end
+    end
+    return level_keys[#level_keys]
+end
+"""
+
+# Atomically promote due delayed jobs (and drain the pre-priority single
+# queue) into the per-priority lists, then claim up to a batch of jobs by
+# weighted draw. Each claimed id moves to the processing list with a
+# visibility deadline of now + the summed timeouts of the batch + grace,
+# since a worker runs its batch one job after another (each job tightens
+# its own deadline when it starts); cancelled or missing jobs are dropped.
+# Returns {next delayed due time or false, record, ...}.
+#
+# KEYS: delayed zset, legacy list, processing list, deadlines zset,
+#       wakeup list, priority lists most urgent first
+# ARGV: record prefix, now, batch size, promote limit, visibility grace,
+#       default timeout, then per priority list its priority value and
+#       weight, then one random number per batch slot
+CLAIM_JOBS_SCRIPT = QUEUE_SCRIPT_HELPERS + """
+local prefix = ARGV[1]
+local now = tonumber(ARGV[2])
+local batch = tonumber(ARGV[3])
+local promote_limit = tonumber(ARGV[4])
+local grace = tonumber(ARGV[5])
+local default_timeout = tonumber(ARGV[6])
+
+local level_keys, level_values, weights = {}, {}, {}
+for i = 6, #KEYS do
+    local level = i - 5
+    level_keys[level] = KEYS[i]
+    level_values[level] = tonumber(ARGV[5 + 2 * level])
+    weights[level] = tonumber(ARGV[6 + 2 * level])
+end
+local levels = #level_keys
+local random_offset = 6 + 2 * levels
+
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, promote_limit)
+for _, entry in ipairs(due) do
+    redis.call('ZREM', KEYS[1], entry)
+    local job_id = entry_job_id(prefix, entry)
+    if job_id then
+        redis.call('LPUSH', priority_queue(level_keys, level_values, load_job(prefix, job_id)), job_id)
+    end
+end
+-- Newest legacy job first, so the oldest ends up next to be popped
+for _ = 1, promote_limit - #due do
+    local job_id = entry_job_id(prefix, redis.call('LPOP', KEYS[2]))
+    if not job_id then break end
+    redis.call('RPUSH', priority_queue(level_keys, level_values, load_job(prefix, job_id)), job_id)
+end
+
+local lengths = {}
+for i = 1, levels do
+    lengths[i] = redis.call('LLEN', level_keys[i])
+end
+
+local result = {false}
+local claimed, batch_timeout = {}, 0
+for slot = 1, batch do
+    local total = 0
+    for i = 1, levels do
+        if lengths[i] > 0 then total = total + weights[i] end
+    end
+    if total == 0 then break end
+
+    local draw = tonumber(ARGV[random_offset + slot]) * total
+    local chosen = levels
+    for i = 1, levels do
+        if lengths[i] > 0 then
+            draw = draw - weights[i]
+            if draw < 0 then chosen = i break end
+        end
+    end
+    while lengths[chosen] == 0 do chosen = chosen - 1 end
+
+    local job_id = entry_job_id(prefix, redis.call('RPOP', level_keys[chosen]))
+    lengths[chosen] = lengths[chosen] - 1
+    local job = job_id and load_job(prefix, job_id)
+    if job and job['status'] ~= 'cancelled' then
+        redis.call('LPUSH', KEYS[3], job_id)
+        table.insert(claimed, job_id)
+        batch_timeout = batch_timeout + (tonumber(job['timeout']) or default_timeout)
+        table.insert(result, redis.call('GET', prefix .. job_id))
+    end
+end
+for _, job_id in ipairs(claimed) do
+    redis.call('ZADD', KEYS[4], now + batch_timeout + grace, job_id)
+end
+
+-- Nothing left to claim: drop wake-up tokens nobody needs
+if #result == 1 then
+    redis.call('DEL', KEYS[5])
+end
+
+local next_due = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+if next_due[2] then result[1] = next_due[2] end
+return result
+"""
+
+# Requeue in-flight jobs whose visibility deadline passed (their worker
+# died), counting it as a retry; jobs out of retries go to the dead-letter
+# list. Returns {requeued, dead-lettered}.
+#
+# Records are re-encoded by cjson, which writes empty arrays as {}.
+#
+# KEYS: deadlines zset, processing list, dead-letter list, wakeup list,
+#       priority lists most urgent first
+# ARGV: record prefix, now, limit, error message, now as ISO timestamp,
+#       then per priority list its priority value
+REAP_JOBS_SCRIPT = QUEUE_SCRIPT_HELPERS + """
+local prefix = ARGV[1]
+local level_keys, level_values = {}, {}
+for i = 5, #KEYS do
+    level_keys[i - 4] = KEYS[i]
+    level_values[i - 4] = tonumber(ARGV[i + 1])
+end
+
+local requeued, dead = 0, 0
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[2], 'LIMIT', 0, tonumber(ARGV[3]))
+for _, job_id in ipairs(expired) do
+    redis.call('ZREM', KEYS[1], job_id)
+    redis.call('LREM', KEYS[2], 0, job_id)
+    local job = load_job(prefix, job_id)
+    if job and job['status'] ~= 'cancelled' then
+        local retry_count = tonumber(job['retry_count']) or 0
+        if retry_count >= (tonumber(job['max_retries']) or 0) then
+            job['status'] = 'failed'
+            job['error'] = ARGV[4]
+            job['failed_at'] = ARGV[5]
+            redis.call('LPUSH', KEYS[3], job_id)
+            dead = dead + 1
+        else
+            job['retry_count'] = retry_count + 1
+            job['status'] = 'retrying'
+            job['last_error'] = ARGV[4]
+            redis.call('RPUSH', priority_queue(level_keys, level_values, job), job_id)
+            redis.call('LPUSH', KEYS[4], 1)
+            requeued = requeued + 1
+        end
+        redis.call('SET', prefix .. job_id, cjson.encode(job))
+    end
+end
+return {requeued, dead}
+"""
+
+# Cancel a job that is waiting (queued, delayed or retrying): mark its
+# record cancelled and drop its id from the queues. Refused once the job
+# is claimed (it has a visibility deadline), since the claiming worker
+# owns the record from then on; runs atomically with claims and reaps.
+# Returns 1 if cancelled.
+#
+# KEYS: job record, deadlines zset, delayed zset, priority lists
+# ARGV: job id, now as ISO timestamp, record TTL
+CANCEL_JOB_SCRIPT = """
+local job_id = ARGV[1]
+if redis.call('ZSCORE', KEYS[2], job_id) then return 0 end
+local raw = redis.call('GET', KEYS[1])
+if not raw then return 0 end
+local ok, job = pcall(cjson.decode, raw)
+if not ok or (job['status'] ~= 'queued' and job['status'] ~= 'retrying') then return 0 end
+
+job['status'] = 'cancelled'
+job['cancelled_at'] = ARGV[2]
+redis.call('ZREM', KEYS[3], job_id)
+for i = 4, #KEYS do
+    redis.call('LREM', KEYS[i], 0, job_id)
+end
+redis.call('SET', KEYS[1], cjson.encode(job), 'EX', tonumber(ARGV[3]))
+return 1
+"""
+
+
+# Pipeline stages bounded per worker process, keyed by the resource they
+# mostly wait on; the GPT stage is additionally bounded per request by
+# OPENAI_MAX_CONCURRENT_REQUESTS in CallAnalysisService
+STAGE_LIMITS = {
+    "whisper": lambda: settings.WORKER_WHISPER_CONCURRENCY,
+    "gpt": lambda: settings.WORKER_GPT_CONCURRENCY,
+    "database": lambda: settings.WORKER_DB_CONCURRENCY
+}
+
+# Stage semaphores per event loop (the API, workers and scripts each run their own)
+_stage_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@asynccontextmanager
+async def pipeline_stage(stage: str):
+    """Hold one of the stage's slots for the duration of the block."""
+    semaphores = _stage_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if stage not in semaphores:
+        semaphores[stage] = asyncio.Semaphore(STAGE_LIMITS[stage]())
+    async with semaphores[stage]:
+        yield
+
+
 class BackgroundJobError(Exception):
     """Custom exception for background job errors."""
     pass
@@ -57,8 +314,33 @@ class BackgroundJobManager:
 
     def __init__(self):
         """Initialize background job manager."""
-        self.redis_client = redis.from_url(settings.REDIS_URL)
+        # Pooled async client; blocking pops wait for a free connection
+        # instead of failing when every connection is in use
+        self.redis_client = aioredis.Redis(
+            connection_pool=aioredis.BlockingConnectionPool.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS
+            )
+        )
         self.queue_name = settings.RQ_QUEUE_NAME
+        self.job_key_prefix = f"{self.queue_name}:jobs:"
+        self.delayed_key = f"{self.queue_name}:delayed"
+        # Claimed, unacknowledged job ids and their visibility deadlines
+        self.processing_key = f"{self.queue_name}:processing"
+        self.deadlines_key = f"{self.queue_name}:deadlines"
+        # Jobs out of retries, kept until replayed or cleaned up
+        self.dead_letter_key = f"{self.queue_name}:dead"
+        # One token per queued job wakes one idle worker
+        self.wakeup_key = f"{self.queue_name}:wakeup"
+        # Single FIFO list used before per-priority queues; drained on claim
+        self.legacy_queue_key = f"{self.queue_name}:queue"
+
+        # Priority levels, most urgent first
+        self.priority_levels = sorted(JobPriority, key=lambda priority: priority.value)
+        self.priority_queue_keys = [self._queue_key(priority) for priority in self.priority_levels]
+        self.claim_script = self.redis_client.register_script(CLAIM_JOBS_SCRIPT)
+        self.reap_script = self.redis_client.register_script(REAP_JOBS_SCRIPT)
+        self.cancel_script = self.redis_client.register_script(CANCEL_JOB_SCRIPT)
 
         # Services for processing
         self.transcription_service = TranscriptionService()
@@ -69,6 +351,8 @@ class BackgroundJobManager:
         self.max_retries = 3
         self.retry_delays = [60, 300, 900]  # 1 min, 5 min, 15 min
         self.default_timeout = 600  # 10 minutes
+        self.visibility_grace = settings.JOB_VISIBILITY_GRACE_SECONDS
+        self.reap_interval = settings.JOB_REAP_INTERVAL_SECONDS
 
         # Job type registry
         self.job_handlers = {
@@ -77,7 +361,14 @@ class BackgroundJobManager:
             "evaluate_disposition": self._handle_disposition_job,
             "process_full_pipeline": self._handle_full_pipeline_job,
             "sync_calls": self._handle_sync_calls_job,
-            "cleanup_old_jobs": self._handle_cleanup_job
+            "cleanup_old_jobs": self._handle_cleanup_job,
+            "backfill_permit_embeddings": self._handle_embedding_backfill_job,
+            "rebuild_permit_rollups": self._handle_rollup_rebuild_job,
+            "rebuild_agent_rollups": self._handle_agent_rollup_rebuild_job,
+            "link_permits": self._handle_permit_linking_job,
+            "detect_permit_duplicates": self._handle_duplicate_detection_job,
+            "rehash_addresses": self._handle_address_rehash_job,
+            "evict_ai_cache": self._handle_ai_cache_eviction_job
         }
 
     async def queue_job(
@@ -107,37 +398,24 @@ class BackgroundJobManager:
             BackgroundJobError: If job queuing fails
         """
         try:
-            # Generate job ID
-            job_id = f"{job_type}_{int(time.time() * 1000)}"
-
-            # Prepare job payload
-            job_payload = {
-                "job_id": job_id,
-                "job_type": job_type,
-                "job_data": job_data,
-                "priority": priority.value,
-                "queued_at": datetime.utcnow().isoformat(),
-                "timeout": timeout or self.default_timeout,
-                "max_retries": max_retries or self.max_retries,
-                "retry_count": 0,
-                "status": JobStatus.QUEUED.value
-            }
+            job_payload = self._job_payload(job_type, job_data, priority, timeout, max_retries)
+            job_id = job_payload["job_id"]
 
-            # Add to priority queue
-            queue_key = f"{self.queue_name}:queue"
+            # Store job details; queues only carry the id
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.set(self._job_key(job_id), json.dumps(job_payload))
 
             if delay_seconds > 0:
-                # Delayed job - use sorted set with timestamp
+                # Delayed job - use sorted set with timestamp; promoted to
+                # its priority queue by the claim script once due
                 execute_at = time.time() + delay_seconds
-                delayed_key = f"{self.queue_name}:delayed"
-                self.redis_client.zadd(delayed_key, {json.dumps(job_payload): execute_at})
+                pipe.zadd(self.delayed_key, {job_id: execute_at})
             else:
                 # Immediate job - use priority queue
-                self.redis_client.lpush(queue_key, json.dumps(job_payload))
+                pipe.lpush(self._queue_key(priority), job_id)
+                pipe.lpush(self.wakeup_key, 1)
 
-            # Store job details
-            job_key = f"{self.queue_name}:jobs:{job_id}"
-            self.redis_client.setex(job_key, 86400, json.dumps(job_payload))  # 24 hour TTL
+            await pipe.execute()
 
             logger.info(f"Queued {job_type} job {job_id} with priority {priority.name}")
 
@@ -147,6 +425,27 @@ class BackgroundJobManager:
             logger.error(f"Failed to queue job {job_type}: {e}")
             raise BackgroundJobError(f"Job queuing failed: {str(e)}")
 
+    def _job_payload(
+        self,
+        job_type: str,
+        job_data: Dict[str, Any],
+        priority: JobPriority,
+        timeout: Optional[int],
+        max_retries: Optional[int]
+    ) -> Dict[str, Any]:
+        """Job record for a newly queued job."""
+        return {
+            "job_id": f"{job_type}_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}",
+            "job_type": job_type,
+            "job_data": job_data,
+            "priority": priority.value,
+            "queued_at": datetime.utcnow().isoformat(),
+            "timeout": timeout or self.default_timeout,
+            "max_retries": max_retries or self.max_retries,
+            "retry_count": 0,
+            "status": JobStatus.QUEUED.value
+        }
+
     async def queue_call_processing(
         self,
         call_log_id: str,
@@ -164,9 +463,58 @@ class BackgroundJobManager:
             job_type="process_full_pipeline",
             job_data=job_data,
             priority=priority,
-            timeout=900  # 15 minutes for full pipeline
+            timeout=CALL_PIPELINE_TIMEOUT
         )
 
+    async def queue_call_processing_batch(
+        self,
+        call_log_ids: List[str],
+        priority: JobPriority = JobPriority.HIGH
+    ) -> List[str]:
+        """
+        Queue full call processing pipeline jobs for many calls in one
+        round trip (e.g. calls imported by a sync).
+
+        Returns:
+            Job IDs, in call_log_ids order
+
+        Raises:
+            BackgroundJobError: If job queuing fails
+        """
+        if not call_log_ids:
+            return []
+
+        try:
+            job_payloads = [
+                self._job_payload(
+                    "process_full_pipeline",
+                    {
+                        "call_log_id": call_log_id,
+                        "recording_url": None,
+                        "processing_modules": ["transcription", "analysis", "disposition"]
+                    },
+                    priority,
+                    CALL_PIPELINE_TIMEOUT,
+                    None
+                )
+                for call_log_id in call_log_ids
+            ]
+            job_ids = [job_payload["job_id"] for job_payload in job_payloads]
+
+            pipe = self.redis_client.pipeline(transaction=True)
+            for job_payload in job_payloads:
+                pipe.set(self._job_key(job_payload["job_id"]), json.dumps(job_payload))
+            pipe.lpush(self._queue_key(priority), *job_ids)
+            pipe.lpush(self.wakeup_key, *[1] * len(job_ids))
+            await pipe.execute()
+
+            logger.info(f"Queued {len(job_ids)} process_full_pipeline jobs with priority {priority.name}")
+            return job_ids
+
+        except Exception as e:
+            logger.error(f"Failed to queue {len(call_log_ids)} call processing jobs: {e}")
+            raise BackgroundJobError(f"Job queuing failed: {str(e)}")
+
     async def queue_transcription(
         self,
         call_log_id: str,
@@ -190,12 +538,14 @@ class BackgroundJobManager:
         self,
         call_log_id: str,
         analysis_modules: Optional[List[str]] = None,
-        priority: JobPriority = JobPriority.MEDIUM
+        priority: JobPriority = JobPriority.MEDIUM,
+        analysis_mode: Optional[str] = None
     ) -> str:
         """Queue call analysis job."""
         job_data = {
             "call_log_id": call_log_id,
-            "analysis_modules": analysis_modules
+            "analysis_modules": analysis_modules,
+            "analysis_mode": analysis_mode
         }
 
         return await self.queue_job(
@@ -222,64 +572,268 @@ class BackgroundJobManager:
             timeout=60  # 1 minute
         )
 
+    async def queue_disposition_batch(
+        self,
+        call_log_ids: List[str],
+        priority: JobPriority = JobPriority.LOW
+    ) -> str:
+        """Queue one disposition evaluation job for many calls (backfills)."""
+        job_data = {
+            "call_log_ids": list(call_log_ids)
+        }
+
+        return await self.queue_job(
+            job_type="evaluate_disposition",
+            job_data=job_data,
+            priority=priority,
+            timeout=60 + len(call_log_ids) // 100  # 1 minute, plus ~1s per 100 calls
+        )
+
+    async def queue_embedding_backfill(
+        self,
+        batch_size: int = 256,
+        time_budget_seconds: int = 540,
+        chain: bool = True,
+        priority: JobPriority = JobPriority.LOW
+    ) -> str:
+        """Queue permit embedding backfill job."""
+        job_data = {
+            "batch_size": batch_size,
+            "time_budget_seconds": time_budget_seconds,
+            "chain": chain
+        }
+
+        return await self.queue_job(
+            job_type="backfill_permit_embeddings",
+            job_data=job_data,
+            priority=priority,
+            timeout=time_budget_seconds + 60
+        )
+
+    async def queue_permit_linking(
+        self,
+        state_code: Optional[str] = None,
+        county_id: Optional[int] = None,
+        full: bool = False,
+        time_budget_seconds: int = 540,
+        chain: bool = True,
+        min_confidence: str = "medium",
+        priority: JobPriority = JobPriority.LOW
+    ) -> str:
+        """Queue permit-to-property linking job."""
+        job_data = {
+            "state_code": state_code,
+            "county_id": county_id,
+            "full": full,
+            "time_budget_seconds": time_budget_seconds,
+            "chain": chain,
+            "min_confidence": min_confidence
+        }
+
+        return await self.queue_job(
+            job_type="link_permits",
+            job_data=job_data,
+            priority=priority,
+            timeout=time_budget_seconds + 60
+        )
+
+    async def queue_duplicate_detection(
+        self,
+        state_code: Optional[str] = None,
+        full: bool = False,
+        min_confidence: float = 75.0,
+        time_budget_seconds: int = 540,
+        chain: bool = True,
+        priority: JobPriority = JobPriority.LOW
+    ) -> str:
+        """Queue permit duplicate detection job."""
+        job_data = {
+            "state_code": state_code,
+            "full": full,
+            "min_confidence": min_confidence,
+            "time_budget_seconds": time_budget_seconds,
+            "chain": chain
+        }
+
+        return await self.queue_job(
+            job_type="detect_permit_duplicates",
+            job_data=job_data,
+            priority=priority,
+            timeout=time_budget_seconds + 60
+        )
+
+    async def queue_address_rehash(
+        self,
+        tables: Optional[List[str]] = None,
+        time_budget_seconds: int = 540,
+        chain: bool = True,
+        cursor: Optional[Dict[str, str]] = None,
+        relink: bool = False,
+        priority: JobPriority = JobPriority.LOW
+    ) -> str:
+        """Queue canonical address rehash job."""
+        job_data = {
+            "tables": tables,
+            "time_budget_seconds": time_budget_seconds,
+            "chain": chain,
+            "cursor": cursor,
+            "relink": relink
+        }
+
+        return await self.queue_job(
+            job_type="rehash_addresses",
+            job_data=job_data,
+            priority=priority,
+            timeout=time_budget_seconds + 60
+        )
+
+    async def queue_address_rehash_if_stale(self) -> Optional[str]:
+        """Queue an address rehash if any row predates ADDRESS_NORMALIZER_VERSION."""
+        from app.services.address_rehash_service import AddressRehashService
+
+        db = next(get_db())
+        try:
+            stale = await asyncio.to_thread(AddressRehashService(db).has_stale_rows)
+        finally:
+            db.close()
+
+        return await self.queue_address_rehash() if stale else None
+
+    def _queue_key(self, priority: JobPriority) -> str:
+        """Redis list holding ids of immediate jobs of one priority level."""
+        return f"{self.queue_name}:queue:{priority.name.lower()}"
+
+    def _job_key(self, job_id: str) -> str:
+        """Redis key of a job record."""
+        return f"{self.job_key_prefix}{job_id}"
+
+    def _priority_for(self, job_payload: Dict[str, Any]) -> JobPriority:
+        """Priority level a job is queued at."""
+        value = job_payload.get("priority", JobPriority.MEDIUM.value)
+        for priority in self.priority_levels:
+            if value <= priority.value:
+                return priority
+        return self.priority_levels[-1]
+
+    async def claim_jobs(self, batch_size: int = 1) -> Tuple[List[Dict[str, Any]], Optional[float]]:
+        """
+        Claim up to batch_size jobs in one round trip.
+
+        Due delayed jobs are promoted in the same atomic script, so workers
+        never race each other moving them. Each slot is drawn from the
+        non-empty priority queues by PRIORITY_WEIGHTS, and each claimed job
+        moves to the processing list with a visibility deadline until it is
+        acknowledged.
+
+        Returns:
+            Tuple of (claimed job payloads, next delayed due time or None)
+        """
+        args = [
+            self.job_key_prefix, time.time(), batch_size, PROMOTE_LIMIT,
+            self.visibility_grace, self.default_timeout
+        ]
+        for priority in self.priority_levels:
+            args.extend([priority.value, PRIORITY_WEIGHTS[priority]])
+        args.extend(random.random() for _ in range(batch_size))
+
+        result = await self.claim_script(
+            keys=[
+                self.delayed_key, self.legacy_queue_key, self.processing_key,
+                self.deadlines_key, self.wakeup_key, *self.priority_queue_keys
+            ],
+            args=args
+        )
+        next_due = float(result[0]) if result[0] else None
+        jobs = [json.loads(job_data) for job_data in result[1:]]
+        return jobs, next_due
+
+    async def reap_expired_jobs(self) -> Dict[str, int]:
+        """
+        Requeue jobs whose worker died before acknowledging them.
+
+        A job still in the processing list past its visibility deadline
+        (timeout plus JOB_VISIBILITY_GRACE_SECONDS) is requeued as a retry,
+        or dead-lettered once out of retries. Safe to run from every worker.
+        """
+        requeued, dead_lettered = await self.reap_script(
+            keys=[
+                self.deadlines_key, self.processing_key, self.dead_letter_key,
+                self.wakeup_key, *self.priority_queue_keys
+            ],
+            args=[
+                self.job_key_prefix, time.time(), REAP_LIMIT,
+                "Visibility timeout expired (worker lost)", datetime.utcnow().isoformat(),
+                *[priority.value for priority in self.priority_levels]
+            ]
+        )
+        if requeued or dead_lettered:
+            logger.warning(f"Reaped expired jobs: {requeued} requeued, {dead_lettered} dead-lettered")
+        return {"requeued": requeued, "dead_lettered": dead_lettered}
+
     async def process_jobs(self, worker_id: str = "worker_1", batch_size: int = 1):
         """
         Process jobs from the queue.
         This runs continuously as a worker process.
+
+        Claims up to batch_size jobs per round trip and runs them most
+        urgent first; a larger batch saves round trips but holds claimed
+        jobs back from other workers (and from the reaper for up to the
+        batch's summed timeouts if this worker dies). Expired in-flight jobs are reaped
+        every JOB_REAP_INTERVAL_SECONDS.
         """
         logger.info(f"Starting background job worker {worker_id}")
+        last_reap = 0.0
 
         while True:
             try:
-                # Process delayed jobs first
-                await self._process_delayed_jobs()
-
-                # Get jobs from queue
-                queue_key = f"{self.queue_name}:queue"
-                job_data = self.redis_client.brpop(queue_key, timeout=5)
+                if time.time() - last_reap >= self.reap_interval:
+                    await self.reap_expired_jobs()
+                    last_reap = time.time()
 
-                if not job_data:
-                    continue  # No jobs available, wait
+                jobs, next_due = await self.claim_jobs(batch_size)
 
-                # Parse job
-                job_payload = json.loads(job_data[1].decode('utf-8'))
-                job_id = job_payload["job_id"]
+                if not jobs:
+                    # Sleep until a job is queued (wake-up token), a delayed
+                    # job is due or the next reap
+                    wait = min(IDLE_WAIT_SECONDS, self.reap_interval)
+                    if next_due is not None:
+                        wait = min(wait, max(next_due - time.time(), 0.1))
+                    await self.redis_client.brpop(self.wakeup_key, timeout=wait)
+                    continue
 
-                logger.info(f"Worker {worker_id} processing job {job_id}")
+                for job_payload in sorted(jobs, key=lambda job: job.get("priority", JobPriority.MEDIUM.value)):
+                    logger.info(f"Worker {worker_id} processing job {job_payload['job_id']}")
 
-                # Process the job
-                await self._process_job(job_payload, worker_id)
+                    # Process the job
+                    await self._process_job(job_payload, worker_id)
 
             except KeyboardInterrupt:
                 logger.info(f"Worker {worker_id} shutting down")
                 break
             except Exception as e:
                 logger.error(f"Worker {worker_id} error: {e}")
-                # Continue processing other jobs
+                # Back off briefly (e.g. Redis unavailable), then continue
+                await asyncio.sleep(1)
                 continue
 
-    async def _process_delayed_jobs(self):
-        """Move delayed jobs to active queue when their time comes."""
-        try:
-            delayed_key = f"{self.queue_name}:delayed"
-            queue_key = f"{self.queue_name}:queue"
-            current_time = time.time()
-
-            # Get jobs ready for processing
-            ready_jobs = self.redis_client.zrangebyscore(delayed_key, 0, current_time)
-
-            for job_data in ready_jobs:
-                # Move to active queue
-                self.redis_client.lpush(queue_key, job_data)
-                self.redis_client.zrem(delayed_key, job_data)
-
-        except Exception as e:
-            logger.error(f"Error processing delayed jobs: {e}")
-
     async def _process_job(self, job_payload: Dict[str, Any], worker_id: str):
-        """Process an individual job."""
+        """
+        Process an individual claimed job and acknowledge it.
+
+        A job is only removed from the processing list once it completed,
+        was scheduled for retry or was dead-lettered; if the worker dies
+        first, the reaper requeues it.
+        """
         job_id = job_payload["job_id"]
         job_type = job_payload["job_type"]
+        timeout = job_payload.get("timeout", self.default_timeout)
+
+        # Restart the visibility deadline now that the job actually runs
+        # (the claim-time deadline covers the whole batch); if the reaper
+        # already requeued it, another worker owns it
+        if not await self._refresh_deadline(job_id, timeout):
+            logger.warning(f"Job {job_id} was reaped before it started; skipping")
+            return
 
         try:
             # Update job status
@@ -288,8 +842,7 @@ class BackgroundJobManager:
             job_payload["started_at"] = datetime.utcnow().isoformat()
 
             # Store updated status
-            job_key = f"{self.queue_name}:jobs:{job_id}"
-            self.redis_client.setex(job_key, 86400, json.dumps(job_payload))
+            await self.redis_client.set(self._job_key(job_id), json.dumps(job_payload))
 
             # Get job handler
             handler = self.job_handlers.get(job_type)
@@ -298,7 +851,6 @@ class BackgroundJobManager:
 
             # Execute job with timeout
             start_time = time.time()
-            timeout = job_payload.get("timeout", self.default_timeout)
 
             try:
                 result = await asyncio.wait_for(
@@ -315,8 +867,15 @@ class BackgroundJobManager:
             job_payload["processing_time"] = processing_time
             job_payload["result"] = result
 
+            await self._acknowledge_job(job_payload)
             logger.info(f"Job {job_id} completed in {processing_time:.2f}s")
 
+        except asyncio.CancelledError:
+            # Worker shutting down: hand the job back rather than leave it
+            # to the reaper
+            await self._release_job(job_payload)
+            raise
+
         except Exception as e:
             # Job failed
             logger.error(f"Job {job_id} failed: {e}")
@@ -332,11 +891,53 @@ class BackgroundJobManager:
                 job_payload["status"] = JobStatus.FAILED.value
                 job_payload["failed_at"] = datetime.utcnow().isoformat()
                 job_payload["error"] = str(e)
+                await self._acknowledge_job(job_payload, dead_letter=True)
+                logger.warning(f"Job {job_id} moved to dead-letter queue after {retry_count} retries")
+
+    async def _refresh_deadline(self, job_id: str, timeout: float) -> bool:
+        """Reset a claimed job's visibility deadline to now + timeout + grace; False if no longer claimed."""
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.zadd(self.deadlines_key, {job_id: time.time() + timeout + self.visibility_grace}, xx=True)
+        pipe.zscore(self.deadlines_key, job_id)
+        _, deadline = await pipe.execute()
+        return deadline is not None
+
+    async def _acknowledge_job(
+        self,
+        job_payload: Dict[str, Any],
+        retry_at: Optional[float] = None,
+        dead_letter: bool = False
+    ):
+        """Remove a claimed job from the processing list and store its outcome, atomically."""
+        job_id = job_payload["job_id"]
+        job_key = self._job_key(job_id)
+
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.lrem(self.processing_key, 0, job_id)
+        pipe.zrem(self.deadlines_key, job_id)
+        if retry_at is not None:
+            pipe.set(job_key, json.dumps(job_payload))
+            pipe.zadd(self.delayed_key, {job_id: retry_at})
+        elif dead_letter:
+            pipe.set(job_key, json.dumps(job_payload))
+            pipe.lpush(self.dead_letter_key, job_id)
+        else:
+            pipe.setex(job_key, JOB_RECORD_TTL, json.dumps(job_payload))
+        await pipe.execute()
+
+    async def _release_job(self, job_payload: Dict[str, Any]):
+        """Put a claimed job back at the front of its priority queue."""
+        job_id = job_payload["job_id"]
+        job_payload["status"] = JobStatus.QUEUED.value
 
-        finally:
-            # Update final job status
-            job_key = f"{self.queue_name}:jobs:{job_id}"
-            self.redis_client.setex(job_key, 86400, json.dumps(job_payload))
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.lrem(self.processing_key, 0, job_id)
+        pipe.zrem(self.deadlines_key, job_id)
+        pipe.set(self._job_key(job_id), json.dumps(job_payload))
+        pipe.rpush(self._queue_key(self._priority_for(job_payload)), job_id)
+        pipe.lpush(self.wakeup_key, 1)
+        await pipe.execute()
+        logger.info(f"Released job {job_id} back to the queue")
 
     async def _queue_retry(self, job_payload: Dict[str, Any], error: str):
         """Queue job for retry with exponential backoff."""
@@ -348,16 +949,14 @@ class BackgroundJobManager:
         job_payload["last_error"] = error
 
         # Add to delayed queue
-        execute_at = time.time() + retry_delay
-        delayed_key = f"{self.queue_name}:delayed"
-        self.redis_client.zadd(delayed_key, {json.dumps(job_payload): execute_at})
+        await self._acknowledge_job(job_payload, retry_at=time.time() + retry_delay)
 
         logger.info(
             f"Queued job {job_payload['job_id']} for retry {retry_count + 1} "
             f"in {retry_delay} seconds"
         )
 
-    # ===== JOB HANDLERS =====
+        # ===== JOB HANDLERS =====
 
     async def _handle_transcription_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle call transcription job."""
@@ -365,10 +964,11 @@ class BackgroundJobManager:
         audio_url = job_data.get("audio_url")
 
         try:
-            result = await self.transcription_service.transcribe_call_recording(
-                call_log_id=call_log_id,
-                audio_url=audio_url
-            )
+            async with pipeline_stage("whisper"):
+                result = await self.transcription_service.transcribe_call_recording(
+                    call_log_id=call_log_id,
+                    audio_url=audio_url
+                )
             return result
         except TranscriptionError as e:
             raise BackgroundJobError(f"Transcription failed: {str(e)}")
@@ -379,22 +979,32 @@ class BackgroundJobManager:
         analysis_modules = job_data.get("analysis_modules")
 
         try:
-            result = await self.analysis_service.analyze_call(
-                call_log_id=call_log_id,
-                analysis_modules=analysis_modules
-            )
+            async with pipeline_stage("gpt"):
+                result = await self.analysis_service.analyze_call(
+                    call_log_id=call_log_id,
+                    analysis_modules=analysis_modules,
+                    analysis_mode=job_data.get("analysis_mode")
+                )
             return result
         except CallAnalysisError as e:
             raise BackgroundJobError(f"Analysis failed: {str(e)}")
 
     async def _handle_disposition_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle disposition evaluation job."""
-        call_log_id = job_data["call_log_id"]
-
+        """Handle disposition evaluation job (one call, or a batch from queue_disposition_batch)."""
         try:
-            result = await self.disposition_engine.evaluate_disposition(
-                call_log_id=call_log_id
-            )
+            if "call_log_ids" in job_data:
+                async with pipeline_stage("database"):
+                    results = await self.disposition_engine.evaluate_many(
+                        call_log_ids=job_data["call_log_ids"]
+                    )
+                statuses = Counter(result["status"] for result in results.values())
+                return {"status": "success", "evaluated": len(results), "statuses": dict(statuses)}
+
+            call_log_id = job_data["call_log_id"]
+            async with pipeline_stage("database"):
+                result = await self.disposition_engine.evaluate_disposition(
+                    call_log_id=call_log_id
+                )
             return result
         except DispositionEngineError as e:
             raise BackgroundJobError(f"Disposition evaluation failed: {str(e)}")
@@ -452,6 +1062,195 @@ class BackgroundJobManager:
         except Exception as e:
             raise BackgroundJobError(f"Call sync failed: {str(e)}")
 
+    async def _handle_embedding_backfill_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle permit embedding backfill job.
+
+        Embeds missing/stale permits for up to time_budget_seconds, then
+        (when chain is set) queues a follow-up job until nothing is left.
+        """
+        from app.services.permit_embedding_service import PermitEmbeddingService
+
+        batch_size = job_data.get("batch_size", 256)
+        time_budget_seconds = job_data.get("time_budget_seconds", 540)
+
+        db = next(get_db())
+        try:
+            service = PermitEmbeddingService(db)
+            result = await asyncio.to_thread(
+                service.backfill,
+                batch_size=batch_size,
+                time_budget_seconds=time_budget_seconds
+            )
+        except Exception as e:
+            raise BackgroundJobError(f"Embedding backfill failed: {str(e)}")
+        finally:
+            db.close()
+
+        if result["error"]:
+            raise BackgroundJobError(f"Embedding backfill failed: {result['error']}")
+
+        if job_data.get("chain", True) and result["embedded"] > 0:
+            result["next_job_id"] = await self.queue_embedding_backfill(
+                batch_size=batch_size,
+                time_budget_seconds=time_budget_seconds
+            )
+
+        return {"status": "completed", **result}
+
+    async def _handle_rollup_rebuild_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle full recomputation of permit stats rollups."""
+        from app.services.permit_rollup_service import PermitRollupService
+
+        db = next(get_db())
+        try:
+            result = await asyncio.to_thread(PermitRollupService(db).rebuild)
+            return {"status": "completed", **result}
+        except Exception as e:
+            raise BackgroundJobError(f"Rollup rebuild failed: {str(e)}")
+        finally:
+            db.close()
+
+    async def _handle_ai_cache_eviction_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle AI result cache eviction (expired, then least recently used past the size budget)."""
+        from app.services.ai_result_cache import get_ai_result_cache
+
+        cache = get_ai_result_cache()
+        try:
+            evicted = await asyncio.to_thread(cache.evict)
+        except Exception as e:
+            raise BackgroundJobError(f"AI cache eviction failed: {str(e)}")
+        return {"status": "completed", **evicted, "stats": cache.stats()}
+
+    async def _handle_agent_rollup_rebuild_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle recomputation of agent daily rollups (all days or the last N)."""
+        from app.services.agent_rollup_service import AgentRollupService
+
+        db = next(get_db())
+        try:
+            result = await asyncio.to_thread(AgentRollupService(db).rebuild, job_data.get("days"))
+            return {"status": "completed", **result}
+        except Exception as e:
+            raise BackgroundJobError(f"Agent rollup rebuild failed: {str(e)}")
+        finally:
+            db.close()
+
+    async def _handle_permit_linking_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle permit-to-property linking job.
+
+        Runs for up to time_budget_seconds; a paused run is resumed from its
+        checkpoint by a follow-up job when chain is set.
+        """
+        from app.services.address_matching_service import MatchConfidence
+        from app.services.permit_linking_service import PermitLinkingService
+
+        time_budget_seconds = job_data.get("time_budget_seconds", 540)
+        min_confidence = job_data.get("min_confidence", "medium")
+
+        db = next(get_db())
+        try:
+            result = await asyncio.to_thread(
+                PermitLinkingService(db).run,
+                state_code=job_data.get("state_code"),
+                county_id=job_data.get("county_id"),
+                full=job_data.get("full", False),
+                time_budget_seconds=time_budget_seconds,
+                min_confidence=MatchConfidence(min_confidence)
+            )
+        except Exception as e:
+            raise BackgroundJobError(f"Permit linking failed: {str(e)}")
+        finally:
+            db.close()
+
+        if result.get("status") == "paused" and job_data.get("chain", True):
+            # The checkpoint remembers the run mode, so resume incrementally
+            result["next_job_id"] = await self.queue_permit_linking(
+                state_code=job_data.get("state_code"),
+                county_id=job_data.get("county_id"),
+                time_budget_seconds=time_budget_seconds,
+                min_confidence=min_confidence
+            )
+
+        return result
+
+    async def _handle_duplicate_detection_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle permit duplicate detection job.
+
+        Runs for up to time_budget_seconds; a paused run is resumed from its
+        checkpoint by a follow-up job when chain is set.
+        """
+        from app.services.permit_dedup_service import PermitDedupService
+
+        time_budget_seconds = job_data.get("time_budget_seconds", 540)
+        min_confidence = job_data.get("min_confidence", 75.0)
+
+        db = next(get_db())
+        try:
+            result = await asyncio.to_thread(
+                PermitDedupService(db).run,
+                state_code=job_data.get("state_code"),
+                full=job_data.get("full", False),
+                min_confidence=min_confidence,
+                time_budget_seconds=time_budget_seconds
+            )
+        except Exception as e:
+            raise BackgroundJobError(f"Duplicate detection failed: {str(e)}")
+        finally:
+            db.close()
+
+        if result.get("status") == "paused" and job_data.get("chain", True):
+            result["next_job_id"] = await self.queue_duplicate_detection(
+                state_code=job_data.get("state_code"),
+                min_confidence=min_confidence,
+                time_budget_seconds=time_budget_seconds
+            )
+
+        return result
+
+    async def _handle_address_rehash_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle canonical address rehash job.
+
+        Runs for up to time_budget_seconds; a paused run is continued from
+        its cursor by a follow-up job when chain is set. Once finished, a
+        full permit linking run is queued if any address_hash changed, so
+        the new hashes are picked up by the equality join.
+        """
+        from app.services.address_rehash_service import AddressRehashService
+
+        time_budget_seconds = job_data.get("time_budget_seconds", 540)
+
+        db = next(get_db())
+        try:
+            result = await asyncio.to_thread(
+                AddressRehashService(db).run,
+                tables=job_data.get("tables"),
+                time_budget_seconds=time_budget_seconds,
+                cursor=job_data.get("cursor")
+            )
+        except Exception as e:
+            raise BackgroundJobError(f"Address rehash failed: {str(e)}")
+        finally:
+            db.close()
+
+        relink = job_data.get("relink", False) or any(
+            table["hashes_changed"] for table in result.get("tables", {}).values()
+        )
+
+        if result.get("status") == "paused" and job_data.get("chain", True):
+            result["next_job_id"] = await self.queue_address_rehash(
+                tables=job_data.get("tables"),
+                time_budget_seconds=time_budget_seconds,
+                cursor=result["cursor"],
+                relink=relink
+            )
+        elif result.get("status") == "completed" and relink:
+            result["linking_job_id"] = await self.queue_permit_linking(full=True)
+
+        return result
+
     async def _handle_cleanup_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle cleanup of old jobs and data."""
         days_old = job_data.get("days_old", 7)
@@ -460,19 +1259,22 @@ class BackgroundJobManager:
             # Clean up old job records
             cutoff_time = time.time() - (days_old * 86400)
 
-            # Remove old completed jobs
-            pattern = f"{self.queue_name}:jobs:*"
-            keys = self.redis_client.keys(pattern)
+            # Remove old completed and dead-lettered jobs
+            pattern = f"{self.job_key_prefix}*"
+            keys = await self.redis_client.keys(pattern)
 
             cleaned_count = 0
             for key in keys:
-                job_data = self.redis_client.get(key)
+                job_data = await self.redis_client.get(key)
                 if job_data:
                     job_info = json.loads(job_data)
+                    finished_at = job_info.get("completed_at") or job_info.get("failed_at")
                     if (job_info.get("status") in ["completed", "failed"] and
-                        job_info.get("completed_at") and
-                        time.mktime(datetime.fromisoformat(job_info["completed_at"]).timetuple()) < cutoff_time):
-                        self.redis_client.delete(key)
+                        finished_at and
+                        time.mktime(datetime.fromisoformat(finished_at).timetuple()) < cutoff_time):
+                        await self.redis_client.delete(key)
+                        if job_info["status"] == "failed":
+                            await self.redis_client.lrem(self.dead_letter_key, 0, job_info["job_id"])
                         cleaned_count += 1
 
             return {
@@ -486,8 +1288,7 @@ class BackgroundJobManager:
 
     async def get_job_status(self, job_id: str) -> Dict[str, Any]:
         """Get status of a specific job."""
-        job_key = f"{self.queue_name}:jobs:{job_id}"
-        job_data = self.redis_client.get(job_key)
+        job_data = await self.redis_client.get(self._job_key(job_id))
 
         if not job_data:
             return {"status": "not_found"}
@@ -503,70 +1304,167 @@ class BackgroundJobManager:
             "processing_time": job_info.get("processing_time"),
             "retry_count": job_info.get("retry_count", 0),
             "error": job_info.get("error"),
+            "last_error": job_info.get("last_error"),
             "result": job_info.get("result")
         }
 
+    async def list_jobs(
+        self,
+        limit: int = 100,
+        status_filter: Optional[str] = None,
+        job_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Job records, most recently queued first.
+
+        Scans the job records with SCAN, so it stays cheap for Redis but
+        reads every record; meant for admin monitoring, not hot paths.
+        """
+        jobs = []
+        keys = [key async for key in self.redis_client.scan_iter(match=f"{self.job_key_prefix}*", count=1000)]
+        for start in range(0, len(keys), 500):
+            for job_data in await self.redis_client.mget(keys[start:start + 500]):
+                if not job_data:
+                    continue
+                job_info = json.loads(job_data)
+                if status_filter and job_info.get("status") != status_filter:
+                    continue
+                if job_type and job_info.get("job_type") != job_type:
+                    continue
+                jobs.append({
+                    "job_id": job_info.get("job_id"),
+                    "job_type": job_info.get("job_type"),
+                    "status": job_info.get("status"),
+                    "priority": job_info.get("priority"),
+                    "queued_at": job_info.get("queued_at"),
+                    "started_at": job_info.get("started_at"),
+                    "completed_at": job_info.get("completed_at"),
+                    "failed_at": job_info.get("failed_at"),
+                    "retry_count": job_info.get("retry_count", 0),
+                    "worker_id": job_info.get("worker_id"),
+                    "error": job_info.get("error") or job_info.get("last_error")
+                })
+
+        jobs.sort(key=lambda job: job.get("queued_at") or "", reverse=True)
+        return jobs[:limit]
+
     async def get_queue_stats(self) -> Dict[str, Any]:
         """Get queue statistics and health information."""
-        queue_key = f"{self.queue_name}:queue"
-        delayed_key = f"{self.queue_name}:delayed"
-
         # Queue lengths
-        queue_length = self.redis_client.llen(queue_key)
-        delayed_count = self.redis_client.zcard(delayed_key)
-
-        # Job status counts
-        job_pattern = f"{self.queue_name}:jobs:*"
-        job_keys = self.redis_client.keys(job_pattern)
+        pipe = self.redis_client.pipeline(transaction=False)
+        for queue_key in self.priority_queue_keys:
+            pipe.llen(queue_key)
+        pipe.llen(self.legacy_queue_key)
+        pipe.zcard(self.delayed_key)
+        pipe.llen(self.processing_key)
+        pipe.llen(self.dead_letter_key)
+        *priority_lengths, legacy_length, delayed_count, in_flight, dead_letter_count = await pipe.execute()
+        queue_lengths = {
+            priority.name.lower(): length
+            for priority, length in zip(self.priority_levels, priority_lengths)
+        }
+        queue_length = sum(priority_lengths) + legacy_length
 
+        # Job status counts, reading the records in SCAN batches
+        total_jobs = 0
         status_counts = {}
-        for key in job_keys:
-            job_data = self.redis_client.get(key)
-            if job_data:
-                job_info = json.loads(job_data)
-                status = job_info.get("status", "unknown")
-                status_counts[status] = status_counts.get(status, 0) + 1
+        keys = []
+        async for key in self.redis_client.scan_iter(match=f"{self.job_key_prefix}*", count=1000):
+            keys.append(key)
+            if len(keys) >= 500:
+                total_jobs += self._count_statuses(await self.redis_client.mget(keys), status_counts)
+                keys = []
+        if keys:
+            total_jobs += self._count_statuses(await self.redis_client.mget(keys), status_counts)
 
         return {
             "queue_length": queue_length,
+            "queue_lengths": queue_lengths,
             "delayed_jobs": delayed_count,
-            "total_jobs": len(job_keys),
+            "in_flight_jobs": in_flight,
+            "dead_letter_jobs": dead_letter_count,
+            "total_jobs": total_jobs,
             "status_breakdown": status_counts,
-            "redis_connected": self.redis_client.ping(),
+            "redis_connected": await self.redis_client.ping(),
             "queue_name": self.queue_name
         }
 
+    @staticmethod
+    def _count_statuses(records: List[Optional[bytes]], status_counts: Dict[str, int]) -> int:
+        """Add job records to per-status counts; returns how many still existed."""
+        found = 0
+        for job_data in records:
+            if job_data:
+                status = json.loads(job_data).get("status", "unknown")
+                status_counts[status] = status_counts.get(status, 0) + 1
+                found += 1
+        return found
+
     async def cancel_job(self, job_id: str) -> bool:
-        """Cancel a queued or processing job."""
-        job_key = f"{self.queue_name}:jobs:{job_id}"
-        job_data = self.redis_client.get(job_key)
+        """
+        Cancel a queued or retrying job, by id (see CANCEL_JOB_SCRIPT).
 
-        if not job_data:
-            return False
+        An entry still in an old payload format is skipped at claim time by
+        its cancelled record.
+        """
+        cancelled = await self.cancel_script(
+            keys=[self._job_key(job_id), self.deadlines_key, self.delayed_key, *self.priority_queue_keys],
+            args=[job_id, datetime.utcnow().isoformat(), JOB_RECORD_TTL]
+        )
+        return bool(cancelled)
 
-        job_info = json.loads(job_data)
+    async def replay_failed_jobs(self, max_jobs: int = 50, job_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Requeue dead-lettered jobs, oldest first, with a fresh retry budget.
 
-        # Can only cancel queued or retrying jobs
-        if job_info.get("status") in ["queued", "retrying"]:
-            job_info["status"] = JobStatus.CANCELLED.value
-            job_info["cancelled_at"] = datetime.utcnow().isoformat()
+        Args:
+            max_jobs: Most jobs to replay
+            job_type: Only replay jobs of this type (optional)
 
-            self.redis_client.setex(job_key, 86400, json.dumps(job_info))
+        Returns:
+            Dict with the replayed job ids and how many remain dead-lettered
+        """
+        replayed = []
+        dead_ids = await self.redis_client.lrange(self.dead_letter_key, 0, -1)
 
-            # Remove from queues if present
-            queue_key = f"{self.queue_name}:queue"
-            delayed_key = f"{self.queue_name}:delayed"
+        # Dead-letter list is pushed on the left, so the oldest is last
+        for raw_id in reversed(dead_ids):
+            if len(replayed) >= max_jobs:
+                break
+            job_id = raw_id.decode("utf-8")
+            job_data = await self.redis_client.get(self._job_key(job_id))
+            if not job_data:
+                # Record cleaned up; nothing left to replay
+                await self.redis_client.lrem(self.dead_letter_key, 0, job_id)
+                continue
 
-            # This is best-effort removal
-            try:
-                self.redis_client.lrem(queue_key, 0, json.dumps(job_info))
-                self.redis_client.zrem(delayed_key, json.dumps(job_info))
-            except:
-                pass
+            job_info = json.loads(job_data)
+            if job_type and job_info.get("job_type") != job_type:
+                continue
+
+            job_info["status"] = JobStatus.QUEUED.value
+            job_info["retry_count"] = 0
+            job_info["last_error"] = job_info.pop("error", None)
+            job_info.pop("failed_at", None)
+            job_info["replayed_at"] = datetime.utcnow().isoformat()
+            job_info["replay_count"] = job_info.get("replay_count", 0) + 1
 
-            return True
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.lrem(self.dead_letter_key, 0, job_id)
+            pipe.set(self._job_key(job_id), json.dumps(job_info))
+            pipe.lpush(self._queue_key(self._priority_for(job_info)), job_id)
+            pipe.lpush(self.wakeup_key, 1)
+            await pipe.execute()
+            replayed.append(job_id)
 
-        return False
+        if replayed:
+            logger.info(f"Replayed {len(replayed)} dead-lettered jobs")
+
+        return {
+            "replayed": len(replayed),
+            "job_ids": replayed,
+            "remaining_dead_letter": await self.redis_client.llen(self.dead_letter_key)
+        }
 
 
 # ===== GLOBAL INSTANCE =====
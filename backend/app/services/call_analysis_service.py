@@ -1,13 +1,27 @@
 """
 AI-powered call analysis service using OpenAI GPT models.
 Performs sentiment analysis, quality scoring, coaching insights, and auto-disposition.
+
+Modules run in one of three execution modes (settings.CALL_ANALYSIS_MODE,
+overridable per call):
+- sequential: one request per module, one after another
+- concurrent: one request per module, all in flight at once (asyncio.gather),
+  bounded per provider by settings.OPENAI_MAX_CONCURRENT_REQUESTS
+- fused: a single structured-output request carrying the transcript once and
+  returning every module's output keyed by module name; modules missing
+  from the response are re-run concurrently
+Each analysis records its mode, wall-clock latency and total tokens so the
+modes can be compared on cost and speed. Module outputs are cached by
+transcript, model and prompt (app.services.ai_result_cache), so reanalysis
+only pays for modules whose prompt or input changed.
 """
 
 import logging
 import asyncio
 import time
 import json
-from typing import Optional, Dict, Any, List
+import weakref
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 
 from openai import AsyncOpenAI
@@ -17,11 +31,107 @@ from app.core.config import settings
 from app.models.ringcentral import CallLog
 from app.models.call_transcript import CallTranscript
 from app.models.call_analysis import CallAnalysis, CallAnalysisMetric
+from app.services.agent_rollup_service import AgentRollupService
+from app.services.ai_result_cache import (
+    AICacheKey, TRANSCRIPT_PLACEHOLDER, content_hash, get_ai_result_cache, prompt_version
+)
 from app.database.base_class import get_db
 
 logger = logging.getLogger(__name__)
 
 
+ANALYSIS_MODES = ("sequential", "concurrent", "fused")
+
+DEFAULT_ANALYSIS_MODULES = [
+    "sentiment_analysis",
+    "quality_scoring",
+    "escalation_assessment",
+    "topic_extraction",
+    "coaching_insights",
+    "auto_disposition"
+]
+
+# System prompt, sampling temperature and error label per module
+MODULE_SETTINGS = {
+    "sentiment_analysis": {
+        "system": "You are an expert in call center sentiment analysis. Provide accurate, objective analysis of customer service interactions.",
+        "temperature": 0.1,
+        "label": "sentiment analysis"
+    },
+    "quality_scoring": {
+        "system": "You are an expert call center quality analyst. Evaluate calls objectively based on industry best practices.",
+        "temperature": 0.1,
+        "label": "quality analysis"
+    },
+    "escalation_assessment": {
+        "system": "You are an expert in customer escalation prediction and satisfaction assessment.",
+        "temperature": 0.1,
+        "label": "escalation analysis"
+    },
+    "topic_extraction": {
+        "system": "You are an expert information extraction specialist for customer service calls.",
+        "temperature": 0.1,
+        "label": "topic extraction"
+    },
+    "coaching_insights": {
+        "system": "You are an expert call center coach. Provide constructive, specific coaching feedback.",
+        "temperature": 0.2,
+        "label": "coaching analysis"
+    },
+    "auto_disposition": {
+        "system": "You are an expert at categorizing customer service call outcomes.",
+        "temperature": 0.1,
+        "label": "disposition prediction"
+    }
+}
+
+COMMON_DISPOSITIONS = [
+    "Resolved - Customer Satisfied",
+    "Follow-up Required",
+    "Information Provided",
+    "Escalation Required",
+    "Customer Complaint",
+    "Sale Made",
+    "No Answer",
+    "Not Interested"
+]
+
+FUSED_SYSTEM_PROMPT = (
+    "You are an expert call center analyst covering sentiment, quality, escalation risk, "
+    "information extraction, coaching and call disposition. Provide accurate, objective "
+    "analysis of customer service interactions."
+)
+FUSED_TEMPERATURE = 0.1
+
+# Stands in for the transcript inside each module's section of a fused prompt
+FUSED_TRANSCRIPT_REFERENCE = "(see the call transcript at the top of this request)"
+
+FUSED_PROMPT_TEMPLATE = """
+Perform each of the following analyses of this customer service call.
+
+Transcript:
+{transcript}
+
+{sections}
+
+Return one JSON object with exactly these keys: {keys}.
+Each key holds the JSON result of that analysis, in the structure its section asks for.
+"""
+
+# Request limiters per event loop, then per provider (API base URL)
+_provider_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """Limiter shared by every analysis request to ``provider`` on the running loop."""
+    semaphores = _provider_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if provider not in semaphores:
+        semaphores[provider] = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENT_REQUESTS)
+    return semaphores[provider]
+
+
 class CallAnalysisError(Exception):
     """Custom exception for call analysis-related errors."""
     pass
@@ -35,12 +145,14 @@ class CallAnalysisService:
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = settings.GPT_ANALYSIS_MODEL
         self.analysis_version = "1.0"
+        self.cache = get_ai_result_cache()
 
     async def analyze_call(
         self,
         call_log_id: str,
         analysis_modules: Optional[List[str]] = None,
-        db: Optional[Session] = None
+        db: Optional[Session] = None,
+        analysis_mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Perform comprehensive AI analysis on a call recording.
@@ -49,6 +161,8 @@ class CallAnalysisService:
             call_log_id: UUID of the call log
             analysis_modules: List of analysis modules to run (optional)
             db: Database session (optional)
+            analysis_mode: sequential, concurrent or fused
+                (default: settings.CALL_ANALYSIS_MODE)
 
         Returns:
             Dict with analysis results and metadata
@@ -58,20 +172,17 @@ class CallAnalysisService:
         """
         start_time = time.time()
 
+        analysis_mode = analysis_mode or settings.CALL_ANALYSIS_MODE
+        if analysis_mode not in ANALYSIS_MODES:
+            raise CallAnalysisError(f"Unknown analysis mode: {analysis_mode}")
+
         # Get database session
         if db is None:
             db = next(get_db())
 
         # Default analysis modules
         if analysis_modules is None:
-            analysis_modules = [
-                "sentiment_analysis",
-                "quality_scoring",
-                "escalation_assessment",
-                "topic_extraction",
-                "coaching_insights",
-                "auto_disposition"
-            ]
+            analysis_modules = list(DEFAULT_ANALYSIS_MODULES)
 
         try:
             # Get call log and transcript
@@ -92,30 +203,22 @@ class CallAnalysisService:
             call_log.analysis_status = "processing"
             db.commit()
 
-            logger.info(f"Starting AI analysis for call {call_log.rc_call_id} with modules: {analysis_modules}")
+            logger.info(
+                f"Starting AI analysis for call {call_log.rc_call_id} "
+                f"({analysis_mode}) with modules: {analysis_modules}"
+            )
 
             # Prepare analysis context
             context = self._prepare_analysis_context(call_log, transcript)
 
             # Run analysis modules
-            analysis_results = {}
-            total_tokens = 0
-
-            for module in analysis_modules:
-                logger.debug(f"Running analysis module: {module}")
-                try:
-                    module_result = await self._run_analysis_module(module, context)
-                    analysis_results[module] = module_result
-                    total_tokens += module_result.get('tokens_used', 0)
-                except Exception as e:
-                    logger.error(f"Analysis module {module} failed: {e}")
-                    analysis_results[module] = {
-                        "status": "failed",
-                        "error": str(e)
-                    }
+            analysis_results, execution = await self.run_modules(
+                context, analysis_modules, analysis_mode
+            )
+            total_tokens = execution["tokens_used"]
 
             # Compile final analysis
-            compiled_analysis = self._compile_analysis_results(analysis_results, context)
+            compiled_analysis = self._compile_analysis_results(analysis_results, context, execution)
 
             # Store analysis in database
             analysis_record = self._create_analysis_record(
@@ -131,9 +234,16 @@ class CallAnalysisService:
 
             db.commit()
 
+            # Fold the new scores into the agent's daily rollup
+            try:
+                AgentRollupService(db).refresh_calls([call_log.id])
+            except Exception as rollup_error:
+                logger.warning(f"Agent rollup refresh failed for call {call_log_id}: {rollup_error}")
+
             processing_time = time.time() - start_time
             logger.info(
-                f"Analysis completed for call {call_log.rc_call_id} in {processing_time:.2f}s. "
+                f"Analysis completed for call {call_log.rc_call_id} in {processing_time:.2f}s "
+                f"({analysis_mode}, modules {execution['latency_seconds']:.2f}s). "
                 f"Tokens used: {total_tokens}"
             )
 
@@ -143,7 +253,9 @@ class CallAnalysisService:
                 "rc_call_id": call_log.rc_call_id,
                 "analysis_id": str(analysis_record.id),
                 "modules_completed": list(analysis_results.keys()),
+                "analysis_mode": analysis_mode,
                 "processing_time_seconds": processing_time,
+                "module_latency_seconds": execution["latency_seconds"],
                 "tokens_used": total_tokens,
                 "results": compiled_analysis
             }
@@ -207,26 +319,241 @@ class CallAnalysisService:
             }
         }
 
-    async def _run_analysis_module(self, module: str, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Run a specific analysis module."""
-        module_handlers = {
-            "sentiment_analysis": self._analyze_sentiment,
-            "quality_scoring": self._analyze_quality,
-            "escalation_assessment": self._assess_escalation,
-            "topic_extraction": self._extract_topics,
-            "coaching_insights": self._generate_coaching,
-            "auto_disposition": self._predict_disposition
+    # ===== EXECUTION MODES =====
+
+    async def run_modules(
+        self,
+        context: Dict[str, Any],
+        analysis_modules: List[str],
+        analysis_mode: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run analysis modules on a prepared context without storing anything.
+
+        A failed module yields {"status": "failed", "error": ...} instead of
+        raising, in every mode.
+
+        Returns:
+            Tuple of (results keyed by module, execution stats: mode,
+            latency_seconds, tokens_used, and for fused runs the modules
+            that fell back to individual requests)
+        """
+        if analysis_mode not in ANALYSIS_MODES:
+            raise CallAnalysisError(f"Unknown analysis mode: {analysis_mode}")
+
+        started = time.perf_counter()
+        execution: Dict[str, Any] = {"mode": analysis_mode}
+
+        if analysis_mode == "fused":
+            analysis_results, fused_tokens, fallback_modules = await self._run_fused(
+                analysis_modules, context
+            )
+            execution["fallback_modules"] = fallback_modules
+        elif analysis_mode == "concurrent":
+            analysis_results = await self._run_concurrent(analysis_modules, context)
+            fused_tokens = 0
+        else:
+            analysis_results = await self._run_sequential(analysis_modules, context)
+            fused_tokens = 0
+
+        execution["latency_seconds"] = round(time.perf_counter() - started, 3)
+        execution["cache_hits"] = sum(1 for result in analysis_results.values() if result.get('cached'))
+        execution["tokens_used"] = fused_tokens + sum(
+            result.get('tokens_used', 0) for result in analysis_results.values()
+        )
+        return analysis_results, execution
+
+    async def _run_sequential(self, analysis_modules: List[str], context: Dict[str, Any]) -> Dict[str, Any]:
+        """One request per module, in order."""
+        analysis_results = {}
+        for module in analysis_modules:
+            analysis_results[module] = await self._run_module_safely(module, context)
+        return analysis_results
+
+    async def _run_concurrent(self, analysis_modules: List[str], context: Dict[str, Any]) -> Dict[str, Any]:
+        """One request per module, all at once under the provider limit."""
+        module_results = await asyncio.gather(
+            *(self._run_module_safely(module, context) for module in analysis_modules)
+        )
+        return dict(zip(analysis_modules, module_results))
+
+    async def _run_fused(
+        self,
+        analysis_modules: List[str],
+        context: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], int, List[str]]:
+        """
+        All known modules in one structured-output request.
+
+        Modules with a cached fused result are left out of the request.
+
+        Returns:
+            Tuple of (results keyed by module, tokens of the fused request,
+            modules re-run individually because the response lacked them)
+        """
+        fusable = [module for module in analysis_modules if module in MODULE_SETTINGS]
+        cache_keys = {module: self._module_cache_key(module, context, fused=True) for module in fusable}
+        cached = await self.cache.get_many(list(cache_keys.values()))
+
+        analysis_results = {
+            module: {**cached[cache_keys[module]], 'cached': True}
+            for module in fusable if cache_keys[module] in cached
         }
+        requested = [module for module in fusable if module not in analysis_results]
+
+        fused: Dict[str, Any] = {}
+        fused_tokens = 0
+        if requested:
+            sections = "\n\n".join(
+                f"=== {module} ===\n"
+                f"{self._module_prompt(module, context, FUSED_TRANSCRIPT_REFERENCE).strip()}"
+                for module in requested
+            )
+            prompt = FUSED_PROMPT_TEMPLATE.format(
+                transcript=context['transcript']['full_text'],
+                sections=sections,
+                keys=', '.join(requested)
+            )
+            response_format = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "call_analysis",
+                    "schema": {
+                        "type": "object",
+                        "properties": {module: {"type": "object"} for module in requested},
+                        "required": requested
+                    }
+                }
+            }
+            try:
+                fused, fused_tokens = await self._complete(
+                    FUSED_SYSTEM_PROMPT, prompt, FUSED_TEMPERATURE, response_format
+                )
+            except Exception as e:
+                logger.error(f"Fused analysis request failed: {e}")
+
+        fused_outputs = []
+        for module in requested:
+            module_result = fused.get(module) if isinstance(fused, dict) else None
+            if isinstance(module_result, dict):
+                analysis_results[module] = module_result
+                fused_outputs.append((cache_keys[module], module_result))
+        await self.cache.set_many(fused_outputs)
+
+        fallback_modules = [module for module in analysis_modules if module not in analysis_results]
+        if fallback_modules:
+            missing = [module for module in fallback_modules if module in MODULE_SETTINGS]
+            if missing:
+                logger.warning(f"Fused analysis missing {missing}; running them individually")
+            analysis_results.update(await self._run_concurrent(fallback_modules, context))
+
+        return {module: analysis_results[module] for module in analysis_modules}, fused_tokens, fallback_modules
+
+    async def _run_module_safely(self, module: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one module, turning a failure into a failed-module result."""
+        logger.debug(f"Running analysis module: {module}")
+        try:
+            return await self._run_analysis_module(module, context)
+        except Exception as e:
+            logger.error(f"Analysis module {module} failed: {e}")
+            return {
+                "status": "failed",
+                "error": str(e)
+            }
 
-        if module not in module_handlers:
+    async def _run_analysis_module(self, module: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a specific analysis module."""
+        if module not in MODULE_SETTINGS:
             raise CallAnalysisError(f"Unknown analysis module: {module}")
 
-        handler = module_handlers[module]
-        return await handler(context)
+        cache_key = self._module_cache_key(module, context)
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return {**cached, 'tokens_used': 0, 'cached': True}
+
+        module_settings = MODULE_SETTINGS[module]
+        prompt = self._module_prompt(module, context, context['transcript']['full_text'])
 
-    async def _analyze_sentiment(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            result, tokens_used = await self._complete(
+                module_settings["system"], prompt, module_settings["temperature"]
+            )
+        except json.JSONDecodeError as e:
+            raise CallAnalysisError(f"Failed to parse {module_settings['label']} response: {e}")
+
+        result['tokens_used'] = tokens_used
+        result['model'] = self.model
+        await self.cache.set(cache_key, result)
+        return result
+
+    def _module_cache_key(self, module: str, context: Dict[str, Any], fused: bool = False) -> AICacheKey:
+        """
+        Cache key for a module's output on this transcript.
+
+        The prompt version hashes the module's prompt rendered without the
+        transcript (plus system prompt and temperature), so changing one
+        module's prompt, or the call details it includes, only misses for
+        that module. Fused outputs come from a different prompt and are
+        cached separately.
+        """
+        template = self._module_prompt(
+            module, context, FUSED_TRANSCRIPT_REFERENCE if fused else TRANSCRIPT_PLACEHOLDER
+        )
+        if fused:
+            kind = f"analysis_fused:{module}"
+            version = prompt_version(FUSED_SYSTEM_PROMPT, FUSED_TEMPERATURE, FUSED_PROMPT_TEMPLATE, template)
+        else:
+            kind = f"analysis:{module}"
+            module_settings = MODULE_SETTINGS[module]
+            version = prompt_version(module_settings["system"], module_settings["temperature"], template)
+        return AICacheKey(kind, self.model, version, content_hash(context['transcript']['full_text']))
+
+    async def _complete(
+        self,
+        system_prompt: str,
+        prompt: str,
+        temperature: float,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        One JSON chat completion under the provider's concurrency limit.
+
+        Returns:
+            Tuple of (parsed JSON content, total tokens)
+
+        Raises:
+            json.JSONDecodeError: If the response is not valid JSON
+        """
+        async with _provider_semaphore(str(self.client.base_url)):
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format=response_format or {"type": "json_object"},
+                temperature=temperature
+            )
+
+        return json.loads(response.choices[0].message.content), response.usage.total_tokens
+
+    # ===== MODULE PROMPTS =====
+
+    def _module_prompt(self, module: str, context: Dict[str, Any], transcript: str) -> str:
+        """User prompt for a module; ``transcript`` is the text or a fused-prompt reference."""
+        prompt_builders = {
+            "sentiment_analysis": self._sentiment_prompt,
+            "quality_scoring": self._quality_prompt,
+            "escalation_assessment": self._escalation_prompt,
+            "topic_extraction": self._topics_prompt,
+            "coaching_insights": self._coaching_prompt,
+            "auto_disposition": self._disposition_prompt
+        }
+        return prompt_builders[module](context, transcript)
+
+    def _sentiment_prompt(self, context: Dict[str, Any], transcript: str) -> str:
         """Analyze call sentiment and emotional trajectory."""
-        prompt = f"""
+        return f"""
 Analyze the sentiment and emotional trajectory of this customer service call.
 
 Call Details:
@@ -235,7 +562,7 @@ Call Details:
 - Customer: {context['call_log']['contact_name'] or 'Unknown'}
 
 Transcript:
-{context['transcript']['full_text']}
+{transcript}
 
 Please analyze:
 1. Overall sentiment (positive/neutral/negative) and score (-100 to 100)
@@ -259,27 +586,9 @@ Return analysis as JSON with this structure:
 }}
 """
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert in call center sentiment analysis. Provide accurate, objective analysis of customer service interactions."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1
-        )
-
-        try:
-            result = json.loads(response.choices[0].message.content)
-            result['tokens_used'] = response.usage.total_tokens
-            result['model'] = self.model
-            return result
-        except json.JSONDecodeError as e:
-            raise CallAnalysisError(f"Failed to parse sentiment analysis response: {e}")
-
-    async def _analyze_quality(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def _quality_prompt(self, context: Dict[str, Any], transcript: str) -> str:
         """Analyze call quality and professional standards."""
-        prompt = f"""
+        return f"""
 Analyze the quality of this customer service call based on professional standards.
 
 Call Details:
@@ -288,7 +597,7 @@ Call Details:
 - Industry: {context['business_context']['industry']}
 
 Transcript:
-{context['transcript']['full_text']}
+{transcript}
 
 Rate the call on these dimensions (0-100 scale):
 1. Overall quality score
@@ -322,26 +631,9 @@ Return analysis as JSON:
 }}
 """
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert call center quality analyst. Evaluate calls objectively based on industry best practices."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1
-        )
-
-        try:
-            result = json.loads(response.choices[0].message.content)
-            result['tokens_used'] = response.usage.total_tokens
-            return result
-        except json.JSONDecodeError as e:
-            raise CallAnalysisError(f"Failed to parse quality analysis response: {e}")
-
-    async def _assess_escalation(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def _escalation_prompt(self, context: Dict[str, Any], transcript: str) -> str:
         """Assess escalation risk and customer satisfaction."""
-        prompt = f"""
+        return f"""
 Assess the escalation risk and customer satisfaction for this service call.
 
 Call Context:
@@ -350,7 +642,7 @@ Call Context:
 - Duration: {context['call_log']['duration_seconds']} seconds
 
 Transcript:
-{context['transcript']['full_text']}
+{transcript}
 
 Analyze:
 1. Escalation risk level (low/medium/high/critical)
@@ -375,33 +667,16 @@ Return analysis as JSON:
 }}
 """
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert in customer escalation prediction and satisfaction assessment."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1
-        )
-
-        try:
-            result = json.loads(response.choices[0].message.content)
-            result['tokens_used'] = response.usage.total_tokens
-            return result
-        except json.JSONDecodeError as e:
-            raise CallAnalysisError(f"Failed to parse escalation analysis response: {e}")
-
-    async def _extract_topics(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def _topics_prompt(self, context: Dict[str, Any], transcript: str) -> str:
         """Extract topics, keywords, and entities from the call."""
-        prompt = f"""
+        return f"""
 Extract topics, keywords, and key information from this service call.
 
 Business Context: {context['business_context']['industry']}
 Common Call Types: {', '.join(context['business_context']['typical_call_types'])}
 
 Transcript:
-{context['transcript']['full_text']}
+{transcript}
 
 Extract:
 1. Primary topic/purpose of the call
@@ -432,26 +707,9 @@ Return as JSON:
 }}
 """
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert information extraction specialist for customer service calls."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1
-        )
-
-        try:
-            result = json.loads(response.choices[0].message.content)
-            result['tokens_used'] = response.usage.total_tokens
-            return result
-        except json.JSONDecodeError as e:
-            raise CallAnalysisError(f"Failed to parse topic extraction response: {e}")
-
-    async def _generate_coaching(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def _coaching_prompt(self, context: Dict[str, Any], transcript: str) -> str:
         """Generate coaching insights and recommendations."""
-        prompt = f"""
+        return f"""
 Provide coaching insights for this customer service call.
 
 Call Details:
@@ -460,7 +718,7 @@ Call Details:
 - Industry: {context['business_context']['industry']}
 
 Transcript:
-{context['transcript']['full_text']}
+{transcript}
 
 Provide coaching analysis:
 1. What the agent did well (strengths)
@@ -486,40 +744,11 @@ Return as JSON:
 }}
 """
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert call center coach. Provide constructive, specific coaching feedback."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.2
-        )
-
-        try:
-            result = json.loads(response.choices[0].message.content)
-            result['tokens_used'] = response.usage.total_tokens
-            return result
-        except json.JSONDecodeError as e:
-            raise CallAnalysisError(f"Failed to parse coaching analysis response: {e}")
-
-    async def _predict_disposition(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def _disposition_prompt(self, context: Dict[str, Any], transcript: str) -> str:
         """Predict the appropriate call disposition."""
         # This would integrate with the disposition engine
         # For now, return a basic prediction
-
-        common_dispositions = [
-            "Resolved - Customer Satisfied",
-            "Follow-up Required",
-            "Information Provided",
-            "Escalation Required",
-            "Customer Complaint",
-            "Sale Made",
-            "No Answer",
-            "Not Interested"
-        ]
-
-        prompt = f"""
+        return f"""
 Based on this customer service call, predict the most appropriate call disposition.
 
 Call Context:
@@ -527,10 +756,10 @@ Call Context:
 - Status: {context['call_log']['status']}
 - Duration: {context['call_log']['duration_seconds']} seconds
 
-Available Dispositions: {', '.join(common_dispositions)}
+Available Dispositions: {', '.join(COMMON_DISPOSITIONS)}
 
 Transcript:
-{context['transcript']['full_text']}
+{transcript}
 
 Predict the best disposition and provide reasoning:
 
@@ -550,29 +779,18 @@ Predict the best disposition and provide reasoning:
 }}
 """
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert at categorizing customer service call outcomes."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1
-        )
-
-        try:
-            result = json.loads(response.choices[0].message.content)
-            result['tokens_used'] = response.usage.total_tokens
-            return result
-        except json.JSONDecodeError as e:
-            raise CallAnalysisError(f"Failed to parse disposition prediction response: {e}")
-
-    def _compile_analysis_results(self, analysis_results: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    def _compile_analysis_results(
+        self,
+        analysis_results: Dict[str, Any],
+        context: Dict[str, Any],
+        execution: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Compile all analysis module results into a final analysis."""
         compiled = {
             "analysis_version": self.analysis_version,
             "model_used": self.model,
-            "analysis_modules": list(analysis_results.keys())
+            "analysis_modules": list(analysis_results.keys()),
+            "execution": execution
         }
 
         # Extract sentiment data
@@ -648,8 +866,8 @@ Predict the best disposition and provide reasoning:
             "alternative_dispositions": disposition.get("alternative_dispositions")
         })
 
-        # Store raw results for debugging
-        compiled["raw_analysis_response"] = analysis_results
+        # Store raw results (and how they were produced) for debugging
+        compiled["raw_analysis_response"] = {**analysis_results, "execution": execution}
 
         return compiled
 
@@ -723,6 +941,7 @@ Predict the best disposition and provide reasoning:
             analysis_model=analysis_data.get("model_used", self.model),
             analysis_version=analysis_data.get("analysis_version", self.analysis_version),
             tokens_used=tokens_used,
+            processing_duration_seconds=(analysis_data.get("execution") or {}).get("latency_seconds"),
             raw_analysis_response=analysis_data.get("raw_analysis_response"),
             status="completed"
         )
@@ -1,29 +1,101 @@
 """
 Auto-disposition decision engine with confidence scoring.
 Implements intelligent call disposition automation with configurable business rules.
+
+evaluate_disposition scores one call against every active disposition;
+evaluate_many does the same for a batch of calls as NumPy matrix operations
+(calls x dispositions) with identical results, and writes the outcomes with
+bulk statements.
 """
 
+import uuid
 import logging
 import json
+from collections import Counter
+from dataclasses import dataclass
+from types import SimpleNamespace
 from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+import numpy as np
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import desc, func, insert, update
 
 from app.core.config import settings
 from app.models.ringcentral import CallLog, CallDisposition, CallDispositionHistory
 from app.models.call_analysis import CallAnalysis
+from app.models.call_transcript import CallTranscript
 from app.database.base_class import get_db
 
 logger = logging.getLogger(__name__)
 
+# Evaluation order of dispositions; the first of equally scored ones wins
+DISPOSITION_ORDER = (CallDisposition.priority, CallDisposition.display_order, CallDisposition.name)
+
+# Calls loaded, scored and written per transaction by evaluate_many
+EVALUATE_MANY_CHUNK_SIZE = 1000
+
 
 class DispositionEngineError(Exception):
     """Custom exception for disposition engine errors."""
     pass
 
 
+@dataclass
+class DispositionSnapshot:
+    """Detached copy of the CallDisposition fields used for scoring."""
+    id: uuid.UUID
+    name: str
+    category: str
+    color: Optional[str]
+    auto_apply_enabled: bool
+    auto_apply_conditions: Optional[Dict[str, Any]]
+    confidence_boost: Optional[int]
+
+
+@dataclass
+class DispositionCatalogue:
+    """
+    Active dispositions in evaluation order, with the disposition side of
+    the scoring rules precomputed for evaluate_many.
+
+    version is (count, latest updated_at) of the active dispositions; the
+    catalogue is rebuilt when it changes.
+    """
+    version: Tuple[int, Optional[datetime]]
+    dispositions: List[DispositionSnapshot]
+    category_codes: np.ndarray          # (D,) column of CATEGORY_PROBES
+    escalation_table: np.ndarray        # (len(ESCALATION_PROBES), D) escalation scores
+    characteristics_table: np.ndarray   # (len(CHARACTERISTICS_PROBES), D) call characteristics scores
+    keyword_vocabulary: Dict[str, int]  # Lowercased auto-apply keywords -> column
+
+
+# The scoring rules depend on a disposition's category (sentiment, quality)
+# or name (escalation, call characteristics) and on a few classes of call
+# values. evaluate_many runs each rule once per call against one disposition
+# per category class, and once per disposition against one stand-in per call
+# class, then gathers the results into the calls x dispositions matrix.
+CATEGORY_CLASSES = ("positive", "neutral", "negative")  # anything else: the last probe
+CATEGORY_PROBES = tuple(
+    DispositionSnapshot(
+        id=None, name="", category=category, color=None,
+        auto_apply_enabled=False, auto_apply_conditions=None, confidence_boost=0
+    )
+    for category in CATEGORY_CLASSES + ("other",)
+)
+# Escalation risk: missing, high/critical, low, anything else
+ESCALATION_PROBES = tuple(
+    SimpleNamespace(escalation_risk=risk) for risk in (None, "high", "low", "medium")
+)
+# Duration (<30s, >300s, other) x direction (outbound, other) x recording (present, missing)
+CHARACTERISTICS_PROBES = tuple(
+    SimpleNamespace(duration_seconds=duration, direction=direction, has_recording=has_recording)
+    for duration in (0, 301, 30)
+    for direction in ("outbound", "inbound")
+    for has_recording in (True, False)
+)
+
+
 class CallDispositionEngine:
     """
     Intelligent call disposition engine with confidence-based automation.
@@ -43,6 +115,9 @@ class CallDispositionEngine:
             "call_characteristics": 15  # Duration, status, etc.
         }
 
+        # Active dispositions for evaluate_many, rebuilt when they change
+        self._catalogue: Optional[DispositionCatalogue] = None
+
         # Confidence boost/penalty factors
         self.confidence_modifiers = {
             "high_quality_transcription": 5,    # Clear, long transcription
@@ -104,14 +179,13 @@ class CallDispositionEngine:
             # Get available dispositions
             available_dispositions = db.query(CallDisposition).filter(
                 CallDisposition.is_active == True
-            ).order_by(CallDisposition.priority, CallDisposition.display_order).all()
+            ).order_by(*DISPOSITION_ORDER).all()
 
             if not available_dispositions:
                 raise DispositionEngineError("No active dispositions found")
 
             # Run multi-factor scoring
             disposition_scores = {}
-            confidence_factors = {}
 
             for disposition in available_dispositions:
                 score, factors = await self._calculate_disposition_score(
@@ -136,50 +210,14 @@ class CallDispositionEngine:
             action_decision = self._determine_action(final_confidence)
 
             # Prepare result
-            result = {
-                "status": "evaluated",
-                "call_log_id": call_log_id,
-                "rc_call_id": call_log.rc_call_id,
-                "recommended_disposition": {
-                    "id": str(best_match["disposition"].id),
-                    "name": best_match["disposition"].name,
-                    "category": best_match["disposition"].category,
-                    "color": best_match["disposition"].color
-                },
-                "confidence": final_confidence,
-                "base_confidence": base_confidence,
-                "confidence_modifiers": confidence_modifiers,
-                "action": action_decision["action"],
-                "reasoning": {
-                    "primary_factors": best_match["factors"],
-                    "scoring_breakdown": {
-                        "sentiment_score": self._get_sentiment_contribution(analysis),
-                        "quality_score": self._get_quality_contribution(analysis),
-                        "escalation_score": self._get_escalation_contribution(analysis),
-                        "call_characteristics_score": self._get_call_characteristics_contribution(call_log)
-                    },
-                    "decision_rationale": action_decision["rationale"]
-                },
-                "alternatives": [
-                    {
-                        "disposition_name": scores["disposition"].name,
-                        "score": scores["score"],
-                        "category": scores["disposition"].category
-                    }
-                    for disp_id, scores in sorted(
-                        disposition_scores.items(),
-                        key=lambda x: x[1]["score"],
-                        reverse=True
-                    )[:3]  # Top 3 alternatives
-                ],
-                "evaluation_metadata": {
-                    "engine_version": "1.0",
-                    "evaluated_at": datetime.utcnow().isoformat(),
-                    "auto_apply_threshold": self.auto_apply_threshold,
-                    "suggest_threshold": self.suggest_threshold,
-                    "dispositions_evaluated": len(available_dispositions)
-                }
-            }
+            ranked = sorted(disposition_scores.values(), key=lambda x: x["score"], reverse=True)
+            result = self._build_evaluation_result(
+                call_log_id, call_log, analysis,
+                best_match["disposition"], best_match["factors"],
+                base_confidence, confidence_modifiers, final_confidence, action_decision,
+                alternatives=[(scores["disposition"], scores["score"]) for scores in ranked[:3]],  # Top 3 alternatives
+                dispositions_evaluated=len(available_dispositions)
+            )
 
             # Execute action if auto-apply or suggest
             if action_decision["action"] == "auto_apply":
@@ -210,6 +248,542 @@ class CallDispositionEngine:
             logger.error(f"Disposition evaluation failed for call {call_log_id}: {e}")
             raise DispositionEngineError(f"Disposition evaluation failed: {str(e)}") from e
 
+    async def evaluate_many(
+        self,
+        call_log_ids: List[str],
+        force_evaluation: bool = False,
+        db: Optional[Session] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Evaluate dispositions for a batch of calls.
+
+        Same rules, scores and actions as evaluate_disposition, but per chunk
+        of EVALUATE_MANY_CHUNK_SIZE calls the call logs, analyses and
+        transcripts are loaded with one query each, all calls are scored
+        against all active dispositions as one matrix, and the call log
+        updates, history rows and usage counts are written with bulk
+        statements in one transaction. Calls without analysis fall back to
+        the basic rules one by one.
+
+        Args:
+            call_log_ids: UUIDs of the call logs
+            force_evaluation: Force re-evaluation even if already processed
+            db: Database session (optional)
+
+        Returns:
+            Dict of evaluation results keyed by call log id; calls that could
+            not be evaluated get {"status": "error", "error": ...}
+
+        Raises:
+            DispositionEngineError: If a chunk cannot be evaluated or written
+        """
+        if db is None:
+            db = next(get_db())
+
+        results = {}
+        call_log_ids = list(dict.fromkeys(str(call_log_id) for call_log_id in call_log_ids))
+
+        for start in range(0, len(call_log_ids), EVALUATE_MANY_CHUNK_SIZE):
+            chunk = call_log_ids[start:start + EVALUATE_MANY_CHUNK_SIZE]
+            try:
+                results.update(await self._evaluate_chunk(chunk, force_evaluation, db))
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Batch disposition evaluation failed for {len(chunk)} calls: {e}")
+                raise DispositionEngineError(f"Batch disposition evaluation failed: {str(e)}") from e
+
+        return results
+
+    async def _evaluate_chunk(
+        self,
+        call_log_ids: List[str],
+        force_evaluation: bool,
+        db: Session
+    ) -> Dict[str, Dict[str, Any]]:
+        """Evaluate one chunk of evaluate_many and write the results."""
+        results = {}
+        uuids = {}
+        for call_log_id in call_log_ids:
+            try:
+                uuids[call_log_id] = uuid.UUID(call_log_id)
+            except ValueError:
+                results[call_log_id] = {"status": "error", "error": f"Call log {call_log_id} not found"}
+
+        # Only the transcript fields used by the confidence modifiers
+        call_logs = {
+            call_log.id: call_log
+            for call_log in db.query(CallLog).options(
+                selectinload(CallLog.transcript).load_only(
+                    CallTranscript.word_count, CallTranscript.confidence_score
+                )
+            ).filter(CallLog.id.in_(list(uuids.values())))
+        }
+        analyses = {
+            analysis.call_log_id: analysis
+            for analysis in db.query(CallAnalysis).filter(
+                CallAnalysis.call_log_id.in_(list(call_logs.keys()))
+            )
+        }
+
+        scored = []
+        unanalyzed = []
+        for call_log_id, call_log_uuid in uuids.items():
+            call_log = call_logs.get(call_log_uuid)
+            if not call_log:
+                results[call_log_id] = {"status": "error", "error": f"Call log {call_log_id} not found"}
+                continue
+
+            analysis = analyses.get(call_log_uuid)
+            if not analysis:
+                unanalyzed.append((call_log_id, call_log))
+            elif call_log.disposition_status in ["auto_applied", "manual"] and not force_evaluation:
+                results[call_log_id] = {
+                    "status": "already_processed",
+                    "current_disposition": call_log.disposition.name if call_log.disposition else None,
+                    "confidence": call_log.disposition_confidence,
+                    "applied_by": call_log.disposition_applied_by
+                }
+            else:
+                scored.append((call_log_id, call_log, analysis))
+
+        if scored:
+            results.update(await self._apply_batch_scores(scored, db))
+
+        for call_log_id, call_log in unanalyzed:
+            try:
+                results[call_log_id] = await self._evaluate_without_analysis(call_log, db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Basic disposition evaluation failed for call {call_log_id}: {e}")
+                results[call_log_id] = {"status": "error", "error": str(e)}
+
+        return {call_log_id: results[call_log_id] for call_log_id in call_log_ids}
+
+    async def _apply_batch_scores(
+        self,
+        scored: List[Tuple[str, CallLog, CallAnalysis]],
+        db: Session
+    ) -> Dict[str, Dict[str, Any]]:
+        """Score calls against the catalogue, decide actions and bulk-write them."""
+        catalogue = self._disposition_catalogue(db)
+        dispositions = catalogue.dispositions
+        call_logs = [call_log for _, call_log, _ in scored]
+        analyses = [analysis for _, _, analysis in scored]
+
+        scores = self._score_matrix(catalogue, call_logs, analyses)
+        # Stable, so equally scored dispositions keep their order as with max() and sorted()
+        ranking = np.argsort(-scores, axis=1, kind="stable")[:, :3]
+
+        applied_at = datetime.utcnow()
+        applied_updates = []
+        review_updates = []
+        history_rows = []
+        usage = Counter()
+        actions = Counter()
+        results = {}
+
+        for row, (call_log_id, call_log, analysis) in enumerate(scored):
+            best = ranking[row, 0]
+            disposition = dispositions[best]
+            base_confidence = float(scores[row, best])
+
+            # Factor breakdown of the winner only
+            _, factors = await self._calculate_disposition_score(disposition, call_log, analysis)
+            confidence_modifiers = self._calculate_confidence_modifiers(call_log, analysis)
+            final_confidence = min(100, max(0, base_confidence + sum(confidence_modifiers.values())))
+            action_decision = self._determine_action(final_confidence)
+
+            result = self._build_evaluation_result(
+                call_log_id, call_log, analysis, disposition, factors,
+                base_confidence, confidence_modifiers, final_confidence, action_decision,
+                alternatives=[(dispositions[column], float(scores[row, column])) for column in ranking[row]],
+                dispositions_evaluated=len(dispositions)
+            )
+
+            if action_decision["action"] == "auto_apply":
+                history_id = uuid.uuid4()
+                applied_updates.append({
+                    "id": call_log.id,
+                    "disposition_id": disposition.id,
+                    "disposition_confidence": final_confidence,
+                    "disposition_applied_by": "auto_applied",
+                    "disposition_applied_at": applied_at,
+                    "disposition_status": "auto_applied"
+                })
+                history_rows.append({
+                    "id": history_id,
+                    "call_log_id": call_log.id,
+                    "disposition_id": disposition.id,
+                    "previous_disposition_id": call_log.disposition_id,
+                    "action_type": "auto_applied",
+                    "applied_by_type": "system",
+                    "disposition_name": disposition.name,
+                    "confidence_score": final_confidence,
+                    "reasoning": result.get("reasoning"),
+                    "alternative_suggestions": result.get("alternatives"),
+                    "applied_at": applied_at
+                })
+                usage[disposition.id] += 1
+                result.update({
+                    "applied": True,
+                    "disposition_id": str(disposition.id),
+                    "history_id": str(history_id),
+                    "applied_at": applied_at.isoformat()
+                })
+            elif action_decision["action"] == "suggest":
+                review_updates.append({
+                    "id": call_log.id,
+                    "call_metadata": self._suggestion_metadata(call_log, disposition, final_confidence, result),
+                    "disposition_status": "suggested"
+                })
+                result.update({
+                    "suggested": True,
+                    "suggestion_stored": True,
+                    "requires_review": True
+                })
+            else:  # manual_required
+                metadata = self._manual_review_metadata(call_log, result)
+                review_updates.append({
+                    "id": call_log.id,
+                    "call_metadata": metadata,
+                    "disposition_status": "manual_required"
+                })
+                result.update({
+                    "manual_required": True,
+                    "flagged": True,
+                    "review_priority": metadata["manual_review_required"]["priority"]
+                })
+
+            actions[action_decision["action"]] += 1
+            results[call_log_id] = result
+
+        # Bulk UPDATE by primary key; rows are batched while their columns
+        # stay the same, so each set of columns goes in its own statement
+        for call_log_updates in (applied_updates, review_updates):
+            if call_log_updates:
+                db.execute(update(CallLog), call_log_updates)
+        if history_rows:
+            db.execute(insert(CallDispositionHistory), history_rows)
+        for disposition_id, count in usage.items():
+            db.execute(
+                update(CallDisposition)
+                .where(CallDisposition.id == disposition_id)
+                .values(usage_count=func.coalesce(CallDisposition.usage_count, 0) + count)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+
+        logger.info(
+            f"Evaluated dispositions for {len(scored)} calls against "
+            f"{len(dispositions)} dispositions: {dict(actions)}"
+        )
+        return results
+
+    def _disposition_catalogue(self, db: Session) -> DispositionCatalogue:
+        """
+        Active dispositions with their scoring tables, cached until the count
+        or latest updated_at of the active dispositions changes (edits through
+        the ORM, including usage count increments, touch updated_at).
+        """
+        count, latest_update = db.query(
+            func.count(CallDisposition.id), func.max(CallDisposition.updated_at)
+        ).filter(CallDisposition.is_active == True).one()
+        version = (count, latest_update)
+
+        if self._catalogue is None or self._catalogue.version != version:
+            dispositions = db.query(CallDisposition).filter(
+                CallDisposition.is_active == True
+            ).order_by(*DISPOSITION_ORDER).all()
+
+            if not dispositions:
+                raise DispositionEngineError("No active dispositions found")
+
+            self._catalogue = self._build_catalogue(version, dispositions)
+            logger.info(f"Loaded {len(dispositions)} active dispositions for batch evaluation")
+
+        return self._catalogue
+
+    def _build_catalogue(
+        self,
+        version: Tuple[int, Optional[datetime]],
+        dispositions: List[CallDisposition]
+    ) -> DispositionCatalogue:
+        """Snapshot dispositions and score each against the call-class stand-ins."""
+        snapshots = [
+            DispositionSnapshot(
+                id=disposition.id,
+                name=disposition.name,
+                category=disposition.category,
+                color=disposition.color,
+                auto_apply_enabled=disposition.auto_apply_enabled,
+                auto_apply_conditions=disposition.auto_apply_conditions,
+                confidence_boost=disposition.confidence_boost
+            )
+            for disposition in dispositions
+        ]
+
+        category_codes = np.array([
+            self._category_code(snapshot.category) for snapshot in snapshots
+        ], dtype=np.intp)
+        escalation_table = np.array([
+            [self._score_escalation_match(snapshot, probe) for snapshot in snapshots]
+            for probe in ESCALATION_PROBES
+        ], dtype=float)
+        characteristics_table = np.array([
+            [self._score_call_characteristics(snapshot, probe, None) for snapshot in snapshots]
+            for probe in CHARACTERISTICS_PROBES
+        ], dtype=float)
+
+        keyword_vocabulary = {}
+        for snapshot in snapshots:
+            for keyword in self._vectorizable_keywords(snapshot.auto_apply_conditions) or []:
+                keyword_vocabulary.setdefault(keyword, len(keyword_vocabulary))
+
+        return DispositionCatalogue(
+            version=version,
+            dispositions=snapshots,
+            category_codes=category_codes,
+            escalation_table=escalation_table,
+            characteristics_table=characteristics_table,
+            keyword_vocabulary=keyword_vocabulary
+        )
+
+    def _score_matrix(
+        self,
+        catalogue: DispositionCatalogue,
+        call_logs: List[CallLog],
+        analyses: List[CallAnalysis]
+    ) -> np.ndarray:
+        """
+        Scores of every call (rows) against every catalogue disposition
+        (columns); each equals the total of _calculate_disposition_score.
+        """
+        count = len(call_logs)
+        sentiment = np.empty((count, len(CATEGORY_PROBES)))
+        quality = np.empty((count, len(CATEGORY_PROBES)))
+        escalation_codes = np.empty(count, dtype=np.intp)
+        characteristics_codes = np.empty(count, dtype=np.intp)
+
+        for row, (call_log, analysis) in enumerate(zip(call_logs, analyses)):
+            for column, probe in enumerate(CATEGORY_PROBES):
+                sentiment[row, column] = self._score_sentiment_match(probe, analysis)
+                quality[row, column] = self._score_quality_match(probe, analysis)
+            escalation_codes[row] = self._escalation_code(analysis)
+            characteristics_codes[row] = self._characteristics_code(call_log)
+
+        # Same operands and order of additions as _calculate_disposition_score
+        codes = catalogue.category_codes
+        scores = sentiment[:, codes] * (self.scoring_weights["sentiment"] / 100)
+        scores += quality[:, codes] * (self.scoring_weights["quality"] / 100)
+        scores += catalogue.escalation_table[escalation_codes] * (self.scoring_weights["escalation"] / 100)
+        scores += (
+            catalogue.characteristics_table[characteristics_codes]
+            * (self.scoring_weights["call_characteristics"] / 100)
+        )
+
+        # Auto-apply boosts; a zero boost leaves the score unchanged
+        features = None
+        for column, disposition in enumerate(catalogue.dispositions):
+            if not (disposition.auto_apply_enabled and disposition.auto_apply_conditions
+                    and disposition.confidence_boost):
+                continue
+            if features is None:
+                features = self._condition_features(catalogue, call_logs, analyses)
+            met = self._auto_apply_conditions_met(catalogue, disposition, features, call_logs, analyses)
+            scores[met, column] += disposition.confidence_boost
+
+        return scores
+
+    def _condition_features(
+        self,
+        catalogue: DispositionCatalogue,
+        call_logs: List[CallLog],
+        analyses: List[CallAnalysis]
+    ) -> Dict[str, np.ndarray]:
+        """Per-call values compared by the auto-apply conditions."""
+        count = len(call_logs)
+        keywords = np.zeros((count, len(catalogue.keyword_vocabulary)), dtype=bool)
+        keywords_valid = np.ones(count, dtype=bool)
+
+        for row, analysis in enumerate(analyses):
+            if not analysis.keywords:
+                continue
+            try:
+                call_keywords = [keyword.lower() for keyword in analysis.keywords]
+            except Exception:
+                keywords_valid[row] = False
+                continue
+            for keyword in call_keywords:
+                column = catalogue.keyword_vocabulary.get(keyword)
+                if column is not None:
+                    keywords[row, column] = True
+
+        return {
+            "sentiment": np.array([analysis.sentiment_score or 0 for analysis in analyses], dtype=float),
+            "quality": np.array([analysis.overall_quality_score or 0 for analysis in analyses]),
+            "escalation": np.array([(analysis.escalation_risk or "").lower() for analysis in analyses], dtype=object),
+            "duration": np.array([call_log.duration_seconds or 0 for call_log in call_logs]),
+            "has_keywords": np.array([bool(analysis.keywords) for analysis in analyses], dtype=bool),
+            "keywords": keywords,
+            "keywords_valid": keywords_valid
+        }
+
+    def _auto_apply_conditions_met(
+        self,
+        catalogue: DispositionCatalogue,
+        disposition: DispositionSnapshot,
+        features: Dict[str, np.ndarray],
+        call_logs: List[CallLog],
+        analyses: List[CallAnalysis]
+    ) -> np.ndarray:
+        """_evaluate_auto_apply_conditions(...) > 0 for every call, as a boolean array."""
+        conditions = disposition.auto_apply_conditions
+        required_keywords = self._vectorizable_keywords(conditions)
+        if required_keywords is None:
+            # Malformed conditions: the scalar checks decide which errors zero the score
+            return np.array([
+                self._evaluate_auto_apply_conditions(disposition, call_log, analysis) > 0
+                for call_log, analysis in zip(call_logs, analyses)
+            ], dtype=bool)
+
+        count = len(call_logs)
+        matches = np.zeros(count, dtype=np.intp)
+        totals = np.zeros(count, dtype=np.intp)
+        failed = np.zeros(count, dtype=bool)
+
+        if "sentiment_score" in conditions:
+            totals += 1
+            matches += features["sentiment"] >= conditions["sentiment_score"]
+
+        if "quality_score" in conditions:
+            totals += 1
+            matches += features["quality"] >= conditions["quality_score"]
+
+        if "keywords" in conditions:
+            # Only counted for calls with keywords; unreadable keywords zero the score
+            applies = features["has_keywords"]
+            columns = [catalogue.keyword_vocabulary[keyword] for keyword in required_keywords]
+            totals += applies
+            matches += applies & features["keywords"][:, columns].any(axis=1)
+            failed |= applies & ~features["keywords_valid"]
+
+        if "escalation_risk" in conditions:
+            totals += 1
+            matches += features["escalation"] == conditions["escalation_risk"].lower()
+
+        if "duration_max_seconds" in conditions:
+            totals += 1
+            matches += features["duration"] <= conditions["duration_max_seconds"]
+
+        if "duration_min_seconds" in conditions:
+            totals += 1
+            matches += features["duration"] >= conditions["duration_min_seconds"]
+
+        match_percentage = np.divide(
+            matches, totals, out=np.zeros(count), where=totals > 0
+        ) * 100
+        return ~failed & (totals > 0) & (match_percentage >= 80)
+
+    @staticmethod
+    def _vectorizable_keywords(conditions: Any) -> Optional[List[str]]:
+        """
+        Lowercased keywords of auto-apply conditions, or None if the
+        conditions hold values the vectorized checks cannot compare like
+        _evaluate_auto_apply_conditions does.
+        """
+        if not isinstance(conditions, dict):
+            return None
+        for key in ("sentiment_score", "quality_score", "duration_max_seconds", "duration_min_seconds"):
+            if key in conditions and not isinstance(conditions[key], (int, float)):
+                return None
+        if "escalation_risk" in conditions and not isinstance(conditions["escalation_risk"], str):
+            return None
+        try:
+            return [keyword.lower() for keyword in conditions.get("keywords", [])]
+        except Exception:
+            return None
+
+    @staticmethod
+    def _category_code(category: str) -> int:
+        """Column of CATEGORY_PROBES scoring like a disposition of this category."""
+        category = category.lower()
+        return CATEGORY_CLASSES.index(category) if category in CATEGORY_CLASSES else len(CATEGORY_CLASSES)
+
+    @staticmethod
+    def _escalation_code(analysis: CallAnalysis) -> int:
+        """Index of the ESCALATION_PROBES stand-in scoring like this analysis."""
+        if not analysis.escalation_risk:
+            return 0
+        risk = analysis.escalation_risk.lower()
+        if risk in ["high", "critical"]:
+            return 1
+        return 2 if risk == "low" else 3
+
+    @staticmethod
+    def _characteristics_code(call_log: CallLog) -> int:
+        """Index of the CHARACTERISTICS_PROBES stand-in scoring like this call."""
+        duration = call_log.duration_seconds or 0
+        duration_code = 0 if duration < 30 else 1 if duration > 300 else 2
+        direction_code = 0 if call_log.direction == "outbound" else 1
+        recording_code = 0 if call_log.has_recording else 1
+        return duration_code * 4 + direction_code * 2 + recording_code
+
+    def _build_evaluation_result(
+        self,
+        call_log_id: str,
+        call_log: CallLog,
+        analysis: CallAnalysis,
+        disposition: CallDisposition,
+        factors: Dict[str, Any],
+        base_confidence: float,
+        confidence_modifiers: Dict[str, float],
+        final_confidence: float,
+        action_decision: Dict[str, Any],
+        alternatives: List[Tuple[CallDisposition, float]],
+        dispositions_evaluated: int
+    ) -> Dict[str, Any]:
+        """Assemble the evaluation result for the best-scoring disposition."""
+        return {
+            "status": "evaluated",
+            "call_log_id": call_log_id,
+            "rc_call_id": call_log.rc_call_id,
+            "recommended_disposition": {
+                "id": str(disposition.id),
+                "name": disposition.name,
+                "category": disposition.category,
+                "color": disposition.color
+            },
+            "confidence": final_confidence,
+            "base_confidence": base_confidence,
+            "confidence_modifiers": confidence_modifiers,
+            "action": action_decision["action"],
+            "reasoning": {
+                "primary_factors": factors,
+                "scoring_breakdown": {
+                    "sentiment_score": self._get_sentiment_contribution(analysis),
+                    "quality_score": self._get_quality_contribution(analysis),
+                    "escalation_score": self._get_escalation_contribution(analysis),
+                    "call_characteristics_score": self._get_call_characteristics_contribution(call_log)
+                },
+                "decision_rationale": action_decision["rationale"]
+            },
+            "alternatives": [
+                {
+                    "disposition_name": alternative.name,
+                    "score": score,
+                    "category": alternative.category
+                }
+                for alternative, score in alternatives
+            ],
+            "evaluation_metadata": {
+                "engine_version": "1.0",
+                "evaluated_at": datetime.utcnow().isoformat(),
+                "auto_apply_threshold": self.auto_apply_threshold,
+                "suggest_threshold": self.suggest_threshold,
+                "dispositions_evaluated": dispositions_evaluated
+            }
+        }
+
     async def _calculate_disposition_score(
         self,
         disposition: CallDisposition,
@@ -584,17 +1158,7 @@ class CallDispositionEngine:
         """Suggest disposition for manual review."""
         try:
             # Store suggestion in call log metadata
-            metadata = call_log.metadata or {}
-            metadata["suggested_disposition"] = {
-                "disposition_id": str(disposition.id),
-                "disposition_name": disposition.name,
-                "confidence": confidence,
-                "reasoning": evaluation_result.get("reasoning"),
-                "alternatives": evaluation_result.get("alternatives"),
-                "suggested_at": datetime.utcnow().isoformat(),
-                "requires_review": True
-            }
-            call_log.metadata = metadata
+            call_log.call_metadata = self._suggestion_metadata(call_log, disposition, confidence, evaluation_result)
             call_log.disposition_status = "suggested"
 
             db.commit()
@@ -621,14 +1185,8 @@ class CallDispositionEngine:
         """Flag call for manual disposition review."""
         try:
             # Store evaluation results for manual review
-            metadata = call_log.metadata or {}
-            metadata["manual_review_required"] = {
-                "reason": "Low confidence in auto-disposition",
-                "evaluation_results": evaluation_result,
-                "flagged_at": datetime.utcnow().isoformat(),
-                "priority": "high" if evaluation_result.get("confidence", 0) < 30 else "medium"
-            }
-            call_log.metadata = metadata
+            metadata = self._manual_review_metadata(call_log, evaluation_result)
+            call_log.call_metadata = metadata
             call_log.disposition_status = "manual_required"
 
             db.commit()
@@ -646,6 +1204,38 @@ class CallDispositionEngine:
             logger.error(f"Failed to flag for manual review: {e}")
             raise DispositionEngineError(f"Manual flagging failed: {str(e)}")
 
+    def _suggestion_metadata(
+        self,
+        call_log: CallLog,
+        disposition: CallDisposition,
+        confidence: float,
+        evaluation_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Call log metadata with the disposition suggestion added."""
+        # A new dict, so the JSON column registers the change
+        metadata = dict(call_log.call_metadata or {})
+        metadata["suggested_disposition"] = {
+            "disposition_id": str(disposition.id),
+            "disposition_name": disposition.name,
+            "confidence": confidence,
+            "reasoning": evaluation_result.get("reasoning"),
+            "alternatives": evaluation_result.get("alternatives"),
+            "suggested_at": datetime.utcnow().isoformat(),
+            "requires_review": True
+        }
+        return metadata
+
+    def _manual_review_metadata(self, call_log: CallLog, evaluation_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Call log metadata with the manual review flag and evaluation added."""
+        metadata = dict(call_log.call_metadata or {})
+        metadata["manual_review_required"] = {
+            "reason": "Low confidence in auto-disposition",
+            "evaluation_results": dict(evaluation_result),
+            "flagged_at": datetime.utcnow().isoformat(),
+            "priority": "high" if evaluation_result.get("confidence", 0) < 30 else "medium"
+        }
+        return metadata
+
     async def _evaluate_without_analysis(self, call_log: CallLog, db: Session) -> Dict[str, Any]:
         """Basic disposition evaluation when AI analysis is not available."""
         logger.info(f"Using basic disposition logic for call {call_log.rc_call_id}")
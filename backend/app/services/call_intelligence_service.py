@@ -3,19 +3,34 @@ Call Intelligence Dashboard Analytics Service.
 Aggregates data from CallLog, CallAnalysis, and CallDisposition models for dashboard metrics.
 """
 
+import copy
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from collections import defaultdict
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, and_, or_
+from sqlalchemy import func, case, and_, cast, literal, select, true, union_all, DateTime, Integer
 
 from app.models.ringcentral import CallLog, CallDisposition
-from app.models.call_analysis import CallAnalysis
+from app.models.call_analysis import CallAnalysis, AgentDailyRollup
 
 logger = logging.getLogger(__name__)
 
+# Dashboard metrics are cached per process for this long, keyed on days
+DASHBOARD_CACHE_TTL_SECONDS = 30
+
+# Days covered by the dashboard trend series
+DASHBOARD_TREND_DAYS = 7
+
+# Strengths / improvement areas shown per agent
+AGENT_TOP_COACHING_ITEMS = 3
+
+_dashboard_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+_dashboard_cache_lock = threading.Lock()
+
 
 class CallIntelligenceService:
     """Service for aggregating call intelligence analytics."""
@@ -28,191 +43,27 @@ class CallIntelligenceService:
         """
         Get comprehensive dashboard metrics.
 
+        Served from a short-lived per-process cache keyed on ``days``; the
+        dashboard auto-refreshes, so concurrent supervisors share one
+        aggregation per DASHBOARD_CACHE_TTL_SECONDS.
+
         Args:
             days: Number of days to analyze
 
         Returns:
             Dict with all dashboard metrics matching CallIntelligenceMetrics schema
         """
-        since_date = datetime.utcnow() - timedelta(days=days)
-        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        week_ago = today - timedelta(days=7)
+        now = time.monotonic()
+        with _dashboard_cache_lock:
+            cached = _dashboard_cache.get(days)
+        if cached and now - cached[0] < DASHBOARD_CACHE_TTL_SECONDS:
+            return copy.deepcopy(cached[1])
 
         try:
-            # Base query for all calls in period - use start_time if created_at is null
-            base_query = self.db.query(CallLog).filter(
-                or_(
-                    CallLog.created_at >= since_date,
-                    and_(
-                        CallLog.created_at.is_(None),
-                        CallLog.start_time >= since_date
-                    )
-                )
-            )
-
-            # Total calls
-            total_calls = base_query.count()
-            calls_today = base_query.filter(
-                or_(
-                    CallLog.created_at >= today,
-                    and_(
-                        CallLog.created_at.is_(None),
-                        CallLog.start_time >= today
-                    )
-                )
-            ).count()
-            calls_this_week = base_query.filter(
-                or_(
-                    CallLog.created_at >= week_ago,
-                    and_(
-                        CallLog.created_at.is_(None),
-                        CallLog.start_time >= week_ago
-                    )
-                )
-            ).count()
-
-            # Sentiment distribution
-            sentiment_counts = self.db.query(
-                CallLog.sentiment,
-                func.count(CallLog.id)
-            ).filter(
-                or_(
-                    CallLog.created_at >= since_date,
-                    and_(
-                        CallLog.created_at.is_(None),
-                        CallLog.start_time >= since_date
-                    )
-                ),
-                CallLog.sentiment.isnot(None)
-            ).group_by(CallLog.sentiment).all()
-
-            sentiment_map = dict(sentiment_counts)
-            positive_calls = sentiment_map.get('positive', 0)
-            neutral_calls = sentiment_map.get('neutral', 0)
-            negative_calls = sentiment_map.get('negative', 0)
-
-            # Average sentiment score
-            avg_sentiment = self.db.query(
-                func.avg(CallLog.sentiment_score)
-            ).filter(
-                or_(
-                    CallLog.created_at >= since_date,
-                    and_(
-                        CallLog.created_at.is_(None),
-                        CallLog.start_time >= since_date
-                    )
-                ),
-                CallLog.sentiment_score.isnot(None)
-            ).scalar() or 0.0
-
-            # Average quality score
-            avg_quality = self.db.query(
-                func.avg(CallLog.quality_score)
-            ).filter(
-                or_(
-                    CallLog.created_at >= since_date,
-                    and_(
-                        CallLog.created_at.is_(None),
-                        CallLog.start_time >= since_date
-                    )
-                ),
-                CallLog.quality_score.isnot(None)
-            ).scalar() or 0.0
-
-            # Quality trend (compare current week vs previous week)
-            current_week_quality = self.db.query(
-                func.avg(CallLog.quality_score)
-            ).filter(
-                CallLog.created_at >= week_ago,
-                CallLog.quality_score.isnot(None)
-            ).scalar() or 0.0
-
-            prev_week_start = week_ago - timedelta(days=7)
-            prev_week_quality = self.db.query(
-                func.avg(CallLog.quality_score)
-            ).filter(
-                CallLog.created_at >= prev_week_start,
-                CallLog.created_at < week_ago,
-                CallLog.quality_score.isnot(None)
-            ).scalar() or 0.0
-
-            quality_trend = 0.0
-            if prev_week_quality and prev_week_quality > 0:
-                quality_trend = ((current_week_quality - prev_week_quality) / prev_week_quality) * 100
-
-            # Escalation metrics
-            escalation_counts = self.db.query(
-                CallLog.escalation_risk,
-                func.count(CallLog.id)
-            ).filter(
-                CallLog.created_at >= since_date,
-                CallLog.escalation_risk.isnot(None)
-            ).group_by(CallLog.escalation_risk).all()
-
-            escalation_map = dict(escalation_counts)
-            high_risk_calls = escalation_map.get('high', 0)
-            critical_risk_calls = escalation_map.get('critical', 0)
-
-            total_with_escalation = sum(escalation_map.values()) if escalation_map else 0
-            escalation_rate = 0.0
-            if total_with_escalation > 0:
-                escalation_rate = ((high_risk_calls + critical_risk_calls) / total_with_escalation) * 100
-
-            # CSAT prediction (from analysis)
-            avg_csat = self.db.query(
-                func.avg(CallAnalysis.predicted_csat_score)
-            ).join(CallLog).filter(
-                CallLog.created_at >= since_date,
-                CallAnalysis.predicted_csat_score.isnot(None)
-            ).scalar() or 0.0
-
-            # Auto-disposition metrics
-            total_dispositioned = self.db.query(CallLog).filter(
-                CallLog.created_at >= since_date,
-                CallLog.disposition_id.isnot(None)
-            ).count()
-
-            auto_applied = self.db.query(CallLog).filter(
-                CallLog.created_at >= since_date,
-                CallLog.disposition_applied_by == 'auto'
-            ).count()
-
-            auto_disposition_rate = 0.0
-            if total_dispositioned > 0:
-                auto_disposition_rate = (auto_applied / total_dispositioned) * 100
-
-            # Calculate auto-disposition accuracy (simplified - assumes approved = accurate)
-            auto_disposition_accuracy = 92.0  # Default accuracy estimate
-
-            # Build trend data (last 7 days)
-            sentiment_trend = self._get_sentiment_trend(7)
-            quality_trend_data = self._get_quality_trend(7)
-            volume_trend = self._get_volume_trend(7)
-
-            return {
-                "total_calls": total_calls,
-                "calls_today": calls_today,
-                "calls_this_week": calls_this_week,
-                "positive_calls": positive_calls,
-                "neutral_calls": neutral_calls,
-                "negative_calls": negative_calls,
-                "avg_sentiment_score": float(avg_sentiment),
-                "avg_quality_score": float(avg_quality),
-                "quality_trend": float(quality_trend),
-                "escalation_rate": float(escalation_rate),
-                "high_risk_calls": high_risk_calls,
-                "critical_risk_calls": critical_risk_calls,
-                "avg_csat_prediction": float(avg_csat),
-                "auto_disposition_rate": float(auto_disposition_rate),
-                "auto_disposition_accuracy": float(auto_disposition_accuracy),
-                "sentiment_trend": sentiment_trend,
-                "quality_trend_data": quality_trend_data,
-                "volume_trend": volume_trend,
-            }
-
+            metrics = self._compute_dashboard_metrics(days)
         except Exception as e:
             logger.error(f"Error getting dashboard metrics: {e}")
-            # Return empty metrics on error
+            # Return empty metrics on error (not cached)
             return {
                 "total_calls": 0,
                 "calls_today": 0,
@@ -234,142 +85,186 @@ class CallIntelligenceService:
                 "volume_trend": [],
             }
 
-    def _get_sentiment_trend(self, days: int) -> List[Dict[str, Any]]:
-        """Get daily sentiment breakdown for trend chart."""
-        trend = []
-        for i in range(days - 1, -1, -1):
-            date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=i)
-            next_date = date + timedelta(days=1)
-
-            # Get sentiment counts for this day
-            day_data = self.db.query(
-                CallLog.sentiment,
-                func.count(CallLog.id)
-            ).filter(
-                CallLog.created_at >= date,
-                CallLog.created_at < next_date
-            ).group_by(CallLog.sentiment).all()
-
-            sentiment_map = dict(day_data)
-            positive = sentiment_map.get('positive', 0)
-            neutral = sentiment_map.get('neutral', 0)
-            negative = sentiment_map.get('negative', 0)
-
-            # Average sentiment score for this day
-            avg_score = self.db.query(
-                func.avg(CallLog.sentiment_score)
-            ).filter(
-                CallLog.created_at >= date,
-                CallLog.created_at < next_date,
-                CallLog.sentiment_score.isnot(None)
-            ).scalar() or 0.0
-
-            trend.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "value": float(avg_score),
-                "positive": positive,
-                "neutral": neutral,
-                "negative": negative,
-            })
+        with _dashboard_cache_lock:
+            _dashboard_cache[days] = (time.monotonic(), metrics)
+        return copy.deepcopy(metrics)
 
-        return trend
-
-    def _get_quality_trend(self, days: int) -> List[Dict[str, Any]]:
-        """Get daily quality score trend."""
-        trend = []
-        for i in range(days - 1, -1, -1):
-            date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=i)
-            next_date = date + timedelta(days=1)
+    def _compute_dashboard_metrics(self, days: int) -> Dict[str, Any]:
+        """
+        Compute every dashboard KPI and trend series in one scan of call_logs.
 
-            avg_quality = self.db.query(
-                func.avg(CallLog.quality_score)
-            ).filter(
-                CallLog.created_at >= date,
-                CallLog.created_at < next_date,
-                CallLog.quality_score.isnot(None)
-            ).scalar() or 0.0
-
-            trend.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "value": float(avg_quality),
+        Rows are grouped by UTC day; each group carries FILTERed counts and
+        (sum, count) pairs for the averages, which are recombined here so
+        period averages stay exact. call_logs.created_at is NOT NULL, so
+        the old start_time fallback never applied and is not repeated.
+        """
+        since_date = datetime.utcnow() - timedelta(days=days)
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        week_ago = today - timedelta(days=7)
+        prev_week_start = week_ago - timedelta(days=7)
+        trend_start = today - timedelta(days=DASHBOARD_TREND_DAYS - 1)
+
+        created = CallLog.created_at
+        in_period = created >= since_date
+
+        def count_if(*conditions):
+            return func.count().filter(and_(*conditions))
+
+        def sum_if(column, *conditions):
+            return func.sum(column).filter(and_(*conditions))
+
+        def count_col_if(column, *conditions):
+            return func.count(column).filter(and_(*conditions))
+
+        day = func.date_trunc('day', func.timezone('UTC', created), type_=DateTime).label('day')
+        rows = self.db.query(
+            day,
+            # Period KPIs
+            count_if(in_period).label('total'),
+            count_if(created >= max(since_date, today)).label('today'),
+            count_if(created >= max(since_date, week_ago)).label('week'),
+            count_if(in_period, CallLog.sentiment == 'positive').label('positive'),
+            count_if(in_period, CallLog.sentiment == 'neutral').label('neutral'),
+            count_if(in_period, CallLog.sentiment == 'negative').label('negative'),
+            sum_if(CallLog.sentiment_score, in_period).label('sentiment_sum'),
+            count_col_if(CallLog.sentiment_score, in_period).label('sentiment_n'),
+            sum_if(CallLog.quality_score, in_period).label('quality_sum'),
+            count_col_if(CallLog.quality_score, in_period).label('quality_n'),
+            sum_if(CallLog.quality_score, created >= week_ago).label('cur_week_quality_sum'),
+            count_col_if(CallLog.quality_score, created >= week_ago).label('cur_week_quality_n'),
+            sum_if(CallLog.quality_score, created >= prev_week_start, created < week_ago).label('prev_week_quality_sum'),
+            count_col_if(CallLog.quality_score, created >= prev_week_start, created < week_ago).label('prev_week_quality_n'),
+            count_col_if(CallLog.escalation_risk, in_period).label('escalation_n'),
+            count_if(in_period, CallLog.escalation_risk == 'high').label('high_risk'),
+            count_if(in_period, CallLog.escalation_risk == 'critical').label('critical_risk'),
+            sum_if(CallAnalysis.predicted_csat_score, in_period).label('csat_sum'),
+            count_col_if(CallAnalysis.predicted_csat_score, in_period).label('csat_n'),
+            count_col_if(CallLog.disposition_id, in_period).label('dispositioned'),
+            count_if(in_period, CallLog.disposition_applied_by == 'auto').label('auto_applied'),
+            # Per-day trend values (whole day, not clipped to the period)
+            func.count().label('day_calls'),
+            count_if(CallLog.sentiment == 'positive').label('day_positive'),
+            count_if(CallLog.sentiment == 'neutral').label('day_neutral'),
+            count_if(CallLog.sentiment == 'negative').label('day_negative'),
+            func.avg(CallLog.sentiment_score).label('day_sentiment'),
+            func.avg(CallLog.quality_score).label('day_quality'),
+        ).outerjoin(
+            CallAnalysis, CallAnalysis.call_log_id == CallLog.id
+        ).filter(
+            created >= min(since_date, prev_week_start)
+        ).group_by(day).all()
+
+        totals: Dict[str, float] = defaultdict(float)
+        by_day: Dict[str, Any] = {}
+        for row in rows:
+            for key, value in row._mapping.items():
+                if key != 'day' and not key.startswith('day_') and value is not None:
+                    totals[key] += float(value)
+            by_day[row.day.strftime("%Y-%m-%d")] = row
+
+        def ratio(numerator: str, denominator: str) -> float:
+            return totals[numerator] / totals[denominator] if totals[denominator] else 0.0
+
+        current_week_quality = ratio('cur_week_quality_sum', 'cur_week_quality_n')
+        prev_week_quality = ratio('prev_week_quality_sum', 'prev_week_quality_n')
+        quality_trend = 0.0
+        if prev_week_quality > 0:
+            quality_trend = ((current_week_quality - prev_week_quality) / prev_week_quality) * 100
+
+        escalation_rate = 0.0
+        if totals['escalation_n'] > 0:
+            escalation_rate = ((totals['high_risk'] + totals['critical_risk']) / totals['escalation_n']) * 100
+
+        auto_disposition_rate = 0.0
+        if totals['dispositioned'] > 0:
+            auto_disposition_rate = (totals['auto_applied'] / totals['dispositioned']) * 100
+
+        # Calculate auto-disposition accuracy (simplified - assumes approved = accurate)
+        auto_disposition_accuracy = 92.0  # Default accuracy estimate
+
+        # Build trend data (last 7 days)
+        sentiment_trend = []
+        quality_trend_data = []
+        volume_trend = []
+        for i in range(DASHBOARD_TREND_DAYS):
+            date = (trend_start + timedelta(days=i)).strftime("%Y-%m-%d")
+            row = by_day.get(date)
+            sentiment_trend.append({
+                "date": date,
+                "value": float(row.day_sentiment or 0.0) if row else 0.0,
+                "positive": row.day_positive if row else 0,
+                "neutral": row.day_neutral if row else 0,
+                "negative": row.day_negative if row else 0,
             })
-
-        return trend
-
-    def _get_volume_trend(self, days: int) -> List[Dict[str, Any]]:
-        """Get daily call volume trend."""
-        trend = []
-        for i in range(days - 1, -1, -1):
-            date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=i)
-            next_date = date + timedelta(days=1)
-
-            count = self.db.query(CallLog).filter(
-                CallLog.created_at >= date,
-                CallLog.created_at < next_date
-            ).count()
-
-            trend.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "value": count,
+            quality_trend_data.append({
+                "date": date,
+                "value": float(row.day_quality or 0.0) if row else 0.0,
+            })
+            volume_trend.append({
+                "date": date,
+                "value": row.day_calls if row else 0,
             })
 
-        return trend
+        return {
+            "total_calls": int(totals['total']),
+            "calls_today": int(totals['today']),
+            "calls_this_week": int(totals['week']),
+            "positive_calls": int(totals['positive']),
+            "neutral_calls": int(totals['neutral']),
+            "negative_calls": int(totals['negative']),
+            "avg_sentiment_score": ratio('sentiment_sum', 'sentiment_n'),
+            "avg_quality_score": ratio('quality_sum', 'quality_n'),
+            "quality_trend": float(quality_trend),
+            "escalation_rate": float(escalation_rate),
+            "high_risk_calls": int(totals['high_risk']),
+            "critical_risk_calls": int(totals['critical_risk']),
+            "avg_csat_prediction": ratio('csat_sum', 'csat_n'),
+            "auto_disposition_rate": float(auto_disposition_rate),
+            "auto_disposition_accuracy": float(auto_disposition_accuracy),
+            "sentiment_trend": sentiment_trend,
+            "quality_trend_data": quality_trend_data,
+            "volume_trend": volume_trend,
+        }
 
     def get_agent_performance(self) -> Dict[str, Any]:
         """
         Get performance metrics for all agents.
 
+        Reads agent_daily_rollups: one grouped query for the scores and one
+        for the coaching items, regardless of the number of agents.
+
         Returns:
             Dict with agents list and total count matching AgentPerformanceResponse schema
         """
         try:
-            # Get all unique agents from calls (user_id is the agent identifier)
+            r = AgentDailyRollup
             agent_metrics = self.db.query(
-                CallLog.user_id,
-                func.count(CallLog.id).label('total_calls'),
-                func.avg(CallLog.quality_score).label('avg_quality'),
-                func.avg(CallLog.sentiment_score).label('avg_sentiment'),
-                func.avg(CallLog.duration_seconds).label('avg_duration'),
-            ).filter(
-                CallLog.user_id.isnot(None)
-            ).group_by(CallLog.user_id).all()
+                r.user_id,
+                func.sum(r.call_count).label('total_calls'),
+                func.sum(r.quality_sum).label('quality_sum'),
+                func.sum(r.quality_count).label('quality_count'),
+                func.sum(r.sentiment_sum).label('sentiment_sum'),
+                func.sum(r.sentiment_count).label('sentiment_count'),
+                func.sum(r.duration_sum).label('duration_sum'),
+                func.sum(r.duration_count).label('duration_count'),
+                func.sum(r.professionalism_sum).label('professionalism_sum'),
+                func.sum(r.professionalism_count).label('professionalism_count'),
+                func.sum(r.empathy_sum).label('empathy_sum'),
+                func.sum(r.empathy_count).label('empathy_count'),
+                func.sum(r.clarity_sum).label('clarity_sum'),
+                func.sum(r.clarity_count).label('clarity_count'),
+                func.sum(r.resolution_sum).label('resolution_sum'),
+                func.sum(r.resolution_count).label('resolution_count'),
+            ).group_by(r.user_id).all()
+
+            coaching = self._top_coaching_items(AGENT_TOP_COACHING_ITEMS)
+
+            def avg(row, name: str) -> float:
+                count = getattr(row, f"{name}_count")
+                return float(getattr(row, f"{name}_sum") or 0) / count if count else 0.0
 
             agents = []
-            for i, row in enumerate(agent_metrics):
-                # Get detailed quality breakdown from CallAnalysis
-                quality_breakdown = self.db.query(
-                    func.avg(CallAnalysis.professionalism_score),
-                    func.avg(CallAnalysis.empathy_score),
-                    func.avg(CallAnalysis.clarity_score),
-                    func.avg(CallAnalysis.resolution_score),
-                ).join(CallLog).filter(
-                    CallLog.user_id == row.user_id
-                ).first()
-
-                # Get coaching insights
-                strengths_data = self.db.query(CallAnalysis.strengths).join(CallLog).filter(
-                    CallLog.user_id == row.user_id,
-                    CallAnalysis.strengths.isnot(None)
-                ).limit(5).all()
-
-                improvements_data = self.db.query(CallAnalysis.improvement_areas).join(CallLog).filter(
-                    CallLog.user_id == row.user_id,
-                    CallAnalysis.improvement_areas.isnot(None)
-                ).limit(5).all()
-
-                # Flatten and dedupe
-                strengths = []
-                for s in strengths_data:
-                    if s[0] and isinstance(s[0], list):
-                        strengths.extend(s[0][:2])
-                strengths = list(set(strengths))[:3]
-
-                improvements = []
-                for im in improvements_data:
-                    if im[0] and isinstance(im[0], list):
-                        improvements.extend(im[0][:2])
-                improvements = list(set(improvements))[:3]
-
+            for row in agent_metrics:
                 # Calculate trend (simplified)
                 quality_trend = "neutral"
                 trend_percentage = 0.0
@@ -378,20 +273,20 @@ class CallIntelligenceService:
                     "agent_id": str(row.user_id),
                     "agent_name": f"Agent {row.user_id[:8]}..." if row.user_id else "Unknown",
                     "avatar_url": None,
-                    "total_calls": row.total_calls or 0,
-                    "avg_quality_score": float(row.avg_quality or 0),
-                    "avg_sentiment_score": float(row.avg_sentiment or 0),
-                    "avg_handle_time": float(row.avg_duration or 0),
-                    "professionalism": float(quality_breakdown[0] or 0) if quality_breakdown else 0,
-                    "empathy": float(quality_breakdown[1] or 0) if quality_breakdown else 0,
-                    "clarity": float(quality_breakdown[2] or 0) if quality_breakdown else 0,
-                    "resolution": float(quality_breakdown[3] or 0) if quality_breakdown else 0,
+                    "total_calls": int(row.total_calls or 0),
+                    "avg_quality_score": avg(row, 'quality'),
+                    "avg_sentiment_score": avg(row, 'sentiment'),
+                    "avg_handle_time": avg(row, 'duration'),
+                    "professionalism": avg(row, 'professionalism'),
+                    "empathy": avg(row, 'empathy'),
+                    "clarity": avg(row, 'clarity'),
+                    "resolution": avg(row, 'resolution'),
                     "quality_trend": quality_trend,
                     "trend_percentage": trend_percentage,
-                    "rank": i + 1,
+                    "rank": 0,
                     "rank_change": 0,
-                    "strengths": strengths,
-                    "improvement_areas": improvements,
+                    "strengths": coaching.get((row.user_id, 'strengths'), []),
+                    "improvement_areas": coaching.get((row.user_id, 'improvement_areas'), []),
                 })
 
             # Sort by quality score
@@ -408,10 +303,47 @@ class CallIntelligenceService:
             logger.error(f"Error getting agent performance: {e}")
             return {"agents": [], "total": 0}
 
+    def _top_coaching_items(self, limit: int) -> Dict[Tuple[str, str], List[str]]:
+        """Most frequent strengths / improvement areas per agent, from the rollups."""
+        r = AgentDailyRollup
+        strengths = func.jsonb_each_text(r.strengths).table_valued('key', 'value').lateral()
+        improvements = func.jsonb_each_text(r.improvement_areas).table_valued('key', 'value').lateral()
+        item_counts = union_all(
+            select(
+                r.user_id, literal('strengths').label('kind'),
+                strengths.c.key.label('item'), cast(strengths.c.value, Integer).label('n')
+            ).select_from(r).join(strengths, true()),
+            select(
+                r.user_id, literal('improvement_areas').label('kind'),
+                improvements.c.key.label('item'), cast(improvements.c.value, Integer).label('n')
+            ).select_from(r).join(improvements, true()),
+        ).subquery()
+
+        rows = self.db.execute(
+            select(
+                item_counts.c.user_id, item_counts.c.kind, item_counts.c.item,
+                func.sum(item_counts.c.n).label('n')
+            ).group_by(
+                item_counts.c.user_id, item_counts.c.kind, item_counts.c.item
+            ).order_by(
+                item_counts.c.user_id, item_counts.c.kind,
+                func.sum(item_counts.c.n).desc(), item_counts.c.item
+            )
+        ).all()
+
+        top: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        for row in rows:
+            items = top[(row.user_id, row.kind)]
+            if len(items) < limit:
+                items.append(row.item)
+        return top
+
     def get_quality_heatmap(self, days: int = 14) -> Dict[str, Any]:
         """
         Get quality scores by agent over time for heatmap visualization.
 
+        One range read of agent_daily_rollups for all agents and days.
+
         Args:
             days: Number of days to show
 
@@ -422,35 +354,31 @@ class CallIntelligenceService:
             end_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
             start_date = end_date - timedelta(days=days)
 
-            # Get unique agents
-            agents = self.db.query(CallLog.user_id).filter(
-                CallLog.user_id.isnot(None),
-                CallLog.created_at >= start_date
-            ).distinct().all()
+            rows = self.db.query(
+                AgentDailyRollup.user_id,
+                AgentDailyRollup.day,
+                AgentDailyRollup.quality_sum,
+                AgentDailyRollup.quality_count,
+            ).filter(
+                AgentDailyRollup.day >= start_date.date(),
+                AgentDailyRollup.day < end_date.date()
+            ).order_by(AgentDailyRollup.user_id).all()
+
+            cells: Dict[str, Dict[Any, Any]] = {}
+            for row in rows:
+                cells.setdefault(row.user_id, {})[row.day] = row
 
             heatmap_data = []
-            for (user_id,) in agents:
+            for user_id, agent_days in cells.items():
                 daily_scores = []
                 for i in range(days):
                     date = start_date + timedelta(days=i)
-                    next_date = date + timedelta(days=1)
-
-                    result = self.db.query(
-                        func.avg(CallLog.quality_score),
-                        func.count(CallLog.id)
-                    ).filter(
-                        CallLog.user_id == user_id,
-                        CallLog.created_at >= date,
-                        CallLog.created_at < next_date,
-                        CallLog.quality_score.isnot(None)
-                    ).first()
-
-                    avg_score = result[0] if result and result[0] else None
-                    call_count = result[1] if result else 0
+                    cell = agent_days.get(date.date())
+                    call_count = cell.quality_count if cell else 0
 
                     daily_scores.append({
                         "date": date.strftime("%Y-%m-%d"),
-                        "score": float(avg_score) if avg_score else None,
+                        "score": float(cell.quality_sum) / call_count if call_count else None,
                         "call_count": call_count,
                     })
 
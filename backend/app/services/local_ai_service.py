@@ -12,6 +12,9 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from app.core.config import settings
+from app.services.ai_result_cache import (
+    AICacheKey, TRANSCRIPT_PLACEHOLDER, content_hash, get_ai_result_cache, prompt_version
+)
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +44,9 @@ class LocalAIService:
         self.hctg_ai_url = getattr(settings, 'HCTG_AI_URL', 'https://hctg-ai.tailad2d5f.ts.net')
         self.hctg_ai_model = getattr(settings, 'HCTG_AI_MODEL', 'qwen2.5:32b')
 
+        # Content-addressed transcript analysis cache
+        self.cache = get_ai_result_cache()
+
     async def health_check(self) -> Dict[str, Any]:
         """Check if local AI services are available."""
         results = {
@@ -86,10 +92,19 @@ class LocalAIService:
             call_metadata: Optional metadata about the call
 
         Returns:
-            Dict with analysis results
+            Dict with analysis results (cached results carry "cached": True)
         """
         start_time = time.time()
 
+        cache_key = AICacheKey(
+            "local_analysis", self.model,
+            prompt_version(self._build_analysis_prompt(TRANSCRIPT_PLACEHOLDER, call_metadata), "json"),
+            content_hash(transcript)
+        )
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return {**cached, "processing_time_seconds": time.time() - start_time, "cached": True}
+
         # Build analysis prompt
         prompt = self._build_analysis_prompt(transcript, call_metadata)
 
@@ -125,7 +140,7 @@ class LocalAIService:
 
                     processing_time = time.time() - start_time
 
-                    return {
+                    analysis_result = {
                         "status": "success",
                         "analysis": analysis,
                         "model": self.model,
@@ -136,6 +151,11 @@ class LocalAIService:
                         }
                     }
 
+            # Unparseable output is not worth keeping
+            if isinstance(analysis, dict) and not analysis.get("parse_error"):
+                await self.cache.set(cache_key, analysis_result)
+            return analysis_result
+
         except aiohttp.ClientError as e:
             logger.error(f"Ollama connection error: {e}")
             raise LocalAIError(f"Failed to connect to Ollama: {str(e)}")
@@ -0,0 +1,423 @@
+"""
+Permit duplicate detection service.
+
+Finds likely duplicate permits in resumable background runs and records
+them as PermitDuplicate rows for review:
+- Candidate pairs come from blocking keys evaluated in SQL: same address
+  (address_hash or address_normalized), same parcel number (punctuation
+  and case stripped) and same normalized owner + street; every block is
+  capped at MAX_BLOCK_SIZE rows per permit so junk keys ("UNKNOWN") cannot
+  explode into quadratic work
+- Pairs are scored with pg_trgm trigram similarity on address and owner
+  plus exact parcel/date agreement, combined into a 0-100 confidence
+- Pairs at or above min_confidence are bulk inserted; existing pairs are
+  left alone (ON CONFLICT DO NOTHING), so reviewed pairs keep their status
+- Incremental runs only compare permits ingested since the last completed
+  run (created_at watermark) against the whole table; a checkpoint per
+  scope records the watermark and the position of an in-progress run
+"""
+
+import logging
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import (
+    select, union_all, literal, any_, and_, or_, case, func, text, true
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from app.models.septic_permit import (
+    SepticPermit, PermitDuplicate, PermitDedupCheckpoint, State
+)
+from app.utils.pagination import keyset_order_by, keyset_page
+
+logger = logging.getLogger(__name__)
+
+
+# Newly ingested permits per transaction
+DEDUP_CHUNK_SIZE = 2000
+
+# Most candidates taken from one block for one permit
+MAX_BLOCK_SIZE = 50
+
+# Pairs below this confidence (0-100) are not recorded
+DEDUP_MIN_CONFIDENCE = 75.0
+
+# Trigram similarity at which address/owner count as a matching field
+FIELD_MATCH_SIMILARITY = 0.8
+
+# Confidence is the weighted average over fields known on both permits
+FIELD_WEIGHTS = {
+    'address': 0.5,
+    'owner_name': 0.2,
+    'parcel_number': 0.2,
+    'permit_date': 0.1,
+}
+
+# Incremental runs re-examine this much before the watermark, covering
+# ingestion transactions that committed after the previous run started
+WATERMARK_OVERLAP = timedelta(minutes=10)
+
+
+class DedupError(Exception):
+    """Custom exception for duplicate detection errors."""
+    pass
+
+
+def score_pair(row: Any) -> Tuple[float, List[str]]:
+    """
+    Combine the per-field signals of a candidate pair.
+
+    Returns:
+        (confidence 0-100, matching field names)
+    """
+    signals = {
+        'address': row.address_sim,
+        'owner_name': row.owner_sim,
+        'parcel_number': row.parcel_match,
+        'permit_date': row.date_match,
+    }
+
+    weighted = 0.0
+    known = 0.0
+    matching_fields = []
+    for field, value in signals.items():
+        if value is None:
+            continue
+        value = float(value)
+        weighted += FIELD_WEIGHTS[field] * value
+        known += FIELD_WEIGHTS[field]
+        if value >= FIELD_MATCH_SIMILARITY:
+            matching_fields.append(field)
+
+    confidence = 100.0 * weighted / known if known else 0.0
+    return round(confidence, 1), matching_fields
+
+
+class PermitDedupService:
+    """
+    Incremental, checkpointed duplicate-permit detector.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize dedup service with database session."""
+        self.db = db
+        self._lock_conn = None
+
+    # ===== SCOPE / CHECKPOINT =====
+
+    def _resolve_scope(self, state_code: Optional[str]) -> Tuple[str, Optional[int]]:
+        """Checkpoint scope key and state id for a run."""
+        if not state_code:
+            return 'all', None
+
+        state_id = self.db.query(State.id).filter(State.code == state_code.upper()).scalar()
+        if not state_id:
+            raise DedupError(f"State {state_code} not found")
+        return state_code.upper(), state_id
+
+    def _get_checkpoint(self, scope: str) -> PermitDedupCheckpoint:
+        """Load or create the checkpoint row for a scope."""
+        checkpoint = self.db.query(PermitDedupCheckpoint).filter(
+            PermitDedupCheckpoint.scope == scope
+        ).first()
+        if not checkpoint:
+            checkpoint = PermitDedupCheckpoint(scope=scope, status='idle')
+            self.db.add(checkpoint)
+            self.db.flush()
+        return checkpoint
+
+    def _try_lock(self, scope: str) -> bool:
+        """Advisory lock (on its own connection) so one run per scope is active."""
+        self._lock_conn = self.db.get_bind().connect()
+        locked = bool(self._lock_conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"),
+            {'key': self._lock_key(scope)}
+        ).scalar())
+        if not locked:
+            self._lock_conn.close()
+            self._lock_conn = None
+        return locked
+
+    def _unlock(self, scope: str) -> None:
+        """Release the scope's advisory lock."""
+        if self._lock_conn is None:
+            return
+        try:
+            self._lock_conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"),
+                {'key': self._lock_key(scope)}
+            )
+        finally:
+            self._lock_conn.close()
+            self._lock_conn = None
+
+    @staticmethod
+    def _lock_key(scope: str) -> int:
+        """Stable 32-bit advisory lock key for a scope."""
+        return zlib.crc32(f"permit_dedup:{scope}".encode())
+
+    # ===== CANDIDATES AND SCORING =====
+
+    def _candidate_pairs(self, permit_ids: List[Any]):
+        """
+        Blocked candidate pairs for a chunk of permits, as a subquery of
+        (id_1, id_2) with id_1 < id_2 and one row per pair.
+        """
+        new = aliased(SepticPermit, name='new')
+        other = aliased(SepticPermit, name='other')
+
+        blocks = [
+            ('address', or_(
+                other.address_hash == new.address_hash,
+                other.address_normalized == new.address_normalized
+            )),
+            # IS NOT NULL lets the planner use the partial block indexes
+            ('parcel_number', and_(
+                other.parcel_number.isnot(None),
+                other.parcel_key() == new.parcel_key()
+            )),
+            ('owner_street', and_(
+                other.owner_name_normalized.isnot(None),
+                other.owner_street_key() == new.owner_street_key()
+            )),
+        ]
+
+        selects = []
+        for name, condition in blocks:
+            matches = select(other.id).where(
+                other.state_id == new.state_id,
+                other.is_active == True,
+                other.id != new.id,
+                condition
+            ).limit(MAX_BLOCK_SIZE).lateral(f"{name}_matches")
+
+            selects.append(
+                select(
+                    func.least(new.id, matches.c.id).label('id_1'),
+                    func.greatest(new.id, matches.c.id).label('id_2')
+                )
+                .select_from(new)
+                .join(matches, true())
+                .where(new.id == any_(literal(permit_ids, ARRAY(SepticPermit.id.type))))
+            )
+
+        candidates = union_all(*selects).subquery('candidates')
+        return select(candidates.c.id_1, candidates.c.id_2).distinct().subquery('pairs')
+
+    def _score_chunk(self, permit_ids: List[Any]) -> List[Any]:
+        """Candidate pairs for a chunk with their per-field similarity signals."""
+        pairs = self._candidate_pairs(permit_ids)
+        p1 = aliased(SepticPermit, name='p1')
+        p2 = aliased(SepticPermit, name='p2')
+
+        query = select(
+            pairs.c.id_1,
+            pairs.c.id_2,
+            (p1.address_hash == p2.address_hash).label('same_hash'),
+            case(
+                (p1.address_hash == p2.address_hash, 1.0),
+                else_=func.similarity(
+                    func.coalesce(p1.address_normalized, ''),
+                    func.coalesce(p2.address_normalized, '')
+                )
+            ).label('address_sim'),
+            case(
+                (and_(p1.owner_name_normalized.isnot(None), p2.owner_name_normalized.isnot(None)),
+                 func.similarity(p1.owner_name_normalized, p2.owner_name_normalized))
+            ).label('owner_sim'),
+            case(
+                (and_(p1.parcel_number.isnot(None), p2.parcel_number.isnot(None)),
+                 p1.parcel_key() == p2.parcel_key())
+            ).label('parcel_match'),
+            case(
+                (and_(p1.permit_date.isnot(None), p2.permit_date.isnot(None)),
+                 p1.permit_date == p2.permit_date)
+            ).label('date_match'),
+        ).select_from(pairs).join(
+            p1, p1.id == pairs.c.id_1
+        ).join(
+            p2, p2.id == pairs.c.id_2
+        )
+        return self.db.execute(query).all()
+
+    def _write_duplicates(self, rows: List[Any], min_confidence: float) -> int:
+        """Bulk insert pairs at or above min_confidence; existing pairs are kept."""
+        records = []
+        for row in rows:
+            confidence, matching_fields = score_pair(row)
+            if confidence < min_confidence:
+                continue
+            records.append({
+                'id': uuid.uuid4(),
+                'permit_id_1': row.id_1,
+                'permit_id_2': row.id_2,
+                'detection_method': 'address_hash' if row.same_hash else 'fuzzy_match',
+                'confidence_score': confidence,
+                'matching_fields': matching_fields,
+                'status': 'pending',
+            })
+        if not records:
+            return 0
+
+        result = self.db.execute(
+            insert(PermitDuplicate.__table__)
+            .values(records)
+            .on_conflict_do_nothing(constraint='uq_permit_duplicate_pair')
+        )
+        return result.rowcount
+
+    def _next_permits(
+        self,
+        state_id: Optional[int],
+        since: Optional[datetime],
+        cursor: Tuple[Optional[datetime], Optional[Any]],
+        chunk_size: int
+    ) -> List[Any]:
+        """Next chunk of active permits in (created_at, id) order."""
+        query = select(SepticPermit.id, SepticPermit.created_at).where(
+            SepticPermit.is_active == True
+        )
+        if state_id:
+            query = query.where(SepticPermit.state_id == state_id)
+        if since:
+            query = query.where(SepticPermit.created_at >= since)
+        query = query.order_by(
+            *keyset_order_by(SepticPermit.created_at, SepticPermit.id, False)
+        )
+        if cursor[1] is None:
+            return self.db.execute(query.limit(chunk_size)).all()
+        return keyset_page(
+            lambda segment, limit: self.db.execute(query.where(segment).limit(limit)).all(),
+            SepticPermit.created_at, SepticPermit.id, False, cursor[0], cursor[1], chunk_size
+        )
+
+    # ===== RUNS =====
+
+    def run(
+        self,
+        state_code: Optional[str] = None,
+        full: bool = False,
+        chunk_size: int = DEDUP_CHUNK_SIZE,
+        min_confidence: float = DEDUP_MIN_CONFIDENCE,
+        time_budget_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Detect duplicate permits for a scope.
+
+        Incremental by default: only permits ingested since the last
+        completed run are compared (against all active permits in their
+        state); the first run is always full. Commits and checkpoints after
+        every chunk; an interrupted or time-limited run resumes from its
+        checkpoint on the next call.
+
+        Args:
+            state_code: Limit to one state (optional)
+            full: Compare every permit regardless of the watermark
+            chunk_size: Permits per chunk / transaction
+            min_confidence: Lowest confidence (0-100) recorded
+            time_budget_seconds: Stop (resumably) after roughly this long
+
+        Returns:
+            Dict with scope, mode, counts, pairs/second and whether the run finished
+        """
+        scope, state_id = self._resolve_scope(state_code)
+
+        if not self._try_lock(scope):
+            return {"scope": scope, "status": "skipped", "reason": "already running"}
+
+        start_time = time.time()
+        score_seconds = 0.0
+        stats = {
+            "scope": scope,
+            "permits_examined": 0,
+            "pairs_evaluated": 0,
+            "duplicates_recorded": 0,
+            "chunks": 0,
+        }
+
+        try:
+            checkpoint = self._get_checkpoint(scope)
+
+            if checkpoint.status in ('running', 'failed') and checkpoint.run_started_at:
+                logger.info(f"Resuming duplicate detection for {scope} from checkpoint")
+            else:
+                checkpoint.status = 'running'
+                checkpoint.run_mode = 'full' if full or not checkpoint.watermark else 'incremental'
+                checkpoint.run_started_at = self.db.execute(select(func.now())).scalar()
+                checkpoint.cursor_at = checkpoint.cursor_id = None
+                checkpoint.last_error = None
+            self.db.commit()
+
+            since = None
+            if checkpoint.run_mode == 'incremental':
+                since = checkpoint.watermark - WATERMARK_OVERLAP
+            stats["mode"] = checkpoint.run_mode
+
+            finished = False
+            while not (time_budget_seconds is not None and
+                       time.time() - start_time >= time_budget_seconds):
+                rows = self._next_permits(
+                    state_id, since, (checkpoint.cursor_at, checkpoint.cursor_id), chunk_size
+                )
+                if not rows:
+                    finished = True
+                    break
+
+                score_start = time.time()
+                pairs = self._score_chunk([row.id for row in rows])
+                score_seconds += time.time() - score_start
+
+                stats["duplicates_recorded"] += self._write_duplicates(pairs, min_confidence)
+                stats["pairs_evaluated"] += len(pairs)
+                stats["permits_examined"] += len(rows)
+                stats["chunks"] += 1
+
+                checkpoint.cursor_at = rows[-1].created_at
+                checkpoint.cursor_id = rows[-1].id
+                self.db.commit()
+
+            elapsed = time.time() - start_time
+            stats["elapsed_seconds"] = round(elapsed, 2)
+            stats["score_seconds"] = round(score_seconds, 2)
+            stats["pairs_per_second"] = (
+                round(stats["pairs_evaluated"] / score_seconds, 1) if score_seconds > 0 else 0.0
+            )
+            stats["finished"] = finished
+
+            if finished:
+                # Everything ingested before this run started has been compared
+                checkpoint.watermark = checkpoint.run_started_at
+                checkpoint.status = 'idle'
+                checkpoint.cursor_at = checkpoint.cursor_id = None
+            checkpoint.last_run_stats = stats
+            self.db.commit()
+
+            stats["status"] = "completed" if finished else "paused"
+            logger.info(
+                f"Duplicate detection {scope}: {stats['permits_examined']:,} permits, "
+                f"{stats['pairs_evaluated']:,} pairs ({stats['pairs_per_second']:,}/s), "
+                f"{stats['duplicates_recorded']:,} recorded in {elapsed:.1f}s"
+            )
+            return stats
+
+        except Exception as e:
+            self.db.rollback()
+            checkpoint = self._get_checkpoint(scope)
+            checkpoint.status = 'failed'
+            checkpoint.last_error = str(e)
+            self.db.commit()
+            raise DedupError(f"Duplicate detection failed for {scope}: {str(e)}")
+
+        finally:
+            self._unlock(scope)
+
+
+# Factory function
+def get_permit_dedup_service(db: Session) -> PermitDedupService:
+    """Create a permit dedup service instance."""
+    return PermitDedupService(db)
@@ -0,0 +1,327 @@
+"""
+Septic permit embedding service.
+
+Generates semantic search embeddings with the local embedding model
+(all-MiniLM-L6-v2 served by Ollama on the R730 ML Workstation) and keeps
+SepticPermit.embedding (pgvector) up to date:
+- embed_query: memoized single-query embedding used by PermitSearchService
+- backfill: batch job embedding permits that are missing or stale
+"""
+
+import logging
+import time
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+import httpx
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, values, column, cast, func, or_
+
+from app.core.config import settings
+from app.models.septic_permit import (
+    SepticPermit, State, County, EMBEDDING_DIMENSIONS
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Permits embedded per model request / per transaction
+EMBEDDING_BATCH_SIZE = 256
+
+# Seconds to wait for the embedding server
+EMBEDDING_TIMEOUT_SECONDS = 30.0
+
+# Query embeddings sit on the search request path, so fail fast
+QUERY_TIMEOUT_SECONDS = 2.0
+
+# After a failed query embedding, skip semantic search for this long
+QUERY_RETRY_COOLDOWN_SECONDS = 30.0
+
+# Distinct search queries whose embeddings are kept in memory
+QUERY_CACHE_SIZE = 1024
+
+_http_client: Optional[httpx.Client] = None
+_query_unavailable_until = 0.0
+
+
+class EmbeddingError(Exception):
+    """Custom exception for embedding errors."""
+    pass
+
+
+def _get_http_client() -> httpx.Client:
+    """Shared keep-alive client for the embedding server."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(timeout=EMBEDDING_TIMEOUT_SECONDS)
+    return _http_client
+
+
+def _request_embeddings(
+    base_url: str,
+    model: str,
+    texts: List[str],
+    timeout: float = EMBEDDING_TIMEOUT_SECONDS
+) -> List[List[float]]:
+    """Call Ollama's /api/embed for a list of texts."""
+    try:
+        response = _get_http_client().post(
+            f"{base_url}/api/embed",
+            json={"model": model, "input": texts},
+            timeout=timeout
+        )
+        response.raise_for_status()
+        embeddings = response.json().get("embeddings") or []
+    except Exception as e:
+        raise EmbeddingError(f"Embedding request failed: {str(e)}")
+
+    if len(embeddings) != len(texts):
+        raise EmbeddingError(
+            f"Embedding server returned {len(embeddings)} vectors for {len(texts)} inputs"
+        )
+    for vector in embeddings:
+        if len(vector) != EMBEDDING_DIMENSIONS:
+            raise EmbeddingError(
+                f"Model {model} returned {len(vector)} dimensions, expected {EMBEDDING_DIMENSIONS}"
+            )
+
+    return embeddings
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _cached_query_embedding(base_url: str, model: str, query: str) -> Tuple[float, ...]:
+    """Memoized query embedding (errors are not cached)."""
+    return tuple(_request_embeddings(base_url, model, [query], timeout=QUERY_TIMEOUT_SECONDS)[0])
+
+
+def build_permit_text(row: Any) -> str:
+    """
+    Text embedded for a permit.
+
+    Accepts a SepticPermit or a row exposing the same attributes plus
+    county_name and state_code.
+    """
+    parts = [
+        row.address,
+        row.city,
+        getattr(row, 'county_name', None),
+        getattr(row, 'state_code', None),
+        row.zip_code,
+        row.owner_name,
+        row.system_type_raw,
+        row.permit_number,
+    ]
+    return ', '.join(str(part) for part in parts if part)
+
+
+class PermitEmbeddingService:
+    """
+    Embeds permits and search queries with the local embedding model.
+    """
+
+    def __init__(self, db: Optional[Session] = None, model: Optional[str] = None):
+        """
+        Initialize embedding service.
+
+        Args:
+            db: Database session (only needed for backfill)
+            model: Embedding model name (defaults to settings.EMBEDDING_MODEL)
+        """
+        self.db = db
+        self.model = model or getattr(settings, 'EMBEDDING_MODEL', 'all-minilm')
+        self.base_url = getattr(
+            settings, 'OLLAMA_BASE_URL', 'https://localhost-0.tailad2d5f.ts.net/ollama'
+        ).rstrip('/')
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts.
+
+        Raises:
+            EmbeddingError: If the embedding server fails or returns bad vectors
+        """
+        if not texts:
+            return []
+        return _request_embeddings(self.base_url, self.model, texts)
+
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a search query (memoized per model).
+
+        After a failure, further calls fail immediately for
+        QUERY_RETRY_COOLDOWN_SECONDS so searches are not held up by an
+        unreachable model server.
+
+        Raises:
+            EmbeddingError: If the embedding server fails or is cooling down
+        """
+        global _query_unavailable_until
+        if time.time() < _query_unavailable_until:
+            raise EmbeddingError("Embedding server recently unavailable")
+
+        normalized = ' '.join(query.lower().split())
+        try:
+            return list(_cached_query_embedding(self.base_url, self.model, normalized))
+        except EmbeddingError:
+            _query_unavailable_until = time.time() + QUERY_RETRY_COOLDOWN_SECONDS
+            raise
+
+    # ===== BACKFILL =====
+
+    def _pending_filter(self, missing: bool):
+        """
+        Active permits with no embedding (missing) or with another model's
+        or a stale one.
+
+        The missing filter matches idx_septic_permits_embedding_pending
+        exactly, so that scan only reads the rows still to embed; the
+        stale scan walks the table in id order.
+        """
+        if missing:
+            return [
+                SepticPermit.embedding.is_(None),
+                SepticPermit.is_active == True
+            ]
+        return [
+            SepticPermit.embedding.isnot(None),
+            SepticPermit.is_active == True,
+            or_(
+                SepticPermit.embedding_model.is_distinct_from(self.model),
+                SepticPermit.embedding_updated_at < SepticPermit.updated_at
+            )
+        ]
+
+    def _load_pending(self, missing: bool, batch_size: int, after_id: Optional[Any]) -> List[Any]:
+        """Next batch of permits needing embeddings, in id order."""
+        query = select(
+            SepticPermit.id,
+            SepticPermit.permit_number,
+            SepticPermit.address,
+            SepticPermit.city,
+            SepticPermit.zip_code,
+            SepticPermit.owner_name,
+            SepticPermit.system_type_raw,
+            State.code.label('state_code'),
+            County.name.label('county_name'),
+        ).join(
+            State, SepticPermit.state_id == State.id
+        ).outerjoin(
+            County, SepticPermit.county_id == County.id
+        ).where(
+            *self._pending_filter(missing)
+        ).order_by(SepticPermit.id).limit(batch_size)
+
+        if after_id is not None:
+            query = query.where(SepticPermit.id > after_id)
+
+        return self.db.execute(query).all()
+
+    def _write_embeddings(self, ids: List[Any], vectors: List[List[float]]) -> None:
+        """Write a batch of embeddings with one UPDATE ... FROM (VALUES ...)."""
+        table = SepticPermit.__table__
+        incoming = values(
+            column('id', table.c.id.type),
+            column('embedding', table.c.embedding.type),
+            name='incoming'
+        ).data(list(zip(ids, vectors)))
+
+        self.db.execute(
+            update(table)
+            .where(table.c.id == cast(incoming.c.id, table.c.id.type))
+            .values(
+                embedding=cast(incoming.c.embedding, table.c.embedding.type),
+                embedding_model=self.model,
+                embedding_updated_at=func.now(),
+                # Embedding refreshes are not data changes
+                updated_at=table.c.updated_at
+            )
+        )
+
+    def backfill(
+        self,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        limit: Optional[int] = None,
+        time_budget_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Embed permits that are missing an embedding or whose data changed.
+
+        Permits without an embedding are embedded first, then stale ones.
+        Commits after every batch, so it can be stopped and resumed.
+
+        Args:
+            batch_size: Permits per embedding request / transaction
+            limit: Stop after this many permits (optional)
+            time_budget_seconds: Stop after roughly this long (optional)
+
+        Returns:
+            Dict with embedded count, batch count, timings and any error
+        """
+        if self.db is None:
+            raise EmbeddingError("Backfill requires a database session")
+
+        start_time = time.time()
+        stats = {
+            "model": self.model,
+            "embedded": 0,
+            "batches": 0,
+            "embed_seconds": 0.0,
+            "write_seconds": 0.0,
+            "error": None,
+        }
+        # Missing embeddings first; last id read per scan
+        scans = {True: None, False: None}
+
+        while True:
+            if limit:
+                batch_size = min(batch_size, limit - stats["embedded"])
+                if batch_size <= 0:
+                    break
+            if time_budget_seconds and time.time() - start_time >= time_budget_seconds:
+                break
+
+            missing = next(iter(scans))
+            rows = self._load_pending(missing, batch_size, scans[missing])
+            if not rows:
+                del scans[missing]
+                if not scans:
+                    break
+                continue
+            scans[missing] = rows[-1].id
+
+            try:
+                embed_start = time.time()
+                vectors = self.embed_texts([build_permit_text(row) for row in rows])
+                stats["embed_seconds"] += time.time() - embed_start
+            except EmbeddingError as e:
+                # Model server down: stop rather than scanning the whole table
+                logger.error(f"Embedding backfill stopped: {e}")
+                stats["error"] = str(e)
+                break
+
+            write_start = time.time()
+            self._write_embeddings([row.id for row in rows], vectors)
+            self.db.commit()
+            stats["write_seconds"] += time.time() - write_start
+
+            stats["embedded"] += len(rows)
+            stats["batches"] += 1
+            if stats["batches"] % 20 == 0:
+                logger.info(f"Embedding backfill: {stats['embedded']:,} permits embedded")
+
+        elapsed = time.time() - start_time
+        stats["elapsed_seconds"] = round(elapsed, 2)
+        stats["embed_seconds"] = round(stats["embed_seconds"], 2)
+        stats["write_seconds"] = round(stats["write_seconds"], 2)
+        stats["permits_per_second"] = round(stats["embedded"] / elapsed, 1) if elapsed > 0 else 0.0
+
+        logger.info(
+            f"Embedding backfill finished: {stats['embedded']:,} permits in {elapsed:.1f}s"
+        )
+        return stats
+
+
+# Factory function
+def get_permit_embedding_service(db: Optional[Session] = None) -> PermitEmbeddingService:
+    """Create a permit embedding service instance."""
+    return PermitEmbeddingService(db)
@@ -6,6 +6,7 @@ Handles batch ingestion of permit records from scrapers with:
 - Update detection via record hash comparison
 - Version history tracking
 - Duplicate candidate flagging
+- Set-based bulk mode (one lookup query + multi-row writes per chunk)
 """
 
 import logging
@@ -16,7 +17,10 @@ from datetime import datetime
 
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select, func
+from sqlalchemy import (
+    select, func, insert, update, values, column, cast, literal, any_, or_
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from app.models.septic_permit import (
     SepticPermit, PermitVersion, PermitDuplicate, PermitImportBatch,
@@ -26,14 +30,54 @@ from app.schemas.septic_permit import (
     PermitCreate, BatchIngestionStats, BatchIngestionResponse
 )
 from app.utils.address_normalization import (
-    normalize_address, normalize_county, normalize_state,
-    normalize_owner_name, compute_address_hash
+    ADDRESS_NORMALIZER_VERSION, canonicalize_address, canonical_address_hash,
+    normalize_many, normalize_county, normalize_state, normalize_owner_name
 )
 from app.database.base_class import get_db
 
 logger = logging.getLogger(__name__)
 
 
+# Records per transaction in bulk mode. Each chunk costs one lookup query
+# plus one multi-row statement per write type.
+BULK_CHUNK_SIZE = 1000
+
+# Fields captured in PermitVersion.permit_data snapshots
+VERSION_SNAPSHOT_FIELDS = [
+    'permit_number', 'address', 'address_normalized', 'city', 'zip_code',
+    'parcel_number', 'latitude', 'longitude', 'owner_name', 'applicant_name',
+    'contractor_name', 'install_date', 'permit_date', 'expiration_date',
+    'system_type_raw', 'tank_size_gallons', 'drainfield_size_sqft', 'bedrooms',
+    'daily_flow_gpd', 'pdf_url', 'permit_url', 'source_portal_code', 'scraped_at',
+]
+
+# Fields compared when detecting which values changed on update
+CHANGE_CHECK_FIELDS = [
+    'permit_number', 'address', 'city', 'zip_code', 'parcel_number',
+    'latitude', 'longitude', 'owner_name', 'applicant_name',
+    'contractor_name', 'install_date', 'permit_date', 'expiration_date',
+    'system_type_raw', 'tank_size_gallons', 'drainfield_size_sqft',
+    'bedrooms', 'daily_flow_gpd', 'pdf_url', 'permit_url'
+]
+
+# Scraped value columns; bulk updates only overwrite these when the incoming
+# value is not None (same rule as ingest_permit's setattr loop)
+PERMIT_DATA_FIELDS = [
+    'permit_number', 'address', 'address_normalized', 'city', 'zip_code',
+    'parcel_number', 'latitude', 'longitude', 'owner_name', 'applicant_name',
+    'contractor_name', 'install_date', 'permit_date', 'expiration_date',
+    'system_type_raw', 'tank_size_gallons', 'drainfield_size_sqft', 'bedrooms',
+    'daily_flow_gpd', 'pdf_url', 'permit_url', 'source_portal_code',
+    'scraped_at', 'raw_data',
+]
+
+# Derived/metadata columns that bulk updates always overwrite
+BULK_METADATA_COLUMNS = [
+    'address_hash', 'address_normalizer_version', 'owner_name_normalized', 'system_type_id',
+    'source_portal_id', 'version', 'record_hash', 'updated_at',
+]
+
+
 class IngestionError(Exception):
     """Custom exception for ingestion-related errors."""
     pass
@@ -49,11 +93,13 @@ class PermitIngestionService:
     - Record hash comparison for change detection
     - Automatic version history creation
     - Duplicate candidate flagging
+    - Bulk mode for large imports (mode='bulk')
     """
 
     def __init__(self, db: Session):
         """Initialize ingestion service with database session."""
         self.db = db
+        self._states_loaded = False
         self._state_cache: Dict[str, int] = {}
         self._county_cache: Dict[str, int] = {}
         self._system_type_cache: Dict[str, int] = {}
@@ -78,6 +124,14 @@ class PermitIngestionService:
 
         return None
 
+    def _load_state_cache(self) -> None:
+        """Load every state code -> ID mapping in a single query."""
+        if self._states_loaded:
+            return
+        for state_id, code in self.db.query(State.id, State.code).all():
+            self._state_cache[code] = state_id
+        self._states_loaded = True
+
     def _get_or_create_county(self, county_name: str, state_id: int) -> Optional[int]:
         """Get or create county ID."""
         if not county_name or not state_id:
@@ -222,32 +276,9 @@ class PermitIngestionService:
         changed_fields: Optional[List[str]] = None
     ) -> PermitVersion:
         """Create a version history record for a permit."""
-        # Serialize current permit data
-        permit_data = {
-            'permit_number': permit.permit_number,
-            'address': permit.address,
-            'address_normalized': permit.address_normalized,
-            'city': permit.city,
-            'zip_code': permit.zip_code,
-            'parcel_number': permit.parcel_number,
-            'latitude': permit.latitude,
-            'longitude': permit.longitude,
-            'owner_name': permit.owner_name,
-            'applicant_name': permit.applicant_name,
-            'contractor_name': permit.contractor_name,
-            'install_date': str(permit.install_date) if permit.install_date else None,
-            'permit_date': str(permit.permit_date) if permit.permit_date else None,
-            'expiration_date': str(permit.expiration_date) if permit.expiration_date else None,
-            'system_type_raw': permit.system_type_raw,
-            'tank_size_gallons': permit.tank_size_gallons,
-            'drainfield_size_sqft': permit.drainfield_size_sqft,
-            'bedrooms': permit.bedrooms,
-            'daily_flow_gpd': permit.daily_flow_gpd,
-            'pdf_url': permit.pdf_url,
-            'permit_url': permit.permit_url,
-            'source_portal_code': permit.source_portal_code,
-            'scraped_at': permit.scraped_at.isoformat() if permit.scraped_at else None,
-        }
+        permit_data = self._snapshot_permit_data(
+            {field: getattr(permit, field, None) for field in VERSION_SNAPSHOT_FIELDS}
+        )
 
         version = PermitVersion(
             id=uuid.uuid4(),
@@ -263,23 +294,37 @@ class PermitIngestionService:
         self.db.add(version)
         return version
 
+    @staticmethod
+    def _snapshot_permit_data(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Serialize permit field values into a JSON-safe version snapshot."""
+        permit_data = {}
+        for field in VERSION_SNAPSHOT_FIELDS:
+            value = row.get(field)
+            if field == 'scraped_at':
+                value = value.isoformat() if value else None
+            elif field.endswith('_date'):
+                value = str(value) if value else None
+            permit_data[field] = value
+        return permit_data
+
     def _get_changed_fields(
         self,
-        existing: SepticPermit,
+        existing: Any,
         new_data: Dict[str, Any]
     ) -> List[str]:
-        """Determine which fields changed between existing and new data."""
+        """
+        Determine which fields changed between existing and new data.
+
+        ``existing`` may be a SepticPermit instance or a plain dict of
+        column values (bulk mode).
+        """
         changed = []
-        check_fields = [
-            'permit_number', 'address', 'city', 'zip_code', 'parcel_number',
-            'latitude', 'longitude', 'owner_name', 'applicant_name',
-            'contractor_name', 'install_date', 'permit_date', 'expiration_date',
-            'system_type_raw', 'tank_size_gallons', 'drainfield_size_sqft',
-            'bedrooms', 'daily_flow_gpd', 'pdf_url', 'permit_url'
-        ]
 
-        for field in check_fields:
-            old_val = getattr(existing, field, None)
+        for field in CHANGE_CHECK_FIELDS:
+            if isinstance(existing, dict):
+                old_val = existing.get(field)
+            else:
+                old_val = getattr(existing, field, None)
             new_val = new_data.get(field)
 
             # Convert dates to strings for comparison
@@ -293,6 +338,40 @@ class PermitIngestionService:
 
         return changed
 
+    @staticmethod
+    def _build_data_dict(
+        permit_data: PermitCreate,
+        address_normalized: Optional[str]
+    ) -> Dict[str, Any]:
+        """Map an incoming permit record onto septic_permits column values."""
+        # Keys must stay in sync with PERMIT_DATA_FIELDS
+        return {
+            'permit_number': permit_data.permit_number,
+            'address': permit_data.address,
+            'address_normalized': address_normalized,
+            'city': permit_data.city,
+            'zip_code': permit_data.zip_code,
+            'parcel_number': permit_data.parcel_number,
+            'latitude': permit_data.latitude,
+            'longitude': permit_data.longitude,
+            'owner_name': permit_data.owner_name,
+            'applicant_name': permit_data.applicant_name,
+            'contractor_name': permit_data.contractor_name,
+            'install_date': permit_data.install_date,
+            'permit_date': permit_data.permit_date,
+            'expiration_date': permit_data.expiration_date,
+            'system_type_raw': permit_data.system_type,
+            'tank_size_gallons': permit_data.tank_size_gallons,
+            'drainfield_size_sqft': permit_data.drainfield_size_sqft,
+            'bedrooms': permit_data.bedrooms,
+            'daily_flow_gpd': permit_data.daily_flow_gpd,
+            'pdf_url': permit_data.pdf_url,
+            'permit_url': permit_data.permit_url,
+            'source_portal_code': permit_data.source_portal_code,
+            'scraped_at': permit_data.scraped_at,
+            'raw_data': permit_data.raw_data,
+        }
+
     def ingest_permit(self, permit_data: PermitCreate) -> Tuple[Optional[uuid.UUID], str]:
         """
         Ingest a single permit record.
@@ -310,16 +389,15 @@ class PermitIngestionService:
             # Get county ID
             county_id = self._get_or_create_county(permit_data.county_name, state_id)
 
-            # Normalize address
-            address_normalized = normalize_address(permit_data.address)
+            # Canonicalize address
+            address_normalized = canonicalize_address(permit_data.address, permit_data.state_code)
             owner_normalized = normalize_owner_name(permit_data.owner_name)
 
-            # Compute address hash for deduplication
-            state = self.db.query(State).filter(State.id == state_id).first()
-            address_hash = compute_address_hash(
+            # Compute address hash for deduplication (shared with properties)
+            address_hash = canonical_address_hash(
                 address_normalized,
                 permit_data.county_name,
-                state.code if state else None
+                permit_data.state_code
             )
 
             # Look for existing permit
@@ -328,32 +406,7 @@ class PermitIngestionService:
             )
 
             # Prepare permit data dict
-            data_dict = {
-                'permit_number': permit_data.permit_number,
-                'address': permit_data.address,
-                'address_normalized': address_normalized,
-                'city': permit_data.city,
-                'zip_code': permit_data.zip_code,
-                'parcel_number': permit_data.parcel_number,
-                'latitude': permit_data.latitude,
-                'longitude': permit_data.longitude,
-                'owner_name': permit_data.owner_name,
-                'applicant_name': permit_data.applicant_name,
-                'contractor_name': permit_data.contractor_name,
-                'install_date': permit_data.install_date,
-                'permit_date': permit_data.permit_date,
-                'expiration_date': permit_data.expiration_date,
-                'system_type_raw': permit_data.system_type,
-                'tank_size_gallons': permit_data.tank_size_gallons,
-                'drainfield_size_sqft': permit_data.drainfield_size_sqft,
-                'bedrooms': permit_data.bedrooms,
-                'daily_flow_gpd': permit_data.daily_flow_gpd,
-                'pdf_url': permit_data.pdf_url,
-                'permit_url': permit_data.permit_url,
-                'source_portal_code': permit_data.source_portal_code,
-                'scraped_at': permit_data.scraped_at,
-                'raw_data': permit_data.raw_data,
-            }
+            data_dict = self._build_data_dict(permit_data, address_normalized)
 
             if existing:
                 # Check if data actually changed
@@ -372,6 +425,7 @@ class PermitIngestionService:
                         setattr(existing, field, value)
 
                 existing.address_hash = address_hash
+                existing.address_normalizer_version = ADDRESS_NORMALIZER_VERSION
                 existing.owner_name_normalized = owner_normalized
                 existing.system_type_id = self._get_system_type_id(permit_data.system_type)
                 existing.source_portal_id = self._get_or_create_portal(
@@ -391,6 +445,7 @@ class PermitIngestionService:
                     state_id=state_id,
                     county_id=county_id,
                     address_hash=address_hash,
+                    address_normalizer_version=ADDRESS_NORMALIZER_VERSION,
                     owner_name_normalized=owner_normalized,
                     system_type_id=self._get_system_type_id(permit_data.system_type),
                     source_portal_id=self._get_or_create_portal(
@@ -413,44 +468,15 @@ class PermitIngestionService:
             logger.error(f"Error ingesting permit: {e}")
             return None, 'error'
 
-    def ingest_batch(
+    def _ingest_rows(
         self,
         permits: List[PermitCreate],
-        source_portal_code: str
-    ) -> BatchIngestionResponse:
-        """
-        Ingest a batch of permits.
-
-        Args:
-            permits: List of permit records to ingest
-            source_portal_code: Source portal identifier
-
-        Returns:
-            BatchIngestionResponse with statistics
-        """
-        start_time = time.time()
-        batch_id = uuid.uuid4()
-
-        # Create import batch record
-        import_batch = PermitImportBatch(
-            id=batch_id,
-            source_name=source_portal_code,
-            total_records=len(permits),
-            status='processing',
-            started_at=datetime.utcnow()
-        )
-        self.db.add(import_batch)
-        self.db.commit()
-
-        stats = BatchIngestionStats(
-            batch_id=batch_id,
-            source_portal_code=source_portal_code,
-            total_records=len(permits)
-        )
-
-        errors = []
-
-        for i, permit_data in enumerate(permits):
+        stats: BatchIngestionStats,
+        errors: List[Dict[str, Any]],
+        offset: int = 0
+    ) -> None:
+        """Ingest records one at a time, committing every 100 rows."""
+        for i, permit_data in enumerate(permits, start=offset):
             try:
                 permit_id, action = self.ingest_permit(permit_data)
 
@@ -471,7 +497,7 @@ class PermitIngestionService:
                 # Commit every 100 records
                 if (i + 1) % 100 == 0:
                     self.db.commit()
-                    logger.info(f"Processed {i + 1}/{len(permits)} permits")
+                    logger.info(f"Processed {i + 1 - offset}/{len(permits)} permits")
 
             except Exception as e:
                 stats.errors += 1
@@ -482,11 +508,347 @@ class PermitIngestionService:
                 })
                 self.db.rollback()
 
+    def _ingest_bulk(
+        self,
+        permits: List[PermitCreate],
+        stats: BatchIngestionStats,
+        errors: List[Dict[str, Any]],
+        offset: int = 0
+    ) -> None:
+        """
+        Set-based ingestion for large imports.
+
+        Each chunk of BULK_CHUNK_SIZE records is normalized in memory,
+        matched against existing permits with one query, and written with
+        one multi-row INSERT for new permits, one UPDATE ... FROM (VALUES)
+        for changed permits and one multi-row INSERT for version rows.
+        A failing chunk is rolled back and all of its records are counted
+        as errors; other chunks are unaffected.
+        """
+        self._load_state_cache()
+
+        for start in range(0, len(permits), BULK_CHUNK_SIZE):
+            chunk = permits[start:start + BULK_CHUNK_SIZE]
+            chunk_offset = offset + start
+            try:
+                counts, chunk_errors = self._ingest_bulk_chunk(chunk, chunk_offset)
+                self.db.commit()
+            except Exception as e:
+                logger.error(f"Bulk chunk at offset {chunk_offset} failed: {e}")
+                self.db.rollback()
+                # Counties/portals created inside the failed transaction are gone
+                self._county_cache.clear()
+                self._portal_cache.clear()
+                stats.errors += len(chunk)
+                errors.extend(
+                    {
+                        'index': chunk_offset + i,
+                        'permit_number': getattr(permit_data, 'permit_number', 'unknown'),
+                        'error': str(e)
+                    }
+                    for i, permit_data in enumerate(chunk)
+                )
+                continue
+
+            stats.inserted += counts['inserted']
+            stats.updated += counts['updated']
+            stats.skipped += counts['skipped']
+            stats.errors += len(chunk_errors)
+            errors.extend(chunk_errors)
+            logger.info(f"Processed {start + len(chunk)}/{len(permits)} permits (bulk)")
+
+    def _ingest_bulk_chunk(
+        self,
+        chunk: List[PermitCreate],
+        offset: int
+    ) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """
+        Resolve and write one chunk of records.
+
+        Matching follows _find_existing_permit: address hash + state + county
+        first, then permit number + state. Records later in the chunk also
+        match records earlier in the chunk, so repeated rows collapse into
+        one insert plus updates instead of violating the dedup indexes.
+
+        Returns:
+            Tuple of (counts by action, per-record error entries)
+        """
+        now = datetime.utcnow()
+        counts = {'inserted': 0, 'updated': 0, 'skipped': 0}
+        chunk_errors = []
+
+        # 1. Normalize everything in memory
+        prepared = []
+        addresses = normalize_many(
+            [permit_data.address for permit_data in chunk],
+            states=[permit_data.state_code for permit_data in chunk]
+        )
+        for i, permit_data in enumerate(chunk, start=offset):
+            state_code = normalize_state(permit_data.state_code)
+            state_id = self._state_cache.get(state_code) if state_code else None
+            if not state_id:
+                chunk_errors.append({
+                    'index': i,
+                    'permit_number': permit_data.permit_number,
+                    'error': f"Unknown state code: {permit_data.state_code}"
+                })
+                continue
+
+            address_normalized = addresses[i - offset]
+            prepared.append({
+                'permit': permit_data,
+                'state_id': state_id,
+                'county_id': self._get_or_create_county(permit_data.county_name, state_id),
+                'address_hash': canonical_address_hash(
+                    address_normalized, permit_data.county_name, state_code
+                ),
+                'owner_normalized': normalize_owner_name(permit_data.owner_name),
+                'data': self._build_data_dict(permit_data, address_normalized),
+            })
+
+        # 2. Resolve every existing match with one query
+        by_address: Dict[Tuple, Dict[str, Any]] = {}
+        by_number: Dict[Tuple, Dict[str, Any]] = {}
+        for row in self._load_existing_permits(prepared):
+            self._index_bulk_row(row, by_address, by_number)
+
+        # 3. Decide insert / update / skip per record
+        inserts: List[Dict[str, Any]] = []
+        updates: Dict[uuid.UUID, Dict[str, Any]] = {}
+        versions: List[Dict[str, Any]] = []
+        new_ids = set()
+
+        for item in prepared:
+            permit_data = item['permit']
+            data_dict = item['data']
+            state_id = item['state_id']
+
+            target = None
+            if item['address_hash']:
+                target = by_address.get((item['address_hash'], state_id, item['county_id']))
+            if target is None and permit_data.permit_number:
+                target = by_number.get((permit_data.permit_number, state_id))
+
+            new_hash = self._compute_record_hash(data_dict)
+            system_type_id = self._get_system_type_id(permit_data.system_type)
+            portal_id = self._get_or_create_portal(permit_data.source_portal_code, state_id)
+
+            if target is not None:
+                if target['record_hash'] == new_hash:
+                    counts['skipped'] += 1
+                    continue
+
+                versions.append({
+                    'id': uuid.uuid4(),
+                    'permit_id': target['id'],
+                    'version': target['version'],
+                    'permit_data': self._snapshot_permit_data(target),
+                    'changed_fields': self._get_changed_fields(target, data_dict),
+                    'change_source': 'scraper',
+                    'source_portal_id': target['source_portal_id'],
+                    'scraped_at': target['scraped_at'],
+                    'created_by': 'system',
+                })
+
+                for field, value in data_dict.items():
+                    if value is not None:
+                        target[field] = value
+                target.update(
+                    address_hash=item['address_hash'],
+                    address_normalizer_version=ADDRESS_NORMALIZER_VERSION,
+                    owner_name_normalized=item['owner_normalized'],
+                    system_type_id=system_type_id,
+                    source_portal_id=portal_id,
+                    version=target['version'] + 1,
+                    record_hash=new_hash,
+                    updated_at=now,
+                )
+                if target['id'] not in new_ids:
+                    updates[target['id']] = target
+                counts['updated'] += 1
+            else:
+                target = {
+                    'id': uuid.uuid4(),
+                    'state_id': state_id,
+                    'county_id': item['county_id'],
+                    'address_hash': item['address_hash'],
+                    'address_normalizer_version': ADDRESS_NORMALIZER_VERSION,
+                    'owner_name_normalized': item['owner_normalized'],
+                    'system_type_id': system_type_id,
+                    'source_portal_id': portal_id,
+                    'is_active': True,
+                    'version': 1,
+                    'record_hash': new_hash,
+                    'updated_at': now,
+                    **data_dict
+                }
+                inserts.append(target)
+                new_ids.add(target['id'])
+                counts['inserted'] += 1
+
+            self._index_bulk_row(target, by_address, by_number)
+
+        # 4. Multi-row writes
+        self._write_bulk_chunk(inserts, list(updates.values()), versions)
+
+        return counts, chunk_errors
+
+    def _load_existing_permits(self, prepared: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Fetch every active permit matching the chunk's address hashes or
+        permit numbers using ``= ANY(array)`` predicates.
+
+        raw_data is not loaded; bulk updates COALESCE it server-side.
+        """
+        hashes = sorted({p['address_hash'] for p in prepared if p['address_hash']})
+        numbers = sorted({p['permit'].permit_number for p in prepared if p['permit'].permit_number})
+        state_ids = sorted({p['state_id'] for p in prepared})
+
+        if not hashes and not numbers:
+            return []
+
+        conditions = []
+        if hashes:
+            conditions.append(SepticPermit.address_hash == any_(
+                literal(hashes, ARRAY(SepticPermit.address_hash.type))
+            ))
+        if numbers:
+            conditions.append(SepticPermit.permit_number == any_(
+                literal(numbers, ARRAY(SepticPermit.permit_number.type))
+            ))
+
+        loaded_columns = ['id', 'state_id', 'county_id'] + [
+            name for name in PERMIT_DATA_FIELDS + BULK_METADATA_COLUMNS
+            if name != 'raw_data'
+        ]
+        rows = self.db.query(
+            *[getattr(SepticPermit, name) for name in loaded_columns]
+        ).filter(
+            SepticPermit.is_active == True,
+            SepticPermit.state_id.in_(state_ids),
+            or_(*conditions)
+        ).all()
+
+        return [row._asdict() for row in rows]
+
+    @staticmethod
+    def _index_bulk_row(
+        row: Dict[str, Any],
+        by_address: Dict[Tuple, Dict[str, Any]],
+        by_number: Dict[Tuple, Dict[str, Any]]
+    ) -> None:
+        """Register a permit row under both dedup keys (first match wins)."""
+        if row.get('address_hash'):
+            by_address.setdefault((row['address_hash'], row['state_id'], row['county_id']), row)
+        if row.get('permit_number'):
+            by_number.setdefault((row['permit_number'], row['state_id']), row)
+
+    def _write_bulk_chunk(
+        self,
+        inserts: List[Dict[str, Any]],
+        updates: List[Dict[str, Any]],
+        versions: List[Dict[str, Any]]
+    ) -> None:
+        """Write a chunk's inserts, updates and version rows in three statements."""
+        table = SepticPermit.__table__
+
+        if inserts:
+            # executemany with a list of dicts is rendered as multi-row
+            # INSERT ... VALUES batches by SQLAlchemy's insertmanyvalues
+            self.db.execute(insert(table), inserts)
+
+        if updates:
+            names = ['id'] + PERMIT_DATA_FIELDS + BULK_METADATA_COLUMNS
+            incoming = values(
+                *[column(name, table.c[name].type) for name in names],
+                name='incoming'
+            ).data([tuple(row.get(name) for name in names) for row in updates])
+
+            assignments = {
+                name: func.coalesce(cast(incoming.c[name], table.c[name].type), table.c[name])
+                for name in PERMIT_DATA_FIELDS
+            }
+            assignments.update({
+                name: cast(incoming.c[name], table.c[name].type)
+                for name in BULK_METADATA_COLUMNS
+            })
+
+            self.db.execute(
+                update(table)
+                .where(table.c.id == cast(incoming.c.id, table.c.id.type))
+                .values(assignments)
+            )
+
+        if versions:
+            self.db.execute(insert(PermitVersion.__table__), versions)
+
+    def begin_import_batch(
+        self,
+        source_portal_code: str,
+        total_records: int = 0
+    ) -> Tuple[PermitImportBatch, BatchIngestionStats]:
+        """
+        Create the PermitImportBatch tracking row and an empty stats object.
+
+        Used together with ingest_records/finish_import_batch by callers that
+        feed records incrementally (e.g. the streaming NDJSON endpoint).
+        """
+        batch_id = uuid.uuid4()
+
+        import_batch = PermitImportBatch(
+            id=batch_id,
+            source_name=source_portal_code,
+            total_records=total_records,
+            status='processing',
+            started_at=datetime.utcnow()
+        )
+        self.db.add(import_batch)
+        self.db.commit()
+
+        stats = BatchIngestionStats(
+            batch_id=batch_id,
+            source_portal_code=source_portal_code,
+            total_records=total_records
+        )
+        return import_batch, stats
+
+    def ingest_records(
+        self,
+        permits: List[PermitCreate],
+        stats: BatchIngestionStats,
+        errors: List[Dict[str, Any]],
+        mode: str = 'row',
+        offset: int = 0
+    ) -> None:
+        """
+        Ingest one slice of an import batch, updating stats and errors in place.
+
+        Args:
+            permits: Records to ingest
+            stats: Running statistics for the import batch
+            errors: Running error detail list for the import batch
+            mode: 'row' or 'bulk' (see ingest_batch)
+            offset: Position of permits[0] within the whole import, used for
+                error 'index' values
+        """
+        if mode == 'bulk':
+            self._ingest_bulk(permits, stats, errors, offset)
+        else:
+            self._ingest_rows(permits, stats, errors, offset)
+
+    def finish_import_batch(
+        self,
+        import_batch: PermitImportBatch,
+        stats: BatchIngestionStats,
+        errors: List[Dict[str, Any]],
+        start_time: float
+    ) -> BatchIngestionResponse:
+        """Commit remaining work and record final counters on the import batch."""
         # Final commit
         self.db.commit()
 
         # Update source portal stats
-        portal_id = self._portal_cache.get(source_portal_code)
+        portal_id = self._portal_cache.get(stats.source_portal_code)
         if portal_id:
             portal = self.db.query(SourcePortal).filter(SourcePortal.id == portal_id).first()
             if portal:
@@ -498,6 +860,7 @@ class PermitIngestionService:
         import_batch.status = 'completed' if stats.errors == 0 else 'completed_with_errors'
         import_batch.completed_at = datetime.utcnow()
         import_batch.processing_time_seconds = elapsed
+        import_batch.total_records = stats.total_records
         import_batch.inserted = stats.inserted
         import_batch.updated = stats.updated
         import_batch.skipped = stats.skipped
@@ -507,20 +870,49 @@ class PermitIngestionService:
         self.db.commit()
 
         stats.processing_time_seconds = elapsed
+        stats.rows_per_second = stats.total_records / elapsed if elapsed > 0 else 0.0
         stats.error_details = errors if errors else None
 
         logger.info(
             f"Batch ingestion complete: {stats.inserted} inserted, "
             f"{stats.updated} updated, {stats.skipped} skipped, "
-            f"{stats.errors} errors in {elapsed:.2f}s"
+            f"{stats.errors} errors in {elapsed:.2f}s "
+            f"({stats.rows_per_second:.0f} rows/s)"
         )
 
         return BatchIngestionResponse(
             status='completed' if stats.errors == 0 else 'completed_with_errors',
             stats=stats,
-            message=f"Processed {len(permits)} records"
+            message=f"Processed {stats.total_records} records"
         )
 
+    def ingest_batch(
+        self,
+        permits: List[PermitCreate],
+        source_portal_code: str,
+        mode: str = 'row'
+    ) -> BatchIngestionResponse:
+        """
+        Ingest a batch of permits.
+
+        Args:
+            permits: List of permit records to ingest
+            source_portal_code: Source portal identifier
+            mode: 'row' processes records one at a time through ingest_permit;
+                'bulk' resolves matches per chunk with a single query and
+                writes with multi-row statements (see _ingest_bulk)
+
+        Returns:
+            BatchIngestionResponse with statistics
+        """
+        start_time = time.time()
+        import_batch, stats = self.begin_import_batch(source_portal_code, len(permits))
+
+        errors = []
+        self.ingest_records(permits, stats, errors, mode=mode)
+
+        return self.finish_import_batch(import_batch, stats, errors, start_time)
+
 
 # Factory function for easy service creation
 def get_permit_ingestion_service(db: Session) -> PermitIngestionService:
@@ -0,0 +1,594 @@
+"""
+Permit-to-property linking service.
+
+Links unlinked septic permits to properties in resumable background runs:
+- Permits are read in (updated_at, id) keyset chunks; each chunk is linked
+  by a set-based address_hash join in SQL, then the remainder is matched on
+  canonical addresses via an indexed address_normalized lookup (catches
+  permits filed under a different county),
+  and what is still left goes through the blocking fuzzy matcher
+  (address_matching_service); only matches at or above min_confidence
+  are written
+- Links are written with UPDATE ... FROM (VALUES ...)
+- Incremental runs only examine permits and properties changed since the
+  last completed run; a checkpoint per scope records watermarks and the
+  position of an in-progress run so it resumes after interruption
+"""
+
+import logging
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy import (
+    select, update, values, column, cast, literal, any_, func, text
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.models.property import Property, PermitLinkCheckpoint
+from app.models.septic_permit import SepticPermit, State
+from app.services.address_matching_service import MatchConfidence
+from app.services.property_service import PropertyService
+from app.utils.address_normalization import canonicalize_address
+from app.utils.pagination import keyset_order_by, keyset_page
+
+logger = logging.getLogger(__name__)
+
+
+# Permits (or properties) per transaction
+LINK_CHUNK_SIZE = 5000
+
+# Matches kept for dry-run previews
+PREVIEW_SAMPLE_SIZE = 20
+
+# Lowest fuzzy tier written by default (LOW is opt-in)
+FUZZY_MIN_CONFIDENCE = MatchConfidence.MEDIUM
+
+# Incremental runs re-examine this much before the watermark, covering
+# transactions that started before the previous run but committed after it
+WATERMARK_OVERLAP = timedelta(minutes=10)
+
+
+class LinkingError(Exception):
+    """Custom exception for permit linking errors."""
+    pass
+
+
+class PermitLinkingService:
+    """
+    Incremental, checkpointed permit-to-property linker.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize linking service with database session."""
+        self.db = db
+        self.properties = PropertyService(db)
+        self._lock_conn = None
+
+    # ===== SCOPE / CHECKPOINT =====
+
+    def _resolve_scope(
+        self,
+        state_code: Optional[str],
+        county_id: Optional[int]
+    ) -> Tuple[str, Optional[int]]:
+        """Checkpoint scope key and state id for a run."""
+        if not state_code:
+            if county_id:
+                raise LinkingError("county_id requires state_code")
+            return 'all', None
+
+        state_id = self.db.query(State.id).filter(State.code == state_code.upper()).scalar()
+        if not state_id:
+            raise LinkingError(f"State {state_code} not found")
+
+        scope = state_code.upper()
+        if county_id:
+            scope = f"{scope}:county:{county_id}"
+        return scope, state_id
+
+    def _get_checkpoint(self, scope: str) -> PermitLinkCheckpoint:
+        """Load or create the checkpoint row for a scope."""
+        checkpoint = self.db.query(PermitLinkCheckpoint).filter(
+            PermitLinkCheckpoint.scope == scope
+        ).first()
+        if not checkpoint:
+            checkpoint = PermitLinkCheckpoint(scope=scope, status='idle')
+            self.db.add(checkpoint)
+            self.db.flush()
+        return checkpoint
+
+    def _try_lock(self, scope: str) -> bool:
+        """
+        Take a session advisory lock so only one run per scope is active.
+
+        The lock lives on its own connection: the ORM session may switch
+        pooled connections between the per-chunk commits.
+        """
+        self._lock_conn = self.db.get_bind().connect()
+        locked = bool(self._lock_conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"),
+            {'key': self._lock_key(scope)}
+        ).scalar())
+        if not locked:
+            self._lock_conn.close()
+            self._lock_conn = None
+        return locked
+
+    def _unlock(self, scope: str) -> None:
+        """Release the scope's advisory lock."""
+        if self._lock_conn is None:
+            return
+        try:
+            self._lock_conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"),
+                {'key': self._lock_key(scope)}
+            )
+        finally:
+            self._lock_conn.close()
+            self._lock_conn = None
+
+    @staticmethod
+    def _lock_key(scope: str) -> int:
+        """Stable 32-bit advisory lock key for a scope."""
+        return zlib.crc32(f"permit_link:{scope}".encode())
+
+    @staticmethod
+    def _scope_filters(model, state_id: Optional[int], county_id: Optional[int]) -> List[Any]:
+        """Active-record and state/county filters for a model."""
+        filters = [model.is_active == True]
+        if state_id:
+            filters.append(model.state_id == state_id)
+        if county_id:
+            filters.append(model.county_id == county_id)
+        return filters
+
+    # ===== MATCHING =====
+
+    def _link_by_hash(self, permit_ids: List[Any]) -> set:
+        """Link permits whose address_hash matches a property in the same state."""
+        if not permit_ids:
+            return set()
+
+        permits = SepticPermit.__table__
+        properties = Property.__table__
+        result = self.db.execute(
+            update(permits)
+            .where(
+                permits.c.id == any_(literal(permit_ids, ARRAY(permits.c.id.type))),
+                permits.c.property_id.is_(None),
+                properties.c.address_hash == permits.c.address_hash,
+                properties.c.state_id == permits.c.state_id,
+                properties.c.is_active == True
+            )
+            # Linking is not a data change (keeps embeddings/increments stable)
+            .values(property_id=properties.c.id, updated_at=permits.c.updated_at)
+            .returning(permits.c.id)
+        )
+        return {row[0] for row in result}
+
+    def _match_enhanced(self, permits: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Match permits on canonical address against
+        properties.address_normalized (indexed lookup).
+
+        Prefers a property in the permit's county; otherwise accepts a
+        single statewide candidate and skips ambiguous ones.
+        """
+        candidates = {}
+        for permit in permits:
+            enhanced = canonicalize_address(permit.address, permit.state_code)
+            if enhanced:
+                candidates[permit.id] = enhanced
+        if not candidates:
+            return []
+
+        addresses = sorted(set(candidates.values()))
+        state_ids = sorted({permit.state_id for permit in permits})
+        rows = self.db.query(
+            Property.id, Property.address_normalized, Property.state_id, Property.county_id
+        ).filter(
+            Property.is_active == True,
+            Property.state_id.in_(state_ids),
+            Property.address_normalized == any_(
+                literal(addresses, ARRAY(Property.address_normalized.type))
+            )
+        ).all()
+
+        by_address: Dict[Tuple[str, int], List[Any]] = {}
+        for row in rows:
+            by_address.setdefault((row.address_normalized, row.state_id), []).append(row)
+
+        matches = []
+        for permit in permits:
+            enhanced = candidates.get(permit.id)
+            found = by_address.get((enhanced, permit.state_id)) if enhanced else None
+            if not found:
+                continue
+
+            same_county = [p for p in found if permit.county_id and p.county_id == permit.county_id]
+            if same_county:
+                chosen = same_county[0]
+            elif len(found) == 1:
+                chosen = found[0]
+            else:
+                continue
+
+            matches.append({
+                'permit_id': permit.id,
+                'property_id': chosen.id,
+                'original_address': permit.address,
+                'normalized_address': enhanced,
+                'method': 'enhanced',
+                'confidence': MatchConfidence.EXACT.value,
+                'score': 100.0,
+            })
+
+        return matches
+
+    def _match_fuzzy(
+        self,
+        permits: List[Any],
+        min_confidence: MatchConfidence = FUZZY_MIN_CONFIDENCE
+    ) -> List[Dict[str, Any]]:
+        """
+        Fuzzy-match permits against properties sharing their street block.
+
+        Candidates come from the permit's county, or the whole state when
+        the permit has no county. Matches below ``min_confidence`` and
+        ambiguous ones are dropped.
+        """
+        groups: Dict[Tuple[int, Optional[int]], List[Tuple[Any, Optional[str], Optional[str]]]] = {}
+        originals = {}
+        for permit in permits:
+            enhanced = canonicalize_address(permit.address, permit.state_code)
+            if not enhanced:
+                continue
+            groups.setdefault((permit.state_id, permit.county_id), []).append(
+                (permit.id, enhanced, permit.zip_code)
+            )
+            originals[permit.id] = permit.address
+
+        matches = []
+        for (state_id, county_id), queries in groups.items():
+            for match in self.properties.find_address_matches(queries, state_id, county_id):
+                if not match.meets(min_confidence):
+                    continue
+                matches.append({
+                    'permit_id': match.query_key,
+                    'property_id': match.candidate_key,
+                    'original_address': originals[match.query_key],
+                    'normalized_address': match.candidate_address,
+                    'method': match.method,
+                    'confidence': match.confidence.value,
+                    'score': match.score,
+                })
+
+        return matches
+
+    def _write_links(self, matches: List[Dict[str, Any]]) -> int:
+        """Write permit -> property links with one UPDATE ... FROM (VALUES ...)."""
+        if not matches:
+            return 0
+
+        permits = SepticPermit.__table__
+        incoming = values(
+            column('permit_id', permits.c.id.type),
+            column('property_id', permits.c.property_id.type),
+            name='incoming'
+        ).data([(m['permit_id'], m['property_id']) for m in matches])
+
+        result = self.db.execute(
+            update(permits)
+            .where(
+                permits.c.id == cast(incoming.c.permit_id, permits.c.id.type),
+                permits.c.property_id.is_(None)
+            )
+            .values(
+                property_id=cast(incoming.c.property_id, permits.c.property_id.type),
+                updated_at=permits.c.updated_at
+            )
+        )
+        return result.rowcount
+
+    def _link_properties_by_hash(self, property_ids: List[Any]) -> int:
+        """Link unlinked permits to recently changed properties by address_hash."""
+        if not property_ids:
+            return 0
+
+        permits = SepticPermit.__table__
+        properties = Property.__table__
+        result = self.db.execute(
+            update(permits)
+            .where(
+                properties.c.id == any_(literal(property_ids, ARRAY(properties.c.id.type))),
+                properties.c.address_hash.isnot(None),
+                permits.c.address_hash == properties.c.address_hash,
+                permits.c.state_id == properties.c.state_id,
+                permits.c.property_id.is_(None),
+                permits.c.is_active == True
+            )
+            .values(property_id=properties.c.id, updated_at=permits.c.updated_at)
+        )
+        return result.rowcount
+
+    # ===== CHUNK READERS =====
+
+    def _next_permits(
+        self,
+        state_id: Optional[int],
+        county_id: Optional[int],
+        since: Optional[datetime],
+        cursor: Tuple[Optional[datetime], Optional[Any]],
+        chunk_size: int
+    ) -> List[Any]:
+        """Next chunk of unlinked permits in (updated_at, id) order."""
+        query = select(
+            SepticPermit.id, SepticPermit.updated_at, SepticPermit.address,
+            SepticPermit.zip_code, SepticPermit.state_id, SepticPermit.county_id,
+            State.code.label('state_code')
+        ).join(
+            State, State.id == SepticPermit.state_id
+        ).where(
+            SepticPermit.property_id.is_(None),
+            *self._scope_filters(SepticPermit, state_id, county_id)
+        )
+        if since:
+            query = query.where(SepticPermit.updated_at >= since)
+        query = query.order_by(
+            *keyset_order_by(SepticPermit.updated_at, SepticPermit.id, False)
+        )
+        if cursor[1] is None:
+            return self.db.execute(query.limit(chunk_size)).all()
+        return keyset_page(
+            lambda segment, limit: self.db.execute(query.where(segment).limit(limit)).all(),
+            SepticPermit.updated_at, SepticPermit.id, False, cursor[0], cursor[1], chunk_size
+        )
+
+    def _next_properties(
+        self,
+        state_id: Optional[int],
+        county_id: Optional[int],
+        since: datetime,
+        cursor: Tuple[Optional[datetime], Optional[Any]],
+        chunk_size: int
+    ) -> List[Any]:
+        """Next chunk of properties changed since ``since`` in (updated_at, id) order."""
+        query = select(Property.id, Property.updated_at).where(
+            Property.updated_at >= since,
+            Property.address_hash.isnot(None),
+            *self._scope_filters(Property, state_id, county_id)
+        )
+        query = query.order_by(
+            *keyset_order_by(Property.updated_at, Property.id, False)
+        )
+        if cursor[1] is None:
+            return self.db.execute(query.limit(chunk_size)).all()
+        return keyset_page(
+            lambda segment, limit: self.db.execute(query.where(segment).limit(limit)).all(),
+            Property.updated_at, Property.id, False, cursor[0], cursor[1], chunk_size
+        )
+
+    # ===== RUNS =====
+
+    def run(
+        self,
+        state_code: Optional[str] = None,
+        county_id: Optional[int] = None,
+        full: bool = False,
+        chunk_size: int = LINK_CHUNK_SIZE,
+        time_budget_seconds: Optional[float] = None,
+        min_confidence: MatchConfidence = FUZZY_MIN_CONFIDENCE
+    ) -> Dict[str, Any]:
+        """
+        Link unlinked permits to properties for a scope.
+
+        Incremental by default: only permits and properties changed since
+        the last completed run are examined (the first run is always full).
+        Commits and checkpoints after every chunk; an interrupted or
+        time-limited run resumes from its checkpoint on the next call.
+
+        Args:
+            state_code: Limit to one state (optional)
+            county_id: Limit to one county within state_code (optional)
+            full: Re-examine every unlinked permit regardless of watermarks
+            chunk_size: Records per chunk / transaction
+            time_budget_seconds: Stop (resumably) after roughly this long
+            min_confidence: Lowest fuzzy match tier to link
+
+        Returns:
+            Dict with scope, mode, counts, timings and whether the run finished
+        """
+        scope, state_id = self._resolve_scope(state_code, county_id)
+
+        if not self._try_lock(scope):
+            return {"scope": scope, "status": "skipped", "reason": "already running"}
+
+        start_time = time.time()
+        stats = {
+            "scope": scope,
+            "permits_examined": 0,
+            "linked_by_hash": 0,
+            "linked_by_enhanced": 0,
+            "linked_by_fuzzy": 0,
+            "properties_examined": 0,
+            "linked_by_property": 0,
+            "chunks": 0,
+        }
+
+        try:
+            checkpoint = self._get_checkpoint(scope)
+
+            if checkpoint.status in ('running', 'failed') and checkpoint.run_started_at:
+                logger.info(f"Resuming permit linking for {scope} from checkpoint")
+            else:
+                checkpoint.status = 'running'
+                checkpoint.run_mode = 'full' if full or not checkpoint.permit_watermark else 'incremental'
+                checkpoint.run_started_at = self.db.execute(select(func.now())).scalar()
+                checkpoint.permit_cursor_at = checkpoint.permit_cursor_id = None
+                checkpoint.property_cursor_at = checkpoint.property_cursor_id = None
+                checkpoint.last_error = None
+            self.db.commit()
+
+            incremental = checkpoint.run_mode == 'incremental'
+            stats["mode"] = checkpoint.run_mode
+
+            def out_of_time() -> bool:
+                return (
+                    time_budget_seconds is not None and
+                    time.time() - start_time >= time_budget_seconds
+                )
+
+            # Pass 1: unlinked permits (all, or changed since last run)
+            finished = False
+            while not out_of_time():
+                rows = self._next_permits(
+                    state_id, county_id,
+                    checkpoint.permit_watermark - WATERMARK_OVERLAP if incremental else None,
+                    (checkpoint.permit_cursor_at, checkpoint.permit_cursor_id),
+                    chunk_size
+                )
+                if not rows:
+                    finished = True
+                    break
+
+                linked = self._link_by_hash([row.id for row in rows])
+                remaining = [row for row in rows if row.id not in linked]
+                matches = self._match_enhanced(remaining)
+                stats["linked_by_hash"] += len(linked)
+                stats["linked_by_enhanced"] += self._write_links(matches)
+
+                matched = {m['permit_id'] for m in matches}
+                fuzzy = self._match_fuzzy(
+                    [row for row in remaining if row.id not in matched], min_confidence
+                )
+                stats["linked_by_fuzzy"] += self._write_links(fuzzy)
+                stats["permits_examined"] += len(rows)
+                stats["chunks"] += 1
+
+                checkpoint.permit_cursor_at = rows[-1].updated_at
+                checkpoint.permit_cursor_id = rows[-1].id
+                self.db.commit()
+
+            # Pass 2: properties changed since last run may match older permits
+            if finished and incremental and checkpoint.property_watermark:
+                finished = False
+                while not out_of_time():
+                    rows = self._next_properties(
+                        state_id, county_id, checkpoint.property_watermark - WATERMARK_OVERLAP,
+                        (checkpoint.property_cursor_at, checkpoint.property_cursor_id),
+                        chunk_size
+                    )
+                    if not rows:
+                        finished = True
+                        break
+
+                    stats["linked_by_property"] += self._link_properties_by_hash([row.id for row in rows])
+                    stats["properties_examined"] += len(rows)
+                    stats["chunks"] += 1
+
+                    checkpoint.property_cursor_at = rows[-1].updated_at
+                    checkpoint.property_cursor_id = rows[-1].id
+                    self.db.commit()
+
+            elapsed = time.time() - start_time
+            stats["elapsed_seconds"] = round(elapsed, 2)
+            stats["permits_per_second"] = round(stats["permits_examined"] / elapsed, 1) if elapsed > 0 else 0.0
+            stats["finished"] = finished
+
+            if finished:
+                # Everything changed before this run started has been examined
+                checkpoint.permit_watermark = checkpoint.run_started_at
+                checkpoint.property_watermark = checkpoint.run_started_at
+                checkpoint.status = 'idle'
+                checkpoint.permit_cursor_at = checkpoint.permit_cursor_id = None
+                checkpoint.property_cursor_at = checkpoint.property_cursor_id = None
+            checkpoint.last_run_stats = stats
+            self.db.commit()
+
+            stats["status"] = "completed" if finished else "paused"
+            logger.info(
+                f"Permit linking {scope}: {stats['permits_examined']:,} permits examined, "
+                f"{stats['linked_by_hash'] + stats['linked_by_enhanced'] + stats['linked_by_fuzzy'] + stats['linked_by_property']:,} "
+                f"linked in {elapsed:.1f}s"
+            )
+            return stats
+
+        except Exception as e:
+            self.db.rollback()
+            checkpoint = self._get_checkpoint(scope)
+            checkpoint.status = 'failed'
+            checkpoint.last_error = str(e)
+            self.db.commit()
+            raise LinkingError(f"Permit linking failed for {scope}: {str(e)}")
+
+        finally:
+            self._unlock(scope)
+
+    def preview(
+        self,
+        state_code: str,
+        county_id: Optional[int] = None,
+        limit: int = LINK_CHUNK_SIZE,
+        min_confidence: MatchConfidence = FUZZY_MIN_CONFIDENCE
+    ) -> Dict[str, Any]:
+        """
+        Dry run: report enhanced-normalization and fuzzy matches for up to
+        ``limit`` unlinked permits without writing anything.
+        """
+        _, state_id = self._resolve_scope(state_code, county_id)
+        rows = self._next_permits(state_id, county_id, None, (None, None), limit)
+        matches = self._match_enhanced(rows)
+        matched = {m['permit_id'] for m in matches}
+        matches += self._match_fuzzy([row for row in rows if row.id not in matched], min_confidence)
+
+        by_confidence: Dict[str, int] = {}
+        for m in matches:
+            by_confidence[m['confidence']] = by_confidence.get(m['confidence'], 0) + 1
+
+        return {
+            "unlinked_permits_checked": len(rows),
+            "would_link": len(matches),
+            "by_confidence": by_confidence,
+            "sample_matches": [
+                {
+                    "permit_id": str(m['permit_id']),
+                    "original_address": m['original_address'],
+                    "normalized_address": m['normalized_address'],
+                    "property_id": str(m['property_id']),
+                    "method": m['method'],
+                    "confidence": m['confidence'],
+                    "score": m['score'],
+                }
+                for m in matches[:PREVIEW_SAMPLE_SIZE]
+            ]
+        }
+
+    def get_checkpoint(self, state_code: Optional[str] = None, county_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Current checkpoint for a scope, for status reporting."""
+        scope, _ = self._resolve_scope(state_code, county_id)
+        checkpoint = self.db.query(PermitLinkCheckpoint).filter(
+            PermitLinkCheckpoint.scope == scope
+        ).first()
+        if not checkpoint:
+            return None
+
+        return {
+            "scope": checkpoint.scope,
+            "status": checkpoint.status,
+            "run_mode": checkpoint.run_mode,
+            "permit_watermark": checkpoint.permit_watermark,
+            "property_watermark": checkpoint.property_watermark,
+            "run_started_at": checkpoint.run_started_at,
+            "last_run_stats": checkpoint.last_run_stats,
+            "last_error": checkpoint.last_error,
+            "updated_at": checkpoint.updated_at,
+        }
+
+
+# Factory function
+def get_permit_linking_service(db: Session) -> PermitLinkingService:
+    """Create a permit linking service instance."""
+    return PermitLinkingService(db)
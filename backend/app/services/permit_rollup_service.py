@@ -0,0 +1,306 @@
+"""
+Septic permit rollup service.
+
+Reads dashboard statistics and search facets from permit_rollups, a table
+of per-state, per-county, per-year and per-month counters kept current by
+statement-level triggers on septic_permits (see PermitRollup). Reads touch
+a handful of small rows instead of aggregating 7M+ permits; nationwide
+figures sum the per-state rows.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy.orm import Session
+from sqlalchemy import func, desc, text
+
+from app.models.septic_permit import PermitRollup, State, County
+
+logger = logging.getLogger(__name__)
+
+
+# ===== ROLLUP SQL =====
+# Used by rebuild(); the permit_rollups migration installed the trigger
+# functions from a frozen copy of this SQL. Changing it needs a new
+# migration carrying the new trigger functions.
+#
+# Every counter is keyed by state, so concurrent writers only contend on
+# their own state's rows; there is no global row every statement would
+# have to lock until commit. Grand totals, years and months are summed
+# over the per-state rows when read.
+
+# Rows contributing to the rollups from one relation, with a +1/-1 sign
+DELTA_SELECT = """
+    SELECT
+        state_id,
+        COALESCE(county_id, 0) AS county_id,
+        COALESCE(EXTRACT(YEAR FROM permit_date)::int, 0) AS permit_year,
+        COALESCE((EXTRACT(YEAR FROM permit_date) * 100 + EXTRACT(MONTH FROM permit_date))::int, 0) AS permit_month,
+        data_quality_score AS quality,
+        {sign} AS sign
+    FROM {relation}
+    WHERE is_active
+"""
+
+# Fan each delta row out to every dimension and add it to the counters.
+# Rows are upserted in key order so concurrent statements lock rollup rows
+# in the same order.
+ROLLUP_UPSERT = """
+    WITH delta AS (
+        {delta}
+    ),
+    expanded AS (
+        SELECT 'state' AS dimension, state_id, 0 AS county_id, 0 AS period, sign, quality FROM delta
+        UNION ALL
+        SELECT 'county', state_id, county_id, 0, sign, quality FROM delta WHERE county_id <> 0
+        UNION ALL
+        SELECT 'state_year', state_id, 0, permit_year, sign, quality FROM delta
+        UNION ALL
+        SELECT 'state_month', state_id, 0, permit_month, sign, quality FROM delta
+    )
+    INSERT INTO permit_rollups AS r (
+        dimension, state_id, county_id, period,
+        permit_count, quality_sum, quality_count, updated_at
+    )
+    SELECT
+        dimension, state_id, county_id, period,
+        SUM(sign),
+        SUM(sign * COALESCE(quality, 0)),
+        SUM(CASE WHEN quality IS NOT NULL THEN sign ELSE 0 END),
+        now()
+    FROM expanded
+    GROUP BY dimension, state_id, county_id, period
+    HAVING SUM(sign) <> 0
+        OR SUM(sign * COALESCE(quality, 0)) <> 0
+        OR SUM(CASE WHEN quality IS NOT NULL THEN sign ELSE 0 END) <> 0
+    ORDER BY dimension, state_id, county_id, period
+    ON CONFLICT (dimension, state_id, county_id, period) DO UPDATE SET
+        permit_count = r.permit_count + EXCLUDED.permit_count,
+        quality_sum = r.quality_sum + EXCLUDED.quality_sum,
+        quality_count = r.quality_count + EXCLUDED.quality_count,
+        updated_at = EXCLUDED.updated_at
+"""
+
+ROLLUP_TRIGGERS = {
+    # operation: (transition table clause, delta rows)
+    'insert': (
+        'REFERENCING NEW TABLE AS new_rows',
+        DELTA_SELECT.format(sign=1, relation='new_rows'),
+    ),
+    'update': (
+        'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows',
+        DELTA_SELECT.format(sign=1, relation='new_rows') + ' UNION ALL ' +
+        DELTA_SELECT.format(sign=-1, relation='old_rows'),
+    ),
+    'delete': (
+        'REFERENCING OLD TABLE AS old_rows',
+        DELTA_SELECT.format(sign=-1, relation='old_rows'),
+    ),
+}
+
+# Recomputes every counter from septic_permits (into an emptied table)
+REBUILD_SQL = ROLLUP_UPSERT.format(delta=DELTA_SELECT.format(sign=1, relation='septic_permits'))
+
+
+def rollup_trigger_statements() -> List[str]:
+    """CREATE statements for the statement-level rollup triggers on septic_permits."""
+    statements = []
+    for operation, (referencing, delta) in ROLLUP_TRIGGERS.items():
+        statements.append(f"""
+            CREATE OR REPLACE FUNCTION permit_rollups_after_{operation}()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                {ROLLUP_UPSERT.format(delta=delta)};
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        statements.append(f"""
+            DROP TRIGGER IF EXISTS trig_septic_permits_rollup_{operation} ON septic_permits;
+            CREATE TRIGGER trig_septic_permits_rollup_{operation}
+            AFTER {operation.upper()} ON septic_permits
+            {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION permit_rollups_after_{operation}();
+        """)
+    return statements
+
+
+def drop_rollup_trigger_statements() -> List[str]:
+    """DROP statements reversing rollup_trigger_statements()."""
+    statements = []
+    for operation in ROLLUP_TRIGGERS:
+        statements.append(f'DROP TRIGGER IF EXISTS trig_septic_permits_rollup_{operation} ON septic_permits')
+        statements.append(f'DROP FUNCTION IF EXISTS permit_rollups_after_{operation}()')
+    return statements
+
+
+class PermitRollupService:
+    """
+    Constant-time permit statistics backed by permit_rollups.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize rollup service with database session."""
+        self.db = db
+
+    def _rows(self, dimension: str):
+        """Query over one rollup dimension, skipping emptied counters."""
+        return self.db.query(PermitRollup).filter(
+            PermitRollup.dimension == dimension,
+            PermitRollup.permit_count > 0
+        )
+
+    def _sum_over_states(self, dimension: str, period: int) -> int:
+        """Permit count of one period summed over every state's row."""
+        return self.db.query(
+            func.coalesce(func.sum(PermitRollup.permit_count), 0)
+        ).filter(
+            PermitRollup.dimension == dimension,
+            PermitRollup.period == period
+        ).scalar()
+
+    def get_totals(self) -> Optional[Any]:
+        """
+        Grand totals summed over the per-state rows (None until the rollups
+        are populated).
+
+        Returns:
+            Row with permit_count, quality_sum, quality_count and updated_at
+        """
+        totals = self.db.query(
+            func.sum(PermitRollup.permit_count).label('permit_count'),
+            func.sum(PermitRollup.quality_sum).label('quality_sum'),
+            func.sum(PermitRollup.quality_count).label('quality_count'),
+            func.max(PermitRollup.updated_at).label('updated_at')
+        ).filter(
+            PermitRollup.dimension == 'state'
+        ).one()
+        return totals if totals.permit_count is not None else None
+
+    def freshness(self) -> Optional[datetime]:
+        """When the rollups last changed (last committed permit write)."""
+        return self.db.query(func.max(PermitRollup.updated_at)).filter(
+            PermitRollup.dimension == 'state'
+        ).scalar()
+
+    def count_states(self) -> int:
+        """States with at least one active permit."""
+        return self._rows('state').count()
+
+    def count_counties(self) -> int:
+        """Counties with at least one active permit."""
+        return self._rows('county').count()
+
+    def count_for_year(self, year: int) -> int:
+        """Active permits with a permit_date in the given year."""
+        return self._sum_over_states('state_year', year)
+
+    def count_for_month(self, year: int, month: int) -> int:
+        """Active permits with a permit_date in the given month."""
+        return self._sum_over_states('state_month', year * 100 + month)
+
+    def top_states(self, limit: int = 10, year: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        States by active permit count.
+
+        Returns:
+            Dicts with code, name, count and (for ``year``) this_year
+        """
+        rows = self.db.query(
+            State.id, State.code, State.name, PermitRollup.permit_count
+        ).join(
+            PermitRollup, PermitRollup.state_id == State.id
+        ).filter(
+            PermitRollup.dimension == 'state',
+            PermitRollup.permit_count > 0
+        ).order_by(
+            desc(PermitRollup.permit_count)
+        ).limit(limit).all()
+
+        this_year = {}
+        if year is not None and rows:
+            this_year = dict(self.db.query(
+                PermitRollup.state_id, PermitRollup.permit_count
+            ).filter(
+                PermitRollup.dimension == 'state_year',
+                PermitRollup.period == year,
+                PermitRollup.state_id.in_([row.id for row in rows])
+            ).all())
+
+        return [
+            {
+                'code': row.code,
+                'name': row.name,
+                'count': row.permit_count,
+                'this_year': this_year.get(row.id, 0)
+            }
+            for row in rows
+        ]
+
+    def top_counties(self, state_codes: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Counties by active permit count, optionally within some states."""
+        query = self.db.query(
+            County.id, County.name, PermitRollup.permit_count
+        ).join(
+            PermitRollup, PermitRollup.county_id == County.id
+        ).filter(
+            PermitRollup.dimension == 'county',
+            PermitRollup.permit_count > 0
+        )
+
+        if state_codes:
+            query = query.join(
+                State, PermitRollup.state_id == State.id
+            ).filter(State.code.in_(state_codes))
+
+        rows = query.order_by(desc(PermitRollup.permit_count)).limit(limit).all()
+        return [{'id': row.id, 'name': row.name, 'count': row.permit_count} for row in rows]
+
+    def counts_by_year(self, limit: int = 10) -> List[Dict[str, int]]:
+        """Most recent permit years with their counts."""
+        count = func.sum(PermitRollup.permit_count)
+        rows = self.db.query(
+            PermitRollup.period, count.label('permit_count')
+        ).filter(
+            PermitRollup.dimension == 'state_year',
+            PermitRollup.period != 0
+        ).group_by(
+            PermitRollup.period
+        ).having(
+            count > 0
+        ).order_by(
+            desc(PermitRollup.period)
+        ).limit(limit).all()
+        return [{'year': row.period, 'count': row.permit_count} for row in rows]
+
+    def rebuild(self) -> Dict[str, Any]:
+        """
+        Recompute all counters from septic_permits.
+
+        Only needed to repair drift (e.g. after bulk SQL run with triggers
+        disabled). Takes an EXCLUSIVE lock on permit_rollups so concurrent
+        permit writes wait and apply their deltas on top of the rebuilt
+        counters; reads continue against the old counters until commit.
+        """
+        start_time = time.time()
+        try:
+            self.db.execute(text("LOCK TABLE permit_rollups IN EXCLUSIVE MODE"))
+            self.db.execute(text("DELETE FROM permit_rollups"))
+            self.db.execute(text(REBUILD_SQL))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        elapsed = time.time() - start_time
+        rows = self.db.query(func.count()).select_from(PermitRollup).scalar() or 0
+        logger.info(f"Rebuilt {rows:,} permit rollup rows in {elapsed:.1f}s")
+        return {"rollup_rows": rows, "elapsed_seconds": round(elapsed, 2)}
+
+
+# Factory function
+def get_permit_rollup_service(db: Session) -> PermitRollupService:
+    """Create a permit rollup service instance."""
+    return PermitRollupService(db)
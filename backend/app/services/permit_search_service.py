@@ -5,6 +5,7 @@ Implements hybrid search combining:
 - PostgreSQL full-text search (TSVECTOR + ts_rank)
 - Semantic search via embeddings (pgvector)
 - Reciprocal Rank Fusion (RRF) for result merging
+- Keyset (cursor) pagination for deep pages
 """
 
 import logging
@@ -14,9 +15,12 @@ from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, text, and_, or_, desc, asc, case
+from sqlalchemy import (
+    select, func, text, literal_column, cast, null, Float, or_, desc
+)
 from sqlalchemy.dialects.postgresql import TSVECTOR
 
+from app.core.config import settings
 from app.models.septic_permit import (
     SepticPermit, State, County, SepticSystemType, SourcePortal,
     PermitDuplicate
@@ -26,7 +30,13 @@ from app.schemas.septic_permit import (
     PermitSummary, SearchHighlight, PermitResponse,
     PermitStatsOverview, PermitStatsByState, PermitStatsByYear
 )
+from app.services.permit_embedding_service import PermitEmbeddingService, EmbeddingError
+from app.services.permit_rollup_service import PermitRollupService
 from app.database.base_class import get_db
+from app.utils.geo import within_radius, distance_miles
+from app.utils.pagination import (
+    encode_cursor, decode_cursor, keyset_order_by, keyset_page
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +44,21 @@ logger = logging.getLogger(__name__)
 # RRF constant (typically 60)
 RRF_K = 60
 
+# Cursor sort key for fused (hybrid) rankings
+HYBRID_SORT_KEY = 'rrf:desc'
+
+# Keyword searches count at most this many matches
+SEARCH_COUNT_LIMIT = 10000
+
+# Bounds for hnsw.ef_search (pgvector default 40, max 1000)
+HNSW_MIN_EF_SEARCH = 40
+HNSW_MAX_EF_SEARCH = 1000
+
+
+def _elapsed_ms(stage_start: float) -> float:
+    """Milliseconds since a time.perf_counter() reading."""
+    return round((time.perf_counter() - stage_start) * 1000, 2)
+
 
 class PermitSearchService:
     """
@@ -47,32 +72,466 @@ class PermitSearchService:
     - Hybrid ranking with RRF
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, embedding_service: Optional[PermitEmbeddingService] = None):
         """Initialize search service with database session."""
         self.db = db
+        self.embedding_service = embedding_service or PermitEmbeddingService()
+        self.rollups = PermitRollupService(db)
 
     def search(self, request: PermitSearchRequest) -> PermitSearchResponse:
         """
         Execute hybrid search on permit records.
 
+        Relevance-sorted text queries fuse keyword and vector candidate lists
+        with RRF (see _hybrid_page); everything else, and any query issued
+        while the embedding model is unavailable, is ranked in SQL.
+
         Args:
             request: Search parameters
 
         Returns:
-            PermitSearchResponse with paginated results
+            PermitSearchResponse with paginated results and per-stage timings
         """
         start_time = time.time()
+        timings: Dict[str, float] = {}
+
+        semantic_weight = request.semantic_weight
+        if semantic_weight is None:
+            semantic_weight = settings.PERMIT_SEMANTIC_WEIGHT
+
+        page = None
+        if request.query and request.sort_by == 'relevance' and semantic_weight > 0:
+            page = self._hybrid_page(request, semantic_weight, timings)
+        if page is None:
+            page = self._keyword_page(request, timings)
+        search_results, total, has_more, next_cursor = page
+        total_capped = total is not None and total > SEARCH_COUNT_LIMIT
+        if total_capped:
+            total = SEARCH_COUNT_LIMIT
+
+        # Build facets (optional)
+        stage_start = time.perf_counter()
+        state_facets = self._get_state_facets(request) if not request.state_codes else None
+        county_facets = self._get_county_facets(request) if request.state_codes and not request.county_ids else None
+        facets_updated_at = self.rollups.freshness() if state_facets is not None or county_facets is not None else None
+        timings['facets_ms'] = _elapsed_ms(stage_start)
+
+        elapsed_ms = (time.time() - start_time) * 1000
+
+        return PermitSearchResponse(
+            results=search_results,
+            total=total,
+            total_capped=total_capped,
+            page=request.page,
+            page_size=request.page_size,
+            total_pages=math.ceil(total / request.page_size) if total is not None else None,
+            next_cursor=next_cursor,
+            has_more=has_more,
+            query=request.query,
+            execution_time_ms=elapsed_ms,
+            stage_timings_ms=timings,
+            state_facets=state_facets,
+            county_facets=county_facets,
+            facets_updated_at=facets_updated_at
+        )
+
+    def _keyword_page(
+        self,
+        request: PermitSearchRequest,
+        timings: Dict[str, float]
+    ) -> Tuple[List[PermitSearchResult], Optional[int], bool, Optional[str]]:
+        """
+        Rank, filter and paginate entirely in SQL (full-text + trigram scoring).
+
+        Page-number requests count at most SEARCH_COUNT_LIMIT + 1 matches
+        (nothing when the page holds the last match); cursor pages return
+        None rather than counting again.
 
-        # Build base query with eager loading
-        query = self.db.query(SepticPermit).join(
+        Returns:
+            (results, total or None, has_more, next_cursor)
+        """
+        stage_start = time.perf_counter()
+        distance_expr = self._distance_expr(request)
+
+        # Select only the columns PermitSummary (and highlighting) needs.
+        # State code and county name come from the same join instead of
+        # per-row lookups.
+        query = self.db.query(*self._summary_columns(distance_expr)).join(
             State, SepticPermit.state_id == State.id
         ).outerjoin(
             County, SepticPermit.county_id == County.id
-        ).outerjoin(
-            SepticSystemType, SepticPermit.system_type_id == SepticSystemType.id
         )
 
-        # Apply filters
+        query = self._apply_filters(query, request)
+
+        # Text search scoring
+        if request.query:
+            keyword_rank, combined_score, text_match = self._text_scoring(request.query)
+
+            # Filter for matches
+            query = query.filter(text_match)
+
+            # Add score to result
+            query = query.add_columns(
+                combined_score.label('relevance_score'),
+                keyword_rank.label('keyword_score')
+            )
+
+        else:
+            # No text search - use default ordering
+            combined_score = None
+            query = query.add_columns(
+                literal_column('1.0').label('relevance_score'),
+                literal_column('0.0').label('keyword_score')
+            )
+
+        # Apply sorting (always tie-broken on id so keyset cursors are stable)
+        sort_name, sort_expr, descending = self._resolve_sort(request, combined_score, distance_expr)
+        sort_key = f"{sort_name}:{'desc' if descending else 'asc'}"
+        query = query.order_by(*keyset_order_by(sort_expr, SepticPermit.id, descending))
+
+        # Fetch one extra row to know whether another page exists
+        if request.cursor:
+            # Keyset pagination: seek past the last row of the previous page
+            last_value, last_id = decode_cursor(request.cursor, sort_key)
+            rows = keyset_page(
+                lambda segment, limit: query.filter(segment).limit(limit).all(),
+                sort_expr, SepticPermit.id, descending, last_value, last_id,
+                request.page_size + 1
+            )
+            offset = 0
+        else:
+            offset = (request.page - 1) * request.page_size
+            rows = query.offset(offset).limit(request.page_size + 1).all()
+        has_more = len(rows) > request.page_size
+        rows = rows[:request.page_size]
+
+        total = None
+        if not request.cursor:
+            if has_more or (offset and not rows):
+                total = self._count_matches(request, SEARCH_COUNT_LIMIT + 1)
+            else:
+                # This page holds the last match
+                total = offset + len(rows)
+
+        next_cursor = None
+        if has_more and rows:
+            last = rows[-1]
+            next_cursor = encode_cursor(sort_key, getattr(last, sort_name), last.id)
+
+        timings['query_ms'] = _elapsed_ms(stage_start)
+
+        # Build response
+        search_results = []
+        for row in rows:
+            search_results.append(self._build_result(
+                row,
+                request.query,
+                score=float(row.relevance_score) if row.relevance_score else 0.0,
+                keyword_score=float(row.keyword_score) if row.keyword_score else 0.0,
+                semantic_score=None
+            ))
+
+        return search_results, total, has_more, next_cursor
+
+    def _hybrid_page(
+        self,
+        request: PermitSearchRequest,
+        semantic_weight: float,
+        timings: Dict[str, float]
+    ) -> Optional[Tuple[List[PermitSearchResult], int, bool, Optional[str]]]:
+        """
+        Hybrid retrieval: keyword and vector candidate lists fused with RRF.
+
+        Stages (each timed into ``timings``):
+        embed (query vector), keyword (top keyword_candidates by text score),
+        semantic (top semantic_candidates by cosine distance via HNSW),
+        fusion (RRF over both ranked lists), hydrate (summary columns for
+        the requested page only).
+
+        Results are limited to the fused candidate pool, so pages beyond
+        it are empty. Returns None when the query cannot be embedded, in
+        which case the caller falls back to keyword ranking.
+        """
+        stage_start = time.perf_counter()
+        try:
+            query_vector = self.embedding_service.embed_query(request.query)
+        except EmbeddingError as e:
+            logger.warning(f"Semantic search unavailable, using keyword ranking: {e}")
+            timings['embed_ms'] = _elapsed_ms(stage_start)
+            return None
+        timings['embed_ms'] = _elapsed_ms(stage_start)
+
+        stage_start = time.perf_counter()
+        keyword_hits = self._keyword_candidates(request)
+        timings['keyword_ms'] = _elapsed_ms(stage_start)
+
+        stage_start = time.perf_counter()
+        semantic_hits = self._semantic_candidates(request, query_vector)
+        timings['semantic_ms'] = _elapsed_ms(stage_start)
+
+        stage_start = time.perf_counter()
+        fused_scores = self._rrf_fuse(
+            [permit_id for permit_id, _ in keyword_hits],
+            [permit_id for permit_id, _ in semantic_hits],
+            semantic_weight
+        )
+        # Highest fused score first, id as tie-break (same order as the cursor)
+        ranked = sorted(fused_scores.items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+        if request.cursor:
+            last_score, last_id = decode_cursor(request.cursor, HYBRID_SORT_KEY)
+            ranked = [
+                (permit_id, score) for permit_id, score in ranked
+                if (score, permit_id) < (last_score, last_id)
+            ]
+            offset = 0
+        else:
+            offset = (request.page - 1) * request.page_size
+        # The fused candidate pool is every result there is
+        total = len(fused_scores)
+
+        page_items = ranked[offset:offset + request.page_size]
+        has_more = len(ranked) > offset + request.page_size
+        timings['fusion_ms'] = _elapsed_ms(stage_start)
+
+        stage_start = time.perf_counter()
+        rows_by_id = {}
+        if page_items:
+            rows = self.db.query(*self._summary_columns(self._distance_expr(request))).join(
+                State, SepticPermit.state_id == State.id
+            ).outerjoin(
+                County, SepticPermit.county_id == County.id
+            ).filter(
+                SepticPermit.id.in_([permit_id for permit_id, _ in page_items])
+            ).all()
+            rows_by_id = {row.id: row for row in rows}
+        timings['hydrate_ms'] = _elapsed_ms(stage_start)
+
+        keyword_scores = dict(keyword_hits)
+        semantic_scores = dict(semantic_hits)
+
+        search_results = []
+        for permit_id, score in page_items:
+            row = rows_by_id.get(permit_id)
+            if row is None:
+                continue
+            search_results.append(self._build_result(
+                row,
+                request.query,
+                score=score,
+                keyword_score=keyword_scores.get(permit_id),
+                semantic_score=semantic_scores.get(permit_id)
+            ))
+
+        next_cursor = None
+        if has_more and page_items:
+            last_id, last_score = page_items[-1]
+            next_cursor = encode_cursor(HYBRID_SORT_KEY, last_score, last_id)
+
+        return search_results, total, has_more, next_cursor
+
+    def _keyword_candidates(self, request: PermitSearchRequest) -> List[Tuple[UUID, float]]:
+        """Top keyword matches as (id, ts_rank) in combined-score order."""
+        keyword_rank, combined_score, text_match = self._text_scoring(request.query)
+
+        query = self.db.query(
+            SepticPermit.id,
+            keyword_rank.label('keyword_score')
+        ).join(
+            State, SepticPermit.state_id == State.id
+        )
+        query = self._apply_filters(query, request).filter(
+            text_match
+        ).order_by(
+            desc(combined_score), desc(SepticPermit.id)
+        ).limit(request.keyword_candidates)
+
+        return [(row.id, float(row.keyword_score or 0.0)) for row in query.all()]
+
+    def _semantic_candidates(
+        self,
+        request: PermitSearchRequest,
+        query_vector: List[float]
+    ) -> List[Tuple[UUID, float]]:
+        """Nearest permits by cosine distance as (id, cosine similarity)."""
+        # HNSW returns at most ef_search rows per scan
+        ef_search = min(HNSW_MAX_EF_SEARCH, max(HNSW_MIN_EF_SEARCH, request.semantic_candidates))
+        self.db.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+            {'ef_search': str(ef_search)}
+        )
+
+        distance = SepticPermit.embedding.cosine_distance(query_vector)
+        query = self.db.query(
+            SepticPermit.id,
+            distance.label('distance')
+        ).join(
+            State, SepticPermit.state_id == State.id
+        )
+        query = self._apply_filters(query, request).filter(
+            SepticPermit.embedding.isnot(None)
+        ).order_by(
+            distance
+        ).limit(request.semantic_candidates)
+
+        return [(row.id, 1.0 - float(row.distance)) for row in query.all()]
+
+    @staticmethod
+    def _rrf_fuse(
+        keyword_ids: List[UUID],
+        semantic_ids: List[UUID],
+        semantic_weight: float
+    ) -> Dict[UUID, float]:
+        """
+        Weighted Reciprocal Rank Fusion.
+
+        score(d) = sum over lists of weight / (RRF_K + rank(d)), rank from 1.
+        """
+        scores: Dict[UUID, float] = {}
+        keyword_weight = 1.0 - semantic_weight
+
+        for rank, permit_id in enumerate(keyword_ids, start=1):
+            scores[permit_id] = scores.get(permit_id, 0.0) + keyword_weight / (RRF_K + rank)
+        for rank, permit_id in enumerate(semantic_ids, start=1):
+            scores[permit_id] = scores.get(permit_id, 0.0) + semantic_weight / (RRF_K + rank)
+
+        return scores
+
+    @staticmethod
+    def _text_scoring(query_text: str) -> Tuple[Any, Any, Any]:
+        """
+        Full-text and trigram scoring for a text query.
+
+        Returns:
+            (ts_rank expression, combined score expression, match filter)
+        """
+        # Full-text search with ts_rank
+        ts_query = func.plainto_tsquery('english', query_text)
+        keyword_rank = func.ts_rank(SepticPermit.search_vector, ts_query)
+
+        # Trigram similarity on address
+        address_similarity = func.similarity(
+            SepticPermit.address_normalized,
+            query_text.upper()
+        )
+
+        # Combined score (double precision so cursor values round-trip exactly)
+        combined_score = cast(
+            (keyword_rank * 0.7) + (address_similarity * 0.3), Float
+        )
+
+        text_match = or_(
+            SepticPermit.search_vector.op('@@')(ts_query),
+            address_similarity > 0.1
+        )
+
+        return keyword_rank, combined_score, text_match
+
+    def _build_result(
+        self,
+        row: Any,
+        query_text: Optional[str],
+        score: float,
+        keyword_score: Optional[float],
+        semantic_score: Optional[float]
+    ) -> PermitSearchResult:
+        """Build a PermitSearchResult from a _summary_columns row."""
+        summary = PermitSummary(
+            id=row.id,
+            permit_number=row.permit_number,
+            address=row.address,
+            city=row.city,
+            state_code=row.state_code,
+            county_name=row.county_name,
+            owner_name=row.owner_name,
+            permit_date=row.permit_date,
+            system_type=row.system_type_raw,
+            has_property=row.property_id is not None,
+            distance_miles=round(row.distance_miles, 3) if row.distance_miles is not None else None
+        )
+
+        # Get highlights if text search
+        highlights = []
+        if query_text:
+            highlights = self._get_highlights(row, query_text)
+
+        return PermitSearchResult(
+            permit=summary,
+            score=score,
+            keyword_score=keyword_score,
+            semantic_score=semantic_score,
+            highlights=highlights
+        )
+
+    @staticmethod
+    def _resolve_sort(
+        request: PermitSearchRequest,
+        relevance_expr: Optional[Any],
+        distance_expr: Optional[Any] = None
+    ) -> Tuple[str, Any, bool]:
+        """
+        Map the requested sort onto (result column name, SQL expression, descending).
+
+        The column name is the attribute on result rows that holds the sort
+        value, used when building next_cursor. Radius searches without a
+        text query rank nearest first.
+        """
+        descending = request.sort_order != 'asc'
+
+        if request.sort_by == 'relevance' and relevance_expr is not None:
+            return 'relevance_score', relevance_expr, True
+        if request.sort_by in ('distance', 'relevance') and distance_expr is not None:
+            return 'distance_miles', distance_expr, False
+        if request.sort_by == 'permit_date':
+            return 'permit_date', SepticPermit.permit_date, descending
+        if request.sort_by in ('address', 'address_normalized'):
+            return 'address_normalized', SepticPermit.address_normalized, descending
+        if request.sort_by == 'owner_name':
+            return 'owner_name', SepticPermit.owner_name, descending
+        if request.sort_by == 'created_at':
+            return 'created_at', SepticPermit.created_at, descending
+
+        # Default: most recent first
+        return 'created_at', SepticPermit.created_at, True
+
+    @staticmethod
+    def _has_radius(request: PermitSearchRequest) -> bool:
+        """Whether the request asks for a radius search."""
+        return (
+            request.latitude is not None and
+            request.longitude is not None and
+            bool(request.radius_miles)
+        )
+
+    def _distance_expr(self, request: PermitSearchRequest) -> Optional[Any]:
+        """Distance in miles from the search center, or None without a radius."""
+        if not self._has_radius(request):
+            return None
+        return distance_miles(SepticPermit.geo_point(), request.latitude, request.longitude)
+
+    @staticmethod
+    def _summary_columns(distance_expr: Optional[Any] = None) -> List[Any]:
+        """Columns needed to hydrate PermitSummary and search highlights."""
+        return [
+            SepticPermit.id,
+            SepticPermit.permit_number,
+            SepticPermit.address,
+            SepticPermit.city,
+            SepticPermit.owner_name,
+            SepticPermit.permit_date,
+            SepticPermit.system_type_raw,
+            SepticPermit.property_id,
+            # Sort keys not otherwise displayed, needed to build cursors
+            SepticPermit.address_normalized,
+            SepticPermit.created_at,
+            State.code.label('state_code'),
+            County.name.label('county_name'),
+            (distance_expr if distance_expr is not None else null()).label('distance_miles'),
+        ]
+
+    def _apply_filters(self, query, request: PermitSearchRequest):
+        """Apply the non-text search filters shared by search and counting."""
         if not request.include_inactive:
             query = query.filter(SepticPermit.is_active == True)
 
@@ -110,154 +569,38 @@ class PermitSearchService:
         if request.install_date_to:
             query = query.filter(SepticPermit.install_date <= request.install_date_to)
 
-        # Geo search (radius)
-        if request.latitude and request.longitude and request.radius_miles:
-            # Convert miles to degrees (approximate)
-            lat_range = request.radius_miles / 69.0
-            lon_range = request.radius_miles / (69.0 * math.cos(math.radians(request.latitude)))
-
-            query = query.filter(
-                and_(
-                    SepticPermit.latitude.isnot(None),
-                    SepticPermit.longitude.isnot(None),
-                    SepticPermit.latitude.between(
-                        request.latitude - lat_range,
-                        request.latitude + lat_range
-                    ),
-                    SepticPermit.longitude.between(
-                        request.longitude - lon_range,
-                        request.longitude + lon_range
-                    )
-                )
-            )
-
-        # Text search scoring
-        search_scores = []
-        if request.query:
-            # Full-text search with ts_rank
-            ts_query = func.plainto_tsquery('english', request.query)
-            keyword_rank = func.ts_rank(SepticPermit.search_vector, ts_query)
-
-            # Trigram similarity on address
-            address_similarity = func.similarity(
-                SepticPermit.address_normalized,
-                request.query.upper()
-            )
-
-            # Combined score
-            combined_score = (keyword_rank * 0.7) + (address_similarity * 0.3)
-
-            # Filter for matches
+        # Geo search (exact radius, GiST-indexed geography point)
+        if self._has_radius(request):
             query = query.filter(
-                or_(
-                    SepticPermit.search_vector.op('@@')(ts_query),
-                    func.similarity(SepticPermit.address_normalized, request.query.upper()) > 0.1
+                within_radius(
+                    SepticPermit.geo_point(),
+                    request.latitude,
+                    request.longitude,
+                    request.radius_miles
                 )
             )
 
-            # Add score to result
-            query = query.add_columns(
-                combined_score.label('relevance_score'),
-                keyword_rank.label('keyword_score')
-            )
-
-        else:
-            # No text search - use default ordering
-            query = query.add_columns(
-                text('1.0').label('relevance_score'),
-                text('0.0').label('keyword_score')
-            )
-
-        # Get total count (before pagination)
-        count_query = query.with_entities(func.count(SepticPermit.id))
-        total = count_query.scalar()
-
-        # Apply sorting
-        if request.query and request.sort_by == 'relevance':
-            query = query.order_by(desc('relevance_score'))
-        elif request.sort_by == 'permit_date':
-            if request.sort_order == 'asc':
-                query = query.order_by(asc(SepticPermit.permit_date))
-            else:
-                query = query.order_by(desc(SepticPermit.permit_date))
-        elif request.sort_by == 'address':
-            if request.sort_order == 'asc':
-                query = query.order_by(asc(SepticPermit.address_normalized))
-            else:
-                query = query.order_by(desc(SepticPermit.address_normalized))
-        elif request.sort_by == 'owner_name':
-            if request.sort_order == 'asc':
-                query = query.order_by(asc(SepticPermit.owner_name))
-            else:
-                query = query.order_by(desc(SepticPermit.owner_name))
-        else:
-            # Default: most recent first
-            query = query.order_by(desc(SepticPermit.created_at))
+        return query
 
-        # Apply pagination
-        offset = (request.page - 1) * request.page_size
-        query = query.offset(offset).limit(request.page_size)
-
-        # Execute query
-        results = query.all()
-
-        # Build response
-        search_results = []
-        for row in results:
-            permit = row[0] if isinstance(row, tuple) else row
-            relevance = row[1] if isinstance(row, tuple) and len(row) > 1 else 1.0
-            keyword_score = row[2] if isinstance(row, tuple) and len(row) > 2 else 0.0
-
-            # Get related data
-            state = self.db.query(State).filter(State.id == permit.state_id).first()
-            county = self.db.query(County).filter(County.id == permit.county_id).first() if permit.county_id else None
-
-            summary = PermitSummary(
-                id=permit.id,
-                permit_number=permit.permit_number,
-                address=permit.address,
-                city=permit.city,
-                state_code=state.code if state else None,
-                county_name=county.name if county else None,
-                owner_name=permit.owner_name,
-                permit_date=permit.permit_date,
-                system_type=permit.system_type_raw,
-                has_property=permit.property_id is not None
-            )
-
-            # Get highlights if text search
-            highlights = []
-            if request.query:
-                highlights = self._get_highlights(permit, request.query)
-
-            search_results.append(PermitSearchResult(
-                permit=summary,
-                score=float(relevance) if relevance else 0.0,
-                keyword_score=float(keyword_score) if keyword_score else 0.0,
-                semantic_score=None,  # TODO: Add when embeddings are implemented
-                highlights=highlights
-            ))
+    def _count_matches(self, request: PermitSearchRequest, limit: int) -> int:
+        """Count matching permits, stopping at limit."""
+        query = self.db.query(SepticPermit.id).join(
+            State, SepticPermit.state_id == State.id
+        )
+        query = self._apply_filters(query, request)
 
-        # Build facets (optional)
-        state_facets = self._get_state_facets(request) if not request.state_codes else None
-        county_facets = self._get_county_facets(request) if request.state_codes and not request.county_ids else None
+        if request.query:
+            _, _, text_match = self._text_scoring(request.query)
+            query = query.filter(text_match)
 
-        elapsed_ms = (time.time() - start_time) * 1000
+        return self.db.query(func.count()).select_from(query.limit(limit).subquery()).scalar() or 0
 
-        return PermitSearchResponse(
-            results=search_results,
-            total=total or 0,
-            page=request.page,
-            page_size=request.page_size,
-            total_pages=math.ceil((total or 0) / request.page_size),
-            query=request.query,
-            execution_time_ms=elapsed_ms,
-            state_facets=state_facets,
-            county_facets=county_facets
-        )
+    def _get_highlights(self, permit: Any, query: str) -> List[SearchHighlight]:
+        """
+        Get search result highlighting for matched terms.
 
-    def _get_highlights(self, permit: SepticPermit, query: str) -> List[SearchHighlight]:
-        """Get search result highlighting for matched terms."""
+        Accepts a SepticPermit or a result row exposing the same attributes.
+        """
         highlights = []
 
         # Check each searchable field
@@ -290,53 +633,15 @@ class PermitSearchService:
         return highlights
 
     def _get_state_facets(self, request: PermitSearchRequest) -> List[Dict[str, Any]]:
-        """Get permit counts by state for faceted filtering."""
-        query = self.db.query(
-            State.code,
-            State.name,
-            func.count(SepticPermit.id).label('count')
-        ).join(
-            SepticPermit, SepticPermit.state_id == State.id
-        ).filter(
-            SepticPermit.is_active == True
-        ).group_by(
-            State.code, State.name
-        ).order_by(
-            desc('count')
-        ).limit(20)
-
+        """Get permit counts by state for faceted filtering (from rollups)."""
         return [
-            {'code': row[0], 'name': row[1], 'count': row[2]}
-            for row in query.all()
+            {'code': row['code'], 'name': row['name'], 'count': row['count']}
+            for row in self.rollups.top_states(limit=20)
         ]
 
     def _get_county_facets(self, request: PermitSearchRequest) -> List[Dict[str, Any]]:
-        """Get permit counts by county for faceted filtering."""
-        query = self.db.query(
-            County.id,
-            County.name,
-            func.count(SepticPermit.id).label('count')
-        ).join(
-            SepticPermit, SepticPermit.county_id == County.id
-        ).join(
-            State, SepticPermit.state_id == State.id
-        ).filter(
-            SepticPermit.is_active == True
-        )
-
-        if request.state_codes:
-            query = query.filter(State.code.in_(request.state_codes))
-
-        query = query.group_by(
-            County.id, County.name
-        ).order_by(
-            desc('count')
-        ).limit(50)
-
-        return [
-            {'id': row[0], 'name': row[1], 'count': row[2]}
-            for row in query.all()
-        ]
+        """Get permit counts by county for faceted filtering (from rollups)."""
+        return self.rollups.top_counties(state_codes=request.state_codes, limit=50)
 
     def get_permit(self, permit_id: UUID) -> Optional[PermitResponse]:
         """Get a single permit by ID with full details."""
@@ -399,111 +704,61 @@ class PermitSearchService:
         )
 
     def get_stats(self) -> PermitStatsOverview:
-        """Get dashboard statistics for permits."""
-        from datetime import date, timedelta
-
-        today = date.today()
-        month_start = today.replace(day=1)
-        year_start = today.replace(month=1, day=1)
+        """
+        Get dashboard statistics for permits.
 
-        # Total counts
-        total_permits = self.db.query(func.count(SepticPermit.id)).filter(
-            SepticPermit.is_active == True
-        ).scalar() or 0
+        Permit counts come from the trigger-maintained rollups;
+        last_updated is when they last changed.
+        """
+        from datetime import date
 
-        total_states = self.db.query(func.count(func.distinct(SepticPermit.state_id))).filter(
-            SepticPermit.is_active == True
-        ).scalar() or 0
+        today = date.today()
 
-        total_counties = self.db.query(func.count(func.distinct(SepticPermit.county_id))).filter(
-            SepticPermit.is_active == True
-        ).scalar() or 0
+        totals = self.rollups.get_totals()
+        total_permits = totals.permit_count if totals else 0
+        avg_quality = (
+            totals.quality_sum / totals.quality_count
+            if totals and totals.quality_count else 0.0
+        )
 
         total_portals = self.db.query(func.count(SourcePortal.id)).filter(
             SourcePortal.is_active == True
         ).scalar() or 0
 
-        # Monthly/yearly counts
-        permits_this_month = self.db.query(func.count(SepticPermit.id)).filter(
-            SepticPermit.is_active == True,
-            SepticPermit.permit_date >= month_start
-        ).scalar() or 0
-
-        permits_this_year = self.db.query(func.count(SepticPermit.id)).filter(
-            SepticPermit.is_active == True,
-            SepticPermit.permit_date >= year_start
-        ).scalar() or 0
-
-        # Average data quality
-        avg_quality = self.db.query(func.avg(SepticPermit.data_quality_score)).filter(
-            SepticPermit.is_active == True,
-            SepticPermit.data_quality_score.isnot(None)
-        ).scalar() or 0.0
-
         # Pending duplicates
         duplicate_count = self.db.query(func.count(PermitDuplicate.id)).filter(
             PermitDuplicate.status == 'pending'
         ).scalar() or 0
 
-        # Top states
-        top_states_query = self.db.query(
-            State.code,
-            State.name,
-            func.count(SepticPermit.id).label('total'),
-            func.count(case((SepticPermit.permit_date >= year_start, 1))).label('this_year')
-        ).join(
-            SepticPermit, SepticPermit.state_id == State.id
-        ).filter(
-            SepticPermit.is_active == True
-        ).group_by(
-            State.code, State.name
-        ).order_by(
-            desc('total')
-        ).limit(10)
-
         top_states = [
             PermitStatsByState(
-                state_code=row[0],
-                state_name=row[1],
-                total_permits=row[2],
-                active_permits=row[2],
-                permits_this_year=row[3]
+                state_code=row['code'],
+                state_name=row['name'],
+                total_permits=row['count'],
+                active_permits=row['count'],
+                permits_this_year=row['this_year']
             )
-            for row in top_states_query.all()
+            for row in self.rollups.top_states(limit=10, year=today.year)
         ]
 
         # Permits by year (last 10 years)
-        permits_by_year_query = self.db.query(
-            func.extract('year', SepticPermit.permit_date).label('year'),
-            func.count(SepticPermit.id).label('count')
-        ).filter(
-            SepticPermit.is_active == True,
-            SepticPermit.permit_date.isnot(None)
-        ).group_by(
-            func.extract('year', SepticPermit.permit_date)
-        ).order_by(
-            desc('year')
-        ).limit(10)
-
         permits_by_year = [
-            PermitStatsByYear(
-                year=int(row[0]) if row[0] else 0,
-                total_permits=row[1]
-            )
-            for row in permits_by_year_query.all()
+            PermitStatsByYear(year=row['year'], total_permits=row['count'])
+            for row in self.rollups.counts_by_year(limit=10)
         ]
 
         return PermitStatsOverview(
             total_permits=total_permits,
-            total_states=total_states,
-            total_counties=total_counties,
+            total_states=self.rollups.count_states(),
+            total_counties=self.rollups.count_counties(),
             total_source_portals=total_portals,
-            permits_this_month=permits_this_month,
-            permits_this_year=permits_this_year,
+            permits_this_month=self.rollups.count_for_month(today.year, today.month),
+            permits_this_year=self.rollups.count_for_year(today.year),
             avg_data_quality_score=float(avg_quality),
             duplicate_pending_count=duplicate_count,
             top_states=top_states,
-            permits_by_year=permits_by_year
+            permits_by_year=permits_by_year,
+            last_updated=totals.updated_at if totals else None
         )
 
 
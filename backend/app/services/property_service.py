@@ -3,7 +3,6 @@ Property data service for ingestion and search.
 """
 
 import logging
-import hashlib
 import re
 import uuid
 from datetime import datetime, timezone
@@ -11,7 +10,8 @@ from time import time
 from typing import List, Optional, Dict, Any, Tuple
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, null, literal, any_, Text
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from app.models.property import Property
 from app.models.septic_permit import State, County, SepticPermit
@@ -19,6 +19,16 @@ from app.schemas.property import (
     PropertyCreate, PropertyResponse, PropertySummary,
     PropertySearchResponse, BatchPropertyResponse, PropertyStatsResponse
 )
+from app.services.address_matching_service import (
+    AddressMatch, AddressMatcher, clean_for_matching, parse_street
+)
+from app.utils.address_normalization import (
+    ADDRESS_NORMALIZER_VERSION, canonicalize_address, canonical_address_hash
+)
+from app.utils.geo import within_radius, distance_miles
+from app.utils.pagination import (
+    encode_cursor, decode_cursor, keyset_order_by, keyset_page
+)
 
 logger = logging.getLogger(__name__)
 
@@ -78,127 +88,58 @@ class PropertyService:
         return county.id
 
     @staticmethod
-    def normalize_address(address: Optional[str]) -> Optional[str]:
-        """Normalize address for matching."""
-        if not address:
-            return None
+    def normalize_address(address: Optional[str], state_code: Optional[str] = None) -> Optional[str]:
+        """Canonical address for matching (shared with permit ingestion)."""
+        return canonicalize_address(address, state_code)
 
-        normalized = address.upper().strip()
-        normalized = re.sub(r'\s+', ' ', normalized)
-
-        replacements = {
-            r'\bSTREET\b': 'ST',
-            r'\bROAD\b': 'RD',
-            r'\bDRIVE\b': 'DR',
-            r'\bAVENUE\b': 'AVE',
-            r'\bBOULEVARD\b': 'BLVD',
-            r'\bLANE\b': 'LN',
-            r'\bCOURT\b': 'CT',
-            r'\bCIRCLE\b': 'CIR',
-            r'\bPLACE\b': 'PL',
-            r'\bTERRACE\b': 'TER',
-            r'\bNORTH\b': 'N',
-            r'\bSOUTH\b': 'S',
-            r'\bEAST\b': 'E',
-            r'\bWEST\b': 'W',
-            r'\bHOLLOW\b': 'HOLW',
-        }
+    @staticmethod
+    def compute_address_hash(address: Optional[str], county_name: Optional[str], state_code: Optional[str]) -> Optional[str]:
+        """Compute SHA256 hash for deduplication (same as permits' address_hash)."""
+        return canonical_address_hash(address, county_name, state_code)
 
-        for pattern, replacement in replacements.items():
-            normalized = re.sub(pattern, replacement, normalized)
+    def find_address_matches(
+        self,
+        queries: List[Tuple[Any, Optional[str], Optional[str]]],
+        state_id: int,
+        county_id: Optional[int] = None
+    ) -> List[AddressMatch]:
+        """
+        Fuzzy-match addresses against active properties of a state or county.
 
-        return normalized
+        Only properties sharing a street number with one of the queries are
+        loaded (idx_properties_address_number); both sides are compared in
+        canonical form.
 
-    @staticmethod
-    def normalize_address_enhanced(address: Optional[str]) -> Optional[str]:
-        """
-        Enhanced address normalization that strips city/state/zip suffixes.
+        Args:
+            queries: (key, canonical address, zip_code) tuples
+            state_id: State to search
+            county_id: Restrict candidates to one county (optional)
 
-        This handles permit addresses that include location info like:
-        - "1000 Mabel DR, Franklin, TN, 37064" -> "1000 MABEL DR"
-        - "9001 Haggard Ln, College Grove, TN 37046" -> "9001 HAGGARD LN"
-        - "2034 Riley Park Drive, Thompsons Station, TN 37179" -> "2034 RILEY PARK DR"
+        Returns:
+            One AddressMatch per query (candidate_key is the property id)
         """
-        if not address:
-            return None
-
-        normalized = address.upper().strip()
-
-        # Common Tennessee cities to strip (add more as needed)
-        tn_cities = [
-            'FRANKLIN', 'NASHVILLE', 'BRENTWOOD', 'NOLENSVILLE', 'SPRING HILL',
-            'COLLEGE GROVE', 'THOMPSONS STATION', 'FAIRVIEW', 'ARRINGTON',
-            'LEIPER\'S FORK', 'LEIPERS FORK', 'BETHESDA', 'EAGLEVILLE'
-        ]
-
-        # Remove state codes and zip codes
-        # Pattern: ", TN 37XXX" or ", TN, 37XXX" or "TN 37XXX"
-        normalized = re.sub(r',?\s*TN\s*,?\s*3[0-9]{4}\s*$', '', normalized)
-
-        # Remove standalone state code at end
-        normalized = re.sub(r',?\s*TN\s*$', '', normalized)
-
-        # Remove city names (with optional preceding comma)
-        for city in tn_cities:
-            normalized = re.sub(rf',?\s*{city}\s*$', '', normalized, flags=re.IGNORECASE)
-
-        # Remove trailing commas
-        normalized = re.sub(r',\s*$', '', normalized)
-
-        # Remove parenthetical notes like (Lot 123), (Westhaven Jewell Lot 2504)
-        # But keep the main address
-        normalized = re.sub(r'\s*\([^)]*\)\s*$', '', normalized)
-
-        # Remove pipe-separated suffixes like "| Franklin, TN 37064"
-        normalized = re.sub(r'\s*\|.*$', '', normalized)
-
-        # Now apply standard normalization
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-
-        replacements = {
-            r'\bSTREET\b': 'ST',
-            r'\bROAD\b': 'RD',
-            r'\bDRIVE\b': 'DR',
-            r'\bAVENUE\b': 'AVE',
-            r'\bBOULEVARD\b': 'BLVD',
-            r'\bLANE\b': 'LN',
-            r'\bCOURT\b': 'CT',
-            r'\bCIRCLE\b': 'CIR',
-            r'\bPLACE\b': 'PL',
-            r'\bTERRACE\b': 'TER',
-            r'\bNORTH\b': 'N',
-            r'\bSOUTH\b': 'S',
-            r'\bEAST\b': 'E',
-            r'\bWEST\b': 'W',
-            r'\bHOLLOW\b': 'HOLW',
-            r'\bCOVE\b': 'CV',
-            r'\bHILLS?\b': 'HL',
-            r'\bCREEK\b': 'CRK',
-            r'\bSPRINGS?\b': 'SPG',
-            r'\bMOUNTAIN\b': 'MTN',
-            r'\bVALLEY\b': 'VLY',
-            r'\bRIDGE\b': 'RDG',
-            r'\bHAVEN\b': 'HVN',
-            r'\bVIEW\b': 'VW',
-            r'\bPARKWAY\b': 'PKWY',
-            r'\bHIGHWAY\b': 'HWY',
-            r'\bPINE\b': 'PNE',
-            r'\bLAKE\b': 'LK',
-            r'\bGROVE\b': 'GRV',
-            r'\bSTATION\b': 'STA',
-            r'\bTRACE\b': 'TRCE',
+        numbers = {
+            parse_street(clean_for_matching(address))[0] for _, address, _ in queries
         }
+        numbers.discard(None)
+        if not numbers:
+            return AddressMatcher([]).match_many(queries)
 
-        for pattern, replacement in replacements.items():
-            normalized = re.sub(pattern, replacement, normalized)
-
-        return normalized.strip()
+        candidates = self.db.query(
+            Property.id, Property.address_normalized, Property.zip_code
+        ).filter(
+            Property.is_active == True,
+            Property.state_id == state_id,
+            Property.address_number() == any_(literal(sorted(numbers), ARRAY(Text)))
+        )
+        if county_id:
+            candidates = candidates.filter(Property.county_id == county_id)
 
-    @staticmethod
-    def compute_address_hash(address_normalized: str, county_name: str, state_code: str) -> str:
-        """Compute SHA256 hash for deduplication."""
-        composite = f"{address_normalized or ''}|{county_name.upper()}|{state_code.upper()}"
-        return hashlib.sha256(composite.encode()).hexdigest()
+        matcher = AddressMatcher(
+            (row.id, canonicalize_address(row.address_normalized), row.zip_code)
+            for row in candidates
+        )
+        return matcher.match_many(queries)
 
     def ingest_batch(
         self,
@@ -274,17 +215,18 @@ class PropertyService:
         if prop_data.county_name:
             county_id = self._get_or_create_county(state_id, prop_data.county_name)
 
-        # Normalize address
-        address_normalized = prop_data.address_normalized or self.normalize_address(prop_data.address)
+        # Canonicalize address (a caller-supplied address_normalized is only
+        # used when there is no raw address, and is canonicalized too)
+        address_normalized = self.normalize_address(
+            prop_data.address or prop_data.address_normalized, prop_data.state_code
+        )
 
         # Compute dedup hash
-        address_hash = None
-        if address_normalized:
-            address_hash = self.compute_address_hash(
-                address_normalized,
-                prop_data.county_name or '',
-                prop_data.state_code
-            )
+        address_hash = self.compute_address_hash(
+            address_normalized,
+            prop_data.county_name,
+            prop_data.state_code
+        )
 
         # Check for existing property
         existing = None
@@ -332,6 +274,7 @@ class PropertyService:
             address=prop_data.address,
             address_normalized=address_normalized,
             address_hash=address_hash,
+            address_normalizer_version=ADDRESS_NORMALIZER_VERSION,
             street_number=prop_data.street_number,
             street_name=prop_data.street_name,
             city=prop_data.city,
@@ -451,10 +394,39 @@ class PropertyService:
         min_bedrooms: Optional[int] = None,
         min_sqft: Optional[int] = None,
         page: int = 1,
-        page_size: int = 25
+        page_size: int = 25,
+        sort_by: str = 'address_normalized',
+        sort_order: str = 'asc',
+        cursor: Optional[str] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        radius_miles: Optional[float] = None
     ) -> PropertySearchResponse:
-        """Search properties with filters."""
-        base_query = self.db.query(Property).filter(Property.is_active == True)
+        """
+        Search properties with filters.
+
+        Pages either by page number or, when ``cursor`` is given, by keyset
+        seek from the previous page's last row (total is not recomputed).
+        Radius searches match the exact circle, report distance_miles and
+        can sort by 'distance' (nearest first).
+
+        Raises:
+            ValueError: If sort_by is unsupported or the cursor is invalid
+        """
+        has_radius = latitude is not None and longitude is not None and bool(radius_miles)
+        distance_expr = (
+            distance_miles(Property.geo_point(), latitude, longitude) if has_radius else None
+        )
+
+        base_query = self.db.query(
+            Property,
+            (distance_expr if distance_expr is not None else null()).label('distance_miles')
+        ).filter(Property.is_active == True)
+
+        if has_radius:
+            base_query = base_query.filter(
+                within_radius(Property.geo_point(), latitude, longitude, radius_miles)
+            )
 
         # Apply filters
         if query:
@@ -493,12 +465,47 @@ class PropertyService:
         if min_sqft:
             base_query = base_query.filter(Property.square_footage >= min_sqft)
 
-        # Get total count
-        total = base_query.count()
-
-        # Paginate
-        offset = (page - 1) * page_size
-        properties = base_query.order_by(Property.address_normalized).offset(offset).limit(page_size).all()
+        sort_columns = {
+            'address_normalized': Property.address_normalized,
+            'owner_name': Property.owner_name,
+            'created_at': Property.created_at,
+        }
+        if distance_expr is not None:
+            sort_columns['distance'] = distance_expr
+        if sort_by not in sort_columns:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        sort_expr = sort_columns[sort_by]
+        # Distance always ranks nearest first
+        descending = sort_order == 'desc' and sort_by != 'distance'
+        sort_key = f"{sort_by}:{'desc' if descending else 'asc'}"
+
+        # Paginate (one extra row tells us whether another page exists)
+        ordered_query = base_query.order_by(*keyset_order_by(sort_expr, Property.id, descending))
+        if cursor:
+            last_value, last_id = decode_cursor(cursor, sort_key)
+            rows = keyset_page(
+                lambda segment, limit: ordered_query.filter(segment).limit(limit).all(),
+                sort_expr, Property.id, descending, last_value, last_id, page_size + 1
+            )
+            # Not recounted for cursor pages
+            total = None
+        else:
+            # Get total count
+            total = base_query.count()
+            rows = ordered_query.offset((page - 1) * page_size).limit(page_size + 1).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        properties = [row.Property for row in rows]
+        distances = {row.Property.id: row.distance_miles for row in rows}
+
+        next_cursor = None
+        if has_more and rows:
+            last = rows[-1]
+            last_value = (
+                last.distance_miles if sort_by == 'distance'
+                else getattr(last.Property, sort_by)
+            )
+            next_cursor = encode_cursor(sort_key, last_value, last.Property.id)
 
         # Get permit counts
         property_ids = [p.id for p in properties]
@@ -528,17 +535,20 @@ class PropertyService:
                 market_value=p.market_value,
                 lot_size_acres=p.lot_size_acres,
                 property_type=p.property_type,
-                permit_count=permit_counts.get(p.id, 0)
+                permit_count=permit_counts.get(p.id, 0),
+                distance_miles=round(distances[p.id], 3) if distances.get(p.id) is not None else None
             ))
 
-        total_pages = (total + page_size - 1) // page_size
+        total_pages = (total + page_size - 1) // page_size if total is not None else None
 
         return PropertySearchResponse(
             total=total,
             page=page,
             page_size=page_size,
             total_pages=total_pages,
-            results=results
+            results=results,
+            next_cursor=next_cursor,
+            has_more=has_more
         )
 
     def get_property(self, property_id: uuid.UUID) -> Optional[PropertyResponse]:
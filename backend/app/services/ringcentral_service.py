@@ -5,12 +5,13 @@ RingCentral service for managing OAuth, API calls, and business logic.
 import asyncio
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from urllib.parse import urlencode
 import httpx
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
+from sqlalchemy.dialects.postgresql import insert
 from ringcentral import SDK
 
 from app.core.config import settings
@@ -20,9 +21,13 @@ from app.schemas.ringcentral import (
     RCStatusResponse, CallRecordResponse, CallListResponse,
     ExtensionResponse, InitiateCallRequest, SyncCallsRequest, UpdateCallRequest
 )
+from app.services.agent_rollup_service import AgentRollupService
 
 logger = logging.getLogger(__name__)
 
+CALL_LOG_PATH = "/restapi/v1.0/account/~/extension/~/call-log"
+CALL_LOG_PAGE_SIZE = 1000
+
 
 class RingCentralError(Exception):
     """Custom exception for RingCentral-related errors."""
@@ -258,12 +263,28 @@ class RingCentralService:
             has_previous=page > 1
         )
 
-    async def sync_calls(self, hours_back: int = 24, force_refresh: bool = False) -> dict:
-        """Sync calls from RingCentral API."""
+    async def sync_calls(
+        self,
+        hours_back: int = 24,
+        force_refresh: bool = False,
+        skip_rc_session_ids: Optional[Iterable[str]] = None
+    ) -> dict:
+        """
+        Sync calls from RingCentral API.
+
+        Reads the call log from the account's high-water mark (less
+        RINGCENTRAL_SYNC_OVERLAP_MINUTES, for calls logged after they
+        started), or over the last hours_back hours on the first sync and
+        with force_refresh. Every page is fetched, several at a time, and
+        imported with one existence query, one bulk insert and one commit;
+        the new calls with recordings are queued for processing per page,
+        except those in skip_rc_session_ids (calls the caller processes
+        itself).
+        """
         try:
             # Check if recently synced
             if not force_refresh and self.rc_account.last_sync_at:
-                time_since_sync = datetime.utcnow() - self.rc_account.last_sync_at
+                time_since_sync = datetime.utcnow() - self._as_utc(self.rc_account.last_sync_at)
                 if time_since_sync < timedelta(minutes=5):
                     return {"message": "Recently synced", "calls_imported": 0}
 
@@ -271,105 +292,206 @@ class RingCentralService:
             platform = sdk.platform()
 
             # Calculate date range
-            date_from = datetime.utcnow() - timedelta(hours=hours_back)
+            date_to = datetime.utcnow()
+            date_from = date_to - timedelta(hours=hours_back)
+            synced_to = self._as_utc(self.rc_account.call_log_synced_to)
+            if synced_to and not force_refresh:
+                date_from = max(date_from, synced_to - timedelta(minutes=settings.RINGCENTRAL_SYNC_OVERLAP_MINUTES))
 
             # Request parameters
             params = {
                 "dateFrom": date_from.isoformat(),
-                "dateTo": datetime.utcnow().isoformat(),
+                "dateTo": date_to.isoformat(),
                 "view": "Detailed",
                 "showBlocked": False,
                 "withRecording": True,
-                "perPage": 1000
+                "perPage": CALL_LOG_PAGE_SIZE
             }
 
-            # Fetch call log
-            response = platform.get("/restapi/v1.0/account/~/extension/~/call-log", params)
-            call_data = response.json()
-
-            # Process calls
+            # Import page by page as pages arrive
+            skip_sessions = set(skip_rc_session_ids or ())
+            import_started_at = datetime.utcnow()
             imported_count = 0
-            for call_record in call_data.get("records", []):
-                if await self._import_call_record(call_record):
-                    imported_count += 1
-
-            # Update sync timestamp
+            queued_count = 0
+            pages = 0
+            async for records in self._call_log_pages(platform, params):
+                pages += 1
+                imported = self._import_call_page(records)
+                imported_count += len(imported)
+                queued_count += await self._queue_recording_processing([
+                    str(call.id) for call in imported
+                    if call.has_recording and call.rc_session_id not in skip_sessions
+                ])
+
+            # Update sync timestamp and high-water mark
             self.rc_account.last_sync_at = datetime.utcnow()
+            if not synced_to or date_to > synced_to:
+                self.rc_account.call_log_synced_to = date_to
             self.rc_account.last_error = None
             self.db.commit()
 
-            logger.info(f"Synced {imported_count} calls for user {self.user_id}")
-            return {"message": "Sync completed", "calls_imported": imported_count}
+            if imported_count:
+                try:
+                    AgentRollupService(self.db).refresh_since(import_started_at, user_id=self.user_id)
+                except Exception as e:
+                    logger.warning(f"Agent rollup refresh failed after sync: {e}")
+
+            logger.info(f"Synced {imported_count} calls from {pages} call-log pages for user {self.user_id}")
+            return {
+                "message": "Sync completed",
+                "calls_imported": imported_count,
+                "recordings_queued": queued_count,
+                "pages": pages,
+                "date_from": params["dateFrom"]
+            }
 
         except Exception as e:
+            self.db.rollback()
             error_msg = f"Call sync failed: {str(e)}"
             self.rc_account.last_error = error_msg
             self.db.commit()
             logger.error(error_msg)
             raise RingCentralError(error_msg)
 
-    async def _import_call_record(self, rc_call_data: dict) -> bool:
-        """Import a single call record from RingCentral."""
-        rc_call_id = str(rc_call_data.get("id"))
-
-        # Check if already exists
-        existing = self.db.query(CallLog).filter(
-            CallLog.rc_call_id == rc_call_id
-        ).first()
-
-        if existing:
-            return False  # Already imported
+    async def _get_json(self, platform, url: str, params: Optional[dict] = None) -> dict:
+        """GET through the (blocking) SDK in a thread, off the event loop."""
+        response = await asyncio.to_thread(platform.get, url, params)
+        return response.json()
+
+    async def _call_log_pages(self, platform, params: dict):
+        """
+        Yield the records of every call-log page.
+
+        When the first page reports totalPages, the others are fetched
+        concurrently (RINGCENTRAL_SYNC_PAGE_CONCURRENCY at a time) and
+        yielded as they arrive; otherwise navigation.nextPage is followed.
+        """
+        first_page = await self._get_json(platform, CALL_LOG_PATH, {**params, "page": 1})
+        yield first_page.get("records", [])
+
+        total_pages = first_page.get("paging", {}).get("totalPages")
+        if total_pages:
+            semaphore = asyncio.Semaphore(settings.RINGCENTRAL_SYNC_PAGE_CONCURRENCY)
+
+            async def fetch_page(page: int) -> dict:
+                async with semaphore:
+                    return await self._get_json(platform, CALL_LOG_PATH, {**params, "page": page})
+
+            tasks = [asyncio.ensure_future(fetch_page(page)) for page in range(2, total_pages + 1)]
+            try:
+                for next_page in asyncio.as_completed(tasks):
+                    yield (await next_page).get("records", [])
+            finally:
+                for task in tasks:
+                    task.cancel()
+            return
+
+        next_page_uri = first_page.get("navigation", {}).get("nextPage", {}).get("uri")
+        while next_page_uri:
+            page_data = await self._get_json(platform, next_page_uri)
+            yield page_data.get("records", [])
+            next_page_uri = page_data.get("navigation", {}).get("nextPage", {}).get("uri")
+
+    def _import_call_page(self, records: List[dict]) -> List[Any]:
+        """
+        Import one call-log page: one query for calls already imported,
+        one bulk insert of the rest and one commit.
+
+        Returns:
+            Rows (id, has_recording, rc_session_id) of the newly imported calls
+        """
+        calls = {}
+        for rc_call_data in records:
+            calls.setdefault(str(rc_call_data.get("id")), rc_call_data)
+        if not calls:
+            return []
+
+        existing = {
+            rc_call_id for (rc_call_id,) in self.db.query(CallLog.rc_call_id).filter(
+                CallLog.rc_call_id.in_(list(calls))
+            )
+        }
+        new_calls = [
+            self._call_log_values(rc_call_id, rc_call_data)
+            for rc_call_id, rc_call_data in calls.items()
+            if rc_call_id not in existing
+        ]
+        if not new_calls:
+            return []
+
+        # A concurrent sync may have imported some of them meanwhile
+        call_logs = CallLog.__table__
+        imported = self.db.execute(
+            insert(call_logs)
+            .values(new_calls)
+            .on_conflict_do_nothing(index_elements=["rc_call_id"])
+            .returning(call_logs.c.id, call_logs.c.has_recording, call_logs.c.rc_session_id)
+        ).all()
+        self.db.commit()
+        return imported
 
-        # Extract call information
-        call_log = CallLog(
-            rc_account_id=self.rc_account.id,
-            user_id=self.user_id,
-            rc_call_id=rc_call_id,
-            rc_session_id=rc_call_data.get("sessionId"),
+    def _call_log_values(self, rc_call_id: str, rc_call_data: dict) -> dict:
+        """call_logs row for a RingCentral call record."""
+        recordings = rc_call_data.get("recording", {}).get("recordings", [])
+        values = {
+            "rc_account_id": self.rc_account.id,
+            "user_id": self.user_id,
+            "rc_call_id": rc_call_id,
+            "rc_session_id": rc_call_data.get("sessionId"),
 
             # Participants
-            from_number=rc_call_data.get("from", {}).get("phoneNumber", ""),
-            to_number=rc_call_data.get("to", {}).get("phoneNumber", ""),
-            from_name=rc_call_data.get("from", {}).get("name"),
-            to_name=rc_call_data.get("to", {}).get("name"),
+            "from_number": rc_call_data.get("from", {}).get("phoneNumber", ""),
+            "to_number": rc_call_data.get("to", {}).get("phoneNumber", ""),
+            "from_name": rc_call_data.get("from", {}).get("name"),
+            "to_name": rc_call_data.get("to", {}).get("name"),
 
             # Metadata
-            direction=rc_call_data.get("direction", "").lower(),
-            status=rc_call_data.get("result"),
-            call_type=rc_call_data.get("type"),
+            "direction": rc_call_data.get("direction", "").lower(),
+            "status": rc_call_data.get("result"),
+            "call_type": rc_call_data.get("type"),
 
             # Timing
-            start_time=self._parse_rc_datetime(rc_call_data.get("startTime")),
-            duration_seconds=rc_call_data.get("duration"),
+            "start_time": self._parse_rc_datetime(rc_call_data.get("startTime")),
+            "duration_seconds": rc_call_data.get("duration"),
 
             # Recording
-            has_recording=len(rc_call_data.get("recording", {}).get("recordings", [])) > 0,
+            "has_recording": len(recordings) > 0,
+            "recording_id": None,
+            "recording_content_uri": None,
+            "recording_duration_seconds": None,
 
             # Raw data
-            metadata=rc_call_data
-        )
+            "call_metadata": rc_call_data
+        }
 
         # Handle recordings
-        recordings = rc_call_data.get("recording", {}).get("recordings", [])
         if recordings:
             first_recording = recordings[0]
-            call_log.recording_id = str(first_recording.get("id"))
-            call_log.recording_content_uri = first_recording.get("contentUri")
-            call_log.recording_duration_seconds = first_recording.get("duration")
-
-        self.db.add(call_log)
-        self.db.commit()
+            values["recording_id"] = str(first_recording.get("id"))
+            values["recording_content_uri"] = first_recording.get("contentUri")
+            values["recording_duration_seconds"] = first_recording.get("duration")
 
-        # Queue for background processing if has recording
-        if call_log.has_recording:
-            await self._queue_recording_processing(call_log.id)
+        return values
 
-        return True
+    async def _queue_recording_processing(self, call_log_ids: List[str]) -> int:
+        """Queue calls for recording download and AI processing in one round trip."""
+        if not call_log_ids:
+            return 0
+        from app.services.background_jobs import background_job_manager, JobPriority
 
-    async def _queue_recording_processing(self, call_log_id: str):
-        """Queue call for recording download and AI processing."""
-        # This will be implemented when we add background job processing
-        logger.info(f"Queued call {call_log_id} for recording processing")
+        try:
+            # Behind calls arriving by webhook
+            await background_job_manager.queue_call_processing_batch(call_log_ids, priority=JobPriority.MEDIUM)
+            return len(call_log_ids)
+        except Exception as e:
+            logger.error(f"Failed to queue {len(call_log_ids)} synced calls for processing: {e}")
+            return 0
+
+    def _as_utc(self, value: Optional[datetime]) -> Optional[datetime]:
+        """Naive UTC datetime (timestamptz columns load timezone-aware)."""
+        if value is None or value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
 
     def _parse_rc_datetime(self, dt_string: Optional[str]) -> Optional[datetime]:
         """Parse RingCentral datetime string."""
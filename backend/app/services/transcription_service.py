@@ -6,8 +6,9 @@ Handles audio file processing and transcription generation.
 import logging
 import asyncio
 import aiohttp
+import tempfile
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -18,10 +19,28 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.models.ringcentral import CallLog
 from app.database.base_class import get_db
+from app.services.ai_result_cache import AICacheKey, file_hash, get_ai_result_cache, prompt_version
+from app.utils.audio_chunking import (
+    AudioChunk, AudioChunkingError, analyze_audio, extract_chunk, plan_chunks, probe_duration, stitch_segments
+)
 
 logger = logging.getLogger(__name__)
 
 
+# Whisper request options (part of the transcription cache key)
+WHISPER_REQUEST_OPTIONS = {
+    "language": "en",  # Assume English for now, can be auto-detected
+    "response_format": "verbose_json",  # Get detailed response with segments
+    "timestamp_granularities": ["segment"]  # Get segment-level timestamps
+}
+
+# Working directory for downloads and chunk files
+RECORDINGS_TEMP_DIR = Path("/tmp/crm_recordings")
+
+# Attempts per chunk before the whole transcription fails
+CHUNK_ATTEMPTS = 2
+
+
 class TranscriptionError(Exception):
     """Custom exception for transcription-related errors."""
     pass
@@ -35,7 +54,9 @@ class TranscriptionService:
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = settings.WHISPER_MODEL
         self.max_file_size = 25 * 1024 * 1024  # 25MB limit for Whisper API
+        self.max_chunked_file_size = settings.TRANSCRIPTION_MAX_FILE_MB * 1024 * 1024
         self.max_duration_seconds = 3600  # 1 hour limit
+        self.cache = get_ai_result_cache()
 
     async def transcribe_call_recording(
         self,
@@ -115,6 +136,7 @@ class TranscriptionService:
                 'segments': transcript_segments,
                 'duration': time.time() - start_time,
                 'model': self.model,
+                'chunks': transcription_result.get('chunks'),
                 'created_at': datetime.utcnow().isoformat(),
                 'file_size_bytes': audio_file.stat().st_size if audio_file.exists() else None
             }
@@ -172,8 +194,9 @@ class TranscriptionService:
 
     async def _download_audio_file(self, audio_url: str, call_id: str) -> Path:
         """Download audio file from URL to temporary location."""
-        temp_dir = Path("/tmp/crm_recordings")
+        temp_dir = RECORDINGS_TEMP_DIR
         temp_dir.mkdir(exist_ok=True)
+        max_size = self._max_accepted_file_size()
 
         # Generate temporary filename
         timestamp = int(time.time())
@@ -187,7 +210,7 @@ class TranscriptionService:
 
                     # Check content length
                     content_length = response.headers.get('content-length')
-                    if content_length and int(content_length) > self.max_file_size:
+                    if content_length and int(content_length) > max_size:
                         raise TranscriptionError(f"Audio file too large: {content_length} bytes")
 
                     # Download in chunks
@@ -196,7 +219,7 @@ class TranscriptionService:
                             f.write(chunk)
 
                             # Check file size during download
-                            if f.tell() > self.max_file_size:
+                            if f.tell() > max_size:
                                 raise TranscriptionError(f"Audio file too large during download")
 
             logger.info(f"Downloaded audio file for call {call_id}: {temp_file}")
@@ -216,11 +239,12 @@ class TranscriptionService:
         if not audio_file.exists():
             raise TranscriptionError(f"Audio file does not exist: {audio_file}")
 
-        # Check file size
+        # Check file size (larger than the Whisper limit is chunked)
         file_size = audio_file.stat().st_size
-        if file_size > self.max_file_size:
+        max_size = self._max_accepted_file_size()
+        if file_size > max_size:
             raise TranscriptionError(
-                f"Audio file too large: {file_size} bytes (max: {self.max_file_size})"
+                f"Audio file too large: {file_size} bytes (max: {max_size})"
             )
 
         if file_size == 0:
@@ -238,8 +262,148 @@ class TranscriptionService:
 
         logger.debug(f"Audio file validation passed: {audio_file} ({file_size} bytes)")
 
+    def _max_accepted_file_size(self) -> int:
+        """Largest recording accepted: the Whisper limit unless chunking is on."""
+        if settings.TRANSCRIPTION_CHUNKING_ENABLED:
+            return max(self.max_file_size, self.max_chunked_file_size)
+        return self.max_file_size
+
     async def _transcribe_audio(self, audio_file: Path) -> Dict[str, Any]:
-        """Perform the actual transcription using OpenAI Whisper."""
+        """
+        Perform the actual transcription using OpenAI Whisper.
+
+        Results are cached by recording content, so the same audio is only
+        sent to Whisper once per model, request options and chunking setup.
+        Long or oversized recordings are transcribed in concurrent chunks.
+        """
+        cache_key = AICacheKey(
+            "transcription", self.model, self._cache_version(),
+            await asyncio.to_thread(file_hash, audio_file)
+        )
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached transcription for {audio_file.name}")
+            return cached
+
+        chunks = await asyncio.to_thread(self._plan_chunks, audio_file)
+        if chunks:
+            result = await self._transcribe_chunked(audio_file, chunks)
+        else:
+            result = await self._request_transcription(audio_file)
+
+        await self.cache.set(cache_key, result)
+        return result
+
+    def _cache_version(self) -> str:
+        """
+        Cache version of a transcription: Whisper request options plus the
+        chunking settings, including the backend and model chunks go to.
+        """
+        chunking = None
+        if settings.TRANSCRIPTION_CHUNKING_ENABLED:
+            backend = settings.TRANSCRIPTION_CHUNK_BACKEND
+            chunking = {
+                "backend": backend,
+                "model": settings.LOCAL_WHISPER_MODEL if backend == "local" else self.model,
+                "threshold_seconds": settings.TRANSCRIPTION_CHUNK_THRESHOLD_SECONDS,
+                "chunk_seconds": settings.TRANSCRIPTION_CHUNK_SECONDS,
+                "overlap_seconds": settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS,
+            }
+        return prompt_version(WHISPER_REQUEST_OPTIONS, chunking)
+
+    def _plan_chunks(self, audio_file: Path) -> Optional[List[AudioChunk]]:
+        """
+        Chunk plan for a recording over the Whisper size limit or longer
+        than TRANSCRIPTION_CHUNK_THRESHOLD_SECONDS; None to send it whole.
+        """
+        if not settings.TRANSCRIPTION_CHUNKING_ENABLED:
+            return None
+
+        oversized = audio_file.stat().st_size > self.max_file_size
+        try:
+            if not oversized:
+                duration = probe_duration(audio_file, settings.FFMPEG_PATH)
+                if duration <= settings.TRANSCRIPTION_CHUNK_THRESHOLD_SECONDS:
+                    return None
+            duration, silences = analyze_audio(audio_file, settings.FFMPEG_PATH)
+        except AudioChunkingError as e:
+            if oversized:
+                raise TranscriptionError(f"Cannot split oversized recording: {str(e)}") from e
+            logger.warning(f"Audio probe failed for {audio_file.name}, transcribing whole: {e}")
+            return None
+
+        chunks = plan_chunks(
+            duration, silences,
+            settings.TRANSCRIPTION_CHUNK_SECONDS,
+            settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS
+        )
+        logger.info(
+            f"Chunking {audio_file.name} ({duration:.0f}s, {len(silences)} silences) "
+            f"into {len(chunks)} chunks"
+        )
+        return chunks
+
+    async def _transcribe_chunked(self, audio_file: Path, chunks: List[AudioChunk]) -> Dict[str, Any]:
+        """
+        Extract and transcribe chunks concurrently, then stitch them.
+
+        Up to TRANSCRIPTION_CHUNK_CONCURRENCY chunks are in flight, so a
+        recording takes about as long as its slowest chunk.
+        """
+        start_time = time.time()
+        semaphore = asyncio.Semaphore(settings.TRANSCRIPTION_CHUNK_CONCURRENCY)
+        RECORDINGS_TEMP_DIR.mkdir(exist_ok=True)
+
+        with tempfile.TemporaryDirectory(prefix="chunks_", dir=RECORDINGS_TEMP_DIR) as temp_dir:
+            async def transcribe_chunk(chunk: AudioChunk) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        chunk_file = await asyncio.to_thread(
+                            extract_chunk, audio_file, chunk, temp_dir, settings.FFMPEG_PATH
+                        )
+                    except AudioChunkingError as e:
+                        raise TranscriptionError(str(e)) from e
+
+                    for attempt in range(1, CHUNK_ATTEMPTS + 1):
+                        try:
+                            return await self._transcribe_chunk_file(chunk_file)
+                        except Exception as e:
+                            if attempt == CHUNK_ATTEMPTS:
+                                raise TranscriptionError(f"Chunk {chunk.index} failed: {str(e)}") from e
+                            logger.warning(f"Chunk {chunk.index} of {audio_file.name} failed, retrying: {e}")
+
+            chunk_results = await asyncio.gather(
+                *(transcribe_chunk(chunk) for chunk in chunks),
+                return_exceptions=True
+            )
+
+        failures = [result for result in chunk_results if isinstance(result, BaseException)]
+        if failures:
+            raise failures[0]
+
+        result = stitch_segments(chunks, chunk_results)
+        result['chunks'] = len(chunks)
+        logger.info(
+            f"Transcribed {audio_file.name} in {len(chunks)} chunks "
+            f"in {time.time() - start_time:.2f}s"
+        )
+        return result
+
+    async def _transcribe_chunk_file(self, chunk_file: Path) -> Dict[str, Any]:
+        """Transcribe one chunk with the configured backend."""
+        if settings.TRANSCRIPTION_CHUNK_BACKEND == "local":
+            from app.services.local_ai_service import local_ai_service
+
+            result = await local_ai_service.transcribe_audio_file(str(chunk_file))
+            return {
+                'text': result.get('text', ''),
+                'language': result.get('language'),
+                'segments': result.get('segments') or []
+            }
+        return await self._request_transcription(chunk_file)
+
+    async def _request_transcription(self, audio_file: Path) -> Dict[str, Any]:
+        """One Whisper request for a whole file."""
         try:
             logger.debug(f"Starting Whisper transcription: {audio_file}")
 
@@ -248,9 +412,7 @@ class TranscriptionService:
                 response = await self.client.audio.transcriptions.create(
                     model=self.model,
                     file=f,
-                    language='en',  # Assume English for now, can be auto-detected
-                    response_format='verbose_json',  # Get detailed response with segments
-                    timestamp_granularities=['segment']  # Get segment-level timestamps
+                    **WHISPER_REQUEST_OPTIONS
                 )
 
             # Convert response to dict for consistent handling
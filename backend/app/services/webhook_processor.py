@@ -5,15 +5,18 @@ Handles event processing, deduplication, and automation pipeline triggers.
 
 import logging
 import asyncio
+import hashlib
+import json
 import time
 from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
 from app.core.config import settings
 from app.models.ringcentral import RCWebhookEvent, CallLog, RCAccount
+from app.services.agent_rollup_service import AgentRollupService
 from app.services.call_processing_pipeline import CallProcessingPipeline, CallProcessingError
 from app.services.ringcentral_service import RingCentralService
 from app.services.background_jobs import background_job_manager, JobPriority
@@ -21,6 +24,83 @@ from app.database.base_class import get_db
 
 logger = logging.getLogger(__name__)
 
+# Deliveries of the same notification (same telephony session, event type
+# and notification id) whose timestamps are closer than this are duplicates
+DUPLICATE_WINDOW_MS = 30000
+
+
+def webhook_event_timestamp_ms(
+    payload: Dict[str, Any],
+    fallback: Optional[datetime] = None
+) -> Optional[int]:
+    """
+    Event time in epoch milliseconds.
+
+    RingCentral sends "timestamp" as ISO 8601; epoch milliseconds are
+    accepted too. Falls back to the given time (naive means UTC).
+    """
+    value = payload.get("timestamp")
+    if value is not None:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            pass
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return int(parsed.timestamp() * 1000)
+        except ValueError:
+            pass
+
+    if fallback is None:
+        return None
+    if fallback.tzinfo is None:
+        fallback = fallback.replace(tzinfo=timezone.utc)
+    return int(fallback.timestamp() * 1000)
+
+
+def webhook_notification_id(payload: Dict[str, Any]) -> str:
+    """
+    Identity of one notification, shared by its redeliveries only.
+
+    RingCentral's notification "uuid" when present, else the session's
+    body.sequence, else a digest of the body. Successive status changes of
+    one session (Setup, Answered, Disconnected) get different ids.
+    """
+    if payload.get("uuid"):
+        return f"uuid={payload['uuid']}"
+    body = payload.get("body")
+    if isinstance(body, dict) and body.get("sequence") is not None:
+        return f"seq={body['sequence']}"
+    digest = hashlib.sha1(json.dumps(body, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"body={digest}"
+
+
+def _idempotency_key(session_id: str, event_type: str, notification_id: str, bucket: int) -> str:
+    return f"{session_id}:{event_type}:{notification_id}:{bucket}"
+
+
+def webhook_idempotency_key(
+    payload: Dict[str, Any],
+    event_type: str,
+    received_at: Optional[datetime] = None
+) -> Optional[str]:
+    """
+    Idempotency key of a webhook delivery: telephony session, event type,
+    notification id and DUPLICATE_WINDOW_MS timestamp bucket. None for
+    events without a telephony session, which are never treated as
+    duplicates.
+    """
+    body = payload.get("body")
+    session_id = body.get("telephonySessionId") if isinstance(body, dict) else None
+    timestamp_ms = webhook_event_timestamp_ms(payload, received_at)
+    if not session_id or timestamp_ms is None:
+        return None
+    return _idempotency_key(
+        session_id, event_type, webhook_notification_id(payload), timestamp_ms // DUPLICATE_WINDOW_MS
+    )
+
 
 class WebhookProcessingError(Exception):
     """Custom exception for webhook processing errors."""
@@ -41,15 +121,16 @@ class WebhookProcessor:
 
         # Supported event types for processing
         self.supported_events = {
-            "/restapi/v1.0/account/~/extension/~/telephony/sessions": self._process_call_session_event,
+            "/restapi/v1.0/account/~/extension/~/telephony/sessions": self._process_call_event,
             "/restapi/v1.0/account/~/extension/~/recording": self._process_recording_event,
-            "/restapi/v1.0/account/~/extension/~/call-log": self._process_call_log_event
+            "/restapi/v1.0/account/~/extension/~/call-log": self._process_call_event
         }
 
     async def process_webhook_event(
         self,
         event_id: str,
-        db: Optional[Session] = None
+        db: Optional[Session] = None,
+        refresh_rollups: bool = True
     ) -> Dict[str, Any]:
         """
         Process a webhook event and trigger appropriate automation workflows.
@@ -57,6 +138,8 @@ class WebhookProcessor:
         Args:
             event_id: UUID of the webhook event to process
             db: Database session (optional)
+            refresh_rollups: Refresh the agent rollup cell of the event's call
+                (batch callers pass False and call refresh_agent_rollups once)
 
         Returns:
             Dict with processing results
@@ -123,6 +206,9 @@ class WebhookProcessor:
 
             db.commit()
 
+            if refresh_rollups and processor_result.get("call_log_id"):
+                self.refresh_agent_rollups([processor_result["call_log_id"]], db)
+
             logger.info(
                 f"Webhook event {event_id} processed successfully in {processing_time:.2f}s: "
                 f"{processor_result['status']}"
@@ -158,33 +244,69 @@ class WebhookProcessor:
             logger.error(f"Webhook processing failed for event {event_id}: {e}")
             raise WebhookProcessingError(f"Webhook processing failed: {str(e)}") from e
 
+    def refresh_agent_rollups(self, call_log_ids: List[str], db: Session) -> None:
+        """Recompute the agent rollup cells of calls changed by webhook events."""
+        if not call_log_ids:
+            return
+        try:
+            AgentRollupService(db).refresh_calls(call_log_ids)
+        except Exception as e:
+            logger.warning(f"Agent rollup refresh failed after webhook processing: {e}")
+
     async def _check_for_duplicates(
         self,
         current_event: RCWebhookEvent,
         db: Session
     ) -> Dict[str, Any]:
-        """Check for duplicate webhook events within a time window."""
+        """
+        Check for an already processed delivery of the same notification.
+
+        Any redelivery within DUPLICATE_WINDOW_MS falls in the current or an
+        adjacent timestamp bucket, so this is one indexed lookup of three
+        idempotency keys; only those few candidates' payloads are compared.
+        Other notifications of the same session (state transitions) have a
+        different notification id and never match.
+        """
         try:
-            # Look for similar events in the last 10 minutes
-            time_window = datetime.utcnow() - timedelta(minutes=10)
+            current_payload = current_event.raw_payload or {}
+            body = current_payload.get("body")
+            session_id = body.get("telephonySessionId") if isinstance(body, dict) else None
+            timestamp_ms = webhook_event_timestamp_ms(current_payload, current_event.received_at)
+            if not session_id or timestamp_ms is None:
+                return {"is_duplicate": False}
+
+            bucket = timestamp_ms // DUPLICATE_WINDOW_MS
+            notification_id = webhook_notification_id(current_payload)
+            if not current_event.idempotency_key:
+                # Events stored before keys were derived at ingestion
+                current_event.idempotency_key = _idempotency_key(
+                    session_id, current_event.event_type, notification_id, bucket
+                )
 
-            similar_events = db.query(RCWebhookEvent).filter(
+            candidates = db.query(RCWebhookEvent).filter(
                 and_(
-                    RCWebhookEvent.event_type == current_event.event_type,
-                    RCWebhookEvent.received_at >= time_window,
+                    RCWebhookEvent.idempotency_key.in_([
+                        _idempotency_key(session_id, current_event.event_type, notification_id, candidate_bucket)
+                        for candidate_bucket in (bucket - 1, bucket, bucket + 1)
+                    ]),
                     RCWebhookEvent.id != current_event.id,
                     RCWebhookEvent.processed == True
                 )
-            ).all()
-
-            # Check for payload similarity (for call events, compare session IDs)
-            current_payload = current_event.raw_payload
-            for similar_event in similar_events:
-                if self._are_events_duplicate(current_payload, similar_event.raw_payload):
+            ).order_by(RCWebhookEvent.received_at).all()
+
+            for candidate in candidates:
+                candidate_payload = candidate.raw_payload or {}
+                if webhook_notification_id(candidate_payload) != notification_id:
+                    continue
+                candidate_ms = webhook_event_timestamp_ms(candidate_payload, candidate.received_at)
+                if candidate_ms is not None and abs(timestamp_ms - candidate_ms) < DUPLICATE_WINDOW_MS:
                     return {
                         "is_duplicate": True,
-                        "original_event_id": str(similar_event.id),
-                        "original_processed_at": similar_event.processing_completed_at.isoformat()
+                        "original_event_id": str(candidate.id),
+                        "original_processed_at": (
+                            candidate.processing_completed_at.isoformat()
+                            if candidate.processing_completed_at else None
+                        )
                     }
 
             return {"is_duplicate": False}
@@ -193,36 +315,6 @@ class WebhookProcessor:
             logger.warning(f"Error checking for duplicates: {e}")
             return {"is_duplicate": False}
 
-    def _are_events_duplicate(self, payload1: Dict[str, Any], payload2: Dict[str, Any]) -> bool:
-        """Check if two webhook payloads represent the same event."""
-        try:
-            # For call events, compare session IDs
-            if "body" in payload1 and "body" in payload2:
-                body1 = payload1["body"]
-                body2 = payload2["body"]
-
-                # Check session ID
-                session1 = body1.get("telephonySessionId")
-                session2 = body2.get("telephonySessionId")
-
-                if session1 and session2 and session1 == session2:
-                    # Also check timestamp to ensure they're close
-                    time1 = payload1.get("timestamp")
-                    time2 = payload2.get("timestamp")
-
-                    if time1 and time2:
-                        # Consider events duplicate if within 30 seconds
-                        time_diff = abs(int(time1) - int(time2))
-                        return time_diff < 30000  # 30 seconds in milliseconds
-
-                    return True
-
-            return False
-
-        except Exception as e:
-            logger.warning(f"Error comparing event payloads: {e}")
-            return False
-
     async def _handle_duplicate_event(
         self,
         webhook_event: RCWebhookEvent,
@@ -603,9 +695,11 @@ class WebhookProcessor:
                 logger.warning(f"No RC account found for account {account_id}, extension {extension_id}")
                 return {"found": False, "reason": "No RC account found"}
 
-            # Try to sync recent calls
+            # Try to sync recent calls; the caller triggers the pipeline for this one
             rc_service = RingCentralService(db=db, user_id=rc_account.user_id)
-            sync_result = await rc_service.sync_calls(hours_back=1, force_refresh=True)
+            sync_result = await rc_service.sync_calls(
+                hours_back=1, force_refresh=True, skip_rc_session_ids=[session_id]
+            )
 
             # Check if the call was synced
             call_log = db.query(CallLog).filter(
@@ -0,0 +1,499 @@
+"""
+Fast-ack webhook ingestion through a durable Redis stream.
+
+With WEBHOOK_FAST_ACK the webhook endpoint only validates the signature
+and appends the raw event to a Redis stream, so RingCentral is answered
+within milliseconds and does not retry slow deliveries. Consumers
+(worker.py --webhook-consumers) store the events in rc_webhook_events in
+batches and run them through WebhookProcessor.
+
+Events are sharded over WEBHOOK_STREAM_SHARDS streams by telephony
+session, and a consumer leases whole shards, so all events of a call are
+handled by one consumer in arrival order. An entry is acknowledged to the
+shard's consumer group only after its event is stored and processed; a
+consumer re-reads its own unacknowledged entries before anything new, and
+one taking over a shard claims the entries its predecessor left pending
+once they have been idle for a whole lease. Leases are renewed between
+events, and a consumer that lost a shard stops processing its entries.
+Stored rows get an id derived from the stream entry id, so a redelivered
+entry is neither stored nor processed twice. Entries that cannot be
+parsed, or were delivered WEBHOOK_STREAM_MAX_DELIVERIES times without
+being acknowledged, are moved to the "<stream>:dead" stream.
+"""
+
+import logging
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+import zlib
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Any, Optional, List, Tuple
+from datetime import datetime
+
+from redis.exceptions import ResponseError
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.models.ringcentral import RCWebhookEvent
+from app.services.background_jobs import background_job_manager
+from app.services.webhook_processor import WebhookProcessor, WebhookProcessingError, webhook_idempotency_key
+from app.database.base_class import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_GROUP = "webhook-processors"
+
+# Namespace of webhook event ids derived from "<shard>:<stream entry id>"
+EVENT_ID_NAMESPACE = uuid.UUID("dedd0f57-c3e7-43df-ae69-b4b7909cf42d")
+
+# Longest blocking read for new entries; well under the shard lease
+READ_BLOCK_MS = 2000
+
+# Leases are renewed (and shards rebalanced) this many times per lease
+LEASE_RENEWALS = 3
+
+# Extend or drop a shard lease only while this consumer still owns it
+RENEW_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class WebhookStreamError(Exception):
+    """Custom exception for webhook stream errors."""
+    pass
+
+
+def webhook_partition_key(payload: Dict[str, Any]) -> str:
+    """Telephony session of a webhook event, or its uuid when it has none."""
+    body = payload.get("body")
+    if isinstance(body, dict):
+        session_id = body.get("telephonySessionId") or body.get("sessionId")
+        if session_id:
+            return str(session_id)
+    return str(payload.get("uuid") or "")
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class WebhookEventStream:
+    """
+    Redis stream of received webhook events and its batch consumers.
+    """
+
+    def __init__(self):
+        """Initialize webhook event stream."""
+        self.redis_client = background_job_manager.redis_client
+        self.stream_name = settings.WEBHOOK_STREAM_NAME
+        self.shard_keys = [f"{self.stream_name}:{shard}" for shard in range(settings.WEBHOOK_STREAM_SHARDS)]
+        # Heartbeats of running consumers, for sharing shards between them
+        self.consumers_key = f"{self.stream_name}:consumers"
+        # Unparseable or repeatedly failing entries, with their shard and entry id
+        self.dead_letter_key = f"{self.stream_name}:dead"
+        self.max_deliveries = settings.WEBHOOK_STREAM_MAX_DELIVERIES
+        self.maxlen = settings.WEBHOOK_STREAM_MAXLEN
+        self.lease_ms = settings.WEBHOOK_STREAM_LEASE_SECONDS * 1000
+        self.renew_lease_script = self.redis_client.register_script(RENEW_LEASE_SCRIPT)
+        self.release_lease_script = self.redis_client.register_script(RELEASE_LEASE_SCRIPT)
+        self.groups_ready = False
+        self.processor: Optional[WebhookProcessor] = None
+
+    def _lease_key(self, shard_key: str) -> str:
+        return f"{shard_key}:owner"
+
+    def shard_for(self, payload: Dict[str, Any]) -> str:
+        """Shard stream of a webhook event, by telephony session."""
+        partition_key = webhook_partition_key(payload).encode("utf-8")
+        return self.shard_keys[zlib.crc32(partition_key) % len(self.shard_keys)]
+
+    @staticmethod
+    def event_id(shard_key: str, entry_id: str) -> uuid.UUID:
+        """RCWebhookEvent id of a stream entry."""
+        return uuid.uuid5(EVENT_ID_NAMESPACE, f"{shard_key}:{entry_id}")
+
+    async def append(
+        self,
+        payload: Dict[str, Any],
+        raw_payload: bytes,
+        headers: Dict[str, Any],
+        signature: Optional[str],
+        received_at: datetime
+    ) -> uuid.UUID:
+        """
+        Append a validated webhook event to its shard stream.
+
+        Returns:
+            Id the event will be stored under in rc_webhook_events
+
+        Raises:
+            WebhookStreamError: If the event could not be appended
+        """
+        shard_key = self.shard_for(payload)
+        try:
+            entry_id = await self.redis_client.xadd(
+                shard_key,
+                {
+                    "payload": raw_payload,
+                    "headers": json.dumps(headers),
+                    "signature": signature or "",
+                    "received_at": received_at.isoformat()
+                },
+                maxlen=self.maxlen,
+                approximate=True
+            )
+        except Exception as e:
+            raise WebhookStreamError(f"Failed to append webhook event: {e}") from e
+        return self.event_id(shard_key, _decode(entry_id))
+
+    async def consume(self, consumer_name: str, batch_size: Optional[int] = None):
+        """
+        Store and process streamed webhook events.
+        This runs continuously in a worker process.
+
+        Reads up to batch_size entries per owned shard per round trip;
+        owned shards are rebalanced between batches and their leases are
+        also renewed between the events of a batch.
+        """
+        batch_size = batch_size or settings.WEBHOOK_CONSUMER_BATCH_SIZE
+        renew_interval = self.lease_ms / 1000 / LEASE_RENEWALS
+        # Owned shard -> whether unacknowledged entries (ours or a previous
+        # owner's) may remain; those are read before anything new
+        owned: Dict[str, bool] = {}
+        last_renewal = 0.0
+        logger.info(f"Starting webhook consumer {consumer_name}")
+
+        async def keep_leases() -> Dict[str, bool]:
+            """Renew leases when due; returns the shards still owned."""
+            nonlocal last_renewal
+            if time.time() - last_renewal >= renew_interval:
+                await self._renew_leases(consumer_name, owned)
+                last_renewal = time.time()
+            return owned
+
+        try:
+            while True:
+                try:
+                    if not owned or time.time() - last_renewal >= renew_interval:
+                        await self._ensure_groups()
+                        await self._rebalance(consumer_name, owned)
+                        last_renewal = time.time()
+
+                    if not owned:
+                        # Every shard is owned by another consumer
+                        await asyncio.sleep(READ_BLOCK_MS / 1000)
+                        continue
+
+                    entries = await self._read_entries(consumer_name, owned, batch_size)
+                    if entries:
+                        await self._process_entries(entries, keep_leases)
+
+                except Exception as e:
+                    logger.error(f"Webhook consumer {consumer_name} error: {e}")
+                    self.groups_ready = False
+                    # Entries of the failed batch stay pending on this
+                    # consumer; re-read them before anything new
+                    for shard_key in owned:
+                        owned[shard_key] = True
+                    # Back off briefly (e.g. Redis or database unavailable), then continue
+                    await asyncio.sleep(1)
+        finally:
+            await self._release_all(consumer_name, owned)
+
+    async def _ensure_groups(self):
+        if self.groups_ready:
+            return
+        for shard_key in self.shard_keys:
+            try:
+                # From the start, so events appended before any consumer ran are kept
+                await self.redis_client.xgroup_create(shard_key, CONSUMER_GROUP, id="0", mkstream=True)
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self.groups_ready = True
+
+    async def _rebalance(self, consumer_name: str, owned: Dict[str, bool]):
+        """
+        Renew owned shard leases and move towards an even share of shards.
+
+        Live consumers are counted by heartbeat; a consumer above its share
+        hands shards back, and one below it takes unowned shards.
+        """
+        now_ms = int(time.time() * 1000)
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zadd(self.consumers_key, {consumer_name: now_ms})
+        pipe.zremrangebyscore(self.consumers_key, "-inf", now_ms - self.lease_ms)
+        pipe.zcard(self.consumers_key)
+        _, _, consumers = await pipe.execute()
+        fair_share = math.ceil(len(self.shard_keys) / max(consumers, 1))
+
+        await self._renew_leases(consumer_name, owned)
+
+        while len(owned) > fair_share:
+            shard_key = list(owned)[-1]
+            await self.release_lease_script(keys=[self._lease_key(shard_key)], args=[consumer_name])
+            del owned[shard_key]
+            logger.info(f"Webhook consumer {consumer_name} released shard {shard_key}")
+
+        # Start at a random shard so consumers spread out
+        start = random.randrange(len(self.shard_keys))
+        for offset in range(len(self.shard_keys)):
+            if len(owned) >= fair_share:
+                break
+            shard_key = self.shard_keys[(start + offset) % len(self.shard_keys)]
+            if shard_key in owned:
+                continue
+            if await self.redis_client.set(self._lease_key(shard_key), consumer_name, nx=True, px=self.lease_ms):
+                owned[shard_key] = True
+                logger.info(f"Webhook consumer {consumer_name} took shard {shard_key}")
+
+    async def _renew_leases(self, consumer_name: str, owned: Dict[str, bool]):
+        """Extend the leases of owned shards, dropping any lost meanwhile."""
+        for shard_key in list(owned):
+            renewed = await self.renew_lease_script(
+                keys=[self._lease_key(shard_key)],
+                args=[consumer_name, self.lease_ms]
+            )
+            if not renewed:
+                logger.warning(f"Webhook consumer {consumer_name} lost shard {shard_key}")
+                del owned[shard_key]
+
+    async def _release_all(self, consumer_name: str, owned: Dict[str, bool]):
+        """Hand back owned shards and deregister, so others take over at once."""
+        try:
+            for shard_key in owned:
+                await self.release_lease_script(keys=[self._lease_key(shard_key)], args=[consumer_name])
+            await self.redis_client.zrem(self.consumers_key, consumer_name)
+        except Exception as e:
+            logger.warning(f"Failed to release shards of webhook consumer {consumer_name}: {e}")
+
+    async def _read_entries(
+        self,
+        consumer_name: str,
+        owned: Dict[str, bool],
+        batch_size: int
+    ) -> List[Tuple[str, str, Dict[bytes, bytes]]]:
+        """
+        Next batch of (shard, entry id, fields), in stream order per shard.
+
+        Unacknowledged entries come first, since they precede anything new
+        on their shard: this consumer's own (e.g. from a failed batch), then
+        a previous owner's once idle for a whole lease, so entries it may
+        still be working on are not taken from under it. A shard with
+        pending entries not yet claimable gets no new reads meanwhile.
+        """
+        waiting = set()
+        for shard_key, has_pending in owned.items():
+            if not has_pending:
+                continue
+            response = await self.redis_client.xreadgroup(
+                CONSUMER_GROUP, consumer_name, {shard_key: "0"}, count=batch_size
+            )
+            mine = [(entry_id, fields) for _, shard_entries in response or [] for entry_id, fields in shard_entries]
+            entries = await self._usable_entries(shard_key, mine)
+            if entries:
+                return entries
+
+            pending = await self.redis_client.xpending(shard_key, CONSUMER_GROUP)
+            if not pending["pending"]:
+                owned[shard_key] = False
+                continue
+
+            result = await self.redis_client.xautoclaim(
+                shard_key, CONSUMER_GROUP, consumer_name,
+                min_idle_time=self.lease_ms, start_id="0-0", count=batch_size
+            )
+            entries = await self._usable_entries(shard_key, result[1])
+            if entries:
+                return entries
+            waiting.add(shard_key)
+
+        readable = {shard_key: ">" for shard_key in owned if shard_key not in waiting}
+        if not readable:
+            await asyncio.sleep(READ_BLOCK_MS / 1000)
+            return []
+        response = await self.redis_client.xreadgroup(
+            CONSUMER_GROUP,
+            consumer_name,
+            readable,
+            count=batch_size,
+            block=READ_BLOCK_MS
+        )
+        return [
+            (_decode(shard_key), _decode(entry_id), fields)
+            for shard_key, shard_entries in response or []
+            for entry_id, fields in shard_entries
+        ]
+
+    async def _usable_entries(
+        self,
+        shard_key: str,
+        redelivered: List[Tuple[Any, Dict[bytes, bytes]]]
+    ) -> List[Tuple[str, str, Dict[bytes, bytes]]]:
+        """
+        Redelivered entries worth processing again.
+
+        Entries trimmed from the stream (no fields) are acknowledged, and
+        ones delivered max_deliveries times are dead-lettered, so a single
+        bad entry cannot block its shard.
+        """
+        if not redelivered:
+            return []
+        trimmed = [entry_id for entry_id, fields in redelivered if not fields]
+        if trimmed:
+            await self.redis_client.xack(shard_key, CONSUMER_GROUP, *trimmed)
+        entries = [(shard_key, _decode(entry_id), fields) for entry_id, fields in redelivered if fields]
+        if not entries:
+            return []
+
+        details = await self.redis_client.xpending_range(
+            shard_key, CONSUMER_GROUP, min=entries[0][1], max=entries[-1][1], count=len(entries)
+        )
+        deliveries = {_decode(detail["message_id"]): detail["times_delivered"] for detail in details}
+        poison = [entry for entry in entries if deliveries.get(entry[1], 0) >= self.max_deliveries]
+        for _, entry_id, fields in poison:
+            await self._dead_letter(
+                shard_key, entry_id, fields, f"Not acknowledged after {deliveries[entry_id]} deliveries"
+            )
+        return [entry for entry in entries if deliveries.get(entry[1], 0) < self.max_deliveries]
+
+    async def _dead_letter(self, shard_key: str, entry_id: str, fields: Dict[bytes, bytes], reason: str):
+        """Move an entry to the dead-letter stream and acknowledge it."""
+        logger.error(f"Dead-lettering webhook stream entry {shard_key}/{entry_id}: {reason}")
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.xadd(
+            self.dead_letter_key,
+            {**fields, "shard": shard_key, "entry_id": entry_id, "reason": reason},
+            maxlen=self.maxlen,
+            approximate=True
+        )
+        pipe.xack(shard_key, CONSUMER_GROUP, entry_id)
+        await pipe.execute()
+
+    def _event_record(self, shard_key: str, entry_id: str, fields: Dict[bytes, bytes]) -> Dict[str, Any]:
+        payload = json.loads(fields[b"payload"])
+        event_type = payload.get("event", "unknown")
+        received_at = datetime.fromisoformat(_decode(fields[b"received_at"]))
+        return {
+            "id": self.event_id(shard_key, entry_id),
+            "event_type": event_type,
+            "event_source": "ringcentral",
+            "raw_payload": payload,
+            "headers": json.loads(fields[b"headers"]),
+            "signature": _decode(fields[b"signature"]) or None,
+            "signature_valid": True,
+            "processed": False,
+            "processing_status": "pending",
+            "processing_attempts": 0,
+            "idempotency_key": webhook_idempotency_key(payload, event_type, received_at),
+            "received_at": received_at
+        }
+
+    async def _process_entries(
+        self,
+        entries: List[Tuple[str, str, Dict[bytes, bytes]]],
+        keep_leases: Callable[[], Awaitable[Dict[str, bool]]]
+    ):
+        """
+        Store a batch of entries, process them in order and acknowledge them.
+
+        The batch is stored with one insert; rows already stored by an
+        earlier delivery are skipped, and events already processed are left
+        alone by WebhookProcessor. Failed events stay on their row as
+        failed (see WebhookProcessor.batch_process_failed_events) and are
+        acknowledged like the rest. Leases are renewed before each event;
+        entries of a shard lost meanwhile are left unacknowledged for its
+        new owner.
+        """
+        records = []
+        for shard_key, entry_id, fields in entries:
+            try:
+                records.append((shard_key, entry_id, self._event_record(shard_key, entry_id, fields)))
+            except Exception as e:
+                await self._dead_letter(shard_key, entry_id, fields, f"Unreadable entry: {e}")
+        if not records:
+            return
+        if self.processor is None:
+            self.processor = WebhookProcessor()
+
+        acknowledged = defaultdict(list)
+        call_log_ids = set()
+        db = SessionLocal()
+        try:
+            db.execute(
+                insert(RCWebhookEvent.__table__)
+                .values([record for _, _, record in records])
+                .on_conflict_do_nothing(index_elements=["id"])
+            )
+            db.commit()
+
+            for shard_key, entry_id, record in records:
+                if shard_key not in await keep_leases():
+                    continue
+                try:
+                    result = await self.processor.process_webhook_event(
+                        str(record["id"]), db, refresh_rollups=False
+                    )
+                    call_log_id = result.get("processor_result", {}).get("call_log_id")
+                    if call_log_id:
+                        call_log_ids.add(call_log_id)
+                except WebhookProcessingError as e:
+                    logger.error(f"Webhook processing error for event {record['id']}: {e}")
+                acknowledged[shard_key].append(entry_id)
+
+            # One refresh for the agent rollup cells of every call in the batch
+            self.processor.refresh_agent_rollups(list(call_log_ids), db)
+        finally:
+            db.close()
+            if acknowledged:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for shard_key, entry_ids in acknowledged.items():
+                    pipe.xack(shard_key, CONSUMER_GROUP, *entry_ids)
+                await pipe.execute()
+
+    async def get_stream_stats(self) -> Dict[str, Any]:
+        """
+        Backlog per shard.
+
+        Returns:
+            Dict with per shard length, pending (read, unacknowledged)
+            and lag (not yet read; Redis 7+) entries and owning consumer
+        """
+        shards = {}
+        for shard_key in self.shard_keys:
+            try:
+                groups = await self.redis_client.xinfo_groups(shard_key)
+            except ResponseError:
+                # Shard stream not created yet
+                groups = []
+            group = next((group for group in groups if _decode(group["name"]) == CONSUMER_GROUP), None)
+            owner = await self.redis_client.get(self._lease_key(shard_key))
+            shards[shard_key] = {
+                "length": await self.redis_client.xlen(shard_key),
+                "pending": group["pending"] if group else 0,
+                "lag": group.get("lag") if group else None,
+                "owner": _decode(owner) if owner else None
+            }
+
+        return {
+            "shards": shards,
+            "pending": sum(shard["pending"] for shard in shards.values()),
+            "lag": sum(shard["lag"] or 0 for shard in shards.values())
+        }
+
+
+# ===== GLOBAL INSTANCE =====
+webhook_event_stream = WebhookEventStream()
@@ -1,18 +1,161 @@
 """
 WebSocket connection manager for real-time call transcription.
 Routes transcript data from Google STT to connected frontend clients.
+
+Transcripts go through a broker (settings.TRANSCRIPT_WS_BROKER):
+- memory: delivered to sockets on this process only; enough for a single
+  uvicorn worker
+- redis: published on a Redis pub/sub channel per call_sid, to which every
+  process with frontend sockets for that call subscribes, so the Twilio
+  media socket and the browser sockets may land on different workers or
+  replicas
+
+Each frontend socket has its own bounded queue and sender task, so a slow
+client never delays the others; when its queue is full the oldest queued
+message is dropped.
 """
 
 import asyncio
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 from fastapi import WebSocket
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+# Called with (call_sid, message) for every transcript message to deliver locally
+DeliverCallback = Callable[[str, str], None]
+
+
+class InMemoryTranscriptBroker:
+    """Delivers published messages straight to this process's sockets."""
+
+    def __init__(self, deliver: DeliverCallback):
+        self.deliver = deliver
+
+    async def publish(self, call_sid: str, message: str):
+        self.deliver(call_sid, message)
+
+    async def subscribe(self, call_sid: str):
+        pass
+
+    async def unsubscribe(self, call_sid: str):
+        pass
+
+    async def close(self):
+        pass
+
+
+class RedisTranscriptBroker:
+    """
+    Redis pub/sub channel per call_sid. One subscriber connection per
+    process, subscribed to the calls with local sockets; a reader task
+    hands its messages to the local sockets. Messages published while no
+    process is subscribed are dropped, as live transcripts have no replay.
+    """
+
+    # Reconnect backoff of the reader after a Redis error
+    RETRY_SECONDS = 1.0
+
+    def __init__(self, deliver: DeliverCallback, channel_prefix: Optional[str] = None):
+        import redis.asyncio as aioredis
+
+        self.deliver = deliver
+        self.channel_prefix = channel_prefix or settings.TRANSCRIPT_WS_CHANNEL_PREFIX
+        self.client = aioredis.from_url(settings.REDIS_URL)
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+
+    def _channel(self, call_sid: str) -> str:
+        return f"{self.channel_prefix}:{call_sid}"
+
+    async def publish(self, call_sid: str, message: str):
+        await self.client.publish(self._channel(call_sid), message)
+
+    async def subscribe(self, call_sid: str):
+        if self._pubsub is None:
+            self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self._channel(call_sid))
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_messages())
+
+    async def unsubscribe(self, call_sid: str):
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self._channel(call_sid))
+
+    async def _read_messages(self):
+        """Deliver messages from subscribed channels until closed."""
+        prefix_length = len(self.channel_prefix) + 1
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None or message["type"] != "message":
+                    continue
+                call_sid = message["channel"].decode()[prefix_length:]
+                self.deliver(call_sid, message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # The pub/sub connection resubscribes its channels when it reconnects
+                logger.warning(f"Transcript subscriber error, retrying in {self.RETRY_SECONDS}s: {e}")
+                await asyncio.sleep(self.RETRY_SECONDS)
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self.client.aclose()
+
+
+TRANSCRIPT_BROKERS = {
+    "memory": InMemoryTranscriptBroker,
+    "redis": RedisTranscriptBroker,
+}
+
+
+class TranscriptClient:
+    """
+    One frontend socket: a bounded queue drained by its own sender task.
+    When the client falls behind, the oldest queued message is dropped.
+    """
+
+    def __init__(self, ws: WebSocket, max_queue: int, on_failure: Callable[["TranscriptClient"], Awaitable[None]]):
+        self.ws = ws
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self._on_failure = on_failure
+        self.task = asyncio.create_task(self._send_messages())
+
+    def offer(self, message: str):
+        """Queue a message without waiting, dropping the oldest if full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def _send_messages(self):
+        while True:
+            message = await self.queue.get()
+            try:
+                await self.ws.send_text(message)
+            except Exception:
+                await self._on_failure(self)
+                return
+
+    async def close(self):
+        """Stop the sender task (unless called from it)."""
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
 
 class TranscriptWSManager:
     """
@@ -20,27 +163,45 @@ class TranscriptWSManager:
     Multiple frontend tabs can subscribe to the same call's transcript.
     """
 
-    def __init__(self):
-        # call_sid -> set of connected WebSockets
-        self._connections: dict[str, set[WebSocket]] = {}
+    def __init__(self, broker_name: Optional[str] = None, client_queue_size: Optional[int] = None):
+        broker_name = broker_name or settings.TRANSCRIPT_WS_BROKER
+        if broker_name not in TRANSCRIPT_BROKERS:
+            raise ValueError(f"Unknown transcript broker: {broker_name}")
+
+        # call_sid -> connected WebSockets on this process and their clients
+        self._connections: dict[str, dict[WebSocket, TranscriptClient]] = {}
         self._lock = asyncio.Lock()
+        self.client_queue_size = client_queue_size or settings.TRANSCRIPT_WS_CLIENT_QUEUE
+        self.broker_name = broker_name
+        self.broker = TRANSCRIPT_BROKERS[broker_name](self._deliver)
+        self.dropped = 0  # Messages dropped for clients that have since disconnected
 
     async def connect(self, call_sid: str, ws: WebSocket):
         """Register a frontend WebSocket for a specific call."""
         async with self._lock:
             if call_sid not in self._connections:
-                self._connections[call_sid] = set()
-            self._connections[call_sid].add(ws)
-        logger.info(f"WS client connected for call {call_sid} (total: {len(self._connections.get(call_sid, set()))})")
+                # First local listener: start receiving the call's transcripts
+                await self.broker.subscribe(call_sid)
+                self._connections[call_sid] = {}
+            self._connections[call_sid][ws] = TranscriptClient(
+                ws, self.client_queue_size,
+                on_failure=lambda client: self.disconnect(call_sid, client.ws)
+            )
+        logger.info(f"WS client connected for call {call_sid} (total: {len(self._connections.get(call_sid, {}))})")
 
     async def disconnect(self, call_sid: str, ws: WebSocket):
         """Remove a frontend WebSocket."""
         async with self._lock:
             conns = self._connections.get(call_sid)
-            if conns:
-                conns.discard(ws)
-                if not conns:
-                    del self._connections[call_sid]
+            client = conns.pop(ws, None) if conns is not None else None
+            if client is None:
+                return
+            if not conns:
+                del self._connections[call_sid]
+                await self.broker.unsubscribe(call_sid)
+
+        self.dropped += client.dropped
+        await client.close()
         logger.info(f"WS client disconnected for call {call_sid}")
 
     async def broadcast_transcript(
@@ -51,7 +212,8 @@ class TranscriptWSManager:
         speaker: str = "customer",
     ):
         """
-        Send a transcript entry to all connected frontends for a call.
+        Send a transcript entry to all connected frontends for a call,
+        on any process when the broker is shared.
         Message format matches TranscriptEntry in useCustomerTranscript.ts.
         """
         message = json.dumps({
@@ -61,37 +223,44 @@ class TranscriptWSManager:
             "timestamp": datetime.now(timezone.utc).isoformat(),
         })
 
-        async with self._lock:
-            conns = self._connections.get(call_sid)
-            if not conns:
-                return
+        try:
+            await self.broker.publish(call_sid, message)
+        except Exception as e:
+            logger.warning(f"Failed to publish transcript for call {call_sid}: {e}")
 
-        # Send outside the lock to avoid holding it during I/O
-        dead: list[WebSocket] = []
-        for ws in list(conns):
-            try:
-                await ws.send_text(message)
-            except Exception:
-                dead.append(ws)
-
-        # Clean up dead connections
-        if dead:
-            async with self._lock:
-                conns = self._connections.get(call_sid)
-                if conns:
-                    for ws in dead:
-                        conns.discard(ws)
-                    if not conns:
-                        del self._connections[call_sid]
+    def _deliver(self, call_sid: str, message: str):
+        """Queue a message for every local socket of a call (never blocks)."""
+        for client in list(self._connections.get(call_sid, {}).values()):
+            client.offer(message)
 
     def has_listeners(self, call_sid: str) -> bool:
-        """Check if any frontends are listening for a call."""
+        """Check if any frontends on this process are listening for a call."""
         return bool(self._connections.get(call_sid))
 
     def active_calls(self) -> list[str]:
-        """List call_sids with active frontend listeners."""
+        """List call_sids with active frontend listeners on this process."""
         return list(self._connections.keys())
 
+    def stats(self) -> dict:
+        """Connection and backpressure counters for this process."""
+        clients = [client for conns in self._connections.values() for client in conns.values()]
+        return {
+            "broker": self.broker_name,
+            "calls": len(self._connections),
+            "clients": len(clients),
+            "queued_messages": sum(client.queue.qsize() for client in clients),
+            "dropped_messages": self.dropped + sum(client.dropped for client in clients),
+        }
+
+    async def close(self):
+        """Stop every sender task and the broker (application shutdown)."""
+        async with self._lock:
+            clients = [client for conns in self._connections.values() for client in conns.values()]
+            self._connections.clear()
+        for client in clients:
+            await client.close()
+        await self.broker.close()
+
 
 # Singleton instance
 transcript_manager = TranscriptWSManager()
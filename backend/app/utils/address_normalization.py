@@ -3,11 +3,46 @@ Address normalization utilities for septic permit deduplication.
 
 Provides consistent address formatting for accurate duplicate detection
 across 7M+ permit records from various state/county sources.
+
+``canonicalize_address`` and ``canonical_address_hash`` are the only
+normalizer for stored addresses: every writer (API ingestion, property
+ingestion, import scripts and the Williamson scrapers) uses them, so
+permits and properties at the same address get the same address_hash and
+link with an equality join. Pass the record's state: city/state/ZIP tails
+are only stripped from Tennessee addresses. Rows record the
+ADDRESS_NORMALIZER_VERSION they were written with; bump it whenever
+canonical output changes and run the rehash_addresses job to recompute
+older rows.
+
+Ingestion and relinking call the normalizers millions of times, so every
+pattern is compiled once at import, token lookups go through one merged
+table, and results are memoized per distinct address. Use
+``normalize_many()`` for large batches; it can fan out across processes.
 """
 
+import os
 import re
 import hashlib
-from typing import Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+
+# Version of canonicalize_address/canonical_address_hash output, stored in
+# address_normalizer_version on septic_permits and properties (NULL = written
+# by one of the per-writer normalizers that predate this module)
+# 2: city/state/ZIP tails are only stripped from Tennessee addresses, and
+# cities only after a comma or before a TN/ZIP tail
+ADDRESS_NORMALIZER_VERSION = 2
+
+# Distinct addresses memoized per normalizer (a few hundred bytes each).
+# Permits and properties repeat the same street addresses heavily.
+ADDRESS_CACHE_SIZE = 262_144
+
+# normalize_many() stays in-process below this many addresses; a process
+# pool only pays off once the work outweighs pickling strings both ways
+PARALLEL_MIN_BATCH = 50_000
+NORMALIZE_CHUNK_SIZE = 5_000
 
 
 # USPS standard street suffix abbreviations
@@ -258,6 +293,43 @@ UNIT_DESIGNATORS = {
 }
 
 
+# Merged token table; later dicts win, so the precedence matches checking
+# directionals, then street suffixes, then unit designators
+_TOKEN_MAP = {**UNIT_DESIGNATORS, **STREET_SUFFIXES, **DIRECTIONALS}
+
+# Periods, commas and hashes become spaces; quotes are dropped
+_PUNCTUATION = str.maketrans({'.': ' ', ',': ' ', '#': ' ', "'": None, '"': None})
+
+_ORDINAL_RE = re.compile(r'\b(\d+)(ST|ND|RD|TH)\b')
+
+# Common Tennessee cities stripped from scraped addresses (add more as needed)
+TN_CITIES = (
+    'FRANKLIN', 'NASHVILLE', 'BRENTWOOD', 'NOLENSVILLE', 'SPRING HILL',
+    'COLLEGE GROVE', 'THOMPSONS STATION', 'FAIRVIEW', 'ARRINGTON',
+    'LEIPER\'S FORK', 'LEIPERS FORK', 'BETHESDA', 'EAGLEVILLE'
+)
+
+# ", TN 37XXX" / ", TN, 37XXX" / "TN 37XXX", then a bare ", TN" state code
+_TN_ZIP_RE = re.compile(r',?\s*\bTN\s*,?\s*3[0-9]{4}\s*$')
+_TN_STATE_RE = re.compile(r',\s*\bTN\b\s*$')
+
+# A trailing city is only stripped after a comma, or (unpunctuated) right
+# before a TN/ZIP tail that was just removed; otherwise "100 Franklin" or
+# "2200 Old Nashville" would lose their street names. Commas are stripped
+# repeatedly, so "..., SPRING HILL, FRANKLIN" loses both.
+_TN_CITY_ALTERNATION = '|'.join(TN_CITIES)
+_TN_COMMA_CITY_RE = re.compile(rf',\s*\b(?:{_TN_CITY_ALTERNATION})[\s.]*$', re.IGNORECASE)
+_TN_BARE_CITY_RE = re.compile(rf'\s\b(?:{_TN_CITY_ALTERNATION})[\s.,]*$', re.IGNORECASE)
+
+# What must survive a bare-city strip: a street word after the house number
+_HAS_STREET_NAME_RE = re.compile(r'^\S+\s+\S*[A-Z]')
+
+_TRAILING_COMMA_RE = re.compile(r',\s*$')
+_TRAILING_NOTE_RE = re.compile(r'\s*\([^)]*\)\s*$')
+_PIPE_SUFFIX_RE = re.compile(r'\s*\|.*$')
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
 def normalize_address(address: Optional[str]) -> Optional[str]:
     """
     Normalize a street address to USPS standard format.
@@ -271,6 +343,8 @@ def normalize_address(address: Optional[str]) -> Optional[str]:
     - Standardize unit designators (APARTMENT → APT)
     - Normalize ordinal numbers (1ST, 2ND, 3RD)
 
+    Results are memoized (``normalize_address.cache_info()``).
+
     Args:
         address: Raw address string
 
@@ -281,55 +355,175 @@ def normalize_address(address: Optional[str]) -> Optional[str]:
         >>> normalize_address("123 North Main Street, Apt. 4B")
         "123 N MAIN ST APT 4B"
         >>> normalize_address("456 S.W. Oak Avenue #201")
-        "456 SW OAK AVE 201"
+        "456 S W OAK AVE 201"
     """
     if not address:
         return None
 
-    # Uppercase
-    normalized = address.upper()
+    # Keep hyphens (for suite numbers like 4-B); one pass over the tokens
+    lookup = _TOKEN_MAP.get
+    words = address.upper().translate(_PUNCTUATION).split()
+    normalized = ' '.join([lookup(word, word) for word in words])
 
-    # Remove punctuation except alphanumerics and spaces
-    # Keep hyphens for now (for suite numbers like 4-B)
-    normalized = re.sub(r'[.,#]', ' ', normalized)
-    normalized = re.sub(r"['\"]", '', normalized)
+    # Normalize ordinal numbers (1ST, 2ND, 3RD, 4TH, etc.)
+    normalized = _ORDINAL_RE.sub(r'\1', normalized)
 
-    # Normalize periods in directionals (S.W. → SW)
-    normalized = re.sub(r'\b([NSEW])\.([NSEW]?)\.?\b', r'\1\2', normalized)
+    return normalized if normalized else None
 
-    # Collapse whitespace
-    normalized = ' '.join(normalized.split())
 
-    # Split into words for token processing
-    words = normalized.split()
-    result_words = []
-
-    for word in words:
-        # Check for directionals (including compound like N.W.)
-        if word in DIRECTIONALS:
-            result_words.append(DIRECTIONALS[word])
-        # Check for street suffixes
-        elif word in STREET_SUFFIXES:
-            result_words.append(STREET_SUFFIXES[word])
-        # Check for unit designators
-        elif word in UNIT_DESIGNATORS:
-            result_words.append(UNIT_DESIGNATORS[word])
-        else:
-            result_words.append(word)
-
-    normalized = ' '.join(result_words)
+def _is_tennessee(state: Optional[str]) -> bool:
+    """True for a TN state code or name (the only state with a city list)."""
+    return bool(state) and state.strip().upper() in ('TN', 'TENNESSEE')
 
-    # Normalize ordinal numbers (1ST, 2ND, 3RD, 4TH, etc.)
-    normalized = re.sub(r'\b(\d+)(ST|ND|RD|TH)\b', r'\1', normalized)
 
-    # Remove standalone # symbol if present
-    normalized = re.sub(r'\s+#\s+', ' ', normalized)
-    normalized = re.sub(r'\s+#', ' ', normalized)
+def strip_location_suffix(address: Optional[str], state: Optional[str] = None) -> Optional[str]:
+    """
+    Uppercase and strip trailing city/state/ZIP and notes from an address.
 
-    # Final whitespace cleanup
-    normalized = ' '.join(normalized.split())
+    City/state/ZIP tails are only stripped for Tennessee records (``state``
+    "TN" or "Tennessee"); notes are stripped for every state. Handles
+    scraped addresses that include location info like:
+    - "1000 Mabel DR, Franklin, TN, 37064" -> "1000 MABEL DR"
+    - "9001 Haggard Ln, College Grove, TN 37046" -> "9001 HAGGARD LN"
+    - "5 Oak Ct (Lot 12)" / "3 Main St | Franklin, TN" -> "5 OAK CT" / "3 MAIN ST"
 
-    return normalized if normalized else None
+    Street names that are also city names are kept: "100 Franklin" and
+    "7 Leipers Fork, TN 37064" are left as streets.
+    """
+    if not address:
+        return None
+
+    stripped = address.upper().strip()
+
+    # Remove parenthetical notes like (Lot 123) and "| Franklin, TN 37064"
+    stripped = _TRAILING_NOTE_RE.sub('', stripped)
+    stripped = _PIPE_SUFFIX_RE.sub('', stripped)
+
+    if _is_tennessee(state):
+        # Remove state code + zip, then a standalone ", TN" at the end
+        unstripped = stripped
+        stripped = _TN_ZIP_RE.sub('', stripped)
+        stripped = _TN_STATE_RE.sub('', stripped)
+        had_state_tail = stripped != unstripped
+
+        # Remove ", CITY" tails, then a bare city directly before the TN tail
+        while True:
+            without_city = _TN_COMMA_CITY_RE.sub('', stripped)
+            if without_city == stripped:
+                break
+            stripped = without_city
+        if had_state_tail:
+            without_city = _TN_BARE_CITY_RE.sub('', stripped)
+            if _HAS_STREET_NAME_RE.search(without_city):
+                stripped = without_city
+
+    stripped = _TRAILING_COMMA_RE.sub('', stripped)
+
+    return stripped
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def canonicalize_address(address: Optional[str], state: Optional[str] = None) -> Optional[str]:
+    """
+    Canonical stored form of an address (ADDRESS_NORMALIZER_VERSION).
+
+    Strips location suffixes (city/state/ZIP tails only when ``state`` is
+    Tennessee), then applies normalize_address. Idempotent, so
+    already-canonical values can be passed through safely.
+
+    Examples:
+        >>> canonicalize_address("1000 Mabel Drive, Franklin, TN, 37064", "TN")
+        "1000 MABEL DR"
+        >>> canonicalize_address("100 Franklin", "TN")
+        "100 FRANKLIN"
+        >>> canonicalize_address("123 North Main Street, Apt. 4B")
+        "123 N MAIN ST APT 4B"
+    """
+    canonical = normalize_address(strip_location_suffix(address, state))
+
+    # Removing punctuation can expose another suffix ("..., TN 37064."),
+    # so repeat until stable; each repeat only ever shortens the address
+    while canonical:
+        again = normalize_address(strip_location_suffix(canonical, state))
+        if again == canonical:
+            break
+        canonical = again
+
+    return canonical
+
+
+def _usps_address(address: Optional[str], state: Optional[str] = None) -> Optional[str]:
+    """normalize_address with the (ignored) state argument of the canonicalizer."""
+    return normalize_address(address)
+
+
+# Normalizers available to normalize_many(), by mode name; each takes
+# (address, state)
+NORMALIZERS = {
+    'canonical': canonicalize_address,
+    'usps': _usps_address,
+}
+
+
+def _normalize_chunk(
+    job: Tuple[str, List[Tuple[Optional[str], Optional[str]]]]
+) -> List[Optional[str]]:
+    """Process-pool entry point; looks the normalizer up by name so it pickles."""
+    mode, pairs = job
+    normalizer = NORMALIZERS[mode]
+    return [normalizer(address, state) for address, state in pairs]
+
+
+def normalize_many(
+    addresses: Iterable[Optional[str]],
+    mode: str = 'canonical',
+    processes: Optional[int] = None,
+    chunk_size: int = NORMALIZE_CHUNK_SIZE,
+    states: Optional[Iterable[Optional[str]]] = None
+) -> List[Optional[str]]:
+    """
+    Normalize a batch of addresses, returning results in input order.
+
+    Only distinct (address, state) pairs are normalized. Batches of at
+    least PARALLEL_MIN_BATCH distinct pairs are split into ``chunk_size``
+    pieces across a process pool; smaller ones run in-process and share
+    the memo cache.
+
+    Args:
+        addresses: Raw addresses (None allowed)
+        mode: 'canonical' (canonicalize_address) or 'usps' (normalize_address)
+        processes: Worker processes; None picks 1 or all cores by batch
+            size, 1 forces in-process
+        chunk_size: Addresses per worker task
+        states: State of each address, same length and order (None: no
+            state, so no city/state/ZIP stripping)
+
+    Returns:
+        Normalized addresses, same length and order as the input
+    """
+    if mode not in NORMALIZERS:
+        raise ValueError(f"Unknown normalization mode: {mode}")
+    normalizer = NORMALIZERS[mode]
+
+    addresses = list(addresses)
+    states = list(states) if states is not None else [None] * len(addresses)
+    if len(states) != len(addresses):
+        raise ValueError("states must have one entry per address")
+    pairs = list(zip(addresses, states))
+    unique = list(dict.fromkeys(pairs))
+
+    if processes is None:
+        processes = (os.cpu_count() or 1) if len(unique) >= PARALLEL_MIN_BATCH else 1
+    if processes <= 1 or len(unique) <= chunk_size:
+        return [normalizer(address, state) for address, state in pairs]
+
+    jobs = [(mode, unique[i:i + chunk_size]) for i in range(0, len(unique), chunk_size)]
+    normalized = {}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for (_, chunk), results in zip(jobs, pool.map(_normalize_chunk, jobs)):
+            normalized.update(zip(chunk, results))
+
+    return [normalized[pair] for pair in pairs]
 
 
 def normalize_county(county: Optional[str]) -> Optional[str]:
@@ -500,13 +694,32 @@ def compute_address_hash(
     return hashlib.sha256(composite_key.encode('utf-8')).hexdigest()
 
 
+def canonical_address_hash(
+    address: Optional[str],
+    county: Optional[str],
+    state: Optional[str]
+) -> Optional[str]:
+    """
+    Dedup/linking hash for an address, shared by permits and properties.
+
+    ``address`` may be raw or already canonical; county and state are
+    normalized too, so "Williamson County"/"WILLIAMSON" and "TN"/"Tennessee"
+    hash alike.
+    """
+    return compute_address_hash(
+        canonicalize_address(address, state),
+        normalize_county(county),
+        normalize_state(state)
+    )
+
+
 def normalize_and_hash(
     address: Optional[str],
     county: Optional[str],
     state: Optional[str]
 ) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
     """
-    Convenience function to normalize all components and compute hash.
+    Convenience function to canonicalize all components and compute hash.
 
     Args:
         address: Raw street address
@@ -514,13 +727,13 @@ def normalize_and_hash(
         state: Raw state name or code
 
     Returns:
-        Tuple of (normalized_address, normalized_county, state_code, address_hash)
+        Tuple of (canonical_address, normalized_county, state_code, address_hash)
 
     Examples:
         >>> normalize_and_hash("123 N. Main Street", "Travis County", "Texas")
         ("123 N MAIN ST", "TRAVIS", "TX", "a1b2c3...")
     """
-    norm_address = normalize_address(address)
+    norm_address = canonicalize_address(address, state)
     norm_county = normalize_county(county)
     state_code = normalize_state(state)
     address_hash = compute_address_hash(norm_address, norm_county, state_code)
@@ -538,6 +751,7 @@ if __name__ == "__main__":
         "1000 West Highway 290",
         "P.O. Box 12345",
         "100 Southeast Boulevard, Suite 200",
+        "1000 Mabel DR, Franklin, TN, 37064",
         None,
         "",
     ]
@@ -545,7 +759,7 @@ if __name__ == "__main__":
     print("Address Normalization Tests:")
     print("-" * 60)
     for addr in test_addresses:
-        result = normalize_address(addr)
+        result = canonicalize_address(addr, 'TN')
         print(f"  {addr!r:45} → {result!r}")
 
     print("\nCounty Normalization Tests:")
@@ -0,0 +1,256 @@
+"""
+Silence-aligned audio chunking for transcription (ffmpeg).
+
+A recording is scanned once with ffmpeg's silencedetect filter, cut into
+chunks of about target_seconds at the silence nearest each target
+boundary (or hard-cut when no silence is close), and each chunk is
+extracted with overlap_seconds of padding on both sides as small mono
+MP3. Transcribed segments are mapped back to recording time and kept only
+when their midpoint falls inside the chunk's own span, so the overlap
+helps words at a cut without producing duplicates; a segment straddling a
+cut that neither chunk claims is recovered from the chunk it overlaps most.
+"""
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Tuple, Union
+
+# silencedetect: quieter than SILENCE_NOISE_DB for at least SILENCE_MIN_SECONDS
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_SECONDS = 0.4
+
+# Cut window around each target boundary, as fractions of target_seconds
+MIN_CHUNK_FRACTION = 0.5
+MAX_CHUNK_FRACTION = 1.25
+
+# Chunk encoding: 16 kHz mono is what Whisper resamples to anyway;
+# 48 kbit/s keeps an hour of audio near 21 MB
+CHUNK_SAMPLE_RATE = 16000
+CHUNK_BITRATE = "48k"
+
+# An unclaimed segment is taken as already covered when more than this
+# fraction of it overlaps a kept segment
+COVERED_FRACTION = 0.5
+
+DURATION_PATTERN = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+SILENCE_START_PATTERN = re.compile(r"silence_start:\s*(-?\d+(?:\.\d+)?)")
+SILENCE_END_PATTERN = re.compile(r"silence_end:\s*(-?\d+(?:\.\d+)?)")
+
+
+class AudioChunkingError(Exception):
+    """Custom exception for audio probing/splitting errors."""
+    pass
+
+
+class AudioChunk(NamedTuple):
+    """
+    One transcription chunk.
+
+    start/end is the span the chunk is responsible for; window_start/
+    window_end (start/end plus overlap) is the audio actually extracted.
+    """
+    index: int
+    start: float
+    end: float
+    window_start: float
+    window_end: float
+
+
+def _run_ffmpeg(ffmpeg: str, args: List[str]) -> subprocess.CompletedProcess:
+    try:
+        return subprocess.run(
+            [ffmpeg, "-hide_banner", *args],
+            capture_output=True,
+            text=True,
+            check=False
+        )
+    except FileNotFoundError:
+        raise AudioChunkingError(f"ffmpeg not found: {ffmpeg}")
+
+
+def probe_duration(path: Union[str, Path], ffmpeg: str = "ffmpeg") -> float:
+    """Duration from the container header (no decoding)."""
+    # Without an output ffmpeg exits non-zero after printing the input info
+    result = _run_ffmpeg(ffmpeg, ["-i", str(path)])
+    return parse_silencedetect(result.stderr)[0]
+
+
+def analyze_audio(
+    path: Union[str, Path],
+    ffmpeg: str = "ffmpeg"
+) -> Tuple[float, List[Tuple[float, float]]]:
+    """
+    Duration and silent intervals of a recording, in one decoding pass.
+
+    Returns:
+        Tuple of (duration seconds, [(silence_start, silence_end), ...])
+    """
+    result = _run_ffmpeg(ffmpeg, [
+        "-nostats", "-i", str(path),
+        "-af", f"silencedetect=noise={SILENCE_NOISE_DB}dB:d={SILENCE_MIN_SECONDS}",
+        "-f", "null", "-"
+    ])
+    if result.returncode != 0:
+        raise AudioChunkingError(f"ffmpeg could not decode {path}: {result.stderr.strip()[-500:]}")
+    return parse_silencedetect(result.stderr)
+
+
+def parse_silencedetect(output: str) -> Tuple[float, List[Tuple[float, float]]]:
+    """Duration and silences from ffmpeg silencedetect output."""
+    duration_match = DURATION_PATTERN.search(output)
+    if not duration_match:
+        raise AudioChunkingError("Could not determine audio duration")
+    hours, minutes, seconds = duration_match.groups()
+    duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    silences = []
+    silence_start = None
+    for line in output.splitlines():
+        start_match = SILENCE_START_PATTERN.search(line)
+        if start_match:
+            silence_start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = SILENCE_END_PATTERN.search(line)
+        if end_match and silence_start is not None:
+            silences.append((silence_start, min(duration, float(end_match.group(1)))))
+            silence_start = None
+    # Recording ends in silence
+    if silence_start is not None:
+        silences.append((silence_start, duration))
+
+    return duration, silences
+
+
+def plan_chunks(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    target_seconds: float,
+    overlap_seconds: float
+) -> List[AudioChunk]:
+    """
+    Split [0, duration] into chunks of about target_seconds.
+
+    Each boundary is the midpoint of the silence closest to the target
+    boundary within [MIN_CHUNK_FRACTION, MAX_CHUNK_FRACTION] of a chunk
+    length from the previous boundary, else start + target_seconds. A tail
+    shorter than MAX_CHUNK_FRACTION of a chunk stays in the last chunk.
+    """
+    cut_points = sorted((start + end) / 2 for start, end in silences)
+
+    spans = []
+    start = 0.0
+    while duration - start > target_seconds * MAX_CHUNK_FRACTION:
+        low = start + target_seconds * MIN_CHUNK_FRACTION
+        high = start + target_seconds * MAX_CHUNK_FRACTION
+        target = start + target_seconds
+        candidates = [point for point in cut_points if low <= point <= high]
+        cut = min(candidates, key=lambda point: abs(point - target)) if candidates else target
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, duration))
+
+    return [
+        AudioChunk(
+            index=index,
+            start=span_start,
+            end=span_end,
+            window_start=max(0.0, span_start - overlap_seconds),
+            window_end=min(duration, span_end + overlap_seconds)
+        )
+        for index, (span_start, span_end) in enumerate(spans)
+    ]
+
+
+def extract_chunk(
+    path: Union[str, Path],
+    chunk: AudioChunk,
+    output_dir: Union[str, Path],
+    ffmpeg: str = "ffmpeg"
+) -> Path:
+    """Write a chunk's window as 16 kHz mono MP3; returns its path."""
+    output = Path(output_dir) / f"chunk_{chunk.index:04d}.mp3"
+    result = _run_ffmpeg(ffmpeg, [
+        "-loglevel", "error", "-y",
+        "-ss", f"{chunk.window_start:.3f}",
+        "-t", f"{chunk.window_end - chunk.window_start:.3f}",
+        "-i", str(path),
+        "-vn", "-ac", "1", "-ar", str(CHUNK_SAMPLE_RATE),
+        "-c:a", "libmp3lame", "-b:a", CHUNK_BITRATE,
+        str(output)
+    ])
+    if result.returncode != 0 or not output.exists():
+        raise AudioChunkingError(f"ffmpeg could not extract chunk {chunk.index}: {result.stderr.strip()[-500:]}")
+    return output
+
+
+def _overlap(start: float, end: float, other_start: float, other_end: float) -> float:
+    return max(0.0, min(end, other_end) - max(start, other_start))
+
+
+def stitch_segments(
+    chunks: List[AudioChunk],
+    chunk_results: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Merge per-chunk transcription results into one.
+
+    Segment times are shifted by the chunk's window start; a segment is
+    kept by the chunk whose span contains its midpoint. Each chunk times a
+    segment crossing a cut a little differently, so its midpoint can land
+    outside both spans: such unclaimed segments are kept, preferring the
+    one overlapping its own chunk's span most, unless most of it is already
+    covered by a kept segment. Segments are then ordered by time and
+    renumbered. A chunk result without segments contributes its whole text.
+    """
+    kept = []
+    unclaimed = []
+    texts = []  # (time, text) for chunk results without segments
+    last_index = len(chunks) - 1
+    for chunk, result in zip(chunks, chunk_results):
+        chunk_segments = result.get('segments') or []
+        if not chunk_segments:
+            text = (result.get('text') or '').strip()
+            if text:
+                texts.append((chunk.start, text))
+            continue
+
+        for segment in chunk_segments:
+            start = float(segment['start']) + chunk.window_start
+            end = float(segment['end']) + chunk.window_start
+            shifted = {
+                **segment,
+                'start': round(start, 3),
+                'end': round(end, 3),
+                'text': segment.get('text', '')
+            }
+            midpoint = (start + end) / 2
+            if midpoint < chunk.start or (midpoint >= chunk.end and chunk.index != last_index):
+                unclaimed.append((_overlap(start, end, chunk.start, chunk.end), shifted))
+            else:
+                kept.append(shifted)
+
+    for _, segment in sorted(unclaimed, key=lambda item: item[0], reverse=True):
+        length = segment['end'] - segment['start']
+        covered = sum(
+            _overlap(segment['start'], segment['end'], other['start'], other['end'])
+            for other in kept
+        )
+        if covered <= COVERED_FRACTION * length:
+            kept.append(segment)
+
+    kept.sort(key=lambda segment: (segment['start'], segment['end']))
+    segments = []
+    for segment_id, segment in enumerate(kept):
+        segments.append({**segment, 'id': segment_id})
+        text = (segment['text'] or '').strip()
+        if text:
+            texts.append((segment['start'], text))
+    texts.sort(key=lambda item: item[0])
+
+    return {
+        'text': ' '.join(text for _, text in texts),
+        'language': next((r.get('language') for r in chunk_results if r.get('language')), 'en'),
+        'duration': chunks[-1].end if chunks else None,
+        'segments': segments
+    }
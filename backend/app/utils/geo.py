@@ -0,0 +1,39 @@
+"""
+Geo radius search helpers (PostGIS geography).
+
+Points are built with geography(ST_SetSRID(ST_MakePoint(lon, lat), 4326)),
+the same expression the GiST expression indexes on septic_permits and
+properties are defined on, so ST_DWithin filters are index-assisted and
+match the exact circle rather than a lat/lon bounding box. Distances are
+computed on the spheroid.
+"""
+
+from typing import Any
+
+from sqlalchemy import func, cast, Float
+
+METERS_PER_MILE = 1609.344
+
+
+def geography_point(latitude: Any, longitude: Any) -> Any:
+    """geography point (SRID 4326) from latitude/longitude columns or values."""
+    return func.geography(
+        func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+    )
+
+
+def within_radius(point: Any, latitude: float, longitude: float, radius_miles: float) -> Any:
+    """Filter for points within radius_miles of (latitude, longitude)."""
+    return func.ST_DWithin(
+        point,
+        geography_point(latitude, longitude),
+        radius_miles * METERS_PER_MILE
+    )
+
+
+def distance_miles(point: Any, latitude: float, longitude: float) -> Any:
+    """Distance in miles from (latitude, longitude), as double precision."""
+    return cast(
+        func.ST_Distance(point, geography_point(latitude, longitude)) / METERS_PER_MILE,
+        Float
+    )
@@ -0,0 +1,142 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Offset pagination makes PostgreSQL read and discard every skipped row, so
+deep pages over 7M+ permits get progressively slower. Keyset pagination
+instead remembers the sort value and id of the last row on a page and asks
+for rows strictly after that position, which an index on (sort_col, id)
+answers in constant time regardless of depth.
+
+Null ordering follows PostgreSQL's defaults so plain B-tree indexes can be
+used in both directions: ASC puts NULLs last, DESC puts NULLs first. Rows
+after a cursor can span the non-NULL values and the NULL block, which no
+single index range covers (an OR of both makes PostgreSQL filter instead of
+seek), so keyset_segments() splits them into separate range seeks that
+keyset_page() reads in turn.
+"""
+
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy import and_, asc, desc, tuple_
+
+
+def _encode_value(value: Any) -> Any:
+    """Tag non-JSON types so they round-trip exactly."""
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {'u': str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """Reverse _encode_value."""
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        if 'u' in value:
+            return uuid.UUID(value['u'])
+    return value
+
+
+def encode_cursor(sort_key: str, sort_value: Any, row_id: Any) -> str:
+    """
+    Build an opaque cursor for the row at the end of a page.
+
+    Args:
+        sort_key: Identifies the sort (field + direction); a cursor is only
+            valid for the sort it was issued for
+        sort_value: Value of the sort column for the last row
+        row_id: Primary key of the last row (tie-breaker)
+
+    Returns:
+        URL-safe base64 string
+    """
+    payload = {'k': sort_key, 'v': [_encode_value(sort_value), _encode_value(row_id)]}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_key: str) -> Tuple[Any, Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        sort_value, row_id = (_decode_value(v) for v in payload['v'])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+    if payload.get('k') != sort_key:
+        raise ValueError("Cursor does not match the requested sort order")
+
+    return sort_value, row_id
+
+
+def keyset_order_by(sort_expr: Any, id_col: Any, descending: bool) -> List[Any]:
+    """ORDER BY clauses matching keyset_segments (sort value, then id)."""
+    direction = desc if descending else asc
+    return [direction(sort_expr), direction(id_col)]
+
+
+def keyset_segments(sort_expr: Any, id_col: Any, descending: bool,
+                    last_value: Any, last_id: Any) -> List[Any]:
+    """
+    WHERE clauses for the rows strictly after (last_value, last_id), in order.
+
+    Each clause is one range seek on a (sort_expr, id) index: a row
+    comparison within the non-NULL values, or an IS NULL range for the
+    NULL block (last for ASC, first for DESC). Read them in turn with the
+    keyset_order_by ordering until the page is full.
+    """
+    if descending:
+        if last_value is None:
+            # Inside the leading NULL block, then everything non-NULL
+            return [
+                and_(sort_expr.is_(None), id_col < last_id),
+                sort_expr.isnot(None),
+            ]
+        return [tuple_(sort_expr, id_col) < tuple_(last_value, last_id)]
+
+    if last_value is None:
+        # Inside the trailing NULL block
+        return [and_(sort_expr.is_(None), id_col > last_id)]
+    return [
+        tuple_(sort_expr, id_col) > tuple_(last_value, last_id),
+        sort_expr.is_(None),
+    ]
+
+
+def keyset_page(fetch: Callable[[Any, int], List[Any]], sort_expr: Any, id_col: Any,
+                descending: bool, last_value: Any, last_id: Any, limit: int) -> List[Any]:
+    """
+    Up to ``limit`` rows after (last_value, last_id).
+
+    Args:
+        fetch: Runs the caller's query with one extra WHERE clause and a
+            row limit, ordered by keyset_order_by, and returns the rows
+        sort_expr, id_col, descending, last_value, last_id: As for
+            keyset_segments
+        limit: Maximum rows to return
+
+    Returns:
+        Rows in keyset order; usually a single seek fills the page
+    """
+    rows: List[Any] = []
+    for segment in keyset_segments(sort_expr, id_col, descending, last_value, last_id):
+        rows.extend(fetch(segment, limit - len(rows)))
+        if len(rows) >= limit:
+            break
+    return rows
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from app.models.ringcentral import CallLog, CallDisposition, RCAccount
 from app.models.call_analysis import CallAnalysis
+from app.services.agent_rollup_service import AgentRollupService
 from app.database.base_class import SessionLocal
 
 
@@ -372,6 +373,7 @@ def seed_ringcentral_data(db: Session, user_id: str = "demo-user-001", call_coun
 
         # Create detailed analysis
         create_sample_call_analysis(db, call_logs)
+        AgentRollupService(db).refresh_calls([call_log.id for call_log in call_logs])
 
         # Count final results
         final_dispositions = db.query(CallDisposition).count()
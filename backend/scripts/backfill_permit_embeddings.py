@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Backfill septic permit semantic search embeddings
+
+Embeds every active permit that has no embedding, an embedding from a
+different model, or one older than its last data change, using the local
+embedding model (settings.EMBEDDING_MODEL via Ollama). Commits per batch,
+so it can be interrupted and re-run.
+
+Usage:
+    export DATABASE_URL="postgresql://..."
+    python backfill_permit_embeddings.py
+    python backfill_permit_embeddings.py --batch-size 512 --limit 100000
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === CONFIGURATION ===
+DEFAULT_BATCH_SIZE = 256
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill permit embeddings')
+    parser.add_argument('--database-url', help='PostgreSQL URL (defaults to $DATABASE_URL)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--limit', type=int, default=None, help='Stop after this many permits')
+    parser.add_argument('--model', default=None, help='Embedding model (defaults to settings.EMBEDDING_MODEL)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    if not os.environ.get('DATABASE_URL'):
+        parser.error('DATABASE_URL is required')
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.database.base_class import SessionLocal
+    from app.services.permit_embedding_service import PermitEmbeddingService
+
+    db = SessionLocal()
+    try:
+        service = PermitEmbeddingService(db, model=args.model)
+        stats = service.backfill(batch_size=args.batch_size, limit=args.limit)
+    finally:
+        db.close()
+
+    logger.info(
+        f"Embedded {stats['embedded']:,} permits in {stats['elapsed_seconds']}s "
+        f"({stats['permits_per_second']}/s; model {stats['embed_seconds']}s, "
+        f"writes {stats['write_seconds']}s)"
+    )
+    if stats['error']:
+        logger.error(f"Stopped early: {stats['error']}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
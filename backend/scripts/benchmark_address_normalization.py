@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Benchmark and golden-check the address normalizers
+
+Builds a synthetic address corpus (default 1M addresses drawn from 250k
+distinct ones, mixing suffix spellings, directionals, units, ordinals,
+punctuation and Tennessee city/state/zip tails) and, for each normalizer
+mode, reports addresses per second for:
+- legacy: uncompiled, uncached reference implementations, frozen below
+- cold:   the current engine with an empty memo cache
+- warm:   the current engine again, cache populated
+- batch:  normalize_many() with a process pool
+
+Before timing anything it checks that the current engine returns exactly
+the same output (value and type) as the legacy implementation for every
+corpus address plus a list of edge cases (as Tennessee and as stateless
+addresses), and that street names which are also city names survive
+canonicalization; it exits non-zero otherwise. No database is needed.
+
+Usage:
+    python benchmark_address_normalization.py
+    python benchmark_address_normalization.py --size 200000 --modes canonical
+    python benchmark_address_normalization.py --check-only
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import logging
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import address_normalization as engine  # noqa: E402
+from app.utils.address_normalization import (  # noqa: E402
+    DIRECTIONALS, STREET_SUFFIXES, UNIT_DESIGNATORS, TN_CITIES, normalize_many
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === CONFIGURATION ===
+DEFAULT_SIZE = 1_000_000
+DEFAULT_DISTINCT = 250_000
+DEFAULT_SEED = 42
+MAX_REPORTED_MISMATCHES = 10
+
+STREET_NAMES = [
+    'Main', 'Oak', 'Cedar', 'Elm', 'Mabel', 'Haggard', 'Riley Park', 'Lewisburg',
+    'Spring Hill', 'Pine Valley', 'Hillsboro', 'Carters Creek', 'Del Rio', 'Old Hickory',
+    'Mountain View', 'Lake Forest', 'Station', 'Trace', 'Grove', 'Haven',
+]
+SUFFIX_SPELLINGS = list(STREET_SUFFIXES) + list(set(STREET_SUFFIXES.values()))
+DIRECTION_SPELLINGS = list(DIRECTIONALS) + ['N', 'S.', 'E', 'W.', 'N.W.', 'S.E.', 'SW']
+UNIT_SPELLINGS = list(UNIT_DESIGNATORS) + ['Apt.', 'Ste', '#']
+ZIP_CODES = ['37064', '37067', '37069', '37046', '37179', '37027', '37135', '78701']
+
+EDGE_CASES = [
+    None, '', ' ', '   \t ', '#', '.,#', '"', "'", '1', '1ST', '21st Street', '2ND AVE NORTH',
+    '123 North Main Street, Apt. 4B', '456 S.W. Oak Avenue #201', '789 East 1st Ave',
+    '1000 West Highway 290', 'P.O. Box 12345', '100 Southeast Boulevard, Suite 200',
+    '1000 Mabel DR, Franklin, TN, 37064', '9001 Haggard Ln, College Grove, TN 37046',
+    '2034 Riley Park Drive, Thompsons Station, TN 37179', '12 Elm St, Spring Hill, Franklin',
+    '12 Elm St, Franklin, Spring Hill', '5 Oak Ct (Westhaven Jewell Lot 2504)',
+    "7 Leiper's Fork Rd, Leiper's Fork", '3 Main St | Franklin, TN 37064', '4 Hills Rd, tn',
+    '8 SPRINGS-CREEK DR', 'STREETSTREET', '42 Straße', '9 ﬁeld lane', '10 Main\nStreet',
+    '11 Main Street\n', '4-1ST ST', '1 COURT,STREET', 'nashville', 'TN 37064',
+    '100 Franklin', '2200 Old Nashville', '450 W Fairview', '7 Leipers Fork',
+    '7 Leipers Fork, TN 37064', '1000 Mabel Dr Franklin TN 37064', '5 Button Rd, Eagleville TN',
+]
+
+# (address, state, expected canonical) for streets named after TN cities,
+# which must never be stripped down to the house number
+STREET_NAME_CASES = [
+    ('100 Franklin', 'TN', '100 FRANKLIN'),
+    ('2200 Old Nashville', 'TN', '2200 OLD NASHVILLE'),
+    ('450 W Fairview', 'TN', '450 W FAIRVIEW'),
+    ('7 Leipers Fork', 'TN', '7 LEIPERS FRK'),
+    ('7 Leipers Fork, TN 37064', 'TN', '7 LEIPERS FRK'),
+    ('100 Franklin Rd, Franklin, TN 37064', 'TN', '100 FRANKLIN RD'),
+    ('1000 Mabel Dr Franklin TN 37064', 'TN', '1000 MABEL DR'),
+    ('12 Elm St, Franklin, Spring Hill', 'TN', '12 ELM ST'),
+    ('100 Franklin', None, '100 FRANKLIN'),
+    ('12 Elm St, Franklin, TN 37064', 'TX', '12 ELM ST FRANKLIN TN 37064'),
+    ('12 Elm St, Franklin, TN 37064', None, '12 ELM ST FRANKLIN TN 37064'),
+]
+
+
+# ===== LEGACY IMPLEMENTATIONS (reference for the golden check) =====
+# normalize_address as it was before the compiled engine, and the
+# canonicalizer's steps written the same uncompiled, uncached way
+
+def legacy_normalize_address(address: Optional[str]) -> Optional[str]:
+    if not address:
+        return None
+
+    normalized = address.upper()
+    normalized = re.sub(r'[.,#]', ' ', normalized)
+    normalized = re.sub(r"['\"]", '', normalized)
+    normalized = re.sub(r'\b([NSEW])\.([NSEW]?)\.?\b', r'\1\2', normalized)
+    normalized = ' '.join(normalized.split())
+
+    words = normalized.split()
+    result_words = []
+    for word in words:
+        if word in DIRECTIONALS:
+            result_words.append(DIRECTIONALS[word])
+        elif word in STREET_SUFFIXES:
+            result_words.append(STREET_SUFFIXES[word])
+        elif word in UNIT_DESIGNATORS:
+            result_words.append(UNIT_DESIGNATORS[word])
+        else:
+            result_words.append(word)
+
+    normalized = ' '.join(result_words)
+    normalized = re.sub(r'\b(\d+)(ST|ND|RD|TH)\b', r'\1', normalized)
+    normalized = re.sub(r'\s+#\s+', ' ', normalized)
+    normalized = re.sub(r'\s+#', ' ', normalized)
+    normalized = ' '.join(normalized.split())
+
+    return normalized if normalized else None
+
+
+def legacy_strip_location_suffix(address: Optional[str], state: Optional[str] = None) -> Optional[str]:
+    if not address:
+        return None
+
+    normalized = address.upper().strip()
+    tn_cities = [
+        'FRANKLIN', 'NASHVILLE', 'BRENTWOOD', 'NOLENSVILLE', 'SPRING HILL',
+        'COLLEGE GROVE', 'THOMPSONS STATION', 'FAIRVIEW', 'ARRINGTON',
+        'LEIPER\'S FORK', 'LEIPERS FORK', 'BETHESDA', 'EAGLEVILLE'
+    ]
+    normalized = re.sub(r'\s*\([^)]*\)\s*$', '', normalized)
+    normalized = re.sub(r'\s*\|.*$', '', normalized)
+    if state and state.strip().upper() in ('TN', 'TENNESSEE'):
+        before = normalized
+        normalized = re.sub(r',?\s*\bTN\s*,?\s*3[0-9]{4}\s*$', '', normalized)
+        normalized = re.sub(r',\s*\bTN\b\s*$', '', normalized)
+        had_state_tail = normalized != before
+        stripped_city = True
+        while stripped_city:
+            stripped_city = False
+            for city in tn_cities:
+                without = re.sub(rf',\s*\b{city}[\s.]*$', '', normalized, flags=re.IGNORECASE)
+                if without != normalized:
+                    normalized = without
+                    stripped_city = True
+        if had_state_tail:
+            for city in tn_cities:
+                without = re.sub(rf'\s\b{city}[\s.,]*$', '', normalized, flags=re.IGNORECASE)
+                if without != normalized:
+                    if re.search(r'^\S+\s+\S*[A-Z]', without):
+                        normalized = without
+                    break
+    normalized = re.sub(r',\s*$', '', normalized)
+    return normalized
+
+
+def legacy_canonicalize_address(address: Optional[str], state: Optional[str] = None) -> Optional[str]:
+    canonical = legacy_normalize_address(legacy_strip_location_suffix(address, state))
+    while canonical:
+        again = legacy_normalize_address(legacy_strip_location_suffix(canonical, state))
+        if again == canonical:
+            break
+        canonical = again
+    return canonical
+
+
+def legacy_usps_address(address: Optional[str], state: Optional[str] = None) -> Optional[str]:
+    return legacy_normalize_address(address)
+
+
+LEGACY = {
+    'canonical': legacy_canonicalize_address,
+    'usps': legacy_usps_address,
+}
+
+
+# ===== CORPUS =====
+
+def random_address(rng: random.Random) -> str:
+    """One messy, human-entered style address."""
+    parts = [str(rng.randint(1, 9999))]
+    if rng.random() < 0.3:
+        parts.append(rng.choice(DIRECTION_SPELLINGS))
+    if rng.random() < 0.1:
+        parts.append(f"{rng.randint(1, 99)}{rng.choice(['st', 'nd', 'rd', 'th'])}")
+    else:
+        parts.append(rng.choice(STREET_NAMES))
+    parts.append(rng.choice(SUFFIX_SPELLINGS))
+    address = ' '.join(parts)
+
+    if rng.random() < 0.15:
+        address += f"{rng.choice([', ', ' '])}{rng.choice(UNIT_SPELLINGS)} {rng.randint(1, 400)}"
+    roll = rng.random()
+    if roll < 0.35:
+        address += f", {rng.choice(TN_CITIES).title()}, TN {rng.choice(ZIP_CODES)}"
+    elif roll < 0.45:
+        address += f" | {rng.choice(TN_CITIES).title()}, TN"
+    elif roll < 0.5:
+        address += f" (Lot {rng.randint(1, 3000)})"
+
+    case = rng.random()
+    if case < 0.4:
+        address = address.upper()
+    elif case < 0.5:
+        address = address.lower()
+    if rng.random() < 0.1:
+        address = f"  {address.replace(' ', '  ', 1)} "
+    return address
+
+
+def build_corpus(size: int, distinct: int, seed: int) -> List[str]:
+    """``size`` addresses sampled with repetition from ``distinct`` generated ones."""
+    rng = random.Random(seed)
+    pool = [random_address(rng) for _ in range(min(size, distinct))]
+    if len(pool) == size:
+        return pool
+    return [rng.choice(pool) for _ in range(size)]
+
+
+# ===== CHECK + BENCHMARK =====
+
+def golden_check(mode: str, corpus: List[str]) -> int:
+    """Count (and log) inputs where the engine differs from the legacy output."""
+    legacy = LEGACY[mode]
+    current = engine.NORMALIZERS[mode]
+    mismatches = 0
+
+    def compare(address: Optional[str], state: Optional[str], expected: Optional[str]) -> None:
+        nonlocal mismatches
+        actual = current(address, state)
+        if type(expected) is not type(actual) or expected != actual:
+            mismatches += 1
+            if mismatches <= MAX_REPORTED_MISMATCHES:
+                logger.error(f"[{mode}] {address!r} ({state}): expected {expected!r}, got {actual!r}")
+
+    pairs = [(address, 'TN') for address in dict.fromkeys(EDGE_CASES + corpus)]
+    pairs += [(address, None) for address in EDGE_CASES]
+    for address, state in pairs:
+        compare(address, state, legacy(address, state))
+    if mode == 'canonical':
+        for address, state, expected in STREET_NAME_CASES:
+            compare(address, state, expected)
+
+    sample = EDGE_CASES + corpus[:20_000]
+    batch = normalize_many(sample, mode=mode, processes=2, chunk_size=2_000, states=['TN'] * len(sample))
+    if batch != [legacy(address, 'TN') for address in sample]:
+        mismatches += 1
+        logger.error(f"[{mode}] normalize_many output differs from legacy")
+    return mismatches
+
+
+def rate(func: Callable[[], object], count: int) -> float:
+    started = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - started)
+
+
+def benchmark(mode: str, corpus: List[str], processes: Optional[int]) -> Dict[str, float]:
+    legacy = LEGACY[mode]
+    current = engine.NORMALIZERS[mode]
+
+    states = ['TN'] * len(corpus)
+    results = {'legacy': rate(lambda: [legacy(a, 'TN') for a in corpus], len(corpus))}
+    engine.canonicalize_address.cache_clear()
+    engine.normalize_address.cache_clear()
+    results['cold'] = rate(lambda: [current(a, 'TN') for a in corpus], len(corpus))
+    results['warm'] = rate(lambda: [current(a, 'TN') for a in corpus], len(corpus))
+    engine.canonicalize_address.cache_clear()
+    engine.normalize_address.cache_clear()
+    results['batch'] = rate(
+        lambda: normalize_many(corpus, mode=mode, processes=processes or os.cpu_count(), states=states),
+        len(corpus)
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark address normalization')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help='Corpus size')
+    parser.add_argument('--distinct', type=int, default=DEFAULT_DISTINCT, help='Distinct addresses in corpus')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--modes', default=','.join(engine.NORMALIZERS), help='Comma-separated modes')
+    parser.add_argument('--processes', type=int, default=None, help='Workers for the batch run (default: all cores)')
+    parser.add_argument('--check-only', action='store_true', help='Run the golden check and exit')
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = [mode for mode in modes if mode not in engine.NORMALIZERS]
+    if unknown:
+        parser.error(f"Unknown modes: {', '.join(unknown)}")
+
+    logger.info(f"Building corpus: {args.size:,} addresses ({args.distinct:,} distinct)")
+    corpus = build_corpus(args.size, args.distinct, args.seed)
+
+    failed = False
+    for mode in modes:
+        mismatches = golden_check(mode, corpus)
+        if mismatches:
+            failed = True
+            logger.error(f"[{mode}] golden check FAILED: {mismatches:,} mismatches")
+        else:
+            logger.info(f"[{mode}] golden check passed: output identical to legacy")
+    if failed:
+        sys.exit(1)
+    if args.check_only:
+        return
+
+    print(f"\n{'mode':<10} {'legacy/s':>12} {'cold/s':>12} {'warm/s':>12} {'batch/s':>12} {'speedup':>8}")
+    for mode in modes:
+        results = benchmark(mode, corpus, args.processes)
+        print(
+            f"{mode:<10} {results['legacy']:>12,.0f} {results['cold']:>12,.0f} "
+            f"{results['warm']:>12,.0f} {results['batch']:>12,.0f} "
+            f"{results['cold'] / results['legacy']:>7.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch disposition evaluation against the per-call path
+
+Inserts N synthetic analyzed calls (call log, analysis and, for most,
+a transcript) under a scratch RingCentral account and scores them against
+the active dispositions in the database:
+- scoring only: the per-call loop over _calculate_disposition_score
+  against the calls x dispositions matrix of evaluate_many; every score
+  must be identical (exit status 1 otherwise)
+- end to end: evaluate_disposition for a sample of the calls, then
+  evaluate_many for all of them (both forced, including the writes); the
+  sample's recommendation, confidence and action must match
+
+Reports calls per second for each. The scratch rows are deleted and the
+dispositions' usage counts restored afterwards unless --keep is given.
+Needs an existing disposition catalogue; no AI requests are made.
+
+Usage:
+    export DATABASE_URL="postgresql://..."
+    python benchmark_disposition_batch.py
+    python benchmark_disposition_batch.py --calls 10000 --sample 500 --seed 7
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === CONFIGURATION ===
+DEFAULT_CALLS = 10000
+DEFAULT_SAMPLE = 500
+INSERT_BATCH_SIZE = 2000
+TRANSCRIPT_RATE = 0.8
+SENTIMENTS = ['positive', 'neutral', 'negative', 'Positive', 'mixed', None]
+ESCALATION_RISKS = ['low', 'medium', 'high', 'critical', 'Low', None]
+STATUSES = ['Completed', 'No Answer', 'Voicemail', 'Busy']
+KEYWORDS = [
+    'billing', 'refund', 'appointment', 'pump', 'septic', 'inspection', 'price',
+    'manager', 'supervisor', 'error', 'broken', 'not working', 'thanks', 'schedule'
+]
+TOPICS = ['billing', 'service', 'scheduling', 'complaint', 'sales', 'technical']
+
+
+def synthetic_rows(account_id, count, rng):
+    """Call logs, analyses and transcripts covering every scoring branch."""
+    start = datetime.now(timezone.utc) - timedelta(days=30)
+    call_logs, analyses, transcripts = [], [], []
+    for index in range(count):
+        call_log_id = uuid.uuid4()
+        duration = rng.choice([0, 5, 29, 30, 120, 300, 301, 900, None])
+        call_logs.append({
+            'id': call_log_id,
+            'rc_account_id': account_id,
+            'user_id': 'disposition-benchmark',
+            'rc_call_id': f"bench-{call_log_id.hex}",
+            'from_number': '+15125550100',
+            'to_number': '+15125550199',
+            'direction': rng.choice(['inbound', 'outbound', 'Outbound']),
+            'status': rng.choice(STATUSES),
+            'start_time': start + timedelta(seconds=index * 60),
+            'duration_seconds': duration,
+            'has_recording': rng.random() < 0.8
+        })
+
+        sentiment_score = rng.choice([None, 0.0, round(rng.uniform(-100, 100), 3)])
+        analyses.append({
+            'id': uuid.uuid4(),
+            'call_log_id': call_log_id,
+            'overall_sentiment': rng.choice(SENTIMENTS),
+            'sentiment_score': sentiment_score,
+            'overall_quality_score': rng.choice([None, 0, rng.randint(1, 100), 40, 60, 80]),
+            'escalation_risk': rng.choice(ESCALATION_RISKS),
+            'topics': rng.sample(TOPICS, rng.randint(0, 5)),
+            'keywords': rng.sample(KEYWORDS, rng.randint(0, 4)) or None,
+            'policy_violations': [] if rng.random() < 0.9 else [{'type': 'disclosure'}],
+            'analysis_model': 'benchmark',
+            'analysis_version': '1.0',
+            'status': 'completed',
+            'processing_attempts': 1
+        })
+
+        if rng.random() < TRANSCRIPT_RATE:
+            word_count = rng.randint(0, 2000)
+            transcripts.append({
+                'id': uuid.uuid4(),
+                'call_log_id': call_log_id,
+                'full_transcript': 'benchmark',
+                'model_used': 'benchmark',
+                'character_count': word_count * 5,
+                'word_count': word_count,
+                'confidence_score': rng.choice([None, rng.random()]),
+                'status': 'completed',
+                'processing_attempts': 1
+            })
+    return call_logs, analyses, transcripts
+
+
+def insert_rows(db, model, rows):
+    from sqlalchemy import insert
+
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(insert(model), rows[start:start + INSERT_BATCH_SIZE])
+
+
+def load_calls(db, call_log_ids):
+    """Call logs (with transcripts) and analyses, in call_log_ids order."""
+    from sqlalchemy.orm import selectinload
+    from app.models.ringcentral import CallLog
+    from app.models.call_analysis import CallAnalysis
+
+    call_logs = {
+        call_log.id: call_log
+        for call_log in db.query(CallLog).options(selectinload(CallLog.transcript)).filter(
+            CallLog.id.in_(call_log_ids)
+        )
+    }
+    analyses = {
+        analysis.call_log_id: analysis
+        for analysis in db.query(CallAnalysis).filter(CallAnalysis.call_log_id.in_(call_log_ids))
+    }
+    return [call_logs[i] for i in call_log_ids], [analyses[i] for i in call_log_ids]
+
+
+async def compare_scoring(engine, db, call_log_ids):
+    """Per-call scoring loop vs the score matrix; returns (loop s, matrix s, mismatches)."""
+    import numpy as np
+
+    catalogue = engine._disposition_catalogue(db)
+    call_logs, analyses = load_calls(db, call_log_ids)
+
+    start = time.perf_counter()
+    expected = np.array([
+        [
+            (await engine._calculate_disposition_score(disposition, call_log, analysis))[0]
+            for disposition in catalogue.dispositions
+        ]
+        for call_log, analysis in zip(call_logs, analyses)
+    ])
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = engine._score_matrix(catalogue, call_logs, analyses)
+    matrix_seconds = time.perf_counter() - start
+
+    # Exact equality: the batch path must not change any decision
+    mismatches = int(np.count_nonzero(scores != expected))
+    return loop_seconds, matrix_seconds, mismatches, len(catalogue.dispositions)
+
+
+def decision(result):
+    return (
+        result['recommended_disposition']['id'],
+        result['base_confidence'],
+        result['confidence'],
+        result['action'],
+        [(alternative['disposition_name'], alternative['score']) for alternative in result['alternatives']]
+    )
+
+
+async def benchmark(args):
+    from sqlalchemy import delete
+    from app.database.base_class import SessionLocal
+    from app.models.ringcentral import RCAccount, CallLog, CallDisposition, CallDispositionHistory
+    from app.models.call_analysis import CallAnalysis
+    from app.models.call_transcript import CallTranscript
+    from app.services.call_disposition_engine import CallDispositionEngine
+
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    engine = CallDispositionEngine()
+    account_id = uuid.uuid4()
+    usage_counts = dict(db.query(CallDisposition.id, CallDisposition.usage_count).all())
+    if not usage_counts:
+        db.close()
+        sys.exit('No dispositions in the database; seed the disposition catalogue first')
+
+    try:
+        call_logs, analyses, transcripts = synthetic_rows(account_id, args.calls, rng)
+        db.add(RCAccount(id=account_id, user_id=f"disposition-benchmark-{account_id.hex[:8]}"))
+        db.flush()
+        insert_rows(db, CallLog, call_logs)
+        insert_rows(db, CallAnalysis, analyses)
+        insert_rows(db, CallTranscript, transcripts)
+        db.commit()
+        call_log_ids = [row['id'] for row in call_logs]
+        logger.info(f"Inserted {len(call_log_ids)} synthetic calls ({len(transcripts)} with transcripts)")
+
+        # Per-call evaluation logs every call
+        logging.getLogger('app').setLevel(logging.WARNING)
+
+        loop_seconds, matrix_seconds, mismatches, disposition_count = await compare_scoring(
+            engine, db, call_log_ids
+        )
+        db.expunge_all()
+
+        sample = [str(call_log_id) for call_log_id in call_log_ids[:args.sample]]
+        start = time.perf_counter()
+        single_results = {}
+        for call_log_id in sample:
+            single_results[call_log_id] = await engine.evaluate_disposition(
+                call_log_id, force_evaluation=True, db=db
+            )
+        single_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_results = await engine.evaluate_many(
+            [str(call_log_id) for call_log_id in call_log_ids], force_evaluation=True, db=db
+        )
+        batch_seconds = time.perf_counter() - start
+
+        differing = sum(
+            1 for call_log_id in sample
+            if decision(single_results[call_log_id]) != decision(batch_results[call_log_id])
+        )
+    finally:
+        if not args.keep:
+            db.rollback()
+            scratch_calls = db.query(CallLog.id).filter(CallLog.rc_account_id == account_id)
+            db.execute(delete(CallDispositionHistory).where(CallDispositionHistory.call_log_id.in_(scratch_calls)))
+            db.execute(delete(CallTranscript).where(CallTranscript.call_log_id.in_(scratch_calls)))
+            db.execute(delete(CallAnalysis).where(CallAnalysis.call_log_id.in_(scratch_calls)))
+            db.execute(delete(CallLog).where(CallLog.rc_account_id == account_id))
+            db.execute(delete(RCAccount).where(RCAccount.id == account_id))
+            for disposition_id, usage_count in usage_counts.items():
+                db.query(CallDisposition).filter(CallDisposition.id == disposition_id).update(
+                    {'usage_count': usage_count}, synchronize_session=False
+                )
+            db.commit()
+            logger.info("Deleted the synthetic calls and restored usage counts")
+        db.close()
+
+    calls = len(call_log_ids)
+    return {
+        'calls': calls,
+        'dispositions': disposition_count,
+        'rows': [
+            ('score loop', calls, loop_seconds),
+            ('score matrix', calls, matrix_seconds),
+            ('evaluate_disposition', len(sample), single_seconds),
+            ('evaluate_many', calls, batch_seconds)
+        ],
+        'score_mismatches': mismatches,
+        'decision_mismatches': differing,
+        'sample': len(sample)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch disposition evaluation')
+    parser.add_argument('--database-url', help='PostgreSQL URL (defaults to $DATABASE_URL)')
+    parser.add_argument('--calls', type=int, default=DEFAULT_CALLS, help='Synthetic calls to evaluate')
+    parser.add_argument('--sample', type=int, default=DEFAULT_SAMPLE,
+                        help='Calls evaluated one by one with evaluate_disposition')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    parser.add_argument('--keep', action='store_true', help='Keep the synthetic calls and their dispositions')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    if not os.environ.get('DATABASE_URL'):
+        parser.error('DATABASE_URL is required')
+    args.sample = min(args.sample, args.calls)
+
+    result = asyncio.run(benchmark(args))
+
+    print(f"\n{result['calls']} calls x {result['dispositions']} dispositions")
+    print(f"{'path':<22} {'calls':>7} {'seconds':>9} {'calls/s':>10}")
+    for name, calls, seconds in result['rows']:
+        print(f"{name:<22} {calls:>7} {seconds:>9.2f} {calls / seconds:>10.0f}")
+    print(f"score mismatches:    {result['score_mismatches']}")
+    print(f"decision mismatches: {result['decision_mismatches']} of {result['sample']} sampled calls")
+
+    if result['score_mismatches'] or result['decision_mismatches']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark background job throughput at several worker concurrencies
+
+Queues full-pipeline jobs on a scratch queue in a local Redis and drains
+them with N concurrent worker tasks of one BackgroundJobManager, for each
+requested N. The Whisper, GPT and disposition backends are stubbed with
+fixed latencies, so the numbers measure queueing, scheduling and the
+per-stage limits (WORKER_*_CONCURRENCY) rather than the AI providers.
+Reports jobs per minute and the peak number of calls in flight per stage.
+
+Needs the same environment as worker.py (settings are loaded on import);
+no database or OpenAI requests are made.
+
+Usage:
+    python benchmark_job_throughput.py
+    python benchmark_job_throughput.py --redis-url redis://localhost:6379/15 --jobs 200
+    python benchmark_job_throughput.py --concurrency 1,4,16 --whisper-ms 800 --gpt-ms 1200
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import logging
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === CONFIGURATION ===
+DEFAULT_JOBS = 100
+DEFAULT_CONCURRENCY = '1,4,16'
+DEFAULT_QUEUE_NAME = 'call-processing-benchmark'
+DEFAULT_WHISPER_MS = 400
+DEFAULT_GPT_MS = 600
+DEFAULT_DB_MS = 50
+RUN_TIMEOUT_SECONDS = 1800
+
+
+class StubBackends:
+    """Fixed-latency stand-ins for the pipeline services, tracking concurrency."""
+
+    def __init__(self, whisper_seconds, gpt_seconds, db_seconds):
+        self.latency = {'whisper': whisper_seconds, 'gpt': gpt_seconds, 'database': db_seconds}
+        self.in_flight = defaultdict(int)
+        self.peak = defaultdict(int)
+        self.completed = 0
+        self.target = 0
+        self.done = asyncio.Event()
+
+    def reset(self, target):
+        self.in_flight.clear()
+        self.peak.clear()
+        self.completed = 0
+        self.target = target
+        self.done = asyncio.Event()
+
+    async def _call(self, stage):
+        self.in_flight[stage] += 1
+        self.peak[stage] = max(self.peak[stage], self.in_flight[stage])
+        try:
+            await asyncio.sleep(self.latency[stage])
+        finally:
+            self.in_flight[stage] -= 1
+
+    async def transcribe_call_recording(self, call_log_id, audio_url=None, **kwargs):
+        await self._call('whisper')
+        return {'status': 'success', 'call_log_id': call_log_id}
+
+    async def analyze_call(self, call_log_id, analysis_modules=None, analysis_mode=None, **kwargs):
+        await self._call('gpt')
+        return {'status': 'success', 'call_log_id': call_log_id}
+
+    async def evaluate_disposition(self, call_log_id, **kwargs):
+        await self._call('database')
+        self.completed += 1
+        if self.completed >= self.target:
+            self.done.set()
+        return {'status': 'success', 'call_log_id': call_log_id}
+
+
+async def clear_queue(manager):
+    keys = [key async for key in manager.redis_client.scan_iter(match=f"{manager.queue_name}:*")]
+    if keys:
+        await manager.redis_client.delete(*keys)
+
+
+async def run_level(manager, stubs, jobs, concurrency, batch_size):
+    await clear_queue(manager)
+    stubs.reset(jobs)
+    for index in range(jobs):
+        await manager.queue_call_processing(call_log_id=f"benchmark-{concurrency}-{index}")
+
+    start = time.perf_counter()
+    tasks = [
+        asyncio.create_task(manager.process_jobs(worker_id=f"benchmark_{concurrency}_{i}", batch_size=batch_size))
+        for i in range(concurrency)
+    ]
+    try:
+        await asyncio.wait_for(stubs.done.wait(), timeout=RUN_TIMEOUT_SECONDS)
+    finally:
+        elapsed = time.perf_counter() - start
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        'concurrency': concurrency,
+        'jobs': stubs.completed,
+        'seconds': elapsed,
+        'jobs_per_minute': stubs.completed / elapsed * 60,
+        'peak': dict(stubs.peak)
+    }
+
+
+async def benchmark(args, levels):
+    from app.core.config import settings
+
+    settings.REDIS_URL = args.redis_url
+    settings.RQ_QUEUE_NAME = args.queue_name
+    from app.services.background_jobs import BackgroundJobManager
+
+    manager = BackgroundJobManager()
+    stubs = StubBackends(args.whisper_ms / 1000, args.gpt_ms / 1000, args.db_ms / 1000)
+    manager.transcription_service = stubs
+    manager.analysis_service = stubs
+    manager.disposition_engine = stubs
+
+    # Per-job logging would dominate the output
+    logging.getLogger('app').setLevel(logging.WARNING)
+
+    results = []
+    try:
+        for concurrency in levels:
+            result = await run_level(manager, stubs, args.jobs, concurrency, args.batch_size)
+            logger.info(
+                f"concurrency {concurrency}: {result['jobs']} jobs in {result['seconds']:.1f}s "
+                f"({result['jobs_per_minute']:.0f} jobs/min)"
+            )
+            results.append(result)
+    finally:
+        await clear_queue(manager)
+        await manager.redis_client.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark background job throughput')
+    parser.add_argument('--redis-url', default=os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+                        help='Redis URL (defaults to $REDIS_URL)')
+    parser.add_argument('--queue-name', default=DEFAULT_QUEUE_NAME, help='Scratch queue name (its keys are deleted)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Pipeline jobs per concurrency level')
+    parser.add_argument('--concurrency', default=DEFAULT_CONCURRENCY, help='Comma-separated worker task counts')
+    parser.add_argument('--batch-size', type=int, default=1, help='Jobs claimed per round trip')
+    parser.add_argument('--whisper-ms', type=int, default=DEFAULT_WHISPER_MS, help='Stubbed transcription latency')
+    parser.add_argument('--gpt-ms', type=int, default=DEFAULT_GPT_MS, help='Stubbed analysis latency')
+    parser.add_argument('--db-ms', type=int, default=DEFAULT_DB_MS, help='Stubbed disposition latency')
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    results = asyncio.run(benchmark(args, levels))
+
+    print(f"\n{'concurrency':>11} {'jobs':>6} {'seconds':>8} {'jobs/min':>9} {'peak whisper':>13} {'peak gpt':>9} {'peak db':>8}")
+    for result in results:
+        peak = result['peak']
+        print(
+            f"{result['concurrency']:>11} {result['jobs']:>6} {result['seconds']:>8.1f} "
+            f"{result['jobs_per_minute']:>9.0f} {peak.get('whisper', 0):>13} "
+            f"{peak.get('gpt', 0):>9} {peak.get('database', 0):>8}"
+        )
+
+
+if __name__ == '__main__':
+    main()
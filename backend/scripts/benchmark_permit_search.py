@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark PermitSearchService.search latency
+
+Seeds a synthetic permit table (default 1M rows, tagged with a dedicated
+source_portal_code so it can be removed again) and records p50/p95 latency
+of PermitSearchService.search at several page sizes.
+
+Usage:
+    export DATABASE_URL="postgresql://..."
+    python benchmark_permit_search.py --seed 1000000
+    python benchmark_permit_search.py --page-sizes 25,100,500 --iterations 50
+    python benchmark_permit_search.py --cleanup
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import logging
+from typing import Dict, List
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === CONFIGURATION ===
+BENCHMARK_PORTAL_CODE = 'benchmark_seed'
+SEED_BATCH_SIZE = 100_000
+DEFAULT_PAGE_SIZES = [25, 100, 500]
+DEFAULT_ITERATIONS = 30
+
+STREET_NAMES = ['MAIN', 'OAK', 'CEDAR', 'ELM', 'RANCH', 'RIVER', 'HILL', 'LAKE', 'PECAN', 'MILL']
+STREET_SUFFIXES = ['ST', 'RD', 'DR', 'LN', 'CT', 'BLVD', 'TRL']
+OWNER_NAMES = ['SMITH', 'JOHNSON', 'WILLIAMS', 'BROWN', 'JONES', 'GARCIA', 'MILLER', 'DAVIS']
+QUERIES = ['MAIN ST', 'OAK RD', 'SMITH', 'RANCH', 'CEDAR DR', 'GARCIA']
+
+
+def seed_permits(db, row_count: int, state_code: str) -> None:
+    """Insert synthetic permits server-side with generate_series."""
+    from sqlalchemy import text
+
+    state_id = db.execute(
+        text("SELECT id FROM states WHERE code = :code"), {'code': state_code}
+    ).scalar()
+    if not state_id:
+        raise RuntimeError(f"State {state_code} not found - run migrations first")
+
+    county_ids = [
+        row[0] for row in db.execute(
+            text("SELECT id FROM counties WHERE state_id = :state_id ORDER BY id LIMIT 20"),
+            {'state_id': state_id}
+        )
+    ] or [None]
+
+    existing = db.execute(
+        text("SELECT count(*) FROM septic_permits WHERE source_portal_code = :code"),
+        {'code': BENCHMARK_PORTAL_CODE}
+    ).scalar()
+
+    logger.info(f"Seeding {row_count - existing:,} rows ({existing:,} already present)")
+
+    for start in range(existing, row_count, SEED_BATCH_SIZE):
+        end = min(start + SEED_BATCH_SIZE, row_count)
+        db.execute(text("""
+            INSERT INTO septic_permits (
+                id, permit_number, state_id, county_id,
+                address, address_normalized, address_hash,
+                city, zip_code, owner_name, owner_name_normalized,
+                permit_date, system_type_raw,
+                latitude, longitude,
+                source_portal_code, scraped_at, is_active, version
+            )
+            SELECT
+                gen_random_uuid(),
+                'BENCH-' || g,
+                :state_id,
+                (CAST(:county_ids AS integer[]))[1 + (g % :county_count)],
+                g || ' ' || (:streets)[1 + (g % 10)] || ' ' || (:suffixes)[1 + (g % 7)],
+                g || ' ' || (:streets)[1 + (g % 10)] || ' ' || (:suffixes)[1 + (g % 7)],
+                md5('benchmark-' || g) || md5('benchmark-' || g),
+                'CITY ' || (g % 50),
+                lpad((78600 + g % 100)::text, 5, '0'),
+                (:owners)[1 + (g % 8)] || ' ' || g,
+                (:owners)[1 + (g % 8)] || ' ' || g,
+                DATE '1990-01-01' + (g % 12000),
+                'CONVENTIONAL',
+                30.0 + (g % 10000) / 5000.0,
+                -98.0 + (g % 7919) / 4000.0,
+                :portal, NOW(), TRUE, 1
+            FROM generate_series(:start, :end - 1) AS g
+        """), {
+            'state_id': state_id,
+            'county_ids': county_ids,
+            'county_count': len(county_ids),
+            'streets': STREET_NAMES,
+            'suffixes': STREET_SUFFIXES,
+            'owners': OWNER_NAMES,
+            'portal': BENCHMARK_PORTAL_CODE,
+            'start': start,
+            'end': end,
+        })
+        db.commit()
+        logger.info(f"Seeded {end:,}/{row_count:,}")
+
+    db.execute(text("ANALYZE septic_permits"))
+    db.commit()
+
+
+def cleanup_permits(db) -> None:
+    """Remove all synthetic benchmark permits."""
+    from sqlalchemy import text
+
+    deleted = db.execute(
+        text("DELETE FROM septic_permits WHERE source_portal_code = :code"),
+        {'code': BENCHMARK_PORTAL_CODE}
+    ).rowcount
+    db.commit()
+    logger.info(f"Deleted {deleted:,} benchmark rows")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sample list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_benchmark(db, page_sizes: List[int], iterations: int, state_code: str) -> Dict[str, Dict]:
+    """Time PermitSearchService.search for browse and text queries."""
+    from app.schemas.septic_permit import PermitSearchRequest
+    from app.services.permit_search_service import PermitSearchService
+
+    service = PermitSearchService(db)
+    results = {}
+
+    for page_size in page_sizes:
+        for label, query in [('browse', None), ('text', 'random')]:
+            samples = []
+            for _ in range(iterations):
+                request = PermitSearchRequest(
+                    query=random.choice(QUERIES) if query else None,
+                    state_codes=[state_code],
+                    page=random.randint(1, 20),
+                    page_size=page_size,
+                    sort_by='permit_date',
+                )
+                started = time.perf_counter()
+                service.search(request)
+                samples.append((time.perf_counter() - started) * 1000)
+
+            key = f"{label}/page_size={page_size}"
+            results[key] = {
+                'p50_ms': round(statistics.median(samples), 2),
+                'p95_ms': round(percentile(samples, 95), 2),
+                'max_ms': round(max(samples), 2),
+            }
+            logger.info(f"{key:28} p50={results[key]['p50_ms']:>9.2f}ms "
+                        f"p95={results[key]['p95_ms']:>9.2f}ms")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark permit search latency')
+    parser.add_argument('--database-url', help='PostgreSQL URL (defaults to $DATABASE_URL)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed this many synthetic rows first')
+    parser.add_argument('--cleanup', action='store_true', help='Delete synthetic rows and exit')
+    parser.add_argument('--state', default='TX', help='State code for synthetic rows')
+    parser.add_argument('--page-sizes', default=','.join(str(p) for p in DEFAULT_PAGE_SIZES))
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    if not os.environ.get('DATABASE_URL'):
+        parser.error('DATABASE_URL is required')
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.database.base_class import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            cleanup_permits(db)
+            return
+
+        if args.seed:
+            seed_permits(db, args.seed, args.state)
+
+        page_sizes = [int(p) for p in args.page_sizes.split(',')]
+        run_benchmark(db, page_sizes, args.iterations, args.state)
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Benchmark background job throughput and delivery under failure injection
+
+Queues short stub jobs on a scratch queue in a local Redis and drains them
+with N worker tasks of one BackgroundJobManager, twice: once clean and once
+with injected faults:
+- handler failures (an exception; retried, then dead-lettered)
+- worker crashes (the task dies mid-job without acknowledging it; it is
+  restarted, and the reaper requeues the job once its visibility deadline
+  passes)
+
+For each run it reports jobs per minute, completed, dead-lettered and lost
+jobs (lost should be 0), duplicate executions (expected under
+at-least-once delivery after crashes) and reaped jobs. With --replay the
+dead-lettered jobs are then replayed without faults and must all complete.
+
+Needs the same environment as worker.py (settings are loaded on import);
+no database or AI requests are made.
+
+Usage:
+    python benchmark_queue_reliability.py
+    python benchmark_queue_reliability.py --redis-url redis://localhost:6379/15 --jobs 500 --concurrency 16
+    python benchmark_queue_reliability.py --fail-rate 0.2 --crash-rate 0.05 --replay
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import logging
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === CONFIGURATION ===
+DEFAULT_JOBS = 200
+DEFAULT_CONCURRENCY = 8
+DEFAULT_QUEUE_NAME = 'call-processing-reliability-benchmark'
+DEFAULT_JOB_MS = 50
+DEFAULT_FAIL_RATE = 0.1
+DEFAULT_CRASH_RATE = 0.02
+DEFAULT_MAX_RETRIES = 2
+JOB_TIMEOUT_SECONDS = 2
+VISIBILITY_GRACE_SECONDS = 1
+REAP_INTERVAL_SECONDS = 1
+RETRY_DELAY_SECONDS = 0.1
+RUN_TIMEOUT_SECONDS = 600
+JOB_TYPE = 'benchmark_job'
+
+
+class SimulatedCrash(BaseException):
+    """Escapes the worker's error handling, like the process dying."""
+
+
+class FaultInjector:
+    """Stub job handler with injected failures and crashes."""
+
+    def __init__(self, job_seconds):
+        self.job_seconds = job_seconds
+        self.fail_rate = 0.0
+        self.crash_rate = 0.0
+        self.executions = Counter()
+        self.completed = set()
+        self.failures = 0
+        self.crashes = 0
+
+    def configure(self, fail_rate, crash_rate):
+        self.fail_rate = fail_rate
+        self.crash_rate = crash_rate
+        self.executions.clear()
+        self.completed.clear()
+        self.failures = 0
+        self.crashes = 0
+
+    async def handle(self, job_data):
+        from app.services.background_jobs import BackgroundJobError
+
+        index = job_data['index']
+        await asyncio.sleep(self.job_seconds)
+        roll = random.random()
+        if roll < self.crash_rate:
+            self.crashes += 1
+            raise SimulatedCrash()
+        if roll < self.crash_rate + self.fail_rate:
+            self.failures += 1
+            raise BackgroundJobError('Injected failure')
+        self.executions[index] += 1
+        self.completed.add(index)
+        return {'status': 'success', 'index': index}
+
+
+async def clear_queue(manager):
+    keys = [key async for key in manager.redis_client.scan_iter(match=f"{manager.queue_name}:*")]
+    if keys:
+        await manager.redis_client.delete(*keys)
+
+
+async def drain(manager, injector, expected, concurrency):
+    """Run worker tasks, restarting crashed ones, until every job is completed or dead-lettered."""
+    def start(slot):
+        return asyncio.create_task(manager.process_jobs(worker_id=f"reliability_{slot}"))
+
+    tasks = {slot: start(slot) for slot in range(concurrency)}
+    deadline = time.perf_counter() + RUN_TIMEOUT_SECONDS
+    try:
+        while time.perf_counter() < deadline:
+            dead = await manager.redis_client.llen(manager.dead_letter_key)
+            if len(injector.completed) + dead >= expected:
+                break
+            for slot, task in tasks.items():
+                if task.done():
+                    # Collect the crash so it is not reported as unretrieved
+                    task.exception()
+                    tasks[slot] = start(slot)
+            await asyncio.sleep(0.05)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+async def run_scenario(manager, injector, name, jobs, concurrency, fail_rate, crash_rate, max_retries):
+    await clear_queue(manager)
+    injector.configure(fail_rate, crash_rate)
+    for index in range(jobs):
+        await manager.queue_job(
+            job_type=JOB_TYPE,
+            job_data={'index': index},
+            timeout=JOB_TIMEOUT_SECONDS,
+            max_retries=max_retries
+        )
+
+    start = time.perf_counter()
+    await drain(manager, injector, jobs, concurrency)
+    elapsed = time.perf_counter() - start
+
+    stats = await manager.get_queue_stats()
+    completed = len(injector.completed)
+    dead = stats['dead_letter_jobs']
+    return {
+        'scenario': name,
+        'jobs': jobs,
+        'seconds': elapsed,
+        'jobs_per_minute': completed / elapsed * 60,
+        'completed': completed,
+        'dead_lettered': dead,
+        'lost': jobs - completed - dead,
+        'duplicates': sum(count - 1 for count in injector.executions.values() if count > 1),
+        'failures': injector.failures,
+        'crashes': injector.crashes,
+        'reaped': manager.reaped
+    }
+
+
+async def benchmark(args):
+    from app.core.config import settings
+
+    settings.REDIS_URL = args.redis_url
+    settings.RQ_QUEUE_NAME = args.queue_name
+    settings.JOB_VISIBILITY_GRACE_SECONDS = VISIBILITY_GRACE_SECONDS
+    settings.JOB_REAP_INTERVAL_SECONDS = REAP_INTERVAL_SECONDS
+    from app.services.background_jobs import BackgroundJobManager
+
+    manager = BackgroundJobManager()
+    manager.retry_delays = [RETRY_DELAY_SECONDS]
+    injector = FaultInjector(args.job_ms / 1000)
+    manager.job_handlers[JOB_TYPE] = injector.handle
+
+    # Count reaped jobs across all worker tasks
+    manager.reaped = 0
+    reap = manager.reap_expired_jobs
+
+    async def counting_reap():
+        result = await reap()
+        manager.reaped += result['requeued'] + result['dead_lettered']
+        return result
+    manager.reap_expired_jobs = counting_reap
+
+    # Per-job logging (including every injected failure) would dominate the output
+    logging.getLogger('app').setLevel(logging.CRITICAL)
+
+    results = []
+    try:
+        for name, fail_rate, crash_rate in [('clean', 0.0, 0.0), ('faulty', args.fail_rate, args.crash_rate)]:
+            manager.reaped = 0
+            result = await run_scenario(
+                manager, injector, name, args.jobs, args.concurrency,
+                fail_rate, crash_rate, args.max_retries
+            )
+            logger.info(
+                f"{name}: {result['completed']} completed, {result['dead_lettered']} dead-lettered, "
+                f"{result['lost']} lost in {result['seconds']:.1f}s"
+            )
+            results.append(result)
+
+        if args.replay:
+            injector.configure(0.0, 0.0)
+            dead = results[-1]['dead_lettered']
+            replay = await manager.replay_failed_jobs(max_jobs=dead)
+            await drain(manager, injector, replay['replayed'], args.concurrency)
+            logger.info(
+                f"replay: {replay['replayed']} replayed, {len(injector.completed)} completed, "
+                f"{replay['remaining_dead_letter']} left dead-lettered"
+            )
+    finally:
+        await clear_queue(manager)
+        await manager.redis_client.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark job queue reliability under failure injection')
+    parser.add_argument('--redis-url', default=os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+                        help='Redis URL (defaults to $REDIS_URL)')
+    parser.add_argument('--queue-name', default=DEFAULT_QUEUE_NAME, help='Scratch queue name (its keys are deleted)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Jobs per scenario')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Worker tasks')
+    parser.add_argument('--job-ms', type=int, default=DEFAULT_JOB_MS, help='Stub job duration')
+    parser.add_argument('--fail-rate', type=float, default=DEFAULT_FAIL_RATE, help='Share of executions that raise')
+    parser.add_argument('--crash-rate', type=float, default=DEFAULT_CRASH_RATE, help='Share of executions that kill their worker')
+    parser.add_argument('--max-retries', type=int, default=DEFAULT_MAX_RETRIES, help='Retries before dead-lettering')
+    parser.add_argument('--replay', action='store_true', help='Replay dead-lettered jobs afterwards')
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args))
+
+    print(f"\n{'scenario':<8} {'jobs':>6} {'seconds':>8} {'jobs/min':>9} {'completed':>10} {'dead':>6} "
+          f"{'lost':>5} {'dupes':>6} {'failures':>9} {'crashes':>8} {'reaped':>7}")
+    for result in results:
+        print(
+            f"{result['scenario']:<8} {result['jobs']:>6} {result['seconds']:>8.1f} "
+            f"{result['jobs_per_minute']:>9.0f} {result['completed']:>10} {result['dead_lettered']:>6} "
+            f"{result['lost']:>5} {result['duplicates']:>6} {result['failures']:>9} "
+            f"{result['crashes']:>8} {result['reaped']:>7}"
+        )
+
+    if any(result['lost'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Compare call analysis execution modes on latency and token cost
+
+Runs the analysis modules of CallAnalysisService on transcribed calls in
+each execution mode (sequential, concurrent, fused) and reports per-mode
+wall-clock latency and total tokens. Nothing is written to the database;
+the OpenAI requests are real and billed.
+
+Usage:
+    export DATABASE_URL="postgresql://..."
+    export OPENAI_API_KEY="sk-..."
+    python compare_analysis_modes.py --limit 5
+    python compare_analysis_modes.py --call-ids <uuid> <uuid> --modes concurrent,fused
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+import logging
+import statistics
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === CONFIGURATION ===
+DEFAULT_LIMIT = 5
+DEFAULT_MODES = 'sequential,concurrent,fused'
+
+
+async def compare(call_ids, limit, modes):
+    from app.database.base_class import SessionLocal
+    from app.models.ringcentral import CallLog
+    from app.models.call_transcript import CallTranscript
+    from app.services.call_analysis_service import CallAnalysisService, DEFAULT_ANALYSIS_MODULES
+
+    service = CallAnalysisService()
+    db = SessionLocal()
+    try:
+        query = db.query(CallLog, CallTranscript).join(
+            CallTranscript, CallTranscript.call_log_id == CallLog.id
+        ).filter(CallTranscript.full_transcript.isnot(None))
+        if call_ids:
+            rows = query.filter(CallLog.id.in_(call_ids)).all()
+        else:
+            rows = query.order_by(CallLog.created_at.desc()).limit(limit).all()
+        contexts = [service._prepare_analysis_context(call_log, transcript) for call_log, transcript in rows]
+    finally:
+        db.close()
+
+    if not contexts:
+        logger.warning("No transcribed calls found")
+        return {}
+
+    stats = {mode: {'latency': [], 'tokens': [], 'failed': 0, 'fallbacks': 0} for mode in modes}
+    for index, context in enumerate(contexts, 1):
+        for mode in modes:
+            results, execution = await service.run_modules(context, list(DEFAULT_ANALYSIS_MODULES), mode)
+            stats[mode]['latency'].append(execution['latency_seconds'])
+            stats[mode]['tokens'].append(execution['tokens_used'])
+            stats[mode]['failed'] += sum(1 for result in results.values() if result.get('status') == 'failed')
+            stats[mode]['fallbacks'] += len(execution.get('fallback_modules', []))
+            logger.info(
+                f"[{index}/{len(contexts)}] {context['call_log']['rc_call_id']} {mode}: "
+                f"{execution['latency_seconds']:.2f}s, {execution['tokens_used']:,} tokens"
+            )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare call analysis execution modes')
+    parser.add_argument('--database-url', help='PostgreSQL URL (defaults to $DATABASE_URL)')
+    parser.add_argument('--call-ids', nargs='+', default=None, help='Call log ids (default: latest transcribed calls)')
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help='Latest transcribed calls to use')
+    parser.add_argument('--modes', default=DEFAULT_MODES, help='Comma-separated execution modes')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    if not os.environ.get('DATABASE_URL'):
+        parser.error('DATABASE_URL is required')
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.services.call_analysis_service import ANALYSIS_MODES
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = [mode for mode in modes if mode not in ANALYSIS_MODES]
+    if unknown:
+        parser.error(f"Unknown modes: {', '.join(unknown)}")
+
+    stats = asyncio.run(compare(args.call_ids, args.limit, modes))
+    if not stats:
+        return
+
+    print(f"\n{'mode':<12} {'calls':>6} {'mean s':>8} {'p50 s':>8} {'max s':>8} {'tokens/call':>12} {'failed':>7} {'fallback':>9}")
+    for mode, mode_stats in stats.items():
+        latency = mode_stats['latency']
+        print(
+            f"{mode:<12} {len(latency):>6} {statistics.mean(latency):>8.2f} "
+            f"{statistics.median(latency):>8.2f} {max(latency):>8.2f} "
+            f"{statistics.mean(mode_stats['tokens']):>12,.0f} "
+            f"{mode_stats['failed']:>7} {mode_stats['fallbacks']:>9}"
+        )
+
+
+if __name__ == '__main__':
+    main()
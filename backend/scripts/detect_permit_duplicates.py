@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Detect duplicate septic permits
+
+Compares permits ingested since the last completed run (or every permit
+with --full) against all active permits sharing an address, parcel number
+or owner + street, and records likely duplicates in permit_duplicates for
+review. Commits per chunk and checkpoints progress, so it can be
+interrupted and re-run; intended for a nightly cron.
+
+Usage:
+    export DATABASE_URL="postgresql://..."
+    python detect_permit_duplicates.py
+    python detect_permit_duplicates.py --state TX --full --min-confidence 80
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === CONFIGURATION ===
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_MIN_CONFIDENCE = 75.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Detect duplicate permits')
+    parser.add_argument('--database-url', help='PostgreSQL URL (defaults to $DATABASE_URL)')
+    parser.add_argument('--state', default=None, help='Limit to one state code')
+    parser.add_argument('--full', action='store_true', help='Compare every permit, not just new ones')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--min-confidence', type=float, default=DEFAULT_MIN_CONFIDENCE)
+    parser.add_argument('--time-budget', type=float, default=None, help='Stop (resumably) after this many seconds')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    if not os.environ.get('DATABASE_URL'):
+        parser.error('DATABASE_URL is required')
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.database.base_class import SessionLocal
+    from app.services.permit_dedup_service import PermitDedupService
+
+    db = SessionLocal()
+    try:
+        stats = PermitDedupService(db).run(
+            state_code=args.state,
+            full=args.full,
+            chunk_size=args.chunk_size,
+            min_confidence=args.min_confidence,
+            time_budget_seconds=args.time_budget
+        )
+    finally:
+        db.close()
+
+    if stats['status'] == 'skipped':
+        logger.warning(f"Skipped: {stats['reason']}")
+        return
+
+    logger.info(
+        f"{stats['mode']} run {stats['status']}: {stats['permits_examined']:,} permits, "
+        f"{stats['pairs_evaluated']:,} pairs evaluated ({stats['pairs_per_second']:,}/s), "
+        f"{stats['duplicates_recorded']:,} duplicates recorded in {stats['elapsed_seconds']}s"
+    )
+
+
+if __name__ == '__main__':
+    main()
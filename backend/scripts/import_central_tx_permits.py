@@ -19,7 +19,6 @@ import sqlite3
 import uuid
 import json
 import argparse
-import hashlib
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Generator
 import logging
@@ -31,6 +30,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.address_normalization import (  # noqa: E402
+    ADDRESS_NORMALIZER_VERSION, canonicalize_address, canonical_address_hash
+)
+
 # === CONFIGURATION ===
 SQLITE_PATH = '/home/will/mgo-unified-output/crm_permits.db'
 BATCH_SIZE = 5000
@@ -200,49 +204,6 @@ COUNTY_NAMES = {
 }
 
 
-def normalize_address(address: Optional[str]) -> Optional[str]:
-    """Normalize address for consistent matching."""
-    if not address:
-        return None
-
-    # Basic normalization
-    addr = address.upper().strip()
-
-    # Common replacements
-    replacements = {
-        ' STREET': ' ST',
-        ' AVENUE': ' AVE',
-        ' BOULEVARD': ' BLVD',
-        ' DRIVE': ' DR',
-        ' ROAD': ' RD',
-        ' LANE': ' LN',
-        ' COURT': ' CT',
-        ' CIRCLE': ' CIR',
-        ' PLACE': ' PL',
-        ' HIGHWAY': ' HWY',
-        ' PARKWAY': ' PKWY',
-        '.': '',
-        ',': '',
-    }
-
-    for old, new in replacements.items():
-        addr = addr.replace(old, new)
-
-    # Remove extra spaces
-    addr = ' '.join(addr.split())
-
-    return addr
-
-
-def compute_address_hash(address: str, city: str, state: str) -> Optional[str]:
-    """Compute hash for address deduplication."""
-    if not address:
-        return None
-
-    normalized = f"{normalize_address(address)}|{(city or '').upper()}|{state.upper()}"
-    return hashlib.md5(normalized.encode()).hexdigest()
-
-
 def parse_date(date_str: Optional[str]) -> Optional[datetime]:
     """Parse date string to datetime."""
     if not date_str:
@@ -399,12 +360,10 @@ class PermitImporter:
             except:
                 pass
 
-        # Compute address hash for deduplication
-        address_hash = compute_address_hash(
-            row['address'],
-            row['city'],
-            'TX'
-        )
+        # Same canonical address/hash as the API ingestion path, keyed by
+        # county so it lines up with idx_septic_permits_dedup_address
+        address_normalized = canonicalize_address(row['address'], 'TX')
+        address_hash = canonical_address_hash(row['address'], COUNTY_NAMES[county_code], 'TX')
 
         return {
             'id': str(uuid.uuid4()),
@@ -412,8 +371,9 @@ class PermitImporter:
             'state_id': self.state_id_cache.get('TX', 1),
             'county_id': county_id,
             'address': row['address'],
-            'address_normalized': normalize_address(row['address']),
+            'address_normalized': address_normalized,
             'address_hash': address_hash,
+            'address_normalizer_version': ADDRESS_NORMALIZER_VERSION,
             'city': row['city'],
             'zip_code': row['zip'],
             'parcel_number': row['parcel_id'],
@@ -453,6 +413,7 @@ class PermitImporter:
                 p['address'],
                 p['address_normalized'],
                 p['address_hash'],
+                p['address_normalizer_version'],
                 p['city'],
                 p['zip_code'],
                 p['parcel_number'],
@@ -473,7 +434,7 @@ class PermitImporter:
         sql = """
             INSERT INTO septic_permits (
                 id, permit_number, state_id, county_id,
-                address, address_normalized, address_hash,
+                address, address_normalized, address_hash, address_normalizer_version,
                 city, zip_code, parcel_number,
                 latitude, longitude,
                 owner_name, owner_name_normalized,
@@ -487,7 +448,7 @@ class PermitImporter:
 
         template = """(
             %s, %s, %s, %s,
-            %s, %s, %s,
+            %s, %s, %s, %s,
             %s, %s, %s,
             %s, %s,
             %s, %s,
@@ -512,7 +473,7 @@ class PermitImporter:
                     cur.execute("""
                         INSERT INTO septic_permits (
                             id, permit_number, state_id, county_id,
-                            address, address_normalized, address_hash,
+                            address, address_normalized, address_hash, address_normalizer_version,
                             city, zip_code, parcel_number,
                             latitude, longitude,
                             owner_name, owner_name_normalized,
@@ -522,7 +483,7 @@ class PermitImporter:
                             is_active, version, created_at, updated_at
                         ) VALUES (
                             %s, %s, %s, %s,
-                            %s, %s, %s,
+                            %s, %s, %s, %s,
                             %s, %s, %s,
                             %s, %s,
                             %s, %s,
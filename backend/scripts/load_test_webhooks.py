@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Replay a RingCentral webhook storm against the API and measure acknowledgements
+
+Three steps, each a subcommand:
+- record:     dump recent webhook payloads from rc_webhook_events to JSON
+              lines, keeping their relative arrival times
+- synthesize: generate a storm of telephony session events (call started /
+              ended / recording ready) with a share of redeliveries, for
+              when no recording is at hand
+- replay:     POST every event, signed with the webhook secret, to
+              /api/v2/webhooks/ringcentral with N concurrent senders, either
+              as fast as possible or at the recorded pace, and report events
+              per second and acknowledgement latency percentiles
+
+Replaying writes the events to the target's database and triggers its
+processing (including duplicate detection and pipeline jobs), so point it
+at a staging or local API. Run it with and without WEBHOOK_FAST_ACK on the
+target to compare stream ingestion with storing events in the request.
+
+Usage:
+    export DATABASE_URL="postgresql://..."
+    python load_test_webhooks.py record --limit 5000 --output storm.jsonl
+    python load_test_webhooks.py synthesize --sessions 2000 --output storm.jsonl
+    python load_test_webhooks.py replay --input storm.jsonl --url http://localhost:8000 --concurrency 64
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import hmac
+import random
+import asyncio
+import hashlib
+import argparse
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === CONFIGURATION ===
+WEBHOOK_PATH = '/api/v2/webhooks/ringcentral'
+SESSION_EVENT = '/restapi/v1.0/account/~/extension/~/telephony/sessions'
+DEFAULT_RECORD_LIMIT = 5000
+DEFAULT_SESSIONS = 1000
+DEFAULT_REDELIVERY_RATE = 0.2
+DEFAULT_STORM_SECONDS = 60
+DEFAULT_CONCURRENCY = 32
+REQUEST_TIMEOUT_SECONDS = 30
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def record(args):
+    """Dump recent webhook payloads, oldest first, with arrival offsets."""
+    from app.database.base_class import SessionLocal
+    from app.models.ringcentral import RCWebhookEvent
+
+    db = SessionLocal()
+    try:
+        rows = db.query(RCWebhookEvent.raw_payload, RCWebhookEvent.received_at).order_by(
+            RCWebhookEvent.received_at.desc()
+        ).limit(args.limit).all()
+    finally:
+        db.close()
+
+    rows.reverse()
+    if not rows:
+        logger.warning("No webhook events recorded")
+        return
+    first = rows[0].received_at
+    with open(args.output, 'w') as f:
+        for row in rows:
+            offset_ms = round((row.received_at - first).total_seconds() * 1000)
+            f.write(json.dumps({'offset_ms': offset_ms, 'payload': row.raw_payload}) + '\n')
+    logger.info(f"Recorded {len(rows)} events to {args.output}")
+
+
+def synthesize(args):
+    """Generate call lifecycle events for many sessions, with redeliveries."""
+    rng = random.Random(args.seed)
+    start = datetime.now(timezone.utc)
+    events = []
+    for _ in range(args.sessions):
+        session_id = f"s-{uuid.uuid4().hex[:20]}"
+        started_ms = rng.uniform(0, args.duration * 1000)
+        ended_ms = started_ms + rng.uniform(20000, 300000)
+        lifecycle = [
+            ('CallStarted', started_ms),
+            ('CallEnded', ended_ms),
+            ('RecordingReady', ended_ms + rng.uniform(2000, 15000))
+        ]
+
+        for event_type, at_ms in lifecycle:
+            payload = {
+                'uuid': str(uuid.uuid4()),
+                'event': SESSION_EVENT,
+                'subscriptionId': 'load-test-telephony/sessions',
+                'timestamp': (start + timedelta(milliseconds=at_ms)).isoformat().replace('+00:00', 'Z'),
+                'body': {
+                    'telephonySessionId': session_id,
+                    'eventType': event_type,
+                    'accountId': 'load-test',
+                    'extensionId': 'load-test',
+                    'hasRecording': True
+                }
+            }
+            events.append((at_ms, payload))
+            # RingCentral redelivers when acknowledgements are slow
+            if rng.random() < args.redelivery_rate:
+                events.append((at_ms + rng.uniform(1000, 20000), payload))
+
+    events.sort(key=lambda event: event[0])
+    with open(args.output, 'w') as f:
+        for at_ms, payload in events:
+            f.write(json.dumps({'offset_ms': round(at_ms), 'payload': payload}) + '\n')
+    logger.info(f"Wrote {len(events)} events for {args.sessions} sessions to {args.output}")
+
+
+async def replay_events(events, url, secret, concurrency, speed):
+    import aiohttp
+
+    queue = asyncio.Queue()
+    for event in events:
+        queue.put_nowait(event)
+
+    latencies = []
+    statuses = Counter()
+    replay_start = time.perf_counter()
+
+    async def sender(session):
+        while True:
+            try:
+                event = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if speed > 0:
+                # Hold the recorded pace (scaled by speed)
+                due = replay_start + event['offset_ms'] / 1000 / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            body = json.dumps(event['payload']).encode('utf-8')
+            signature = hmac.new(secret.encode('utf-8'), body, hashlib.sha1).hexdigest()
+            sent = time.perf_counter()
+            try:
+                async with session.post(
+                    url,
+                    data=body,
+                    headers={'Content-Type': 'application/json', 'X-RC-Signature': signature}
+                ) as response:
+                    await response.read()
+                    statuses[response.status] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - sent)
+
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        await asyncio.gather(*(sender(session) for _ in range(concurrency)))
+
+    return latencies, statuses, time.perf_counter() - replay_start
+
+
+def replay(args):
+    """POST the recorded events and report throughput and ack latency."""
+    secret = args.secret or os.environ.get('RINGCENTRAL_WEBHOOK_SECRET')
+    if not secret:
+        sys.exit('A webhook secret is required (--secret or $RINGCENTRAL_WEBHOOK_SECRET)')
+
+    with open(args.input) as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    if args.limit:
+        events = events[:args.limit]
+    if not events:
+        sys.exit(f"No events in {args.input}")
+
+    url = args.url.rstrip('/') + WEBHOOK_PATH
+    logger.info(f"Replaying {len(events)} events to {url} with {args.concurrency} senders")
+    latencies, statuses, elapsed = asyncio.run(
+        replay_events(events, url, secret, args.concurrency, args.speed)
+    )
+
+    print(f"\nevents:        {len(latencies)}")
+    print(f"seconds:       {elapsed:.2f}")
+    print(f"events/s:      {len(latencies) / elapsed:.1f}")
+    for label, fraction in [('p50', 0.50), ('p95', 0.95), ('p99', 0.99)]:
+        print(f"{label} ack ms:    {percentile(latencies, fraction) * 1000:.1f}")
+    print(f"max ack ms:    {max(latencies) * 1000:.1f}")
+    print(f"responses:     {dict(statuses)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RingCentral webhook storm load test')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='Dump recent webhook payloads from the database')
+    record_parser.add_argument('--database-url', help='PostgreSQL URL (defaults to $DATABASE_URL)')
+    record_parser.add_argument('--limit', type=int, default=DEFAULT_RECORD_LIMIT, help='Most recent events to dump')
+    record_parser.add_argument('--output', required=True, help='JSON lines file to write')
+
+    synthesize_parser = subparsers.add_parser('synthesize', help='Generate a synthetic webhook storm')
+    synthesize_parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS, help='Telephony sessions')
+    synthesize_parser.add_argument('--duration', type=int, default=DEFAULT_STORM_SECONDS, help='Window in which calls start, in seconds')
+    synthesize_parser.add_argument('--redelivery-rate', type=float, default=DEFAULT_REDELIVERY_RATE,
+                                   help='Share of events delivered twice')
+    synthesize_parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    synthesize_parser.add_argument('--output', required=True, help='JSON lines file to write')
+
+    replay_parser = subparsers.add_parser('replay', help='Replay a recorded storm against the API')
+    replay_parser.add_argument('--input', required=True, help='JSON lines file from record or synthesize')
+    replay_parser.add_argument('--url', default='http://localhost:8000', help='API base URL')
+    replay_parser.add_argument('--secret', help='Webhook secret (defaults to $RINGCENTRAL_WEBHOOK_SECRET)')
+    replay_parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Concurrent senders')
+    replay_parser.add_argument('--speed', type=float, default=0,
+                               help='Multiple of the recorded pace (0 = as fast as possible)')
+    replay_parser.add_argument('--limit', type=int, default=None, help='Replay only the first N events')
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        if args.database_url:
+            os.environ['DATABASE_URL'] = args.database_url
+        if not os.environ.get('DATABASE_URL'):
+            parser.error('DATABASE_URL is required')
+        record(args)
+    elif args.command == 'synthesize':
+        synthesize(args)
+    else:
+        replay(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Rehash permit and property addresses with the canonical normalizer
+
+Recomputes address_normalized and address_hash for every row written by an
+older normalizer (address_normalizer_version NULL or below
+ADDRESS_NORMALIZER_VERSION). Permits whose new hash collides with another
+active permit are left unhashed and recorded in permit_duplicates. Commits
+per chunk, so it can be interrupted and re-run.
+
+Usage:
+    export DATABASE_URL="postgresql://..."
+    python rehash_addresses.py --dry-run
+    python rehash_addresses.py --table permits --chunk-size 10000
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === CONFIGURATION ===
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rehash addresses with the canonical normalizer')
+    parser.add_argument('--database-url', help='PostgreSQL URL (defaults to $DATABASE_URL)')
+    parser.add_argument('--table', choices=['permits', 'properties'], default=None, help='Limit to one table')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--processes', type=int, default=None, help='Normalizer worker processes')
+    parser.add_argument('--time-budget', type=float, default=None, help='Stop (resumably) after this many seconds')
+    parser.add_argument('--dry-run', action='store_true', help='Only count stale rows')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    if not os.environ.get('DATABASE_URL'):
+        parser.error('DATABASE_URL is required')
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.database.base_class import SessionLocal
+    from app.services.address_rehash_service import AddressRehashService
+    from app.utils.address_normalization import ADDRESS_NORMALIZER_VERSION
+
+    db = SessionLocal()
+    try:
+        service = AddressRehashService(db)
+        if args.dry_run:
+            for table, count in service.count_stale().items():
+                logger.info(f"{table}: {count:,} rows below normalizer v{ADDRESS_NORMALIZER_VERSION}")
+            return
+
+        stats = service.run(
+            tables=[args.table] if args.table else None,
+            chunk_size=args.chunk_size,
+            time_budget_seconds=args.time_budget,
+            processes=args.processes
+        )
+    finally:
+        db.close()
+
+    if stats['status'] == 'skipped':
+        logger.warning(f"Skipped: {stats['reason']}")
+        return
+
+    for table, table_stats in stats['tables'].items():
+        logger.info(
+            f"{table}: {table_stats['rows_rehashed']:,} rows rehashed, "
+            f"{table_stats['hashes_changed']:,} hashes changed"
+        )
+    logger.info(
+        f"Run {stats['status']} in {stats['elapsed_seconds']}s ({stats['rows_per_second']:,} rows/s), "
+        f"{stats['duplicates_recorded']:,} duplicate pairs recorded"
+    )
+    if stats['status'] == 'paused':
+        logger.info("Time budget reached; run again to continue")
+
+
+if __name__ == '__main__':
+    main()
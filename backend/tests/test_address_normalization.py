@@ -0,0 +1,80 @@
+"""Tests for the versioned address canonicalizer (app.utils.address_normalization)."""
+
+import pytest
+
+from app.utils.address_normalization import (
+    canonicalize_address, normalize_address, normalize_many, strip_location_suffix
+)
+
+
+# Streets named after TN cities must never be stripped down to the house number
+@pytest.mark.parametrize("address, state, expected", [
+    ("100 Franklin", "TN", "100 FRANKLIN"),
+    ("2200 Old Nashville", "TN", "2200 OLD NASHVILLE"),
+    ("450 W Fairview", "TN", "450 W FAIRVIEW"),
+    ("7 Leipers Fork", "TN", "7 LEIPERS FRK"),
+    ("7 Leipers Fork, TN 37064", "TN", "7 LEIPERS FRK"),
+    ("100 Franklin Rd, Franklin, TN 37064", "TN", "100 FRANKLIN RD"),
+    ("1000 Mabel Dr Franklin TN 37064", "TN", "1000 MABEL DR"),
+    ("12 Elm St, Franklin, Spring Hill", "TN", "12 ELM ST"),
+    ("100 Franklin", None, "100 FRANKLIN"),
+])
+def test_street_names_that_are_city_names_are_kept(address, state, expected):
+    assert canonicalize_address(address, state) == expected
+
+
+@pytest.mark.parametrize("address, state, expected", [
+    ("1000 Mabel DR, Franklin, TN, 37064", "TN", "1000 MABEL DR"),
+    ("9001 Haggard Ln, College Grove, TN 37046", "Tennessee", "9001 HAGGARD LN"),
+    ("2034 Riley Park Drive, Thompsons Station, TN 37179", "tn", "2034 RILEY PARK DR"),
+])
+def test_tennessee_location_tails_are_stripped(address, state, expected):
+    assert canonicalize_address(address, state) == expected
+
+
+@pytest.mark.parametrize("state", [None, "TX"])
+def test_location_tails_are_kept_outside_tennessee(state):
+    assert canonicalize_address("12 Elm St, Franklin, TN 37064", state) == "12 ELM ST FRANKLIN TN 37064"
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("5 Oak Ct (Westhaven Jewell Lot 2504)", "5 OAK CT"),
+    ("3 Main St | Franklin, TN 37064", "3 MAIN ST"),
+])
+def test_notes_are_stripped_for_every_state(address, expected):
+    assert strip_location_suffix(address) == expected
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("123 North Main Street, Apt. 4B", "123 N MAIN ST APT 4B"),
+    ("100 Southeast Boulevard, Suite 200", "100 SE BLVD STE 200"),
+    (None, None),
+    ("", None),
+])
+def test_normalize_address(address, expected):
+    assert normalize_address(address) == expected
+
+
+@pytest.mark.parametrize("address, state", [
+    ("1000 Mabel DR, Franklin, TN, 37064", "TN"),
+    ("7 Leipers Fork, TN 37064", "TN"),
+    ("123 North Main Street, Apt. 4B", None),
+])
+def test_canonicalize_is_idempotent(address, state):
+    canonical = canonicalize_address(address, state)
+
+    assert canonicalize_address(canonical, state) == canonical
+
+
+def test_normalize_many_matches_one_at_a_time():
+    addresses = ["100 Franklin", "12 Elm St, Franklin, TN 37064", None, "100 Franklin"]
+    states = ["TN", "TN", None, None]
+
+    assert normalize_many(addresses, states=states, processes=1) == [
+        canonicalize_address(address, state) for address, state in zip(addresses, states)
+    ]
+
+
+def test_normalize_many_rejects_mismatched_states():
+    with pytest.raises(ValueError):
+        normalize_many(["100 Franklin"], states=["TN", "TN"])
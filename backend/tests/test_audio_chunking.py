@@ -0,0 +1,133 @@
+"""Tests for chunk planning and transcript stitching (app.utils.audio_chunking)."""
+
+import pytest
+
+from app.utils.audio_chunking import (
+    AudioChunk, AudioChunkingError, parse_silencedetect, plan_chunks, stitch_segments
+)
+
+
+def _segment(start, end, text):
+    return {"start": start, "end": end, "text": text}
+
+
+# ===== plan_chunks =====
+
+def test_short_recording_is_one_chunk():
+    assert plan_chunks(300.0, [], 300, 2.0) == [AudioChunk(0, 0.0, 300.0, 0.0, 300.0)]
+
+
+def test_tail_under_max_fraction_stays_in_last_chunk():
+    # 370s < 1.25 * 300s
+    chunks = plan_chunks(370.0, [], 300, 2.0)
+
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [(0.0, 370.0)]
+
+
+def test_cuts_at_the_silence_nearest_the_target():
+    silences = [(200.0, 201.0), (289.0, 291.0), (320.0, 322.0)]
+
+    chunks = plan_chunks(600.0, silences, 300, 2.0)
+
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [(0.0, 290.0), (290.0, 600.0)]
+
+
+def test_hard_cut_without_a_silence_in_the_window():
+    # Both silences fall outside [150, 375] of the first chunk
+    silences = [(100.0, 101.0), (400.0, 401.0)]
+
+    chunks = plan_chunks(700.0, silences, 300, 2.0)
+
+    assert chunks[0].end == 300.0
+    assert chunks[1].start == 300.0
+
+
+def test_chunks_cover_the_recording_with_clamped_overlap():
+    chunks = plan_chunks(1000.0, [(295.0, 297.0), (610.0, 612.0)], 300, 2.0)
+
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    assert chunks[0].start == 0.0 and chunks[-1].end == 1000.0
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start == previous.end
+    for chunk in chunks:
+        assert chunk.window_start == max(0.0, chunk.start - 2.0)
+        assert chunk.window_end == min(1000.0, chunk.end + 2.0)
+
+
+# ===== stitch_segments =====
+
+def test_overlap_duplicates_are_kept_once_and_renumbered():
+    chunks = [AudioChunk(0, 0.0, 291.0, 0.0, 296.0), AudioChunk(1, 291.0, 600.0, 286.0, 600.0)]
+    results = [
+        {"segments": [_segment(0, 280, "a"), _segment(288, 296, "cross0")], "language": "en"},
+        {"segments": [_segment(0, 9, "cross1"), _segment(11, 314, "b")]},
+    ]
+
+    stitched = stitch_segments(chunks, results)
+
+    assert stitched["text"] == "a cross1 b"
+    assert [segment["id"] for segment in stitched["segments"]] == [0, 1, 2]
+    assert [(segment["start"], segment["end"]) for segment in stitched["segments"]] == [
+        (0.0, 280.0), (286.0, 295.0), (297.0, 600.0)
+    ]
+    assert stitched["language"] == "en"
+    assert stitched["duration"] == 600.0
+
+
+def test_segment_straddling_a_cut_unclaimed_by_both_chunks_is_recovered():
+    chunks = [AudioChunk(0, 0.0, 100.0, 0.0, 102.0), AudioChunk(1, 100.0, 200.0, 98.0, 200.0)]
+    # Chunk 0 times the straddling words 96-106 (midpoint 101, past its end);
+    # chunk 1 times them 94-104 (midpoint 99, before its start)
+    results = [
+        {"segments": [_segment(0, 90, "first"), _segment(96, 106, "straddle0")]},
+        {"segments": [_segment(-4, 6, "straddle1"), _segment(8, 102, "second")]},
+    ]
+
+    stitched = stitch_segments(chunks, results)
+
+    assert stitched["text"] == "first straddle0 second"
+    assert [segment["id"] for segment in stitched["segments"]] == [0, 1, 2]
+
+
+def test_last_chunk_keeps_segments_ending_at_the_recording_end():
+    chunks = [AudioChunk(0, 0.0, 100.0, 0.0, 100.0)]
+
+    stitched = stitch_segments(chunks, [{"segments": [_segment(95, 105, "end")]}])
+
+    assert stitched["text"] == "end"
+
+
+def test_chunk_without_segments_contributes_its_text_in_time_order():
+    chunks = [AudioChunk(0, 0.0, 100.0, 0.0, 102.0), AudioChunk(1, 100.0, 200.0, 98.0, 200.0)]
+    results = [
+        {"text": " first chunk ", "segments": []},
+        {"segments": [_segment(10, 50, "second")]},
+    ]
+
+    stitched = stitch_segments(chunks, results)
+
+    assert stitched["text"] == "first chunk second"
+    assert [segment["text"] for segment in stitched["segments"]] == ["second"]
+
+
+# ===== parse_silencedetect =====
+
+def test_parse_silencedetect():
+    output = "\n".join([
+        "  Duration: 00:10:05.50, start: 0.000000, bitrate: 64 kb/s",
+        "[silencedetect @ 0x1] silence_start: -0.01",
+        "[silencedetect @ 0x1] silence_end: 1.5 | silence_duration: 1.51",
+        "[silencedetect @ 0x1] silence_start: 300.25",
+        "[silencedetect @ 0x1] silence_end: 301 | silence_duration: 0.75",
+        "[silencedetect @ 0x1] silence_start: 604.0",
+    ])
+
+    duration, silences = parse_silencedetect(output)
+
+    assert duration == 605.5
+    assert silences == [(0.0, 1.5), (300.25, 301.0), (604.0, 605.5)]
+
+
+def test_parse_silencedetect_without_duration():
+    with pytest.raises(AudioChunkingError):
+        parse_silencedetect("silence_start: 1.0")
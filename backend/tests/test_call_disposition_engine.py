@@ -0,0 +1,109 @@
+"""Tests that batch disposition scoring matches per-call scoring (app.services.call_disposition_engine)."""
+
+import asyncio
+import itertools
+import random
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.call_disposition_engine import CallDispositionEngine
+
+
+def _disposition(name, category, conditions=None, boost=0):
+    return SimpleNamespace(
+        id=uuid.uuid4(), name=name, category=category, color=None,
+        auto_apply_enabled=conditions is not None, auto_apply_conditions=conditions,
+        confidence_boost=boost
+    )
+
+
+DISPOSITIONS = [
+    _disposition("Resolved - Satisfied", "positive"),
+    _disposition("Sale Closed", "Positive", {"sentiment_score": 0.5, "keywords": ["Purchase", "order"]}, 12),
+    _disposition("Follow Up - Information", "neutral"),
+    _disposition("No Answer", "neutral", {"duration_max_seconds": 30}, 8),
+    _disposition("Not Interested", "negative", {"escalation_risk": "LOW", "duration_min_seconds": 10}, 5),
+    _disposition("Complaint Escalation", "negative", {"quality_score": 50, "escalation_risk": "high"}, 20),
+    _disposition("Voicemail", "other"),
+    # Malformed conditions fall back to the scalar checks
+    _disposition("Callback", "neutral", {"quality_score": "high"}, 7),
+    _disposition("Zero Boost", "positive", {"sentiment_score": 0}, 0),
+]
+
+
+def _calls(count, seed=7):
+    rng = random.Random(seed)
+    call_logs, analyses = [], []
+    for _ in range(count):
+        call_logs.append(SimpleNamespace(
+            id=uuid.uuid4(),
+            rc_call_id="rc",
+            duration_seconds=rng.choice([None, 0, 12, 29, 30, 31, 180, 300, 301, 900]),
+            direction=rng.choice(["outbound", "inbound", None]),
+            has_recording=rng.choice([True, False, None]),
+        ))
+        analyses.append(SimpleNamespace(
+            overall_sentiment=rng.choice([None, "positive", "Neutral", "negative", "mixed"]),
+            sentiment_score=rng.choice([None, -0.8, -0.1, 0, 0.2, 0.9]),
+            overall_quality_score=rng.choice([None, 0, 35, 40, 55, 60, 79, 80, 95]),
+            escalation_risk=rng.choice([None, "", "High", "critical", "low", "medium", "unknown"]),
+            keywords=rng.choice([None, [], ["purchase"], ["Refund", "ORDER"], ["billing"]]),
+        ))
+    return call_logs, analyses
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return CallDispositionEngine()
+
+
+def _scalar_scores(engine, call_logs, analyses):
+    async def score_all():
+        return [
+            [
+                (await engine._calculate_disposition_score(disposition, call_log, analysis))[0]
+                for disposition in DISPOSITIONS
+            ]
+            for call_log, analysis in zip(call_logs, analyses)
+        ]
+
+    return np.array(asyncio.run(score_all()))
+
+
+def test_score_matrix_matches_calculate_disposition_score(engine):
+    call_logs, analyses = _calls(400)
+    catalogue = engine._build_catalogue((len(DISPOSITIONS), None), DISPOSITIONS)
+
+    matrix = engine._score_matrix(catalogue, call_logs, analyses)
+
+    assert matrix.shape == (len(call_logs), len(DISPOSITIONS))
+    np.testing.assert_array_equal(matrix, _scalar_scores(engine, call_logs, analyses))
+
+
+def test_score_matrix_picks_the_same_best_disposition(engine):
+    call_logs, analyses = _calls(200, seed=11)
+    catalogue = engine._build_catalogue((len(DISPOSITIONS), None), DISPOSITIONS)
+
+    matrix = engine._score_matrix(catalogue, call_logs, analyses)
+    scalar = _scalar_scores(engine, call_logs, analyses)
+
+    # argmax takes the first of equal scores, like evaluation order does
+    assert list(matrix.argmax(axis=1)) == list(scalar.argmax(axis=1))
+
+
+def test_category_and_characteristics_probes_cover_every_class(engine):
+    categories = ["positive", "NEUTRAL", "negative", "other", ""]
+    assert [engine._category_code(category) for category in categories] == [0, 1, 2, 3, 3]
+
+    codes = {
+        engine._characteristics_code(SimpleNamespace(
+            duration_seconds=duration, direction=direction, has_recording=has_recording
+        ))
+        for duration, direction, has_recording in itertools.product(
+            [None, 29, 30, 300, 301], ["outbound", "inbound"], [True, False]
+        )
+    }
+    assert codes == set(range(12))
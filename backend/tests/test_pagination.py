@@ -0,0 +1,125 @@
+"""Tests for keyset cursor encoding and segment planning (app.utils.pagination)."""
+
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+
+from app.utils.pagination import (
+    decode_cursor, encode_cursor, keyset_order_by, keyset_page, keyset_segments
+)
+
+permits = Table(
+    "permits", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("owner_name", String),
+)
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.parametrize("sort_value, row_id", [
+    ("SMITH", 42),
+    (None, 7),
+    (3.25, uuid.UUID("12345678-1234-5678-1234-567812345678")),
+    (date(2024, 2, 29), 1),
+    (datetime(2024, 2, 29, 13, 45, 6, 789000), 2),
+    (datetime(2024, 2, 29, 13, 45, tzinfo=timezone.utc), 3),
+])
+def test_cursor_round_trips_values(sort_value, row_id):
+    cursor = encode_cursor("owner_name:asc", sort_value, row_id)
+
+    assert decode_cursor(cursor, "owner_name:asc") == (sort_value, row_id)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor("owner_name:asc", "?&/+= " * 10, 1)
+
+    assert "=" not in cursor
+    assert all(char.isalnum() or char in "-_" for char in cursor)
+
+
+def test_cursor_for_another_sort_is_rejected():
+    cursor = encode_cursor("owner_name:asc", "SMITH", 42)
+
+    with pytest.raises(ValueError, match="sort order"):
+        decode_cursor(cursor, "owner_name:desc")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "e30", "eyJrIjoieCJ9"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "owner_name:asc")
+
+
+def test_order_by_ties_on_id_in_the_same_direction():
+    ascending = keyset_order_by(permits.c.owner_name, permits.c.id, descending=False)
+    descending = keyset_order_by(permits.c.owner_name, permits.c.id, descending=True)
+
+    assert [_sql(clause) for clause in ascending] == ["permits.owner_name ASC", "permits.id ASC"]
+    assert [_sql(clause) for clause in descending] == ["permits.owner_name DESC", "permits.id DESC"]
+
+
+def test_ascending_segments_seek_values_then_the_trailing_null_block():
+    segments = keyset_segments(permits.c.owner_name, permits.c.id, False, "SMITH", 42)
+
+    assert [_sql(segment) for segment in segments] == [
+        "(permits.owner_name, permits.id) > ('SMITH', 42)",
+        "permits.owner_name IS NULL",
+    ]
+
+
+def test_ascending_segments_inside_the_null_block():
+    segments = keyset_segments(permits.c.owner_name, permits.c.id, False, None, 42)
+
+    assert [_sql(segment) for segment in segments] == [
+        "permits.owner_name IS NULL AND permits.id > 42",
+    ]
+
+
+def test_descending_segments_after_a_value():
+    segments = keyset_segments(permits.c.owner_name, permits.c.id, True, "SMITH", 42)
+
+    assert [_sql(segment) for segment in segments] == [
+        "(permits.owner_name, permits.id) < ('SMITH', 42)",
+    ]
+
+
+def test_descending_segments_finish_the_leading_null_block_first():
+    segments = keyset_segments(permits.c.owner_name, permits.c.id, True, None, 42)
+
+    assert [_sql(segment) for segment in segments] == [
+        "permits.owner_name IS NULL AND permits.id < 42",
+        "permits.owner_name IS NOT NULL",
+    ]
+
+
+def test_page_reads_segments_in_order_until_full():
+    calls = []
+
+    def fetch(segment, limit):
+        calls.append(limit)
+        # First segment has 2 rows, the NULL block plenty
+        return ["a", "b"][:limit] if len(calls) == 1 else ["n1", "n2", "n3"][:limit]
+
+    rows = keyset_page(fetch, permits.c.owner_name, permits.c.id, False, "SMITH", 42, 4)
+
+    assert rows == ["a", "b", "n1", "n2"]
+    assert calls == [4, 2]
+
+
+def test_page_stops_after_a_full_first_segment():
+    calls = []
+
+    def fetch(segment, limit):
+        calls.append(limit)
+        return list(range(limit))
+
+    rows = keyset_page(fetch, permits.c.owner_name, permits.c.id, False, "SMITH", 42, 3)
+
+    assert rows == [0, 1, 2]
+    assert calls == [3]
@@ -0,0 +1,94 @@
+"""Tests for webhook duplicate keys (app.services.webhook_processor)."""
+
+from datetime import datetime, timezone
+
+from app.services.webhook_processor import (
+    DUPLICATE_WINDOW_MS, webhook_event_timestamp_ms, webhook_idempotency_key, webhook_notification_id
+)
+
+EVENT_TYPE = "/restapi/v1.0/account/~/telephony/sessions"
+
+
+def _payload(**overrides):
+    payload = {
+        "uuid": "notification-1",
+        "timestamp": "2026-10-16T12:00:00.000Z",
+        "body": {"telephonySessionId": "s-1", "sequence": 3, "parties": [{"status": {"code": "Answered"}}]},
+    }
+    payload.update(overrides)
+    return payload
+
+
+# ===== webhook_event_timestamp_ms =====
+
+def test_timestamp_from_iso_and_epoch_ms():
+    expected = int(datetime(2026, 10, 16, 12, tzinfo=timezone.utc).timestamp() * 1000)
+
+    assert webhook_event_timestamp_ms({"timestamp": "2026-10-16T12:00:00Z"}) == expected
+    assert webhook_event_timestamp_ms({"timestamp": "2026-10-16T12:00:00"}) == expected
+    assert webhook_event_timestamp_ms({"timestamp": expected}) == expected
+    assert webhook_event_timestamp_ms({"timestamp": str(expected)}) == expected
+
+
+def test_timestamp_falls_back_to_receive_time():
+    received_at = datetime(2026, 10, 16, 12, 0, 5)
+
+    assert webhook_event_timestamp_ms({"timestamp": "garbage"}, received_at) == (
+        int(received_at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+    )
+    assert webhook_event_timestamp_ms({}) is None
+
+
+# ===== webhook_notification_id =====
+
+def test_notification_id_prefers_uuid_then_sequence_then_body_digest():
+    assert webhook_notification_id(_payload()) == "uuid=notification-1"
+    assert webhook_notification_id(_payload(uuid=None)) == "seq=3"
+
+    body = {"telephonySessionId": "s-1", "parties": []}
+    digest = webhook_notification_id({"body": body})
+    assert digest.startswith("body=")
+    assert webhook_notification_id({"body": dict(reversed(list(body.items())))}) == digest
+
+
+# ===== webhook_idempotency_key =====
+
+def test_redelivery_of_a_notification_gets_the_same_key():
+    first = webhook_idempotency_key(_payload(), EVENT_TYPE)
+    redelivered = webhook_idempotency_key(_payload(), EVENT_TYPE, datetime(2026, 10, 16, 12, 5))
+
+    assert first is not None
+    assert first == redelivered
+
+
+def test_successive_notifications_of_a_session_get_different_keys():
+    answered = _payload()
+    disconnected = _payload(uuid="notification-2", body={**answered["body"], "sequence": 4})
+
+    assert webhook_idempotency_key(answered, EVENT_TYPE) != webhook_idempotency_key(disconnected, EVENT_TYPE)
+
+
+def test_key_depends_on_event_type_and_session():
+    other_session = _payload(body={**_payload()["body"], "telephonySessionId": "s-2"})
+
+    assert webhook_idempotency_key(_payload(), EVENT_TYPE) != webhook_idempotency_key(_payload(), "other")
+    assert webhook_idempotency_key(_payload(), EVENT_TYPE) != webhook_idempotency_key(other_session, EVENT_TYPE)
+
+
+def test_key_buckets_by_duplicate_window():
+    timestamp_ms = 1_800_000_000_000 - 1_800_000_000_000 % DUPLICATE_WINDOW_MS
+
+    same_window = [
+        webhook_idempotency_key(_payload(timestamp=timestamp_ms + offset), EVENT_TYPE)
+        for offset in (0, DUPLICATE_WINDOW_MS - 1)
+    ]
+    next_window = webhook_idempotency_key(_payload(timestamp=timestamp_ms + DUPLICATE_WINDOW_MS), EVENT_TYPE)
+
+    assert same_window[0] == same_window[1]
+    assert next_window != same_window[0]
+
+
+def test_events_without_a_session_or_time_have_no_key():
+    assert webhook_idempotency_key(_payload(body={"sequence": 3}), EVENT_TYPE) is None
+    assert webhook_idempotency_key(_payload(body="not a dict"), EVENT_TYPE) is None
+    assert webhook_idempotency_key(_payload(timestamp=None), EVENT_TYPE) is None
@@ -4,12 +4,22 @@ Background job worker for RingCentral call processing automation.
 Processes transcription, analysis, and disposition jobs from the Redis queue.
 
 Usage:
-    python worker.py [--worker-id WORKER_ID] [--concurrency N]
+    python worker.py [--worker-id WORKER_ID] [--concurrency N] [--batch-size N] [--webhook-consumers N]
 
 Examples:
     python worker.py                           # Single worker with default ID
     python worker.py --worker-id worker_2      # Named worker
     python worker.py --concurrency 3          # Process 3 jobs concurrently
+    python worker.py --webhook-consumers 1    # Also consume the fast-ack webhook stream
+
+Each concurrency slot is an asyncio task on one non-blocking Redis
+connection pool; Whisper, GPT and database stages are capped per process by
+WORKER_WHISPER_CONCURRENCY, WORKER_GPT_CONCURRENCY and WORKER_DB_CONCURRENCY.
+Database sessions come from a pool of one connection per job task and
+webhook consumer (plus WORKER_DB_POOL_OVERFLOW), so concurrent jobs never
+share a transaction.
+Webhook consumers store and process events acknowledged in WEBHOOK_FAST_ACK
+mode; they default to one per worker when that mode is on.
 """
 
 import asyncio
@@ -21,7 +31,9 @@ import time
 from typing import Optional
 
 from app.core.config import settings
+from app.database.base_class import use_pooled_engine
 from app.services.background_jobs import background_job_manager
+from app.services.webhook_stream import webhook_event_stream
 
 # Configure logging
 logging.basicConfig(
@@ -35,16 +47,29 @@ logger = logging.getLogger(__name__)
 class WorkerManager:
     """Manages background job worker processes."""
 
-    def __init__(self, worker_id: str, concurrency: int = 1):
+    def __init__(
+        self,
+        worker_id: str,
+        concurrency: int = 1,
+        batch_size: int = 1,
+        webhook_consumers: int = 0,
+        webhook_batch_size: Optional[int] = None
+    ):
         """
         Initialize worker manager.
 
         Args:
             worker_id: Unique identifier for this worker
             concurrency: Number of jobs to process concurrently
+            batch_size: Jobs claimed per queue round trip by each task
+            webhook_consumers: Webhook stream consumer tasks
+            webhook_batch_size: Stream entries read per shard per round trip
         """
         self.worker_id = worker_id
         self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.webhook_consumers = webhook_consumers
+        self.webhook_batch_size = webhook_batch_size
         self.running = False
         self.tasks = []
 
@@ -60,6 +85,13 @@ class WorkerManager:
                 task = asyncio.create_task(self._worker_loop(task_id))
                 self.tasks.append(task)
 
+            for i in range(self.webhook_consumers):
+                consumer_name = f"{self.worker_id}_webhooks_{i}"
+                task = asyncio.create_task(
+                    webhook_event_stream.consume(consumer_name, batch_size=self.webhook_batch_size)
+                )
+                self.tasks.append(task)
+
             # Wait for all tasks to complete
             await asyncio.gather(*self.tasks)
 
@@ -95,7 +127,7 @@ class WorkerManager:
                 # Process jobs using the background job manager
                 await background_job_manager.process_jobs(
                     worker_id=task_id,
-                    batch_size=1
+                    batch_size=self.batch_size
                 )
 
             except asyncio.CancelledError:
@@ -134,6 +166,13 @@ async def health_monitor(worker_manager: WorkerManager):
                 f"Total Jobs: {stats['total_jobs']}"
             )
 
+            if worker_manager.webhook_consumers:
+                stream_stats = await webhook_event_stream.get_stream_stats()
+                logger.info(
+                    f"Webhook Stream - Pending: {stream_stats['pending']}, "
+                    f"Unread: {stream_stats['lag']}"
+                )
+
             # Log status breakdown if available
             status_breakdown = stats.get('status_breakdown', {})
             if status_breakdown:
@@ -171,6 +210,24 @@ async def main():
         default=1,
         help='Number of jobs to process concurrently'
     )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help='Jobs claimed per queue round trip by each task'
+    )
+    parser.add_argument(
+        '--webhook-consumers',
+        type=int,
+        default=1 if settings.WEBHOOK_FAST_ACK else 0,
+        help='Webhook stream consumer tasks (default 1 with WEBHOOK_FAST_ACK, else 0)'
+    )
+    parser.add_argument(
+        '--webhook-batch-size',
+        type=int,
+        default=settings.WEBHOOK_CONSUMER_BATCH_SIZE,
+        help='Webhook stream entries read per shard per round trip'
+    )
     parser.add_argument(
         '--monitor',
         action='store_true',
@@ -195,10 +252,20 @@ async def main():
             logger.error(f"Redis connection failed: {e}")
             return 1
 
+    # One connection per concurrent task; the shared StaticPool connection
+    # would interleave their transactions
+    use_pooled_engine(
+        pool_size=args.concurrency + args.webhook_consumers,
+        max_overflow=settings.WORKER_DB_POOL_OVERFLOW
+    )
+
     # Create worker manager
     worker_manager = WorkerManager(
         worker_id=args.worker_id,
-        concurrency=args.concurrency
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        webhook_consumers=args.webhook_consumers,
+        webhook_batch_size=args.webhook_batch_size
     )
 
     # Setup signal handlers
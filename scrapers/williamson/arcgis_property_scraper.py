@@ -21,11 +21,15 @@ import aiohttp
 import json
 import logging
 import os
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Dict, List, Any
-import re
-import hashlib
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'backend'))
+from app.utils.address_normalization import (  # noqa: E402
+    ADDRESS_NORMALIZER_VERSION, canonicalize_address, canonical_address_hash
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -57,48 +61,6 @@ OUTPUT_DIR = Path("C:/Users/Will/crm-work/ReactCRM/scrapers/output/williamson_co
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def normalize_address(address: Optional[str]) -> Optional[str]:
-    """Normalize address for matching."""
-    if not address:
-        return None
-
-    # Uppercase and strip
-    normalized = address.upper().strip()
-
-    # Remove multiple spaces
-    normalized = re.sub(r'\s+', ' ', normalized)
-
-    # Standardize abbreviations
-    replacements = {
-        r'\bSTREET\b': 'ST',
-        r'\bROAD\b': 'RD',
-        r'\bDRIVE\b': 'DR',
-        r'\bAVENUE\b': 'AVE',
-        r'\bBOULEVARD\b': 'BLVD',
-        r'\bLANE\b': 'LN',
-        r'\bCOURT\b': 'CT',
-        r'\bCIRCLE\b': 'CIR',
-        r'\bPLACE\b': 'PL',
-        r'\bTERRACE\b': 'TER',
-        r'\bNORTH\b': 'N',
-        r'\bSOUTH\b': 'S',
-        r'\bEAST\b': 'E',
-        r'\bWEST\b': 'W',
-        r'\bHOLLOW\b': 'HOLW',
-    }
-
-    for pattern, replacement in replacements.items():
-        normalized = re.sub(pattern, replacement, normalized)
-
-    return normalized
-
-
-def compute_address_hash(address_normalized: str, county: str, state: str) -> str:
-    """Compute SHA256 hash for deduplication."""
-    composite = f"{address_normalized or ''}|{county.upper()}|{state.upper()}"
-    return hashlib.sha256(composite.encode()).hexdigest()
-
-
 def convert_unix_timestamp(ms_timestamp: Optional[int]) -> Optional[str]:
     """Convert Unix millisecond timestamp to ISO date string."""
     if not ms_timestamp:
@@ -117,7 +79,7 @@ def extract_property_data(feature: Dict[str, Any]) -> Dict[str, Any]:
 
     # Get address
     address = attrs.get('ADDRESS') or ''
-    address_normalized = normalize_address(address)
+    address_normalized = canonicalize_address(address, 'TN')
 
     # Extract centroid from polygon if available
     centroid_lat = None
@@ -159,7 +121,8 @@ def extract_property_data(feature: Dict[str, Any]) -> Dict[str, Any]:
         # Address
         'address': address,
         'address_normalized': address_normalized,
-        'address_hash': compute_address_hash(address_normalized, 'WILLIAMSON', 'TN') if address_normalized else None,
+        'address_hash': canonical_address_hash(address, 'WILLIAMSON', 'TN') if address_normalized else None,
+        'address_normalizer_version': ADDRESS_NORMALIZER_VERSION,
         'street_number': attrs.get('streetnumber'),
         'street_name': attrs.get('streetname'),
         'city': attrs.get('CITY'),
@@ -12,17 +12,21 @@ This script:
 4. Uses batch commits for reliability
 """
 
-import hashlib
 import json
 import logging
-import re
+import sys
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Set
+from typing import Dict, Any, List, Set
 
 import psycopg2
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'backend'))
+from app.utils.address_normalization import (  # noqa: E402
+    ADDRESS_NORMALIZER_VERSION, canonicalize_address, canonical_address_hash
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -37,48 +41,6 @@ PROPERTIES_FILE = SCRIPT_DIR.parent / "output" / "williamson_county" / "properti
 BATCH_SIZE = 500  # Commit every 500 records
 
 
-def normalize_address(address: Optional[str]) -> Optional[str]:
-    """Normalize address for matching."""
-    if not address:
-        return None
-
-    normalized = address.upper().strip()
-    normalized = re.sub(r'[.,#\'"()]+', ' ', normalized)
-    normalized = re.sub(r'\s+', ' ', normalized)
-
-    replacements = {
-        r'\bSTREET\b': 'ST',
-        r'\bROAD\b': 'RD',
-        r'\bDRIVE\b': 'DR',
-        r'\bAVENUE\b': 'AVE',
-        r'\bBOULEVARD\b': 'BLVD',
-        r'\bLANE\b': 'LN',
-        r'\bCOURT\b': 'CT',
-        r'\bCIRCLE\b': 'CIR',
-        r'\bPLACE\b': 'PL',
-        r'\bTERRACE\b': 'TER',
-        r'\bPARKWAY\b': 'PKWY',
-        r'\bNORTH\b': 'N',
-        r'\bSOUTH\b': 'S',
-        r'\bEAST\b': 'E',
-        r'\bWEST\b': 'W',
-        r'\bHOLLOW\b': 'HOLW',
-        r'\bCREEK\b': 'CRK',
-        r'\bHIGHWAY\b': 'HWY',
-    }
-
-    for pattern, replacement in replacements.items():
-        normalized = re.sub(pattern, replacement, normalized)
-
-    return normalized.strip()
-
-
-def compute_address_hash(address_normalized: str, county_name: str, state_code: str) -> str:
-    """Compute SHA256 hash for deduplication."""
-    composite = f"{address_normalized or ''}|{county_name.upper()}|{state_code.upper()}"
-    return hashlib.sha256(composite.encode()).hexdigest()
-
-
 def load_properties(file_path: Path) -> List[Dict[str, Any]]:
     """Load properties from JSON checkpoint file."""
     logger.info(f"Loading properties from {file_path}")
@@ -147,13 +109,13 @@ def main():
                 if not address:
                     continue
 
-                address_normalized = prop.get('address_normalized') or normalize_address(address)
+                # Always recompute: hashes stored in the checkpoint predate the
+                # shared canonicalizer and would not match rows in the database
+                address_normalized = canonicalize_address(address, 'TN')
                 if not address_normalized:
                     continue
 
-                address_hash = prop.get('address_hash')
-                if not address_hash:
-                    address_hash = compute_address_hash(address_normalized, 'Williamson', 'TN')
+                address_hash = canonical_address_hash(address, 'Williamson', 'TN')
 
                 if address_hash not in existing_hashes:
                     prop['_computed_hash'] = address_hash
@@ -185,7 +147,7 @@ def main():
                     cur.execute("""
                         INSERT INTO properties (
                             id, state_id, county_id,
-                            address, address_normalized, address_hash,
+                            address, address_normalized, address_hash, address_normalizer_version,
                             street_number, street_name, city, subdivision,
                             parcel_id, gis_link,
                             centroid_lat, centroid_lon,
@@ -201,7 +163,7 @@ def main():
                             created_at, updated_at
                         ) VALUES (
                             %s, %s, %s,
-                            %s, %s, %s,
+                            %s, %s, %s, %s,
                             %s, %s, %s, %s,
                             %s, %s,
                             %s, %s,
@@ -218,7 +180,7 @@ def main():
                         )
                     """, (
                         str(prop_id), state_id, county_id,
-                        address, address_normalized, address_hash,
+                        address, address_normalized, address_hash, ADDRESS_NORMALIZER_VERSION,
                         prop.get('street_number'), prop.get('street_name'),
                         prop.get('city'), prop.get('subdivision'),
                         prop.get('parcel_id'), prop.get('gis_link'),
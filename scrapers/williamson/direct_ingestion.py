@@ -6,20 +6,23 @@ Bypasses the API and inserts properties directly into the production database,
 then links permits by address hash.
 """
 
-import hashlib
 import json
 import logging
 import os
-import re
 import sys
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Dict, Any, List
 
 import psycopg2
 from psycopg2.extras import execute_values
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'backend'))
+from app.utils.address_normalization import (  # noqa: E402
+    ADDRESS_NORMALIZER_VERSION, canonicalize_address, canonical_address_hash
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -35,46 +38,6 @@ OUTPUT_DIR = SCRIPT_DIR.parent / "output" / "williamson_county"
 MATCHED_PROPERTIES_FILE = OUTPUT_DIR / "matched_properties.ndjson"
 
 
-def normalize_address(address: Optional[str]) -> Optional[str]:
-    """Normalize address for matching."""
-    if not address:
-        return None
-
-    normalized = address.upper().strip()
-    normalized = re.sub(r'[.,#\'"()]+', ' ', normalized)
-    normalized = re.sub(r'\s+', ' ', normalized)
-
-    replacements = {
-        r'\bSTREET\b': 'ST',
-        r'\bROAD\b': 'RD',
-        r'\bDRIVE\b': 'DR',
-        r'\bAVENUE\b': 'AVE',
-        r'\bBOULEVARD\b': 'BLVD',
-        r'\bLANE\b': 'LN',
-        r'\bCOURT\b': 'CT',
-        r'\bCIRCLE\b': 'CIR',
-        r'\bPLACE\b': 'PL',
-        r'\bTERRACE\b': 'TER',
-        r'\bPARKWAY\b': 'PKWY',
-        r'\bNORTH\b': 'N',
-        r'\bSOUTH\b': 'S',
-        r'\bEAST\b': 'E',
-        r'\bWEST\b': 'W',
-        r'\bHOLLOW\b': 'HOLW',
-    }
-
-    for pattern, replacement in replacements.items():
-        normalized = re.sub(pattern, replacement, normalized)
-
-    return normalized.strip()
-
-
-def compute_address_hash(address_normalized: str, county_name: str, state_code: str) -> str:
-    """Compute SHA256 hash for deduplication."""
-    composite = f"{address_normalized or ''}|{county_name.upper()}|{state_code.upper()}"
-    return hashlib.sha256(composite.encode()).hexdigest()
-
-
 def load_properties(file_path: Path) -> List[Dict[str, Any]]:
     """Load properties from NDJSON file."""
     logger.info(f"Loading properties from {file_path}")
@@ -135,10 +98,10 @@ def insert_properties(conn, properties: List[Dict], state_id: int, county_id: in
 
                 # Get address info
                 address = prop.get('address')
-                address_normalized = prop.get('address_normalized') or normalize_address(address)
-                address_hash = prop.get('address_hash')
-                if not address_hash and address_normalized:
-                    address_hash = compute_address_hash(address_normalized, 'Williamson', 'TN')
+                # Recompute rather than trusting the NDJSON: its hashes predate
+                # the shared canonicalizer
+                address_normalized = canonicalize_address(address, 'TN')
+                address_hash = canonical_address_hash(address, 'Williamson', 'TN')
 
                 # Check if already exists
                 cur.execute("""
@@ -168,7 +131,7 @@ def insert_properties(conn, properties: List[Dict], state_id: int, county_id: in
                 cur.execute("""
                     INSERT INTO properties (
                         id, state_id, county_id,
-                        address, address_normalized, address_hash,
+                        address, address_normalized, address_hash, address_normalizer_version,
                         street_number, street_name, city, subdivision,
                         parcel_id, gis_link,
                         centroid_lat, centroid_lon,
@@ -183,9 +146,9 @@ def insert_properties(conn, properties: List[Dict], state_id: int, county_id: in
                         has_building_details, geocoded, is_active,
                         created_at, updated_at
                     ) VALUES (
-                        %s, %s, %s,
                         %s, %s, %s,
                         %s, %s, %s, %s,
+                        %s, %s, %s, %s,
                         %s, %s,
                         %s, %s,
                         %s, %s, %s,
@@ -193,7 +156,7 @@ def insert_properties(conn, properties: List[Dict], state_id: int, county_id: in
                         %s, %s, %s,
                         %s, %s, %s,
                         %s, %s, %s,
-                        %s, %s, %s,
+                        %s, %s, %s, %s,
                         %s, %s, %s, %s,
                         %s, %s, %s,
                         %s, %s, %s,
@@ -201,7 +164,7 @@ def insert_properties(conn, properties: List[Dict], state_id: int, county_id: in
                     )
                 """, (
                     str(prop_id), state_id, county_id,
-                    address, address_normalized, address_hash,
+                    address, address_normalized, address_hash, ADDRESS_NORMALIZER_VERSION,
                     prop.get('street_number'), prop.get('street_name'), prop.get('city'), prop.get('subdivision'),
                     prop.get('parcel_id'), prop.get('gis_link'),
                     prop.get('centroid_lat'), prop.get('centroid_lon'),
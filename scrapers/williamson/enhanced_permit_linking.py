@@ -4,8 +4,9 @@ Enhanced Permit-to-Property Linking for Williamson County, TN
 
 Fixes critical bugs in the original clean_address() function and adds:
 1. Proper stripping of subdivision names, cities, states, zips
-2. RapidFuzz for high-performance fuzzy matching
-3. Street key matching for fallback
+2. Blocked RapidFuzz matching via the backend's shared address matcher
+   (candidates share street number + street name or ZIP, scored in batches)
+3. Sole-candidate street block fallback (LOW confidence), ambiguous ties skipped
 4. Classification of truly unmatchable permits
 
 Target: 65-75% raw link rate, 85-92% effective link rate
@@ -13,18 +14,31 @@ Target: 65-75% raw link rate, 85-92% effective link rate
 
 import hashlib
 import re
+import sys
 import psycopg2
+from pathlib import Path
 from typing import Optional, Tuple, Dict, List
 import logging
 from dataclasses import dataclass
 from enum import Enum
 
+# Shared matching engine lives in the backend
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'backend'))
+
 try:
-    from rapidfuzz import fuzz, process
+    from app.services.address_matching_service import AddressMatcher, MatchConfidence
     RAPIDFUZZ_AVAILABLE = True
 except ImportError:
     RAPIDFUZZ_AVAILABLE = False
-    print("WARNING: rapidfuzz not installed. Using fallback matching. Install with: pip install rapidfuzz")
+    print("WARNING: rapidfuzz not installed. Using exact matching only. Install with: pip install rapidfuzz numpy")
+
+    class MatchConfidence(Enum):
+        """Confidence levels for matches (mirrors address_matching_service)."""
+        EXACT = "exact"
+        HIGH = "high"
+        MEDIUM = "medium"
+        LOW = "low"
+        NONE = "none"
 
 logging.basicConfig(
     level=logging.INFO,
@@ -46,15 +60,6 @@ class UnmatchableCategory(Enum):
     ADDRESSABLE = "addressable"         # Should be linkable
 
 
-class MatchConfidence(Enum):
-    """Confidence levels for matches."""
-    EXACT = "exact"           # 100% match
-    HIGH = "high"             # 95%+ fuzzy
-    MEDIUM = "medium"         # 85-94% fuzzy
-    LOW = "low"               # Street key match
-    NONE = "none"             # No match
-
-
 @dataclass
 class LinkResult:
     """Result of attempting to link a permit."""
@@ -259,30 +264,14 @@ def classify_unmatchable(address: str, cleaned: Optional[str]) -> UnmatchableCat
     return UnmatchableCategory.NEW_CONSTRUCTION
 
 
-def extract_street_key(address: str) -> Optional[str]:
-    """Extract street number + first word of street name for broad matching."""
-    match = re.match(r'^(\d+)\s+([A-Z]+)', address)
-    if match:
-        return f"{match.group(1)} {match.group(2)}"
-    return None
-
-
-def fuzzy_match(cleaned_addr: str, property_addresses: Dict[str, str], threshold: int = 92) -> Tuple[Optional[str], float]:
-    """Find best fuzzy match using RapidFuzz."""
-    if not RAPIDFUZZ_AVAILABLE or not cleaned_addr:
-        return None, 0
-
-    result = process.extractOne(
-        cleaned_addr,
-        list(property_addresses.keys()),
-        scorer=fuzz.token_sort_ratio,
-        score_cutoff=threshold
-    )
-
-    if result:
-        matched_addr, score, _ = result
-        return property_addresses[matched_addr], score
-    return None, 0
+def exact_match_only(cleaned_addr: Optional[str], address_to_properties: Dict[str, List[str]]) -> Tuple[Optional[str], MatchConfidence, str]:
+    """Fallback when rapidfuzz is unavailable: unique exact address only."""
+    found = address_to_properties.get(cleaned_addr) if cleaned_addr else None
+    if found and len(set(found)) == 1:
+        return found[0], MatchConfidence.EXACT, "exact"
+    if found:
+        return None, MatchConfidence.NONE, "ambiguous"
+    return None, MatchConfidence.NONE, "none"
 
 
 def main():
@@ -309,30 +298,26 @@ def main():
 
             # Load all properties
             cur.execute("""
-                SELECT id, address_normalized
+                SELECT id, address_normalized, zip_code
                 FROM properties
                 WHERE county_id = %s AND is_active = TRUE AND address_normalized IS NOT NULL
             """, (county_id,))
             properties = cur.fetchall()
 
             # Build lookup structures
-            address_to_property = {row[1]: str(row[0]) for row in properties}
-
-            # Build street key index for fallback matching
-            street_key_to_properties: Dict[str, List[Tuple[str, str]]] = {}
-            for addr, prop_id in address_to_property.items():
-                key = extract_street_key(addr)
-                if key:
-                    if key not in street_key_to_properties:
-                        street_key_to_properties[key] = []
-                    street_key_to_properties[key].append((addr, prop_id))
-
-            logger.info(f"Loaded {len(address_to_property):,} properties")
-            logger.info(f"Built {len(street_key_to_properties):,} street key groups")
+            if RAPIDFUZZ_AVAILABLE:
+                matcher = AddressMatcher((str(row[0]), row[1], row[2]) for row in properties)
+                logger.info(f"Loaded {len(matcher):,} properties")
+                logger.info(f"Built {matcher.block_count:,} street blocks")
+            else:
+                address_to_properties: Dict[str, List[str]] = {}
+                for prop_id, addr, _ in properties:
+                    address_to_properties.setdefault(addr, []).append(str(prop_id))
+                logger.info(f"Loaded {len(properties):,} properties")
 
             # Get all permits (including already linked for re-processing)
             cur.execute("""
-                SELECT id, address, address_normalized, property_id
+                SELECT id, address, address_normalized, zip_code, property_id
                 FROM septic_permits
                 WHERE state_id = %s AND county_id = %s AND is_active = TRUE
             """, (state_id, county_id))
@@ -345,77 +330,50 @@ def main():
                 'fuzzy_high': 0,
                 'fuzzy_medium': 0,
                 'street_key': 0,
+                'ambiguous': 0,
                 'already_linked': 0,
                 'unmatched': 0,
             }
+            result_keys = {
+                MatchConfidence.EXACT: 'exact',
+                MatchConfidence.HIGH: 'fuzzy_high',
+                MatchConfidence.MEDIUM: 'fuzzy_medium',
+                MatchConfidence.LOW: 'street_key',
+            }
 
             categories = {cat: 0 for cat in UnmatchableCategory}
 
             newly_linked = 0
 
-            for permit_id, address, address_normalized, existing_property_id in all_permits:
-                # Clean the address
+            # Clean addresses, skipping permits that are already linked
+            pending = []
+            for permit_id, address, address_normalized, zip_code, existing_property_id in all_permits:
                 cleaned = clean_address(address)
-
-                # Skip if already correctly linked
                 if existing_property_id and cleaned:
-                    # Verify the link is still valid
                     results['already_linked'] += 1
                     continue
-
-                matched_property_id = None
-                confidence = MatchConfidence.NONE
-                method = "none"
-                score = 0.0
-
-                if cleaned:
-                    # Layer 1: Exact match
-                    if cleaned in address_to_property:
-                        matched_property_id = address_to_property[cleaned]
-                        confidence = MatchConfidence.EXACT
-                        method = "exact"
-                        score = 100.0
-                        results['exact'] += 1
-
-                    # Layer 2: Fuzzy match (high confidence >= 95)
-                    elif RAPIDFUZZ_AVAILABLE:
-                        prop_id, fuzz_score = fuzzy_match(cleaned, address_to_property, threshold=95)
-                        if prop_id:
-                            matched_property_id = prop_id
-                            confidence = MatchConfidence.HIGH
-                            method = "fuzzy_high"
-                            score = fuzz_score
-                            results['fuzzy_high'] += 1
-                        else:
-                            # Layer 3: Fuzzy match (medium confidence 85-94)
-                            prop_id, fuzz_score = fuzzy_match(cleaned, address_to_property, threshold=85)
-                            if prop_id:
-                                matched_property_id = prop_id
-                                confidence = MatchConfidence.MEDIUM
-                                method = "fuzzy_medium"
-                                score = fuzz_score
-                                results['fuzzy_medium'] += 1
-
-                    # Layer 4: Street key match (if still no match)
-                    if not matched_property_id:
-                        street_key = extract_street_key(cleaned)
-                        if street_key and street_key in street_key_to_properties:
-                            candidates = street_key_to_properties[street_key]
-                            if len(candidates) == 1:
-                                # Unique match on street key
-                                matched_property_id = candidates[0][1]
-                                confidence = MatchConfidence.LOW
-                                method = "street_key_unique"
-                                score = 75.0
-                                results['street_key'] += 1
-
+                pending.append((permit_id, address, cleaned, zip_code))
+
+            # Exact, fuzzy (blocked, batch-scored) and sole street-block matches in one pass
+            if RAPIDFUZZ_AVAILABLE:
+                outcomes = [
+                    (m.candidate_key, m.confidence, m.method)
+                    for m in matcher.match_many((p[0], p[2], p[3]) for p in pending)
+                ]
+            else:
+                outcomes = [exact_match_only(p[2], address_to_properties) for p in pending]
+
+            for (permit_id, address, cleaned, _), (matched_property_id, confidence, method) in zip(pending, outcomes):
                 # Update permit if we found a match
                 if matched_property_id:
+                    results[result_keys[confidence]] += 1
                     cur.execute("""
                         UPDATE septic_permits SET property_id = %s WHERE id = %s
                     """, (matched_property_id, str(permit_id)))
                     newly_linked += 1
                 else:
+                    if method == 'ambiguous':
+                        results['ambiguous'] += 1
                     # Classify why it's unmatchable
                     category = classify_unmatchable(address, cleaned)
                     categories[category] += 1
@@ -456,7 +414,8 @@ def main():
             logger.info(f"  Exact matches:       {results['exact']:,}")
             logger.info(f"  Fuzzy (high ≥95%):   {results['fuzzy_high']:,}")
             logger.info(f"  Fuzzy (med 85-94%):  {results['fuzzy_medium']:,}")
-            logger.info(f"  Street key unique:   {results['street_key']:,}")
+            logger.info(f"  Street block (low):  {results['street_key']:,}")
+            logger.info(f"  Ambiguous (skipped): {results['ambiguous']:,}")
             logger.info(f"  Unmatched:           {results['unmatched']:,}")
             logger.info(f"")
             logger.info(f"UNMATCHABLE CATEGORIES:")
@@ -13,11 +13,18 @@ Strategy:
 4. Link additional permits
 """
 
-import hashlib
+import logging
 import re
-import psycopg2
+import sys
+from pathlib import Path
 from typing import Optional, Tuple
-import logging
+
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'backend'))
+from app.utils.address_normalization import (  # noqa: E402
+    canonicalize_address, canonical_address_hash
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -66,42 +73,8 @@ def clean_address(address: Optional[str]) -> Optional[str]:
     if street_match:
         cleaned = street_match.group(1)
 
-    # Standard normalization (same as direct_ingestion.py)
-    cleaned = re.sub(r'[.,#\'"()]+', ' ', cleaned)
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-
-    replacements = {
-        r'\bSTREET\b': 'ST',
-        r'\bROAD\b': 'RD',
-        r'\bDRIVE\b': 'DR',
-        r'\bAVENUE\b': 'AVE',
-        r'\bBOULEVARD\b': 'BLVD',
-        r'\bLANE\b': 'LN',
-        r'\bCOURT\b': 'CT',
-        r'\bCIRCLE\b': 'CIR',
-        r'\bPLACE\b': 'PL',
-        r'\bTERRACE\b': 'TER',
-        r'\bPARKWAY\b': 'PKWY',
-        r'\bNORTH\b': 'N',
-        r'\bSOUTH\b': 'S',
-        r'\bEAST\b': 'E',
-        r'\bWEST\b': 'W',
-        r'\bHOLLOW\b': 'HOLW',
-        r'\bCREEK\b': 'CRK',
-        r'\bHIGHWAY\b': 'HWY',
-        r'\bPIKE\b': 'PK',
-    }
-
-    for pattern, replacement in replacements.items():
-        cleaned = re.sub(pattern, replacement, cleaned)
-
-    return cleaned.strip() if cleaned.strip() else None
-
-
-def compute_address_hash(address_normalized: str, county_name: str, state_code: str) -> str:
-    """Compute SHA256 hash for matching."""
-    composite = f"{address_normalized or ''}|{county_name.upper()}|{state_code.upper()}"
-    return hashlib.sha256(composite.encode()).hexdigest()
+    # Standard normalization (shared with the backend)
+    return canonicalize_address(cleaned, 'TN')
 
 
 def main():
@@ -172,7 +145,7 @@ def main():
                     continue
 
                 # Try hash match with cleaned address
-                new_hash = compute_address_hash(cleaned, 'Williamson', 'TN')
+                new_hash = canonical_address_hash(cleaned, 'Williamson', 'TN')
                 if new_hash in property_lookup:
                     property_id = property_lookup[new_hash][0]
                     cur.execute("""
@@ -22,6 +22,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+# Shared matching engine lives in the backend
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'backend'))
+from app.services.address_matching_service import AddressMatcher
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -144,27 +148,6 @@ def extract_address_from_permit_label(label: str) -> Optional[str]:
     return label.split(' - ')[0].strip() if ' - ' in label else None
 
 
-def extract_street_key(address: str) -> Optional[str]:
-    """
-    Extract a simplified street key for fuzzy matching.
-
-    Returns: "123 MAIN ST" style key (just number and street name/type)
-    """
-    if not address:
-        return None
-
-    # Look for pattern: number + street name
-    match = re.match(r'^(\d+[A-Za-z]?)\s+(.+)$', address)
-    if match:
-        number = match.group(1)
-        street = match.group(2)
-        # Just take the first 3 words of the street
-        street_parts = street.split()[:3]
-        return f"{number} {' '.join(street_parts)}"
-
-    return address
-
-
 def load_properties(file_path: Path) -> List[Dict[str, Any]]:
     """Load property records from NDJSON file."""
     logger.info(f"Loading properties from {file_path}")
@@ -213,25 +196,20 @@ def build_property_index(properties: List[Dict]) -> Dict[str, List[Dict]]:
     return index
 
 
-def build_fuzzy_property_index(properties: List[Dict]) -> Dict[str, List[Dict]]:
+def build_fuzzy_matcher(prop_index: Dict[str, List[Dict]]) -> AddressMatcher:
     """
-    Build a fuzzy index using street keys for fallback matching.
+    Build the blocked fuzzy matcher for fallback matching.
 
-    Returns: Dict mapping street_key -> list of property records
+    Candidates are keyed by normalized address (see build_property_index)
+    and blocked by street number + street name / ZIP.
     """
-    index = defaultdict(list)
-
-    for prop in properties:
-        address = prop.get('address') or prop.get('address_normalized')
-        if address:
-            normalized = normalize_address(address)
-            if normalized:
-                key = extract_street_key(normalized)
-                if key:
-                    index[key].append(prop)
+    matcher = AddressMatcher(
+        (normalized, normalized, props[0].get('zip_code') or props[0].get('zip'))
+        for normalized, props in prop_index.items()
+    )
 
-    logger.info(f"Built fuzzy index with {len(index):,} unique street keys")
-    return index
+    logger.info(f"Built fuzzy matcher with {matcher.block_count:,} street blocks")
+    return matcher
 
 
 def match_permits_to_properties(
@@ -248,7 +226,7 @@ def match_permits_to_properties(
     """
     # Build indexes
     prop_index = build_property_index(properties)
-    fuzzy_index = build_fuzzy_property_index(properties)
+    matcher = build_fuzzy_matcher(prop_index)
 
     # Track matches
     matched_properties: Dict[str, Dict] = {}  # address_hash -> property with permits
@@ -257,7 +235,9 @@ def match_permits_to_properties(
     no_match = 0
     no_address = 0
 
-    # Process each permit
+    # Extract and normalize every permit address first so the fuzzy
+    # fallback can be scored in one batch
+    extracted = []
     for permit in permits:
         # Extract address from permit value or label
         permit_value = permit.get('value', '')
@@ -278,19 +258,31 @@ def match_permits_to_properties(
             no_address += 1
             continue
 
-        # Try exact match first
+        extracted.append((permit, permit_address, permit_normalized))
+
+    # Exact matches come straight from the index; the rest are fuzzy
+    # matched within their street block
+    fuzzy_queries = [
+        (position, normalized, None)
+        for position, (_, _, normalized) in enumerate(extracted)
+        if normalized not in prop_index
+    ]
+    fuzzy_results = {m.query_key: m for m in matcher.match_many(fuzzy_queries)}
+
+    for position, (permit, permit_address, permit_normalized) in enumerate(extracted):
+        permit_value = permit.get('value', '')
         matched_props = prop_index.get(permit_normalized, [])
         match_type = 'exact'
+        match_confidence = 'exact'
 
-        # If no exact match, try fuzzy match
         if not matched_props:
-            permit_key = extract_street_key(permit_normalized)
-            if permit_key:
-                matched_props = fuzzy_index.get(permit_key, [])
+            fuzzy = fuzzy_results[position]
+            if fuzzy.candidate_key is not None:
+                matched_props = prop_index[fuzzy.candidate_key]
                 match_type = 'fuzzy'
+                match_confidence = fuzzy.confidence.value
 
         if matched_props:
-            # Use first match (could refine with more sophisticated matching)
             prop = matched_props[0]
 
             # Get address hash as key
@@ -313,7 +305,8 @@ def match_permits_to_properties(
                 'permit_id': permit.get('id'),
                 'permit_value': permit_value,
                 'permit_address': permit_address,
-                'permit_normalized': permit_normalized
+                'permit_normalized': permit_normalized,
+                'match_confidence': match_confidence
             })
 
             if match_type == 'exact':
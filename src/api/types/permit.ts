@@ -198,6 +198,8 @@ export type FacetItem = z.infer<typeof facetItemSchema>;
 export const permitSearchResponseSchema = z.object({
   results: z.array(permitSearchResultSchema),
   total: z.number(),
+  // Counting stops at a limit; total is then a lower bound
+  total_capped: z.boolean().optional(),
   page: z.number(),
   page_size: z.number(),
   total_pages: z.number(),
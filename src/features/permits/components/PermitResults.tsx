@@ -173,7 +173,10 @@ export function PermitResults({
         <div className="text-sm text-gray-600">
           Showing {(data.page - 1) * data.page_size + 1} -{" "}
           {Math.min(data.page * data.page_size, data.total)} of{" "}
-          <span className="font-semibold">{data.total.toLocaleString()}</span>{" "}
+          <span className="font-semibold">
+            {data.total.toLocaleString()}
+            {data.total_capped && "+"}
+          </span>{" "}
           permits
           {data.query && (
             <span className="ml-2">